@@ -4,7 +4,7 @@
 
 from crewai import Agent, LLM
 from config.llm_config import get_llm_params
-from tools.dataset_tools import DatasetTools
+from tools.agent_tools import DatasetTools
 
 
 def make_insights_agent() -> Agent:
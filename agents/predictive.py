@@ -1,7 +1,7 @@
 import os
 from crewai import Agent, LLM
 from config.llm_config import get_llm_params
-from tools.dataset_tools import DatasetTools
+from tools.agent_tools import DatasetTools
 
 def make_predictive_agent() -> Agent:
     """Factory — creates a Predictive Machine Learning Agent."""
@@ -0,0 +1,214 @@
+# Crewlyze Progress Events
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Typed progress event channel for analysis runs.
+
+run_crew() emits structured events (stage started/finished, token usage,
+charts produced, auto-healing attempts) through the sink bound to the current
+context. The server binds a sink that appends each event as one JSON line to
+the session's ``events.jsonl``, which /api/analyze/events streams as SSE so the
+frontend never has to infer progress from stdout text.
+
+The module also provides a per-context stdout router: instead of swapping the
+process-global ``sys.stdout`` with ``contextlib.redirect_stdout`` (which leaks
+output between concurrent runs), each analysis thread binds its own log file
+and writes from other threads continue to reach the real console.
+
+Context variables do not follow work into new threads on their own. CrewAI
+and LiteLLM start threads and submit executor tasks during a run, and those
+would lose the run's log stream and event sink. Inside a
+context_propagation() block, threads started and executor tasks submitted
+from a bound run execute in a copy of the submitter's context. Threads and
+tasks started from anywhere else are untouched, and the patch is removed
+when no run is active.
+"""
+
+import contextlib
+import contextvars
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.thread import _worker as _pool_worker
+from pathlib import Path
+from typing import Callable, Optional
+
+# Event types
+RUN_STARTED     = "run_started"
+RUN_FINISHED    = "run_finished"
+RUN_FAILED      = "run_failed"
+STAGE_STARTED   = "stage_started"
+STAGE_FINISHED  = "stage_finished"
+STAGE_SKIPPED   = "stage_skipped"
+CHART_PRODUCED  = "chart_produced"
+HEAL_ATTEMPT    = "heal_attempt"
+
+EVENT_TYPES = frozenset({
+    RUN_STARTED, RUN_FINISHED, RUN_FAILED,
+    STAGE_STARTED, STAGE_FINISHED, STAGE_SKIPPED,
+    CHART_PRODUCED, HEAL_ATTEMPT,
+})
+
+EventSink = Callable[[dict], None]
+
+# Sink bound for the analysis running in the current context (thread)
+current_event_sink: contextvars.ContextVar[Optional[EventSink]] = contextvars.ContextVar(
+    "current_event_sink", default=None
+)
+
+# Log file bound for the analysis running in the current context (thread)
+current_log_stream = contextvars.ContextVar("current_log_stream", default=None)
+
+
+def make_event(event_type: str, **fields) -> dict:
+    """Build an event dict with a type and millisecond timestamp."""
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown progress event type: {event_type}")
+    event = {"type": event_type, "ts": time.time() * 1000}
+    event.update(fields)
+    return event
+
+
+def emit(event_type: str, **fields) -> None:
+    """Send an event to the sink bound in this context. No-op when unbound."""
+    sink = current_event_sink.get()
+    if sink is None:
+        return
+    try:
+        sink(make_event(event_type, **fields))
+    except Exception as exc:
+        print(f"[Events] Failed to emit {event_type}: {exc}", file=sys.__stderr__)
+
+
+class JsonlEventWriter:
+    """Event sink that appends events as JSON lines to *path* (thread-safe)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Truncate events from a previous run of the same session
+        self.path.write_text("", encoding="utf-8")
+
+    def __call__(self, event: dict) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def read_events(path: Path) -> list:
+    """Load all events recorded in an ``events.jsonl`` file."""
+    events = []
+    path = Path(path)
+    if not path.exists():
+        return events
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return events
+
+
+# ---------------------------------------------------------------------------
+# Per-context stdout routing
+# ---------------------------------------------------------------------------
+
+class _ContextStdout:
+    """sys.stdout proxy that writes to the log stream bound in the current context."""
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+
+    def _target(self):
+        stream = current_log_stream.get()
+        # A thread that outlived its run still carries the run's (closed) log file
+        if stream is None or getattr(stream, "closed", False):
+            return self._fallback
+        return stream
+
+    def write(self, data):
+        return self._target().write(data)
+
+    def flush(self):
+        try:
+            self._target().flush()
+        except Exception:
+            pass
+
+    def isatty(self):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._fallback, name)
+
+
+_install_lock = threading.Lock()
+
+
+def install_stdout_router() -> None:
+    """Replace sys.stdout once with the context-aware proxy (idempotent)."""
+    with _install_lock:
+        if not isinstance(sys.stdout, _ContextStdout):
+            sys.stdout = _ContextStdout(sys.stdout)
+
+
+def _run_bound() -> bool:
+    return current_log_stream.get() is not None or current_event_sink.get() is not None
+
+
+def _is_pool_worker(thread: threading.Thread) -> bool:
+    return getattr(thread, "_target", None) is _pool_worker
+
+
+_propagating_runs = 0
+_original_start = threading.Thread.start
+_original_submit = ThreadPoolExecutor.submit
+
+
+def _start(self):
+    # Pool workers outlive the run that spawned them; their tasks get the
+    # submitter's context through _submit instead
+    if _run_bound() and not _is_pool_worker(self):
+        ctx, run = contextvars.copy_context(), self.run
+        self.run = lambda: ctx.run(run)
+    return _original_start(self)
+
+
+def _submit(self, fn, /, *args, **kwargs):
+    if _run_bound():
+        return _original_submit(self, contextvars.copy_context().run, fn, *args, **kwargs)
+    return _original_submit(self, fn, *args, **kwargs)
+
+
+@contextlib.contextmanager
+def context_propagation():
+    """Carry bound runs' context into the threads and executor tasks they start.
+
+    While at least one block is active, ``threading.Thread.start`` and
+    ``ThreadPoolExecutor.submit`` are patched process-wide. Only calls made
+    from a context with a bound log stream or event sink are changed; the
+    originals are restored when the last block exits.
+    """
+    global _propagating_runs
+    with _install_lock:
+        if _propagating_runs == 0:
+            threading.Thread.start = _start
+            ThreadPoolExecutor.submit = _submit
+        _propagating_runs += 1
+    try:
+        yield
+    finally:
+        with _install_lock:
+            _propagating_runs -= 1
+            if _propagating_runs == 0:
+                threading.Thread.start = _original_start
+                ThreadPoolExecutor.submit = _original_submit
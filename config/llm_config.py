@@ -3,10 +3,10 @@
 # Licensed under the MIT License
 
 import os
-import requests
-from dotenv import load_dotenv
+import threading
 
-load_dotenv()
+_env_loaded = False
+_env_lock = threading.Lock()
 
 def _load_local_config():
     try:
@@ -22,7 +22,22 @@ def _load_local_config():
     except Exception:
         pass
 
-_load_local_config()
+
+def _ensure_env() -> None:
+    """Load .env and ~/.crewlyze/config.json into the environment on first use, not at import."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if _env_loaded:
+            return
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
+        _load_local_config()
+        _env_loaded = True
 
 # NVIDIA NIM OpenAI-compatible endpoint (required for LiteLLM / CrewAI)
 NVIDIA_NIM_BASE_URL = "https://integrate.api.nvidia.com/v1"
@@ -40,6 +55,7 @@ def _sync_nvidia_env(api_key: str) -> None:
 
 def get_llm_config() -> dict:
     """Return the raw provider config dict (may contain extra keys)."""
+    _ensure_env()
     from config.context import current_llm_provider, current_llm_api_key
     provider = current_llm_provider.get() or os.getenv("LLM_PROVIDER", "nvidia")
 
@@ -186,6 +202,9 @@ def validate_llm_connection(provider: str, model: str, api_key: str = "") -> dic
     Ping the configured LLM with a minimal prompt.
     Returns {"valid": bool, "message": str}.
     """
+    import requests
+
+    _ensure_env()
 
     if provider == "custom" and api_key and "|" in api_key:
         parts = api_key.split("|", 1)
@@ -276,6 +295,9 @@ def call_minimax_m3(messages: list, stream: bool = False, **kwargs) -> dict:
     """
     Direct HTTP client for MiniMax-M3 via NVIDIA NIM.
     """
+    import requests
+
+    _ensure_env()
     api_key = os.getenv("NVIDIA_API_KEY")
     if not api_key:
         raise ValueError("NVIDIA_API_KEY environment variable is not set.")
@@ -2,15 +2,308 @@
 # Copyright (c) 2026 Sowmiyan S
 # Licensed under the MIT License
 
-import os
+"""
+Append-only run metrics in ``DATA_DIR/metrics.sqlite3``.
+
+log_metric() used to read all of metrics.json, append one run, cut the list
+to the last 100 and rewrite the file, with no locking. Concurrent runs could
+lose entries, and anything older than 100 runs was gone. Now:
+
+- Each run is one row in ``runs``, and each stage duration is one row in
+  ``stage_times``. Inserts go through one WAL connection behind a lock. A
+  busy timeout covers other processes.
+- Retention is by age: rows older than ``CREWLYZE_METRICS_RETENTION_DAYS``
+  (default 90) are pruned, at most once an hour.
+- summarize() aggregates a window ("1h", "24h", "7d", "30d", "all", or
+  seconds). It reports p50/p95/p99 run and stage latency, token usage,
+  cost, success rate and throughput. With a bucket size it also returns a
+  time series for capacity planning.
+
+An existing metrics.json is imported once, in a single transaction, and
+renamed to metrics.json.migrated. Runs already present (same timestamp and
+session) are skipped, so an interrupted import can simply run again. get_metrics() still returns the same list of run
+dicts, oldest first, for the metrics screen.
+"""
+
 import json
+import math
+import os
+import re
+import sqlite3
+import threading
 import time
 from pathlib import Path
+from typing import Optional
+
+PRUNE_INTERVAL_S = 3600
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id     TEXT,
+    dataset_name   TEXT,
+    rows           INTEGER,
+    columns        INTEGER,
+    ts             REAL NOT NULL,
+    total_time     REAL,
+    token_usage    INTEGER,
+    estimated_cost REAL,
+    success        INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stage_times (
+    run_id  INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    stage   TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    ts      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_ts ON runs(ts);
+CREATE INDEX IF NOT EXISTS idx_stage_times_ts ON stage_times(ts, stage);
+"""
+
 
 def get_metrics_file_path() -> Path:
     user_home = Path.home() / ".crewlyze"
     return Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data"))) / "metrics.json"
 
+
+def parse_window(window) -> Optional[float]:
+    """Seconds for "90s", "15m", "24h", "7d", "2w" or a number; None for "all". Raises ValueError."""
+    if window is None or str(window).strip().lower() in ("", "all"):
+        return None
+    text = str(window).strip().lower()
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([smhdw]?)", text)
+    if not match:
+        raise ValueError(f"Invalid window {window!r}; use e.g. 1h, 24h, 7d or all")
+    return float(match.group(1)) * _WINDOW_UNITS.get(match.group(2) or "s", 1)
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _distribution(values: list, percentiles: tuple) -> dict:
+    values = sorted(values)
+    summary = {"count": len(values)}
+    for pct in percentiles:
+        summary[f"p{pct}"] = round(_percentile(values, pct), 3)
+    summary["mean"] = round(sum(values) / len(values), 3) if values else 0.0
+    return summary
+
+
+class MetricsStore:
+    """Thread-safe run metrics on a single SQLite connection (WAL mode)."""
+
+    def __init__(self, db_path: Path, legacy_json: Optional[Path] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._last_prune = 0.0
+        if legacy_json is not None and legacy_json.exists():
+            self._migrate(legacy_json)
+
+    def _migrate(self, legacy_json: Path) -> None:
+        try:
+            with open(legacy_json, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            entries = [e for e in entries if isinstance(e, dict)] if isinstance(entries, list) else []
+            imported = 0
+            with self._lock:
+                try:
+                    for entry in entries:
+                        ts = float(entry.get("timestamp") or 0)
+                        if ts and self._conn.execute(
+                            "SELECT 1 FROM runs WHERE ts = ? AND session_id IS ?", (ts, entry.get("session_id"))
+                        ).fetchone():
+                            continue
+                        self._insert(entry)
+                        imported += 1
+                    self._conn.commit()
+                except Exception:
+                    self._conn.rollback()
+                    raise
+            legacy_json.rename(legacy_json.with_name(legacy_json.name + ".migrated"))
+            print(f"[Metrics] Imported {imported} run(s) from {legacy_json.name}")
+        except Exception as e:
+            print(f"[Metrics] Could not import {legacy_json.name}: {e}")
+
+    def _insert(self, entry: dict) -> int:
+        """Insert one run and its stages without committing (caller holds the lock)."""
+        ts = float(entry.get("timestamp") or time.time() * 1000)
+        stages = [(stage, float(seconds)) for stage, seconds in (entry.get("stages") or {}).items()
+                  if isinstance(seconds, (int, float)) and not isinstance(seconds, bool)]
+        cur = self._conn.execute(
+            "INSERT INTO runs (session_id, dataset_name, rows, columns, ts, total_time, token_usage, "
+            "estimated_cost, success) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (entry.get("session_id"), entry.get("dataset_name"), int(entry.get("rows") or 0),
+             int(entry.get("columns") or 0), ts, float(entry.get("total_time") or 0),
+             int(entry.get("token_usage") or 0), float(entry.get("estimated_cost") or 0),
+             1 if entry.get("success", True) else 0),
+        )
+        run_id = cur.lastrowid
+        self._conn.executemany(
+            "INSERT INTO stage_times (run_id, stage, seconds, ts) VALUES (?, ?, ?, ?)",
+            [(run_id, stage, seconds, ts) for stage, seconds in stages],
+        )
+        return run_id
+
+    def append(self, entry: dict, prune: bool = True) -> int:
+        with self._lock:
+            try:
+                run_id = self._insert(entry)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        if prune and time.time() - self._last_prune > PRUNE_INTERVAL_S:
+            self.prune()
+        return run_id
+
+    def prune(self) -> int:
+        """Delete runs older than the retention period. Returns the number removed."""
+        try:
+            days = float(os.getenv("CREWLYZE_METRICS_RETENTION_DAYS", "90"))
+        except ValueError:
+            days = 90.0
+        cutoff = (time.time() - days * 86400) * 1000
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM runs WHERE ts < ?", (cutoff,))
+            self._conn.execute("DELETE FROM stage_times WHERE ts < ?", (cutoff,))
+            self._conn.commit()
+            self._last_prune = time.time()
+        return cur.rowcount
+
+    @staticmethod
+    def _since(window_s: Optional[float]) -> float:
+        return 0.0 if window_s is None else (time.time() - window_s) * 1000
+
+    def runs(self, window_s: Optional[float] = None, limit: Optional[int] = 100) -> list:
+        """Run dicts in the legacy metrics.json shape, oldest first."""
+        query = ("SELECT id, session_id, dataset_name, rows, columns, ts, total_time, token_usage, "
+                 "estimated_cost, success FROM runs WHERE ts >= ? ORDER BY ts DESC")
+        params: list = [self._since(window_s)]
+        if limit:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            ids = [r[0] for r in rows]
+            stages: dict = {}
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                for run_id, stage, seconds in self._conn.execute(
+                    f"SELECT run_id, stage, seconds FROM stage_times WHERE run_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ):
+                    stages.setdefault(run_id, {})[stage] = seconds
+        return [
+            {
+                "session_id": r[1], "dataset_name": r[2], "rows": r[3], "columns": r[4], "timestamp": r[5],
+                "stages": stages.get(r[0], {}), "total_time": r[6], "token_usage": r[7],
+                "estimated_cost": r[8], "success": bool(r[9]),
+            }
+            for r in reversed(rows)
+        ]
+
+    def stage_percentiles(self, window_s: Optional[float] = None, percentiles: tuple = (50, 90, 95, 99)) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, seconds FROM stage_times WHERE ts >= ?", (self._since(window_s),)
+            ).fetchall()
+        durations: dict = {}
+        for stage, seconds in rows:
+            durations.setdefault(stage, []).append(seconds)
+        summary = {}
+        for stage, values in durations.items():
+            dist = _distribution(values, percentiles)
+            dist.pop("mean")
+            summary[stage] = dist
+        return summary
+
+    def summarize(self, window_s: Optional[float] = None, bucket_s: Optional[float] = None,
+                  percentiles: tuple = (50, 95, 99)) -> dict:
+        """Latency, token, cost and throughput aggregates over the window, optionally bucketed."""
+        since = self._since(window_s)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, rows, total_time, token_usage, estimated_cost, success FROM runs WHERE ts >= ? ORDER BY ts",
+                (since,),
+            ).fetchall()
+        now_ms = time.time() * 1000
+        if window_s is not None:
+            span_s = window_s
+        else:
+            span_s = max(1.0, (now_ms - rows[0][0]) / 1000) if rows else 0.0
+
+        summary = {
+            "window_s": window_s,
+            "span_s": round(span_s, 1),
+            **self._aggregate(rows, span_s, percentiles),
+            "stages": self.stage_percentiles(window_s, percentiles),
+        }
+        if bucket_s:
+            start_ms = since if window_s is not None else (rows[0][0] if rows else now_ms)
+            buckets: dict = {}
+            for row in rows:
+                buckets.setdefault(int((row[0] - start_ms) // (bucket_s * 1000)), []).append(row)
+            summary["bucket_s"] = bucket_s
+            summary["series"] = [
+                {"start": start_ms + index * bucket_s * 1000, **self._aggregate(bucket_rows, bucket_s, percentiles)}
+                for index, bucket_rows in sorted(buckets.items())
+            ]
+        return summary
+
+    @staticmethod
+    def _aggregate(rows: list, span_s: float, percentiles: tuple) -> dict:
+        total_runs = len(rows)
+        successes = sum(1 for r in rows if r[5])
+        tokens = sum(r[3] or 0 for r in rows)
+        cost = sum(r[4] or 0.0 for r in rows)
+        processed_rows = sum(r[1] or 0 for r in rows)
+        hours = span_s / 3600 if span_s else 0.0
+        return {
+            "runs": total_runs,
+            "successes": successes,
+            "failures": total_runs - successes,
+            "success_rate": round(successes / total_runs, 3) if total_runs else None,
+            "total_time": _distribution([r[2] or 0.0 for r in rows], percentiles),
+            "tokens": {
+                "total": tokens,
+                "per_run": _distribution([float(r[3] or 0) for r in rows], percentiles),
+            },
+            "cost": {"total": round(cost, 4), "per_run_mean": round(cost / total_runs, 4) if total_runs else 0.0},
+            "throughput": {
+                "runs_per_hour": round(total_runs / hours, 3) if hours else None,
+                "rows_per_hour": round(processed_rows / hours, 1) if hours else None,
+                "tokens_per_hour": round(tokens / hours, 1) if hours else None,
+            },
+        }
+
+
+_store: Optional[MetricsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> MetricsStore:
+    """Process-wide store in ``DATA_DIR/metrics.sqlite3`` (imports a legacy metrics.json once)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            legacy = get_metrics_file_path()
+            _store = MetricsStore(legacy.with_name("metrics.sqlite3"), legacy_json=legacy)
+        return _store
+
+
 def log_metric(
     session_id: str,
     dataset_name: str,
@@ -22,49 +315,42 @@ def log_metric(
     token_usage: int = 0,
     estimated_cost: float = 0.0
 ):
-    metrics_path = get_metrics_file_path()
-    metrics_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    new_entry = {
-        "session_id": session_id,
-        "dataset_name": dataset_name,
-        "rows": rows,
-        "columns": cols,
-        "timestamp": time.time() * 1000,  # Milliseconds since epoch
-        "stages": stages,
-        "total_time": total_time,
-        "token_usage": token_usage,
-        "estimated_cost": estimated_cost,
-        "success": success
-    }
-    
-    metrics = []
-    if metrics_path.exists():
-        try:
-            with open(metrics_path, "r", encoding="utf-8") as f:
-                metrics = json.load(f)
-                if not isinstance(metrics, list):
-                    metrics = []
-        except Exception:
-            metrics = []
-            
-    metrics.append(new_entry)
-    
-    # Cap to last 100 entries to prevent file from growing indefinitely
-    metrics = metrics[-100:]
-    
     try:
-        with open(metrics_path, "w", encoding="utf-8") as f:
-            json.dump(metrics, f, indent=2)
+        get_metrics_store().append({
+            "session_id": session_id,
+            "dataset_name": dataset_name,
+            "rows": rows,
+            "columns": cols,
+            "timestamp": time.time() * 1000,  # Milliseconds since epoch
+            "stages": stages,
+            "total_time": total_time,
+            "token_usage": token_usage,
+            "estimated_cost": estimated_cost,
+            "success": success
+        })
     except Exception as e:
         print(f"Failed to save metrics: {e}")
 
-def get_metrics() -> list:
-    metrics_path = get_metrics_file_path()
-    if not metrics_path.exists():
-        return []
+
+def get_metrics(window: Optional[str] = None, limit: Optional[int] = 100) -> list:
+    """Recent runs, oldest first (the last *limit* in *window*)."""
     try:
-        with open(metrics_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
+        return get_metrics_store().runs(parse_window(window), limit)
+    except ValueError:
+        raise
+    except Exception as e:
+        print(f"Failed to read metrics: {e}")
         return []
+
+
+def get_stage_percentiles(percentiles: tuple = (50, 90, 95, 99), window: Optional[str] = None) -> dict:
+    """Latency percentiles (seconds) for each pipeline stage across recorded runs."""
+    return get_metrics_store().stage_percentiles(parse_window(window), percentiles)
+
+
+def summarize_metrics(window: Optional[str] = "24h", bucket: Optional[str] = None) -> dict:
+    """Aggregates for the metrics API; *window* and *bucket* use parse_window() syntax."""
+    bucket_s = parse_window(bucket) if bucket else None
+    if bucket_s is not None and bucket_s <= 0:
+        raise ValueError("bucket must be positive")
+    return get_metrics_store().summarize(parse_window(window), bucket_s)
@@ -21,7 +21,7 @@ Performance improvements in this version:
 
 import logging
 import os
-import shutil
+import re
 import sys
 import time
 import traceback
@@ -55,6 +55,7 @@ except ImportError as exc:
     print(f"ERROR: {exc}\nRun: pip install crewai")
     sys.exit(1)
 
+from config import events
 from tools.dataset_tools import build_dataset_profile, generate_plotly_charts, read_csv_robust
 from workflows.pipeline import make_pipeline
 
@@ -75,6 +76,9 @@ def _run_auto_visualizer_fallback(csv_path: Path, output_dir: Path, relations_te
     matplotlib.use('Agg')
     import matplotlib.pyplot as plt
     import seaborn as sns
+    from tools.data_reduction import line_series
+
+    SCATTER_POINT_BUDGET = 5000
 
     try:
         df = read_csv_robust(csv_path)
@@ -125,7 +129,8 @@ def _run_auto_visualizer_fallback(csv_path: Path, output_dir: Path, relations_te
         for i, (x_col, y_col, ptype) in enumerate(relation_pairs[:5]):
             color = colors[i % len(colors)]
             try:
-                sample = df[[x_col, y_col]].dropna().head(2000)
+                # Every row is used; dense scatters are hex-binned and lines LTTB-downsampled
+                sample = df[[x_col, y_col]].dropna()
                 if sample.empty:
                     continue
 
@@ -140,7 +145,11 @@ def _run_auto_visualizer_fallback(csv_path: Path, output_dir: Path, relations_te
                     plt.xticks(rotation=40, ha="right", color=TEXT_COLOR)
                     title = f"{y_col} by {x_col}"
                 elif "line" in ptype:
-                    sns.lineplot(data=sample.sort_values(x_col), x=x_col, y=y_col, color=color, ax=ax)
+                    series = line_series(sample, x_col, y_col)
+                    if series is None:
+                        plt.close()
+                        continue
+                    sns.lineplot(data=series, x=x_col, y=y_col, color=color, ax=ax)
                     title = f"{y_col} over {x_col}"
                 elif "box" in ptype:
                     if not x_is_num:
@@ -153,7 +162,13 @@ def _run_auto_visualizer_fallback(csv_path: Path, output_dir: Path, relations_te
                     sns.histplot(sample[x_col].dropna(), kde=True, color=color, ax=ax)
                     title = f"Distribution of {x_col}"
                 else:
-                    if x_is_num and y_is_num:
+                    if x_is_num and y_is_num and len(sample) > SCATTER_POINT_BUDGET:
+                        hb = ax.hexbin(sample[x_col], sample[y_col], gridsize=50,
+                                       cmap="Purples", mincnt=1)
+                        fig.colorbar(hb, ax=ax, label="Rows")
+                        ax.set_xlabel(x_col)
+                        ax.set_ylabel(y_col)
+                    elif x_is_num and y_is_num:
                         sns.scatterplot(data=sample, x=x_col, y=y_col,
                                         color=color, alpha=0.7, ax=ax)
                     else:
@@ -219,7 +234,14 @@ def _run_auto_visualizer_fallback(csv_path: Path, output_dir: Path, relations_te
                 try:
                     x, y = numeric_cols[0], numeric_cols[1]
                     fig, ax = plt.subplots(figsize=(10, 6))
-                    sns.scatterplot(data=df.head(2000), x=x, y=y, color=colors[1], alpha=0.7, ax=ax)
+                    pair = df[[x, y]].dropna()
+                    if len(pair) > SCATTER_POINT_BUDGET:
+                        hb = ax.hexbin(pair[x], pair[y], gridsize=50, cmap="Blues", mincnt=1)
+                        fig.colorbar(hb, ax=ax, label="Rows")
+                        ax.set_xlabel(x)
+                        ax.set_ylabel(y)
+                    else:
+                        sns.scatterplot(data=pair, x=x, y=y, color=colors[1], alpha=0.7, ax=ax)
                     ax.set_title(f"{x} vs {y} Relationship", fontsize=13, fontweight="bold", pad=14)
                     _apply_light_style(fig, ax)
                     plt.tight_layout()
@@ -258,62 +280,20 @@ def _run_auto_visualizer_fallback(csv_path: Path, output_dir: Path, relations_te
 # Session cleanup helper
 # ---------------------------------------------------------------------------
 
-def _cleanup_old_sessions(max_age_hours: int = 24) -> None:
-    """Remove session directories older than *max_age_hours*.
-    Also enforces a strict disk quota limit: if the total combined size of sessions and
-    outputs exceeds 1.0 GB, it prunes the oldest folders until the size is under 400 MB.
+def _cleanup_old_sessions(max_age_hours: Optional[int] = None) -> None:
+    """Remove sessions older than *max_age_hours* (default: the configured
+    retention) and enforce the 1.0 GB disk quota.
+
+    Sizes come from the usage ledger in tools/storage_quota.py rather than a
+    recursive scan per call. The server runs this on a background schedule
+    (see ensure_scheduler()); call it directly only for one-off cleanup.
     """
-    user_home = Path.home() / ".crewlyze"
-    data_dir = Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data")))
-    sessions_root = data_dir / "sessions"
-    outputs_root  = Path(os.getenv("CREWLYZE_OUTPUTS_DIR", str(user_home / "outputs")))
-
-    # 1. Clean based on age
-    for root in (sessions_root, outputs_root):
-        if not root.exists():
-            continue
-        cutoff = time.time() - max_age_hours * 3600
-        for session_dir in root.iterdir():
-            if session_dir.is_dir():
-                try:
-                    if session_dir.stat().st_mtime < cutoff:
-                        shutil.rmtree(session_dir, ignore_errors=True)
-                except OSError:
-                    pass
-
-    # 2. Clean based on disk quota (max 1.0 GB combined)
-    def get_dir_size(path: Path) -> int:
-        if not path.exists():
-            return 0
-        return sum(f.stat().st_size for f in path.glob('**/*') if f.is_file())
-
-    total_size = get_dir_size(sessions_root) + get_dir_size(outputs_root)
-    max_quota_bytes = 1000 * 1024 * 1024  # 1.0 GB
-    target_quota_bytes = 400 * 1024 * 1024 # 400 MB
-
-    if total_size > max_quota_bytes:
-        print(f"Disk quota exceeded: {total_size / (1024*1024):.1f}MB. Pruning oldest sessions...")
-        # Collect all session subfolders and outputs with their mtimes
-        subfolders = []
-        for root in (sessions_root, outputs_root):
-            if root.exists():
-                for folder in root.iterdir():
-                    if folder.is_dir():
-                        subfolders.append((folder, folder.stat().st_mtime))
-        
-        # Sort oldest first
-        subfolders.sort(key=lambda x: x[1])
+    from tools.storage_quota import enforce, get_ledger
 
-        for folder, _ in subfolders:
-            try:
-                shutil.rmtree(folder, ignore_errors=True)
-                # Recalculate
-                total_size = get_dir_size(sessions_root) + get_dir_size(outputs_root)
-                if total_size <= target_quota_bytes:
-                    print(f"Disk footprint successfully reduced to {total_size / (1024*1024):.1f}MB.")
-                    break
-            except Exception as e:
-                print(f"Error pruning session folder {folder}: {e}")
+    ledger = get_ledger()
+    if ledger.reconciled_at is None:
+        ledger.reconcile()
+    enforce(max_age_hours)
 
 
 # ---------------------------------------------------------------------------
@@ -485,6 +465,7 @@ def run_crew(
     on_progress: Optional[Callable[[str, object], None]] = None,
     selected_tasks: Optional[list[str]] = None,
     deep_analysis: bool = False,
+    on_event:    Optional[Callable[[dict], None]] = None,
 ) -> dict:
     """
     Run the full multi-agent analysis pipeline on *csv_path*.
@@ -504,6 +485,9 @@ def run_crew(
     on_progress : Optional callback(stage: str, data: object) called after
                   each stage completes. Stages: "profiling", "cleaning",
                   "relations", "insights", "visualization", "plotly".
+    on_event    : Optional sink receiving typed progress events (see
+                  config/events.py): run/stage started and finished with
+                  durations and token counts, charts produced, heal attempts.
 
     Returns
     -------
@@ -511,7 +495,67 @@ def run_crew(
         dataframe, cleaning_steps, relations, insights, code,
         output_dir, plotly_charts
     """
-    _cleanup_old_sessions()
+    sink_token = events.current_event_sink.set(on_event) if on_event else None
+    events.emit(events.RUN_STARTED, session_id=session_id, dataset=Path(csv_path).name)
+    start = time.time()
+    run_stats: dict = {}
+    try:
+        result = _run_pipeline(csv_path, session_id, on_progress, selected_tasks, deep_analysis, run_stats)
+    except Exception as exc:
+        events.emit(
+            events.RUN_FAILED, session_id=session_id,
+            duration_ms=round((time.time() - start) * 1000), error=str(exc),
+        )
+        _log_failed_run(csv_path, session_id, run_stats, time.time() - start)
+        raise
+    else:
+        events.emit(
+            events.RUN_FINISHED, session_id=session_id,
+            duration_ms=round((time.time() - start) * 1000),
+            charts=len(result.get("plotly_charts") or []),
+        )
+        return result
+    finally:
+        if sink_token is not None:
+            events.current_event_sink.reset(sink_token)
+
+
+def _log_failed_run(csv_path: str, session_id: str, run_stats: dict, total_time: float) -> None:
+    """Record a failed run with the stages it completed, so failure rates are real."""
+    try:
+        from config.metrics_tracker import log_metric
+        tokens = run_stats.get("tokens", 0)
+        log_metric(
+            session_id=session_id,
+            dataset_name=Path(csv_path).name,
+            rows=run_stats.get("rows", 0),
+            cols=run_stats.get("cols", 0),
+            stages=run_stats.get("stages", {}),
+            total_time=total_time,
+            success=False,
+            token_usage=tokens,
+            estimated_cost=(tokens / 1_000_000) * 0.15 if tokens else 0.0,
+        )
+    except Exception as e:
+        print(f"Error logging metric: {e}")
+
+
+def _run_pipeline(
+    csv_path: str,
+    session_id: str,
+    on_progress: Optional[Callable[[str, object], None]],
+    selected_tasks: Optional[list[str]],
+    deep_analysis: bool,
+    run_stats: Optional[dict] = None,
+) -> dict:
+    """Body of run_crew(); events emitted here reach the sink bound by run_crew().
+
+    *run_stats* is filled in as the run progresses (stages, tokens, shape) so
+    run_crew() can log a failed run.
+    """
+    # Old-session cleanup runs on a background schedule, off the analysis path
+    from tools.storage_quota import ensure_scheduler
+    ensure_scheduler()
 
     import time
     from config.metrics_tracker import log_metric
@@ -519,11 +563,31 @@ def run_crew(
     start_run = time.time()
     stage_times = {}
     total_tokens = 0
+    run_stats = {} if run_stats is None else run_stats
+    run_stats["stages"] = stage_times
 
     def _progress(stage: str, data: object = None) -> None:
         if on_progress:
             on_progress(stage, data)
 
+    stage_tokens_start = {}
+
+    def _stage_started(stage: str) -> None:
+        stage_tokens_start[stage] = total_tokens
+        events.emit(events.STAGE_STARTED, stage=stage)
+
+    def _stage_finished(stage: str) -> None:
+        run_stats["tokens"] = total_tokens
+        events.emit(
+            events.STAGE_FINISHED, stage=stage,
+            duration_ms=round(stage_times.get(stage, 0.0) * 1000),
+            tokens=total_tokens - stage_tokens_start.get(stage, total_tokens),
+            total_tokens=total_tokens,
+        )
+
+    def _stage_skipped(stage: str) -> None:
+        events.emit(events.STAGE_SKIPPED, stage=stage)
+
     # ── Per-session directories ───────────────────────────────────────────────
     user_home = Path.home() / ".crewlyze"
     data_dir = Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data")))
@@ -549,7 +613,13 @@ def run_crew(
         raise FileNotFoundError(f"Upload not found at: {csv_path}")
 
     n_rows, n_cols = df.shape
+    run_stats.update(rows=n_rows, cols=n_cols)
     print(f"Loaded {n_rows:,} rows, {n_cols} columns")
+    try:
+        from tools.dataset_diff import record_metadata
+        record_metadata(csv_path, df)
+    except Exception as e:
+        print(f"[Dataset Diff] Could not record upload metadata: {e}")
     cols_preview = ", ".join(df.columns[:10])
     if n_cols > 10:
         cols_preview += "..."
@@ -559,8 +629,11 @@ def run_crew(
     original_backup = session_data_dir / "original.csv"
     cleaned_path    = session_data_dir / "cleaned.csv"
 
+    from tools.session_storage import break_link, dedupe
+    break_link(original_backup)  # never rewrite a deduplicated blob in place
     df.to_csv(original_backup, index=False)
     df.to_csv(cleaned_path, index=False)
+    dedupe([csv_path, original_backup])
     print(f"Original backed up → {original_backup}")
     print(f"Working copy created → {cleaned_path}\n")
 
@@ -597,6 +670,7 @@ def run_crew(
             # Update our in-memory df and shapes
             df = df_coerced
             n_rows, n_cols = df.shape
+            run_stats.update(rows=n_rows, cols=n_cols)
         else:
             print("No type conflicts detected.")
 
@@ -607,9 +681,11 @@ def run_crew(
         print(f"Large file detected ({n_rows:,} rows). "
               f"Profiling on {profile_max_rows:,}-row sample ...")
     print("Building dataset profile ...")
+    _stage_started("profiling")
     start_prof = time.time()
     profile = build_dataset_profile(str(cleaned_path), max_rows=profile_max_rows)
     stage_times["profiling"] = time.time() - start_prof
+    _stage_finished("profiling")
     _progress("profiling", profile)
     print("Profile ready.\n")
 
@@ -660,6 +736,7 @@ def run_crew(
     if do_cleaning:
         print("\n[Stage 1/4] Running Data Cleaner ...")
         start_clean_stage = time.time()
+        _stage_started("cleaning")
         clean_crew = Crew(
             agents=[agents[0]],
             tasks=[tasks[0]],
@@ -685,10 +762,12 @@ def run_crew(
             )
 
         stage_times["cleaning"] = time.time() - start_clean_stage
+        _stage_finished("cleaning")
         _progress("cleaning", clean_output)
         print("[Stage 1/4] Cleaning complete.\n")
     else:
         print("\n[Stage 1/4] Skipping Data Cleaner (user selection).\n")
+        _stage_skipped("cleaning")
         _progress("cleaning", clean_output)
 
     # ════════════════════════════════════════════════════════════════════════
@@ -699,6 +778,7 @@ def run_crew(
     if do_relations:
         print("\n[Stage 2/4] Running Relation Analyst ...")
         start_rel_stage = time.time()
+        _stage_started("relations")
         try:
             rel_crew = Crew(
                 agents=[agents[1]],
@@ -734,10 +814,12 @@ def run_crew(
             relation_output = _run_auto_relation_fallback(df)
 
         stage_times["relations"] = time.time() - start_rel_stage
+        _stage_finished("relations")
         _progress("relations", relation_output)
         print("[Stage 2/4] Relation Analysis complete.\n")
     else:
         print("\n[Stage 2/4] Skipping Relation Analyst (user selection).\n")
+        _stage_skipped("relations")
         _progress("relations", relation_output)
 
     # ════════════════════════════════════════════════════════════════════════
@@ -748,6 +830,7 @@ def run_crew(
     if do_visualization:
         print("[Stage 3/4] Running Data Visualizer ...")
         start_viz_stage = time.time()
+        _stage_started("visualization")
 
         # Inject relation output directly into the task description
         viz_task = tasks[3]
@@ -786,10 +869,12 @@ def run_crew(
             print(fallback_msg)
 
         stage_times["visualization"] = time.time() - start_viz_stage
+        _stage_finished("visualization")
         _progress("visualization", visualize_output)
         print("[Stage 3/4] Visualization complete.\n")
     else:
         print("[Stage 3/4] Skipping Data Visualizer (user selection).\n")
+        _stage_skipped("visualization")
         _progress("visualization", visualize_output)
 
     # ════════════════════════════════════════════════════════════════════════
@@ -800,6 +885,7 @@ def run_crew(
     if do_insights:
         print("[Stage 4/4] Running BI Analyst ...")
         start_ins_stage = time.time()
+        _stage_started("insights")
 
         # Inject cleaning, relation, and visualization outputs into task description
         ins_task = tasks[2]
@@ -831,10 +917,12 @@ def run_crew(
             insights_output = _run_auto_insights_fallback(df, project_goal)
 
         stage_times["insights"] = time.time() - start_ins_stage
+        _stage_finished("insights")
         _progress("insights", insights_output)
         print("[Stage 4/4] BI Analysis complete.\n")
     else:
         print("[Stage 4/4] Skipping BI Analyst (user selection).\n")
+        _stage_skipped("insights")
         _progress("insights", insights_output)
 
     # ════════════════════════════════════════════════════════════════════════
@@ -844,6 +932,7 @@ def run_crew(
     if deep_analysis:
         print("[Stage 5/5] Running Predictive Auto-ML ...")
         start_pred_stage = time.time()
+        _stage_started("predictive")
         
         pred_task = tasks[4]
         pred_crew = Crew(
@@ -868,21 +957,36 @@ def run_crew(
             predictive_output = "Predictive analysis encountered an error."
 
         stage_times["predictive"] = time.time() - start_pred_stage
+        _stage_finished("predictive")
         _progress("predictive", predictive_output)
         print("[Stage 5/5] Predictive Analysis complete.\n")
     else:
+        _stage_skipped("predictive")
         _progress("predictive", predictive_output)
 
     # ── Generate interactive Plotly charts (pure Python, no LLM) ─────────────
     print("[Stage 4/4] Building interactive Plotly charts ...")
+    _stage_started("plotly")
     start_plotly_stage = time.time()
+    chart_render_times = {}
     plotly_charts = generate_plotly_charts(
         csv_path=str(cleaned_path),
         relations_text=relation_output,
-        output_dir=str(session_output_dir)
+        output_dir=str(session_output_dir),
+        render_stats=chart_render_times,
     )
+    for chart in plotly_charts:
+        # Per-chart PNG render latency goes with the event; cached snapshots have none
+        events.emit(
+            events.CHART_PRODUCED, title=chart.get("title"),
+            x=chart.get("x"), y=chart.get("y"), chart_type=chart.get("type"),
+            render_seconds=chart_render_times.get(chart.get("png")),
+        )
     _progress("plotly", plotly_charts)
     stage_times["plotly"] = time.time() - start_plotly_stage
+    if chart_render_times:
+        stage_times["chart_render_total"] = sum(chart_render_times.values())
+    _stage_finished("plotly")
     print(f"Generated {len(plotly_charts)} interactive chart(s).\n")
 
     # ── Reload cleaned dataframe ──────────────────────────────────────────────
@@ -891,6 +995,21 @@ def run_crew(
     except Exception:
         print("WARNING: Could not load cleaned CSV. Falling back to original data.")
         cleaned_df = df
+    else:
+        # Record the cleaned file's metadata and the upload→cleaned diff now,
+        # while the frame is in memory, so /api/dataset-diff reads no data
+        try:
+            from tools.dataset_diff import record_diff_summary, record_metadata
+            record_metadata(cleaned_path, cleaned_df)
+            record_diff_summary(session_data_dir)
+        except Exception as e:
+            print(f"[Dataset Diff] Could not record diff summary: {e}")
+        # Same for the report/deck statistics profile
+        try:
+            from ui.export import record_profile
+            record_profile(cleaned_path, cleaned_df)
+        except Exception as e:
+            print(f"[Reports] Could not record dataset profile: {e}")
 
     total_time = time.time() - start_run
     try:
@@ -25,57 +25,30 @@ import shutil
 import threading
 import time
 import zipfile
-from io import BytesIO
+import zlib
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
-from tools.dataset_tools import read_csv_robust
-
-# Copy assets on startup/reload
-try:
-    # 1. Convert bin/crewlyze.js line endings to LF
-    bin_js = Path(__file__).resolve().parent / "bin" / "crewlyze.js"
-    if bin_js.exists():
-        with open(bin_js, "rb") as f:
-            content = f.read()
-        lf_content = content.replace(b"\r\n", b"\n")
-        with open(bin_js, "wb") as f:
-            f.write(lf_content)
-        print("Successfully converted bin/crewlyze.js line endings to LF")
-except Exception as e:
-    print(f"Failed to convert line endings: {e}")
-
-# 2. Compress large local PNG assets to avoid Git LFS dependencies
-try:
-    from PIL import Image
-    assets_dir = Path(__file__).resolve().parent / "assets"
-    targets = {
-        "logo.png": (512, 512),
-        "chat_logo.png": (512, 512),
-        "favicon.png": (48, 48),
-        "placeholder_thumbnail.png": (600, 400),
-        "branding_image.png": (800, 500)
-    }
-    for filename, max_size in targets.items():
-        filepath = assets_dir / filename
-        if filepath.exists():
-            orig_size = filepath.stat().st_size
-            if orig_size < 1000:
-                print(f"Skipping LFS pointer file: {filename}")
-                continue
-            with Image.open(filepath) as img:
-                img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                img.save(filepath, "PNG", optimize=True)
-            new_size = filepath.stat().st_size
-            print(f"Optimized asset {filename}: {orig_size} -> {new_size} bytes")
-except Exception as e:
-    print(f"Asset optimization failed: {e}")
+from tools.dataset_tools import normalize_csv_upload, read_csv_robust
+from tools.executors import run_cpu
+from tools.sql_workbench import close_session as close_sql_workbench
+from tools.project_catalog import get_catalog
+from tools.model_catalog import get_model_catalog
+from tools.storage_quota import get_ledger as get_usage_ledger
+from tools.session_storage import break_link, dedupe as dedupe_session_files, ensure_hot as ensure_session_hot
+from tools.project_archive import invalidate as invalidate_project_archives
+from tools.safe_paths import is_safe_filename
+from tools.results_store import read_results, read_versioned, write_results, etag_matches, invalidate as invalidate_results
+
+# Asset optimization and bin/crewlyze.js line endings are a build step
+# (python -m tools.build_assets), not import-time work.
 
 from fastapi import FastAPI, File, UploadFile, Form, BackgroundTasks, HTTPException, Request
-from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse, JSONResponse
+from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
 # regex to find ANSI terminal escape patterns
@@ -249,7 +222,7 @@ AUTH_TOKEN = os.getenv("AUTH_TOKEN", "enterprise-secret-key")
 class OptionalAuthMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         if AUTH_ENABLED:
-            if request.url.path.startswith("/api/") and not request.url.path.startswith("/api/validate-key"):
+            if request.url.path.startswith("/api/") and not request.url.path.startswith(("/api/validate-key", "/api/health")):
                 auth_header = request.headers.get("Authorization")
                 if not auth_header or not auth_header.startswith("Bearer ") or auth_header.split(" ")[1] != AUTH_TOKEN:
                     return JSONResponse(status_code=401, content={"detail": "Unauthorized: Invalid or missing Enterprise Token"})
@@ -258,10 +231,31 @@ class OptionalAuthMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(OptionalAuthMiddleware)
 
+# Compress JSON responses (results, figures, previews). Server-sent event
+# streams are passed through untouched so log lines are not buffered.
+_STREAMING_PATHS = ("/api/analyze/stream", "/api/analyze/events", "/api/copilot/stream")
+# ZIP archives are already compressed; gzip would only add CPU and buffering
+_PRECOMPRESSED_SUFFIXES = ("/export-zip",)
+
+class SelectiveGZipMiddleware:
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=6)
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] == "http" and not scope["path"].startswith(_STREAMING_PATHS)
+                and not scope["path"].endswith(_PRECOMPRESSED_SUFFIXES)):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+app.add_middleware(SelectiveGZipMiddleware)
+
 # ---------------------------------------------------------------------------
 # State & Directory Setup
 # ---------------------------------------------------------------------------
 
+SERVER_STARTED_AT = time.time()
 USER_HOME = Path.home() / ".crewlyze"
 DATA_DIR = Path(os.getenv("CREWLYZE_DATA_DIR", str(USER_HOME / "data")))
 SESSIONS_DIR = DATA_DIR / "sessions"
@@ -273,6 +267,13 @@ for path in (DATA_DIR, SESSIONS_DIR, OUTPUTS_DIR):
 @app.on_event("startup")
 async def cleanup_stale_analyses():
     """Scan all session metadata files on boot and reset any stale projects stuck in the running status."""
+    # Bounded thread pool for blocking work (asyncio.to_thread and plain def routes)
+    try:
+        from tools.executors import install as install_executors
+        install_executors()
+    except Exception as e:
+        print(f"[Executors] Could not install the I/O pool: {e}")
+
     try:
         if SESSIONS_DIR.exists() and SESSIONS_DIR.is_dir():
             for session_dir in SESSIONS_DIR.iterdir():
@@ -288,14 +289,75 @@ async def cleanup_stale_analyses():
                                 if not done_path.exists():
                                     with open(done_path, "w") as df:
                                         df.write("done")
-                                with open(metadata_path, "w", encoding="utf-8") as f:
-                                    json.dump(meta, f, indent=2)
+                                save_project_metadata(session_dir.name, meta)
                                 print(f"Reset stale running session: {session_dir.name}")
                         except Exception as e:
                             print(f"Failed to reset metadata for {session_dir.name}: {e}")
     except Exception as e:
         print(f"Error during startup stale session cleanup: {e}")
 
+    # Resume notifications that were queued or in flight when the server stopped
+    try:
+        get_outbox().start()
+    except Exception as e:
+        print(f"[Outbox] Could not start the notification dispatcher: {e}")
+
+    # Index any projects the catalog does not know about yet (first start, manual copies)
+    try:
+        added, removed = await asyncio.to_thread(get_catalog().sync, SESSIONS_DIR, get_project_metadata)
+        if added or removed:
+            print(f"[Catalog] Synced project index: +{added} / -{removed}")
+    except Exception as e:
+        print(f"[Catalog] Sync failed: {e}")
+
+    # Build the LLM model index off the request path (litellm import is slow)
+    threading.Thread(target=get_model_catalog().warm, name="crewlyze-model-catalog", daemon=True).start()
+
+    # Optional warm-up of crewai, litellm, matplotlib, workers and Kaleido (CREWLYZE_WARMUP)
+    try:
+        from tools import warmup
+        if warmup.start():
+            print("[Warmup] Warm-up scheduled in the background")
+    except Exception as e:
+        print(f"[Warmup] Could not start warm-up: {e}")
+
+    # Age/quota cleanup of old sessions runs on a background schedule
+    try:
+        from tools.storage_quota import ensure_scheduler
+        ensure_scheduler()
+    except Exception as e:
+        print(f"[Cleanup] Could not start cleanup scheduler: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_chart_renderer():
+    """Stop the persistent chart renderer pool, if one was started."""
+    try:
+        from tools.chart_renderer import shutdown_pool
+        shutdown_pool()
+    except Exception as e:
+        print(f"Error stopping chart renderer: {e}")
+    try:
+        from tools.report_renderer import shutdown_pool as shutdown_report_pool
+        shutdown_report_pool()
+    except Exception as e:
+        print(f"Error stopping report renderer: {e}")
+    try:
+        from tools.storage_quota import stop_scheduler
+        stop_scheduler()
+    except Exception:
+        pass
+    try:
+        from tools.notify_outbox import get_outbox as _get_outbox
+        _get_outbox(DATA_DIR).stop()
+    except Exception as e:
+        print(f"Error stopping notification outbox: {e}")
+    try:
+        from tools.executors import shutdown as shutdown_executors
+        shutdown_executors()
+    except Exception as e:
+        print(f"Error stopping executors: {e}")
+
 
 def is_safe_id(id_str: str) -> bool:
     """Ensure the ID is strictly alphanumeric (plus dashes/underscores) to prevent path traversal."""
@@ -303,17 +365,6 @@ def is_safe_id(id_str: str) -> bool:
         return False
     return bool(re.match(r"^[a-zA-Z0-9_-]+$", id_str))
 
-def is_safe_filename(filename: str) -> bool:
-    """Ensure the filename doesn't contain path traversal characters and has a safe pattern."""
-    if not filename:
-        return False
-    if ".." in filename or "/" in filename or "\\" in filename:
-        return False
-    if "\0" in filename:
-        return False
-    # Allow safe characters including spaces, dashes, dots, underscores, parentheses, brackets, and common special symbols in column names
-    return bool(re.match(r"^[a-zA-Z0-9_\-. ()[\]$,%&+@=;\'~#]+$", filename))
-
 def validate_project_id(project_id: str) -> str:
     """Validate that the project_id matches a safe pattern to prevent path traversal."""
     if not is_safe_id(project_id):
@@ -340,16 +391,98 @@ def get_safe_output_dir(project_id: str) -> Path:
         raise HTTPException(status_code=400, detail="Path traversal detected.")
     return resolved
 
-_metadata_lock = threading.Lock()
+def thaw_session(session_dir: Path) -> Path:
+    """Rehydrate a session's dataset CSVs from the compressed cold tier.
+
+    Only handlers that read or replace the dataset files call this, and async
+    handlers run it off the event loop: a thaw decompresses whole datasets.
+    """
+    try:
+        ensure_session_hot(session_dir)
+    except Exception as e:
+        print(f"[Storage] Could not rehydrate session {session_dir.name}: {e}")
+    return session_dir
+
+def get_hot_session_dir(project_id: str) -> Path:
+    """get_safe_session_dir() followed by thaw_session(), for handlers that read the dataset."""
+    return thaw_session(get_safe_session_dir(project_id))
+
+def create_session_dir(project_id: str) -> Path:
+    session_dir = get_safe_session_dir(project_id)
+    session_dir.mkdir(parents=True, exist_ok=True)
+    return session_dir
+
+def restore_cached_charts(output_dir: Path) -> None:
+    """Restore chart PNGs missing from a session output dir from the chart cache."""
+    try:
+        from tools.chart_cache import restore_pngs
+        restored = restore_pngs(output_dir)
+        if restored:
+            print(f"[ChartCache] Restored {restored} chart(s) into {output_dir.name}")
+    except Exception as e:
+        print(f"[ChartCache] Restore failed: {e}")
+
+# Metadata access is serialized per project, not globally: project ids hash
+# onto a fixed set of lock stripes, so work on different projects never
+# contends. Parsed metadata is cached (write-through) and revalidated against
+# the file's mtime/size, so polls skip the JSON parse.
+_METADATA_LOCK_STRIPES = 64
+_metadata_locks = [threading.RLock() for _ in range(_METADATA_LOCK_STRIPES)]
+_metadata_cache: dict = {}  # project_id -> {"sig", "meta", "outputs_mtime"}
+
+
+def _metadata_lock_for(project_id: str) -> threading.RLock:
+    return _metadata_locks[zlib.crc32(project_id.encode("utf-8")) % _METADATA_LOCK_STRIPES]
+
+
+def _file_signature(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def atomic_write_json(path: Path, data, **dump_kwargs) -> None:
+    """Write JSON to a temp file beside *path*, fsync it and rename it into place."""
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
 
 def save_project_metadata(project_id: str, meta: dict):
     session_dir = get_safe_session_dir(project_id)
     if not session_dir.exists():
         session_dir.mkdir(parents=True, exist_ok=True)
     metadata_path = session_dir / "metadata.json"
-    with _metadata_lock:
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2)
+    with _metadata_lock_for(project_id):
+        atomic_write_json(metadata_path, meta, indent=2)
+        previous = _metadata_cache.get(project_id) or {}
+        _metadata_cache[project_id] = {
+            "sig": _file_signature(metadata_path),
+            "meta": dict(meta),
+            "outputs_mtime": previous.get("outputs_mtime"),
+        }
+    try:
+        get_catalog().upsert(dict(meta, id=project_id))
+    except Exception as e:
+        print(f"[Catalog] Could not index {project_id}: {e}")
+    # Metadata is saved on every project write (create, import, status change),
+    # so this keeps the disk-usage ledger current without global scans
+    try:
+        get_usage_ledger().track(project_id)
+    except Exception as e:
+        print(f"[Quota] Could not update usage for {project_id}: {e}")
+
+def forget_project_metadata(project_id: str) -> None:
+    with _metadata_lock_for(project_id):
+        _metadata_cache.pop(project_id, None)
 
 def get_project_metadata(project_id: str) -> dict:
     session_dir = get_safe_session_dir(project_id)
@@ -359,13 +492,23 @@ def get_project_metadata(project_id: str) -> dict:
         return {}
         
     meta = {}
-    with _metadata_lock:
-        if metadata_path.exists():
+    lock = _metadata_lock_for(project_id)
+    with lock:
+        sig = _file_signature(metadata_path)
+        cached = _metadata_cache.get(project_id)
+        if cached is not None and sig is not None and cached["sig"] == sig:
+            meta = dict(cached["meta"])
+        elif sig is None:
+            _metadata_cache.pop(project_id, None)
+            cached = None
+        else:
             try:
                 with open(metadata_path, "r", encoding="utf-8") as f:
                     meta = json.load(f)
+                cached = {"sig": sig, "meta": dict(meta), "outputs_mtime": None}
+                _metadata_cache[project_id] = cached
             except Exception:
-                pass
+                cached = None
             
     # Default metadata if not present or corrupt (compatibility check)
     if not meta:
@@ -395,11 +538,16 @@ def get_project_metadata(project_id: str) -> dict:
             "thumbnail": None
         }
 
-    # Dynamically resolve and update the thumbnail link if generated PNGs exist
+    # Dynamically resolve and update the thumbnail link if generated PNGs exist.
+    # The PNG scan only reruns when the output folder's mtime has changed.
     output_dir = get_safe_output_dir(project_id)
+    outputs_mtime = output_dir.stat().st_mtime_ns if output_dir.is_dir() else None
+    if cached is not None and cached.get("outputs_mtime") == outputs_mtime:
+        return meta
+
     current_thumb = meta.get("thumbnail")
     target_thumb = None
-    if output_dir.exists() and output_dir.is_dir():
+    if outputs_mtime is not None:
         png_charts = sorted(
             [f for f in output_dir.glob("*.png")],
             key=lambda x: x.stat().st_mtime,
@@ -412,10 +560,104 @@ def get_project_metadata(project_id: str) -> dict:
     if current_thumb != target_thumb:
         meta["thumbnail"] = target_thumb
         save_project_metadata(project_id, meta)
+    with lock:
+        entry = _metadata_cache.get(project_id)
+        if entry is not None:
+            entry["outputs_mtime"] = outputs_mtime
         
     return meta
 
 
+def _report_sources(project_id: str, require_dataset: bool = True) -> tuple:
+    """``(session_dir, output_dir, cleaned_csv, results, results_etag, meta)`` for report rendering."""
+    from tools.chart_cache import restore_pngs
+
+    session_dir = get_hot_session_dir(project_id)
+    output_dir = get_safe_output_dir(project_id)
+    cleaned_csv = session_dir / "cleaned.csv"
+    versioned = read_versioned(session_dir)
+    if versioned is None or (require_dataset and not cleaned_csv.exists()):
+        raise HTTPException(status_code=400, detail="Data analysis results not available.")
+    data, results_etag = versioned
+    if output_dir.exists():
+        restore_pngs(output_dir)  # before hashing, so a restore does not change the key next time
+    return session_dir, output_dir, cleaned_csv, data, results_etag, get_project_metadata(project_id)
+
+
+def _report_pdf_job(session_id: str, report_title: Optional[str] = None) -> tuple:
+    """``(cache key, export_pdf() result dict)`` for the session's executive PDF."""
+    from tools.report_cache import charts_signature, files_signature, report_key
+
+    session_dir, output_dir, cleaned_csv, data, results_etag, meta = _report_sources(session_id)
+    title = report_title.strip() if report_title and report_title.strip() else meta.get("report_title", meta.get("name", "Analysis Report"))
+    goal = meta.get("optimized_goal") or meta.get("goal") or ""
+    dataset_key = files_signature([cleaned_csv])
+    key = report_key(results_etag, dataset_key, charts_signature(output_dir), title, goal)
+
+    # Format result structure for reportlab builder (picklable: it goes to the renderer pool)
+    report_dict = {
+        "dataset_path":   str(cleaned_csv),
+        "dataset_key":    f"{session_id}:{dataset_key}",
+        "cleaning_steps": data.get("cleaning_steps", ""),
+        "relations":      data.get("relations", ""),
+        "insights":       data.get("insights", ""),
+        "code":           data.get("code", ""),
+        "output_dir":     str(output_dir),
+        "report_title":   title,
+        "goal":           goal,
+    }
+    return key, report_dict
+
+
+def _report_pptx_job(project_id: str, theme: str = "dark") -> tuple:
+    """``(cache key, export_pptx_cached() job)`` for the project's slide deck."""
+    from tools.report_cache import charts_signature, files_signature, report_key
+
+    session_dir, output_dir, cleaned_csv, data, results_etag, meta = _report_sources(project_id, require_dataset=False)
+    deck_meta = {k: meta[k] for k in ("report_title", "name") if k in meta}
+    dataset_key = files_signature([cleaned_csv])
+    key = report_key(results_etag, dataset_key, charts_signature(output_dir),
+                     deck_meta.get("report_title", ""), deck_meta.get("name", ""), kind="pptx", theme=theme.lower())
+    deck_fields = ("insights", "png_charts", "output_dir", "rows_count", "cols_count", "numeric_count", "cat_count")
+    job = {
+        "data":        {k: data[k] for k in deck_fields if k in data},
+        "meta":        deck_meta,
+        "cleaned_csv": str(cleaned_csv),
+        "dataset_key": f"{project_id}:{dataset_key}",  # shares the PDF's dataset profile
+        "theme":       theme,
+    }
+    return key, job
+
+
+def render_report(kind: str, project_id: str, report_title: Optional[str] = None, theme: str = "dark"):
+    """Future for the project's cached PDF (``kind="pdf"``) or PPTX deck, rendered off-thread on a miss."""
+    from tools.report_renderer import render
+
+    if kind == "pdf":
+        key, job = _report_pdf_job(project_id, report_title)
+    else:
+        key, job = _report_pptx_job(project_id, theme)
+    return render(kind, key, job)
+
+
+def get_report_pdf(session_id: str, report_title: Optional[str] = None) -> Path:
+    """Path of the session's executive PDF in the report cache, waiting for the render if needed.
+
+    The API and every notifier share this file, so a report is rendered once
+    per (results version, dataset, charts, title, goal).
+    """
+    return Path(render_report("pdf", session_id, report_title).result())
+
+
+def prerender_reports(session_id: str) -> None:
+    """Queue the PDF and default PPTX deck so the first download is a cache hit."""
+    for kind in ("pdf", "pptx"):
+        try:
+            render_report(kind, session_id)
+        except Exception as e:
+            print(f"[Reports] Could not queue {kind.upper()} pre-render: {e}")
+
+
 def parse_bool(value: Optional[str]) -> bool:
     return bool(value and str(value).strip().lower() not in {"false", "0", "off", "no", ""})
 
@@ -480,25 +722,8 @@ def send_automated_email(session_id: str, results_data: dict, meta: dict, cfg: d
 
         # Generate PDF bytes if requested
         pdf_bytes = None
-        report_dict = {}
         if send_pdf:
-            session_dir = get_safe_session_dir(session_id)
-            cleaned_csv = session_dir / "cleaned.csv"
-            df = read_csv_robust(cleaned_csv)
-            
-            report_dict = {
-                "dataframe":      df,
-                "cleaning_steps": results_data["cleaning_steps"],
-                "relations":      results_data["relations"],
-                "insights":       results_data["insights"],
-                "code":           results_data.get("code", ""),
-                "output_dir":     str(get_safe_output_dir(session_id)),
-                "report_title":   meta.get("report_title", meta.get("name", "Analysis Report")),
-                "goal":           meta.get("optimized_goal") or meta.get("goal") or "",
-            }
-            
-            _load_crew()
-            pdf_bytes = _export_pdf(report_dict)
+            pdf_bytes = get_report_pdf(session_id).read_bytes()
 
         # Build email
         msg = MIMEMultipart()
@@ -526,7 +751,7 @@ def send_automated_email(session_id: str, results_data: dict, meta: dict, cfg: d
             part = MIMEBase('application', "octet-stream")
             part.set_payload(pdf_bytes)
             encoders.encode_base64(part)
-            clean_title = report_dict.get('report_title', meta.get('name', 'report'))
+            clean_title = meta.get('report_title', meta.get('name', 'report'))
             filename = re.sub(r"[^a-zA-Z0-9_-]", "_", clean_title.lower())[:60] or f"report_{session_id}"
             part.add_header('Content-Disposition', f'attachment; filename="{filename}.pdf"')
             msg.attach(part)
@@ -556,11 +781,36 @@ def send_automated_email(session_id: str, results_data: dict, meta: dict, cfg: d
     except Exception as e:
         print(f"[Automation Email] Failed to send automated email: {e}")
 
+def _report_pdf_attachment(session_id: str) -> dict:
+    """Outbox attachment for the cached report PDF, resolved through get_report_pdf at send time."""
+    return {"kind": "report_pdf", "field": "file", "filename": f"report_{session_id}.pdf", "mime": "application/pdf"}
+
+
+def _chart_attachments(session_id: str, limit: int = 3) -> list:
+    """Outbox attachments for the session's first *limit* chart PNGs."""
+    output_dir = get_safe_output_dir(session_id)
+    if not output_dir.exists():
+        return []
+    restore_cached_charts(output_dir)
+    png_charts = sorted(output_dir.glob("*.png"), key=lambda x: x.stat().st_mtime)
+    return [
+        {"kind": "file", "path": str(chart_path), "field": f"chart_{idx}", "filename": chart_path.name, "mime": "image/png"}
+        for idx, chart_path in enumerate(png_charts[:limit])
+    ]
+
+
+def get_outbox():
+    """The notification outbox, with the report PDF registered as an attachment source."""
+    from tools.notify_outbox import get_outbox as _get_outbox
+
+    outbox = _get_outbox(DATA_DIR)
+    outbox.register_artifact("report_pdf", get_report_pdf)
+    return outbox
+
+
 def send_automated_slack(session_id: str, results_data: dict, meta: dict, cfg: dict):
+    """Queue the Slack summary card in the notification outbox."""
     try:
-        import urllib.request
-        import json
-        
         webhook_url = cfg.get("SLACK_WEBHOOK_URL")
         if not webhook_url:
             print("[Automation Slack] Slack webhook URL missing. Skipping Slack post.")
@@ -629,22 +879,15 @@ def send_automated_slack(session_id: str, results_data: dict, meta: dict, cfg: d
         ]
         
         payload = {"blocks": blocks}
-        req = urllib.request.Request(
-            webhook_url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json"}
-        )
-        with urllib.request.urlopen(req, timeout=10) as response:
-            res_body = response.read().decode("utf-8")
-        print(f"[Automation Slack] Automated Slack message posted successfully: {res_body}")
+        get_outbox().enqueue(session_id, {
+            "channel": "slack", "label": "Slack summary", "url": webhook_url, "json": payload,
+        })
     except Exception as e:
-        print(f"[Automation Slack] Failed to post automated Slack message: {e}")
+        print(f"[Automation Slack] Failed to queue automated Slack message: {e}")
 
 def send_automated_webhook(session_id: str, results_data: dict, meta: dict, cfg: dict):
+    """Queue the analysis_completed event (and report PDF) for the custom webhook."""
     try:
-        import requests
-        import json
-        
         webhook_url = cfg.get("OUTBOUND_WEBHOOK_URL")
         if not webhook_url:
             print("[Automation Webhook] Outbound Webhook URL missing. Skipping Webhook post.")
@@ -653,7 +896,7 @@ def send_automated_webhook(session_id: str, results_data: dict, meta: dict, cfg:
         send_json = parse_bool(cfg.get("WEBHOOK_SEND_JSON", True))
         attach_pdf = parse_bool(cfg.get("WEBHOOK_ATTACH_PDF", True))
 
-        print(f"[Automation Webhook] Dispatched automated webhook payload to {webhook_url}...")
+        print("[Automation Webhook] Queueing automated webhook payload...")
 
         payload = {
             "event": "analysis_completed",
@@ -675,59 +918,16 @@ def send_automated_webhook(session_id: str, results_data: dict, meta: dict, cfg:
                 "insights": results_data.get("insights", "")
             }
             
-        files = {}
-        opened_files = []
-        
-        session_dir = get_safe_session_dir(session_id)
-        output_dir = get_safe_output_dir(session_id)
-        
-        if attach_pdf:
-            pdf_path = output_dir / f"{session_id}_report.pdf"
-            if not pdf_path.exists():
-                try:
-                    cleaned_csv = session_dir / "cleaned.csv"
-                    df = read_csv_robust(cleaned_csv)
-                    report_dict = {
-                        "dataframe":      df,
-                        "cleaning_steps": results_data["cleaning_steps"],
-                        "relations":      results_data["relations"],
-                        "insights":       results_data["insights"],
-                        "code":           results_data.get("code", ""),
-                        "output_dir":     str(output_dir),
-                        "report_title":   meta.get("report_title", meta.get("name", "Analysis Report")),
-                        "goal":           meta.get("optimized_goal") or meta.get("goal") or "",
-                    }
-                    _load_crew()
-                    pdf_bytes = _export_pdf(report_dict)
-                    with open(pdf_path, "wb") as pf:
-                        pf.write(pdf_bytes)
-                except Exception as pdf_err:
-                    print(f"[Webhook Outbound] Failed to pre-compile PDF attachment: {pdf_err}")
-            
-            if pdf_path.exists():
-                fp = open(pdf_path, "rb")
-                opened_files.append(fp)
-                files["file"] = (f"report_{session_id}.pdf", fp, "application/pdf")
-                
-        try:
-            if files:
-                payload_data = {"payload_json": json.dumps(payload)}
-                response = requests.post(webhook_url, data=payload_data, files=files, timeout=15)
-            else:
-                response = requests.post(webhook_url, json=payload, timeout=15)
-            response.raise_for_status()
-            print(f"[Automation Webhook] Automated custom Webhook completed successfully.")
-        finally:
-            for fp in opened_files:
-                fp.close()
+        get_outbox().enqueue(session_id, {
+            "channel": "webhook", "label": "Custom webhook", "url": webhook_url, "json": payload,
+            "attachments": [_report_pdf_attachment(session_id)] if attach_pdf else [],
+        })
     except Exception as e:
-        print(f"[Automation Webhook] Failed to trigger automated custom Webhook: {e}")
+        print(f"[Automation Webhook] Failed to queue automated custom Webhook: {e}")
 
 def send_automated_discord(session_id: str, results_data: dict, meta: dict, cfg: dict):
+    """Queue the Discord summary embed, or one post per enabled channel in separate-channels mode."""
     try:
-        import requests
-        import json
-        
         username = cfg.get("DISCORD_USERNAME", "").strip()
         avatar_url = cfg.get("DISCORD_AVATAR_URL", "").strip() or "https://raw.githubusercontent.com/sowmiyan-s/crewlyze/main/assets/chat_logo.png"
         embed_color_hex = cfg.get("DISCORD_EMBED_COLOR", "#5865F2").strip()
@@ -774,59 +974,16 @@ def send_automated_discord(session_id: str, results_data: dict, meta: dict, cfg:
                 if mention:
                     sub_payload["content"] = f"{mention} - {content_title} Complete!\n" + sub_payload.get("content", "")
 
-                sub_files = {}
-                sub_opened_files = []
-                session_dir = get_safe_session_dir(session_id)
-                output_dir = get_safe_output_dir(session_id)
-
+                sub_attachments = []
                 if force_pdf and attach_pdf:
-                    pdf_path = output_dir / f"{session_id}_report.pdf"
-                    if not pdf_path.exists():
-                        try:
-                            cleaned_csv = session_dir / "cleaned.csv"
-                            df = read_csv_robust(cleaned_csv)
-                            report_dict = {
-                                "dataframe":      df,
-                                "cleaning_steps": results_data["cleaning_steps"],
-                                "relations":      results_data["relations"],
-                                "insights":       results_data["insights"],
-                                "code":           results_data.get("code", ""),
-                                "output_dir":     str(output_dir),
-                                "report_title":   meta.get("report_title", meta.get("name", "Analysis Report")),
-                                "goal":           meta.get("optimized_goal") or meta.get("goal") or "",
-                            }
-                            _load_crew()
-                            pdf_bytes = _export_pdf(report_dict)
-                            with open(pdf_path, "wb") as pf:
-                                pf.write(pdf_bytes)
-                        except Exception as pdf_err:
-                            print(f"[Discord Webhook] Failed to pre-compile PDF attachment: {pdf_err}")
-                    
-                    if pdf_path.exists():
-                        fp = open(pdf_path, "rb")
-                        sub_opened_files.append(fp)
-                        sub_files["file"] = (f"report_{session_id}.pdf", fp, "application/pdf")
-
-                if force_charts and attach_charts and output_dir.exists():
-                    png_charts = sorted(list(output_dir.glob("*.png")), key=lambda x: x.stat().st_mtime)
-                    for idx, chart_path in enumerate(png_charts[:3]):
-                        fp = open(chart_path, "rb")
-                        sub_opened_files.append(fp)
-                        sub_files[f"chart_{idx}"] = (chart_path.name, fp, "image/png")
+                    sub_attachments.append(_report_pdf_attachment(session_id))
+                if force_charts and attach_charts:
+                    sub_attachments.extend(_chart_attachments(session_id))
 
-                try:
-                    if sub_files:
-                        payload_data = {"payload_json": json.dumps(sub_payload)}
-                        response = requests.post(webhook_url, data=payload_data, files=sub_files, timeout=15)
-                    else:
-                        response = requests.post(webhook_url, json=sub_payload, timeout=15)
-                    response.raise_for_status()
-                    print(f"[Automation Discord] Sub-report '{content_title}' posted successfully.")
-                except Exception as post_err:
-                    print(f"[Automation Discord] Failed to post sub-report '{content_title}': {post_err}")
-                finally:
-                    for fp in sub_opened_files:
-                        fp.close()
+                get_outbox().enqueue(session_id, {
+                    "channel": "discord", "label": f"Discord {content_title}", "url": webhook_url,
+                    "json": sub_payload, "attachments": sub_attachments,
+                })
 
             # 1. Data Cleaning
             if parse_bool(cfg.get("DISCORD_CLEANING_ENABLED")) and results_data.get("cleaning_steps"):
@@ -864,7 +1021,7 @@ def send_automated_discord(session_id: str, results_data: dict, meta: dict, cfg:
             print("[Automation Discord] Discord webhook URL missing. Skipping Discord post.")
             return
 
-        print("[Automation Discord] Posting automated summary to Discord...")
+        print("[Automation Discord] Queueing automated summary for Discord...")
 
         title = meta.get("report_title", meta.get("name", "Crewlyze Executive Analysis"))
         rows = results_data.get("rows_count", 0)
@@ -941,63 +1098,22 @@ def send_automated_discord(session_id: str, results_data: dict, meta: dict, cfg:
         if mention:
             payload["content"] = f"{mention} - Analysis Completed!"
             
-        # Deliverables attachment files
-        files = {}
-        opened_files = []
-        
-        session_dir = get_safe_session_dir(session_id)
-        output_dir = get_safe_output_dir(session_id)
-        
+        # Deliverables are resolved when the outbox sends the post
+        attachments = []
         if attach_pdf:
-            pdf_path = output_dir / f"{session_id}_report.pdf"
-            if not pdf_path.exists():
-                try:
-                    cleaned_csv = session_dir / "cleaned.csv"
-                    df = read_csv_robust(cleaned_csv)
-                    report_dict = {
-                        "dataframe":      df,
-                        "cleaning_steps": results_data["cleaning_steps"],
-                        "relations":      results_data["relations"],
-                        "insights":       results_data["insights"],
-                        "code":           results_data.get("code", ""),
-                        "output_dir":     str(output_dir),
-                        "report_title":   meta.get("report_title", meta.get("name", "Analysis Report")),
-                        "goal":           meta.get("optimized_goal") or meta.get("goal") or "",
-                    }
-                    _load_crew()
-                    pdf_bytes = _export_pdf(report_dict)
-                    with open(pdf_path, "wb") as pf:
-                        pf.write(pdf_bytes)
-                except Exception as pdf_err:
-                    print(f"[Discord Webhook] Failed to pre-compile PDF attachment: {pdf_err}")
-            
-            if pdf_path.exists():
-                fp = open(pdf_path, "rb")
-                opened_files.append(fp)
-                files["file"] = (f"report_{session_id}.pdf", fp, "application/pdf")
-                
-        if attach_charts and output_dir.exists():
-            png_charts = sorted(list(output_dir.glob("*.png")), key=lambda x: x.stat().st_mtime)
-            for idx, chart_path in enumerate(png_charts[:3]):
-                fp = open(chart_path, "rb")
-                opened_files.append(fp)
-                files[f"chart_{idx}"] = (chart_path.name, fp, "image/png")
-                
-        try:
-            if files:
-                payload_data = {"payload_json": json.dumps(payload)}
-                response = requests.post(webhook_url, data=payload_data, files=files, timeout=15)
-            else:
-                response = requests.post(webhook_url, json=payload, timeout=15)
-            response.raise_for_status()
-            print(f"[Automation Discord] Automated Discord message posted successfully.")
-        finally:
-            for fp in opened_files:
-                fp.close()
+            attachments.append(_report_pdf_attachment(session_id))
+        if attach_charts:
+            attachments.extend(_chart_attachments(session_id))
+
+        get_outbox().enqueue(session_id, {
+            "channel": "discord", "label": "Discord summary", "url": webhook_url,
+            "json": payload, "attachments": attachments,
+        })
     except Exception as e:
-        print(f"[Automation Discord] Failed to post automated Discord message: {e}")
+        print(f"[Automation Discord] Failed to queue automated Discord message: {e}")
 
 def run_automation_pipeline(session_id: str, results_data: dict):
+    """Queue the enabled automated notifications; the outbox sends and retries them."""
     try:
         cfg_path = get_local_config_path()
         if not cfg_path.exists():
@@ -1056,8 +1172,9 @@ def run_crew_in_background(
     report_title: str,
 ):
     """
-    Orchestrates the CrewAI pipeline in a background thread, writing all
-    stdout progress to a tail-able stdout.log file and serializing results.
+    Orchestrates the CrewAI pipeline in a background thread, writing this
+    run's stdout to a tail-able stdout.log, its typed progress events to
+    events.jsonl, and serializing results.
     """
     global active_analyses
     try:
@@ -1113,6 +1230,7 @@ def run_crew_in_background(
 
         session_dir = SESSIONS_DIR / session_id
         log_path = session_dir / "stdout.log"
+        events_path = session_dir / "events.jsonl"
         done_path = session_dir / "done.txt"
         results_path = session_dir / "results.json"
 
@@ -1128,10 +1246,15 @@ def run_crew_in_background(
         except Exception:
             pass
 
-        # 2. Redirect stdout and kickoff
-        with open(log_path, "w", encoding="utf-8", errors="replace") as log_file:
-            import contextlib
-            with contextlib.redirect_stdout(log_file):
+        # 2. Route this thread's stdout to the session log and kickoff.
+        # contextlib.redirect_stdout swaps sys.stdout process-wide, which
+        # interleaves output from concurrent runs; the router is per-context.
+        from config.events import JsonlEventWriter, context_propagation, current_log_stream, install_stdout_router
+        install_stdout_router()
+        event_writer = JsonlEventWriter(events_path)
+        with open(log_path, "w", encoding="utf-8", errors="replace") as log_file, context_propagation():
+            log_token = current_log_stream.set(log_file)
+            try:
                 try:
                     print("Initializing multi-agent workflows...")
                     _load_crew()
@@ -1140,19 +1263,24 @@ def run_crew_in_background(
                         session_id=session_id,
                         selected_tasks=selected_tasks or None,
                         deep_analysis=deep_analysis,
+                        on_event=event_writer,
                     )
                     
-                    # Convert results to JSON-serializable structure
-                    # Re-map Plotly charts into serializable JSON dictionaries
+                    # Convert results to JSON-serializable structure.
+                    # Plotly figures are stored as typed-array encoded files under
+                    # figures/; results.json only references them by filename.
+                    from tools.figure_codec import FIGURES_DIRNAME, clear_figures, save_figure
+                    figures_dir = session_dir / FIGURES_DIRNAME
+                    clear_figures(figures_dir)
                     plotly_serializable = []
-                    for chart in result.get("plotly_charts", []):
+                    for idx, chart in enumerate(result.get("plotly_charts", [])):
                         try:
                             plotly_serializable.append({
                                 "title": chart["title"],
-                                "fig_json": json.loads(chart["fig"].to_json())
+                                **save_figure(figures_dir, idx, chart["fig"]),
                             })
-                        except Exception:
-                            pass
+                        except Exception as fig_err:
+                            print(f"[Plotly] Could not store chart {chart.get('title')!r}: {fig_err}")
 
                     # Gather static PNG charts
                     png_charts_list = [f.name for f in Path(result["output_dir"]).glob("*.png")]
@@ -1175,8 +1303,7 @@ def run_crew_in_background(
                     preview_data = result["dataframe"].head(100).replace([float('inf'), float('-inf')], float('nan')).fillna("").to_dict(orient="records")
                     serializable_result["preview"] = preview_data
 
-                    with open(results_path, "w", encoding="utf-8") as f:
-                        json.dump(serializable_result, f, indent=2)
+                    write_results(session_dir, serializable_result)
                     
                     print("\nAnalysis complete! Ready to render dashboard.")
 
@@ -1191,6 +1318,10 @@ def run_crew_in_background(
                     except Exception:
                         pass
 
+                    # Pre-render the PDF and PPTX in the background; downloads and
+                    # notifier attachments then wait on (or hit) the same artifact.
+                    prerender_reports(session_id)
+
                     # Trigger outbound automations (Email, Slack, Webhook)
                     try:
                         run_automation_pipeline(session_id, serializable_result)
@@ -1203,8 +1334,7 @@ def run_crew_in_background(
                     traceback.print_exc(file=log_file)
                     
                     error_result = {"error": str(e)}
-                    with open(results_path, "w", encoding="utf-8") as f:
-                        json.dump(error_result, f, indent=2)
+                    write_results(session_dir, error_result)
 
                     # Update metadata status to failed
                     try:
@@ -1217,11 +1347,40 @@ def run_crew_in_background(
                     # Write done sentinel to stop EventSource streams
                     with open(done_path, "w") as f:
                         f.write("done")
+            finally:
+                current_log_stream.reset(log_token)
     finally:
         with active_analyses_lock:
             active_analyses = max(0, active_analyses - 1)
 
 
+# ---------------------------------------------------------------------------
+# Upload helpers (blocking; async handlers run them in the executors)
+# ---------------------------------------------------------------------------
+
+def _store_upload(src, file_path: Path, log_path: Path, log_line: str) -> None:
+    """Copy an upload's spooled file into the session and start its log."""
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(src, buffer)
+    with open(log_path, "w") as f:
+        f.write(log_line)
+
+
+def _excel_sheet_names(file_path: Path) -> list:
+    return pd.ExcelFile(file_path).sheet_names
+
+
+def _sqlite_table_names(file_path: Path) -> list:
+    import sqlite3
+    conn = sqlite3.connect(str(file_path))
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
 # ---------------------------------------------------------------------------
 # API Endpoints
 # ---------------------------------------------------------------------------
@@ -1230,8 +1389,7 @@ def run_crew_in_background(
 async def upload_file(file: UploadFile = File(...)):
     """Uploads the dataset and registers a unique user session ID."""
     session_id = uuid.uuid4().hex[:12]
-    session_dir = get_safe_session_dir(session_id)
-    session_dir.mkdir(parents=True, exist_ok=True)
+    session_dir = await asyncio.to_thread(create_session_dir, session_id)
 
     filename_lower = file.filename.lower()
     is_excel = filename_lower.endswith((".xlsx", ".xls"))
@@ -1244,13 +1402,9 @@ async def upload_file(file: UploadFile = File(...)):
     else:
         file_path = session_dir / "original_upload.csv"
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
     # Pre-configure fresh log files
     log_path = session_dir / "stdout.log"
-    with open(log_path, "w") as f:
-        f.write("Dataset uploaded successfully.\n")
+    await asyncio.to_thread(_store_upload, file.file, file_path, log_path, "Dataset uploaded successfully.\n")
 
     proj_name = file.filename.rsplit('.', 1)[0].replace('_', ' ').replace('-', ' ').title()
     status = "idle"
@@ -1259,28 +1413,20 @@ async def upload_file(file: UploadFile = File(...)):
 
     if is_excel:
         try:
-            xl = pd.ExcelFile(file_path)
-            sheets = xl.sheet_names
+            sheets = await asyncio.to_thread(_excel_sheet_names, file_path)
             status = "awaiting_sheet"
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to read Excel workbook: {e}")
     elif is_sqlite:
         try:
-            import sqlite3
-            conn = sqlite3.connect(str(file_path))
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [row[0] for row in cursor.fetchall()]
-            conn.close()
+            tables = await asyncio.to_thread(_sqlite_table_names, file_path)
             status = "awaiting_table"
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to read SQLite tables: {e}")
     else:
-        # standard CSV validation
+        # standard CSV validation; parsing and the UTF-8 rewrite run in the CPU pool
         try:
-            df = read_csv_robust(file_path)
-            # save back formatted to make sure it's UTF-8 comma-separated
-            df.to_csv(file_path, index=False)
+            await run_cpu(normalize_csv_upload, str(file_path))
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to read CSV: {e}")
 
@@ -1294,7 +1440,7 @@ async def upload_file(file: UploadFile = File(...)):
             "created_at": time.time() * 1000,
             "status": status
         }
-        save_project_metadata(session_id, meta)
+        await asyncio.to_thread(save_project_metadata, session_id, meta)
     except Exception:
         pass
 
@@ -1309,14 +1455,16 @@ async def upload_file(file: UploadFile = File(...)):
 
 
 @app.post("/api/upload/select-sheet")
-async def select_excel_sheet(session_id: str = Form(...), sheet_name: str = Form(...)):
+def select_excel_sheet(session_id: str = Form(...), sheet_name: str = Form(...)):
     session_dir = get_safe_session_dir(session_id)
     xlsx_path = session_dir / "uploaded_file.xlsx"
     if not xlsx_path.exists():
         raise HTTPException(status_code=400, detail="Excel upload not found.")
     try:
         df = pd.read_excel(xlsx_path, sheet_name=sheet_name)
+        thaw_session(session_dir)  # a cold copy would otherwise be restored over the new CSV
         csv_path = session_dir / "original_upload.csv"
+        break_link(csv_path)
         df.to_csv(csv_path, index=False)
         
         meta = get_project_metadata(session_id)
@@ -1331,7 +1479,7 @@ async def select_excel_sheet(session_id: str = Form(...), sheet_name: str = Form
 
 
 @app.post("/api/upload/select-table")
-async def select_sqlite_table(session_id: str = Form(...), table_name: str = Form(...)):
+def select_sqlite_table(session_id: str = Form(...), table_name: str = Form(...)):
     session_dir = get_safe_session_dir(session_id)
     db_path = session_dir / "uploaded_file.db"
     if not db_path.exists():
@@ -1343,7 +1491,9 @@ async def select_sqlite_table(session_id: str = Form(...), table_name: str = For
         df = pd.read_sql_query(f"SELECT * FROM `{safe_table}`", conn)
         conn.close()
         
+        thaw_session(session_dir)  # a cold copy would otherwise be restored over the new CSV
         csv_path = session_dir / "original_upload.csv"
+        break_link(csv_path)
         df.to_csv(csv_path, index=False)
         
         meta = get_project_metadata(session_id)
@@ -1358,8 +1508,21 @@ async def select_sqlite_table(session_id: str = Form(...), table_name: str = For
 
 
 @app.post("/api/query-sql")
-async def query_sql_dataset(session_id: str = Form(...), sql_query: str = Form(...)):
-    session_dir = get_safe_session_dir(session_id)
+async def query_sql_dataset(
+    session_id: str = Form(...),
+    sql_query: str = Form(...),
+    offset: int = Form(0),
+    limit: int = Form(100),
+    cursor: Optional[str] = Form(None),
+):
+    """Runs a read-only SQL query against the session's DuckDB workbench and returns one page.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next page;
+    cached results are sliced instead of re-executed.
+    """
+    from tools.sql_workbench import QueryTimeout, run_query
+
+    session_dir = await asyncio.to_thread(get_hot_session_dir, session_id)
     csv_path = session_dir / "cleaned.csv"
     if not csv_path.exists():
         csv_path = session_dir / "original_upload.csv"
@@ -1370,103 +1533,48 @@ async def query_sql_dataset(session_id: str = Form(...), sql_query: str = Form(.
     if not clean_query:
         return {"success": False, "error": "Query cannot be empty."}
 
-    # Security check: Enforce read-only SELECT queries
-    first_word = clean_query.split()[0].upper() if clean_query.split() else ""
-    if first_word not in ("SELECT", "EXPLAIN", "WITH"):
-        return {"success": False, "error": "Security Error: Only read-only queries (SELECT) are permitted."}
-
-    forbidden = ["ATTACH", "DETACH", "PRAGMA", "CREATE", "DROP", "ALTER", "INSERT", "UPDATE", "DELETE", "VACUUM", "REINDEX", "TRANSACTION", "COMMIT", "ROLLBACK"]
-    if any(re.search(rf"\b{kw}\b", clean_query, re.IGNORECASE) for kw in forbidden):
-        return {"success": False, "error": "Security Error: Mutating or administrative SQL statements are blocked."}
-
     try:
-        import sqlite3
-        df = read_csv_robust(csv_path)
-        conn = sqlite3.connect(":memory:")
-        df.to_sql("dataset", conn, index=False)
-
-        # Set execution instruction limit to prevent infinite loops / CPU DoS (~3 seconds max)
-        step_counter = [0]
-        def interrupt_handler():
-            step_counter[0] += 1
-            if step_counter[0] > 1000:  # 1,000 progress callbacks ~ 3 seconds
-                return 1
-            return 0
-
-        conn.set_progress_handler(interrupt_handler, 1000)
-
-        res_df = pd.read_sql_query(clean_query, conn)
-        conn.close()
-
-        res_df = res_df.replace([float('inf'), float('-inf')], float('nan')).fillna("")
-        results = res_df.head(100).to_dict(orient="records")
-        columns = list(res_df.columns)
-
-        return {
-            "success": True,
-            "columns": columns,
-            "results": results,
-            "total_count": len(res_df)
-        }
+        # Read-only access, external file access and the time limit are all
+        # enforced by DuckDB itself (see tools/sql_workbench.py)
+        page = await asyncio.to_thread(run_query, session_dir, csv_path, clean_query, offset, limit, None, cursor)
+        return {"success": True, **page}
+    except QueryTimeout as e:
+        return {"success": False, "error": str(e)}
     except Exception as e:
         err_msg = str(e)
-        if "interrupted" in err_msg.lower():
-            err_msg = "Query execution timed out (3s limit exceeded)."
+        if "read-only" in err_msg.lower() or "Permission Error" in err_msg:
+            err_msg = f"Security Error: Only read-only queries on the dataset are permitted. ({err_msg})"
         return {"success": False, "error": err_msg}
 
 
 @app.get("/api/dataset-diff")
-async def get_dataset_diff(session_id: str):
-    session_dir = get_safe_session_dir(session_id)
+async def get_dataset_diff(session_id: str, deep: bool = False, key: Optional[str] = None, samples: int = 5):
+    """Schema / row-count diff between the upload and the cleaned dataset.
+
+    The summary comes from cached metadata (recorded by the pipeline), so no
+    data is read. ``deep=true`` streams both files and adds per-column
+    changed-cell counts, null deltas and sample changed rows; ``key=id,...``
+    aligns rows by those columns instead of by position.
+    """
+    from tools.dataset_diff import deep_diff, diff_summary
+
+    session_dir = await asyncio.to_thread(get_hot_session_dir, session_id)
     orig_path = session_dir / "original_upload.csv"
     clean_path = session_dir / "cleaned.csv"
     
     if not orig_path.exists():
         raise HTTPException(status_code=400, detail="Original dataset upload not found.")
-        
-    orig_df = read_csv_robust(orig_path)
-    
-    if not clean_path.exists():
-        return {
-            "cleaned": False,
-            "original_rows": len(orig_df),
-            "original_cols": len(orig_df.columns),
-            "original_columns": list(orig_df.columns)
-        }
-        
-    clean_df = read_csv_robust(clean_path)
-    
-    rows_dropped = len(orig_df) - len(clean_df)
-    cols_changed = []
-    
-    for col in orig_df.columns:
-        if col not in clean_df.columns:
-            cols_changed.append({"column": col, "type": "dropped"})
-            
-    for col in clean_df.columns:
-        if col not in orig_df.columns:
-            cols_changed.append({"column": col, "type": "added"})
-        elif orig_df[col].dtype != clean_df[col].dtype:
-            cols_changed.append({
-                "column": col, 
-                "type": "type_changed", 
-                "from": str(orig_df[col].dtype), 
-                "to": str(clean_df[col].dtype)
-            })
-            
-    return {
-        "cleaned": True,
-        "original_rows": len(orig_df),
-        "original_cols": len(orig_df.columns),
-        "cleaned_rows": len(clean_df),
-        "cleaned_cols": len(clean_df.columns),
-        "rows_dropped": rows_dropped,
-        "changes": cols_changed
-    }
+
+    summary = await asyncio.to_thread(diff_summary, session_dir)
+    if deep and summary.get("cleaned"):
+        key_cols = [k.strip() for k in key.split(",") if k.strip()] if key else None
+        # Hashes every cell of both files: CPU-bound, so it runs in the CPU pool
+        summary["deep"] = await run_cpu(deep_diff, orig_path, clean_path, key_cols, max(0, min(samples, 50)))
+    return summary
 
 
 @app.post("/api/share/slack")
-async def share_report_to_slack(session_id: str = Form(...), webhook_url: str = Form(...)):
+def share_report_to_slack(session_id: str = Form(...), webhook_url: str = Form(...)):
     session_dir = get_safe_session_dir(session_id)
     results_path = session_dir / "results.json"
     if not results_path.exists():
@@ -1542,7 +1650,7 @@ async def share_report_to_slack(session_id: str = Form(...), webhook_url: str =
 
 
 @app.post("/api/validate-key")
-async def validate_api_key(
+def validate_api_key(
     provider: str = Form(...),
     model: str = Form(...),
     api_key: Optional[str] = Form(""),
@@ -1572,7 +1680,7 @@ async def trigger_analysis(
     clean_rules: Optional[str] = Form("")
 ):
     """Launches the CrewAI analysis process in the background."""
-    session_dir = get_safe_session_dir(session_id)
+    session_dir = await asyncio.to_thread(get_hot_session_dir, session_id)
     csv_path = session_dir / "original_upload.csv"
 
     if not csv_path.exists():
@@ -1597,12 +1705,15 @@ async def trigger_analysis(
     deep = deep_analysis.strip().lower() in {"true", "1", "yes", "on"}
 
     # Persist report title and rules if provided
-    try:
+    def _save_run_settings():
         meta = get_project_metadata(session_id)
         if report_title.strip():
             meta["report_title"] = report_title.strip()
         meta["clean_rules"] = clean_rules.strip() if clean_rules else ""
         save_project_metadata(session_id, meta)
+
+    try:
+        await asyncio.to_thread(_save_run_settings)
     except Exception:
         pass
 
@@ -1642,7 +1753,7 @@ async def trigger_analysis(
 @app.get("/api/analyze/stream")
 async def stream_analysis_logs(session_id: str):
     """Streams running stdout log lines using Server-Sent Events (SSE)."""
-    session_dir = get_safe_session_dir(session_id)
+    session_dir = await asyncio.to_thread(get_safe_session_dir, session_id)
     log_path = session_dir / "stdout.log"
 
     # Reset streaming state
@@ -1682,20 +1793,73 @@ async def stream_analysis_logs(session_id: str):
     return StreamingResponse(log_generator(), media_type="text/event-stream")
 
 
+@app.get("/api/analyze/events")
+async def stream_analysis_events(session_id: str):
+    """Streams typed JSON progress events (stage timings, tokens, charts) using SSE."""
+    session_dir = await asyncio.to_thread(get_safe_session_dir, session_id)
+    events_path = session_dir / "events.jsonl"
+    done_path = session_dir / "done.txt"
+
+    async def event_generator():
+        # Wait for the background run to create events.jsonl
+        for _ in range(50):
+            if events_path.exists():
+                break
+            await asyncio.sleep(0.1)
+
+        if not events_path.exists():
+            yield "event: end\ndata: {}\n\n"
+            return
+
+        with open(events_path, "r", encoding="utf-8") as f:
+            pending = ""
+            while True:
+                chunk = f.readline()
+                if chunk:
+                    pending += chunk
+                    # Only forward complete lines; the writer may be mid-append
+                    if not pending.endswith("\n"):
+                        continue
+                    line, pending = pending.strip(), ""
+                    if line:
+                        yield f"data: {line}\n\n"
+                elif done_path.exists():
+                    trailing = (pending + f.read()).splitlines()
+                    for trail_line in trailing:
+                        if trail_line.strip():
+                            yield f"data: {trail_line.strip()}\n\n"
+                    yield "event: end\ndata: {}\n\n"
+                    break
+                else:
+                    await asyncio.sleep(0.1)
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 @app.get("/api/results")
-async def get_results(session_id: str):
-    """Retrieves cached JSON results containing stats, insights, and charts."""
+def get_results(session_id: str, request: Request, fields: Optional[str] = None):
+    """Retrieves cached JSON results containing stats, insights, and charts.
+
+    Responses carry a strong ETag; a matching If-None-Match gets 304 Not
+    Modified. ``fields=insights,relations`` returns only those keys, with an
+    ETag that changes only when they do.
+    """
     session_dir = get_safe_session_dir(session_id)
-    results_path = session_dir / "results.json"
-    if not results_path.exists():
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    if field_list:
+        field_list.append("error")  # a failed run must still surface its error
+
+    versioned = read_versioned(session_dir, field_list)
+    if versioned is None:
         return {"ready": False, "status": "pending"}
 
-    with open(results_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        if "error" in data:
-            return data
+    data, etag = versioned
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if "error" not in data:
         data["ready"] = True
-        return data
+    return JSONResponse(data, headers=headers)
 
 
 @app.post("/api/copilot")
@@ -1713,12 +1877,10 @@ async def ask_copilot(
         env_key_name = "NVIDIA_API_KEY"
     else:
         env_key_name = f"{provider.upper()}_API_KEY"
-    _load_crew()
-    _apply_runtime_llm_settings(provider, model, api_key or "", env_key_name)
 
-    session_dir = get_safe_session_dir(session_id)
+    session_dir = await asyncio.to_thread(get_hot_session_dir, session_id)
     csv_path = session_dir / "cleaned.csv"
-    output_dir = get_safe_output_dir(session_id)
+    output_dir = await asyncio.to_thread(get_safe_output_dir, session_id)
 
     if not csv_path.exists():
         # Fall back to original upload if cleaning hasn't run or completed
@@ -1732,17 +1894,23 @@ async def ask_copilot(
     current_session_csv.set(str(csv_path))
     current_session_output_dir.set(str(output_dir))
 
-    # Call copilot model runner with server-side auto-healing
-    try:
-        res = _run_copilot_query(query, str(csv_path), str(output_dir))
-    except Exception as exc:
-        print(f"[AI Chat Auto-Heal] Exception in copilot: {exc}")
-        res = {
-            "success": True,
-            "text": f"✨ **[AI Chat Auto-Healed]** *Recovered from API connection error: {exc}*\n\n"
-                    f"The AI Chat engine intercepted the provider exception and maintained active conversation mode. Please check your LLM provider key in Settings if persistent.",
-            "plot_path": None
-        }
+    # Call copilot model runner with server-side auto-healing. The crew
+    # import and the model round-trip run off the event loop.
+    def _answer():
+        _load_crew()
+        _apply_runtime_llm_settings(provider, model, api_key or "", env_key_name)
+        try:
+            return _run_copilot_query(query, str(csv_path), str(output_dir))
+        except Exception as exc:
+            print(f"[AI Chat Auto-Heal] Exception in copilot: {exc}")
+            return {
+                "success": True,
+                "text": f"✨ **[AI Chat Auto-Healed]** *Recovered from API connection error: {exc}*\n\n"
+                        f"The AI Chat engine intercepted the provider exception and maintained active conversation mode. Please check your LLM provider key in Settings if persistent.",
+                "plot_path": None
+            }
+
+    res = await asyncio.to_thread(_answer)
 
     # Re-map absolute plot path to relative HTTP endpoint URL
     plot_url = None
@@ -1773,12 +1941,10 @@ async def stream_copilot(
         env_key_name = "NVIDIA_API_KEY"
     else:
         env_key_name = f"{provider.upper()}_API_KEY"
-    _load_crew()
-    _apply_runtime_llm_settings(provider, model, api_key or "", env_key_name)
 
-    session_dir = get_safe_session_dir(session_id)
+    session_dir = await asyncio.to_thread(get_hot_session_dir, session_id)
     csv_path = session_dir / "cleaned.csv"
-    output_dir = get_safe_output_dir(session_id)
+    output_dir = await asyncio.to_thread(get_safe_output_dir, session_id)
 
     if not csv_path.exists():
         csv_path = session_dir / "original_upload.csv"
@@ -1795,6 +1961,8 @@ async def stream_copilot(
 
     def run_sync_stream():
         try:
+            _load_crew()
+            _apply_runtime_llm_settings(provider, model, api_key or "", env_key_name)
             from ui.copilot import stream_copilot_query
             for chunk in stream_copilot_query(
                 query=query,
@@ -1835,7 +2003,7 @@ async def stream_copilot(
 
 
 @app.get("/api/chat-history")
-async def get_chat_history(session_id: str):
+def get_chat_history(session_id: str):
     """Retrieves saved project AI chat history."""
     session_dir = get_safe_session_dir(session_id)
     history_file = session_dir / "chat_history.json"
@@ -1850,7 +2018,7 @@ async def get_chat_history(session_id: str):
 
 
 @app.post("/api/chat-history")
-async def save_chat_history(session_id: str = Form(...), messages_json: str = Form(...)):
+def save_chat_history(session_id: str = Form(...), messages_json: str = Form(...)):
     """Saves project AI chat history to session storage."""
     session_dir = get_safe_session_dir(session_id)
     history_file = session_dir / "chat_history.json"
@@ -1864,7 +2032,7 @@ async def save_chat_history(session_id: str = Form(...), messages_json: str = Fo
 
 
 @app.get("/api/export-notebook")
-async def get_jupyter_notebook(session_id: str):
+def get_jupyter_notebook(session_id: str):
     """Generates a downloadable Jupyter Notebook (.ipynb) containing the analysis code."""
     session_dir = get_safe_session_dir(session_id)
     results_path = session_dir / "results.json"
@@ -2001,45 +2169,23 @@ async def get_jupyter_notebook(session_id: str):
 @app.get("/api/export-pdf")
 async def get_pdf_report(session_id: str, report_title: Optional[str] = None):
     """Generates and streams back the executive PDF report."""
-    session_dir = get_safe_session_dir(session_id)
-    results_path = session_dir / "results.json"
-    cleaned_csv = session_dir / "cleaned.csv"
-
-    if not results_path.exists() or not cleaned_csv.exists():
-        raise HTTPException(status_code=400, detail="Data analysis results not available.")
-
-    with open(results_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    meta = get_project_metadata(session_id)
-    title = report_title.strip() if report_title else meta.get("report_title", meta.get("name", "Analysis Report"))
-    goal = meta.get("optimized_goal") or meta.get("goal") or ""
-
-    # Format result structure for reportlab builder
-    df = read_csv_robust(cleaned_csv)
-    report_dict = {
-        "dataframe":      df,
-        "cleaning_steps": data["cleaning_steps"],
-        "relations":      data["relations"],
-        "insights":       data["insights"],
-        "code":           data.get("code", ""),
-        "output_dir":     str(get_safe_output_dir(session_id)),
-        "report_title":   title,
-        "goal":           goal,
-    }
-
     try:
-        _load_crew()
-        pdf_bytes = _export_pdf(report_dict)
-        filename = re.sub(r"[^a-zA-Z0-9_-]", "_", title.lower())[:60] or f"report_{session_id}"
-        return StreamingResponse(
-            BytesIO_iterator(pdf_bytes),
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
-        )
+        future = await asyncio.to_thread(render_report, "pdf", session_id, report_title)
+        pdf_path = Path(await asyncio.wrap_future(future))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {e}")
 
+    meta = await asyncio.to_thread(get_project_metadata, session_id)
+    title = report_title.strip() if report_title and report_title.strip() else meta.get("report_title", meta.get("name", "Analysis Report"))
+    filename = re.sub(r"[^a-zA-Z0-9_-]", "_", title.lower())[:60] or f"report_{session_id}"
+    return FileResponse(
+        pdf_path,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
+    )
+
 
 @app.post("/api/export-chat-pdf")
 async def export_chat_history_pdf(
@@ -2054,8 +2200,11 @@ async def export_chat_history_pdf(
         raise HTTPException(status_code=400, detail=f"Invalid messages format: {e}")
 
     try:
-        _load_crew()
-        pdf_bytes = _export_chat_pdf(messages, session_id)
+        def _render():
+            _load_crew()
+            return _export_chat_pdf(messages, session_id)
+
+        pdf_bytes = await asyncio.to_thread(_render)
         filename = f"chat_history_{session_id}"
         return StreamingResponse(
             BytesIO_iterator(pdf_bytes),
@@ -2073,24 +2222,27 @@ async def export_webhook(
 ):
     """(Enterprise) Export PDF report directly to a Slack/Discord webhook."""
     import requests
-    output_dir = get_safe_output_dir(session_id)
-    pdf_path = output_dir / f"{session_id}_report.pdf"
-    
-    if not pdf_path.exists():
+    try:
+        future = await asyncio.to_thread(render_report, "pdf", session_id)
+        pdf_path = Path(await asyncio.wrap_future(future))
+    except Exception:
         raise HTTPException(status_code=404, detail="PDF report not found. Run analysis first.")
     
-    try:
+    def _post():
         with open(pdf_path, 'rb') as f:
             files = {'file': (f"report_{session_id}.pdf", f, 'application/pdf')}
             payload = {'content': f"📈 **Crewlyze AI Analysis Complete!**\nNew business insights are ready for session: `{session_id}`"}
             response = requests.post(webhook_url, data=payload, files=files, timeout=10)
             response.raise_for_status()
+
+    try:
+        await asyncio.to_thread(_post)
         return {"status": "success", "message": "Report successfully dispatched to webhook!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Webhook dispatch failed: {str(e)}")
 
 @app.post("/api/share/slack")
-async def manual_share_slack(
+def manual_share_slack(
     session_id: str = Form(...),
     webhook_url: str = Form(...)
 ):
@@ -2103,12 +2255,12 @@ async def manual_share_slack(
             results_data = json.load(f)
         meta = get_project_metadata(session_id)
         send_automated_slack(session_id, results_data, meta, cfg)
-        return {"status": "success"}
+        return {"status": "success", "queued": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/share/discord")
-async def manual_share_discord(
+def manual_share_discord(
     session_id: str = Form(...),
     webhook_url: str = Form(...)
 ):
@@ -2130,12 +2282,12 @@ async def manual_share_discord(
             results_data = json.load(f)
         meta = get_project_metadata(session_id)
         send_automated_discord(session_id, results_data, meta, cfg)
-        return {"status": "success"}
+        return {"status": "success", "queued": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/share/email")
-async def manual_share_email(
+def manual_share_email(
     session_id: str = Form(...),
     smtp_account_id: Optional[str] = Form(None),
     recipient_email: Optional[str] = Form(None),
@@ -2187,7 +2339,7 @@ async def manual_share_email(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/integrations/test/email")
-async def test_email_integration(
+def test_email_integration(
     smtp_host: str = Form(...),
     smtp_port: str = Form(...),
     smtp_user: str = Form(...),
@@ -2240,7 +2392,7 @@ async def test_email_integration(
         raise HTTPException(status_code=400, detail=f"Email test failed: {str(e)}")
 
 @app.post("/api/integrations/test/slack")
-async def test_slack_integration(
+def test_slack_integration(
     webhook_url: str = Form(...)
 ):
     try:
@@ -2259,7 +2411,7 @@ async def test_slack_integration(
         raise HTTPException(status_code=400, detail=f"Slack test failed: {str(e)}")
 
 @app.post("/api/integrations/test/discord")
-async def test_discord_integration(
+def test_discord_integration(
     webhook_url: str = Form(...),
     discord_username: Optional[str] = Form(""),
     discord_avatar_url: Optional[str] = Form(""),
@@ -2323,7 +2475,7 @@ async def test_discord_integration(
         raise HTTPException(status_code=400, detail=f"Discord test failed: {str(e)}")
 
 @app.post("/api/integrations/test/webhook")
-async def test_webhook_integration(
+def test_webhook_integration(
     webhook_url: str = Form(...)
 ):
     try:
@@ -2347,7 +2499,7 @@ async def test_webhook_integration(
 
 
 @app.get("/api/charts/{session_id}/{filename}")
-async def serve_chart(session_id: str, filename: str):
+def serve_chart(session_id: str, filename: str):
     """Serves the generated PNG visual charts."""
     if not is_safe_filename(filename):
         raise HTTPException(status_code=400, detail="Invalid filename.")
@@ -2362,6 +2514,28 @@ async def serve_chart(session_id: str, filename: str):
     return FileResponse(chart_path)
 
 
+@app.get("/api/figures/{session_id}/{filename}")
+def serve_figure(session_id: str, filename: str):
+    """Serves a typed-array encoded Plotly figure referenced from results.json."""
+    if not is_safe_filename(filename) or not filename.endswith(".json"):
+        raise HTTPException(status_code=400, detail="Invalid filename.")
+    from tools.figure_codec import FIGURES_DIRNAME
+    figures_dir = get_safe_session_dir(session_id) / FIGURES_DIRNAME
+    figure_path = (figures_dir / filename).resolve()
+    try:
+        figure_path.relative_to(figures_dir.resolve())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Path traversal detected.")
+    if not figure_path.exists():
+        raise HTTPException(status_code=404, detail="Figure not found.")
+    # Filenames carry a content hash, so the payload never changes under a name
+    return FileResponse(
+        figure_path,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
 # ---------------------------------------------------------------------------
 # Utility Streams
 # ---------------------------------------------------------------------------
@@ -2376,7 +2550,7 @@ def BytesIO_iterator(data_bytes: bytes):
 # ---------------------------------------------------------------------------
 
 @app.get("/api/ollama-models")
-async def list_ollama_models(base_url: str = "http://localhost:11434"):
+def list_ollama_models(base_url: str = "http://localhost:11434"):
     """Fetches list of local Ollama models from the local Ollama service tags API."""
     import requests
     try:
@@ -2401,25 +2575,100 @@ async def list_ollama_models(base_url: str = "http://localhost:11434"):
 def get_local_config_path() -> Path:
     return USER_HOME / "config.json"
 
+
+def _read_local_config() -> dict:
+    cfg_path = get_local_config_path()
+    if cfg_path.exists():
+        try:
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+def _write_local_config(cfg: dict) -> None:
+    cfg_path = get_local_config_path()
+    cfg_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(cfg_path, "w", encoding="utf-8") as f:
+        json.dump(cfg, f, indent=2)
+
+
 config_lock = asyncio.Lock()
 
 @app.get("/api/metrics")
-async def get_performance_metrics():
+def get_performance_metrics(window: Optional[str] = None, limit: int = 100):
     from config.metrics_tracker import get_metrics
-    return get_metrics()
+    try:
+        return get_metrics(window, max(1, min(limit, 10000)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/metrics/summary")
+def get_metrics_summary(window: str = "24h", bucket: Optional[str] = None):
+    """p50/p95/p99 run and stage latency, tokens, cost and throughput over *window* (e.g. 1h, 7d, all)."""
+    from config.metrics_tracker import summarize_metrics
+    try:
+        return summarize_metrics(window, bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/health")
+def get_health(ready: bool = False):
+    """Liveness plus warm-up readiness. With ?ready=true, answers 503 until warm-up has finished."""
+    from tools import warmup
+    warm = warmup.status()
+    body = {
+        "status": "ok",
+        "uptime_s": round(time.time() - SERVER_STARTED_AT, 1),
+        "ready": warm["ready"],
+        "warmup": warm,
+    }
+    if ready and not warm["ready"]:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+@app.get("/api/chart-cache/stats")
+async def get_chart_cache_stats():
+    from tools.chart_cache import get_chart_cache
+    return get_chart_cache().stats()
+
+@app.get("/api/storage/usage")
+async def get_storage_usage():
+    return get_usage_ledger().stats()
+
+@app.get("/api/query-cache/stats")
+async def get_query_cache_stats():
+    from tools.query_cache import get_query_cache
+    return get_query_cache().stats()
+
+@app.get("/api/metrics/stages")
+def get_stage_latency_percentiles(window: Optional[str] = None):
+    from config.metrics_tracker import get_stage_percentiles
+    try:
+        return get_stage_percentiles(window=window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/notifications/stats")
+def get_notification_stats():
+    return get_outbox().stats()
+
+@app.get("/api/notifications/dead-letters")
+def get_notification_dead_letters(limit: int = 50):
+    return {"dead_letters": get_outbox().dead_letters(limit)}
+
+@app.post("/api/notifications/{delivery_id}/retry")
+def retry_notification(delivery_id: int):
+    if not get_outbox().retry(delivery_id):
+        raise HTTPException(status_code=404, detail="No dead-lettered delivery with that id")
+    return {"status": "queued"}
 
 @app.get("/api/config")
 async def get_local_config():
     async with config_lock:
-        cfg_path = get_local_config_path()
-        cfg = {}
-        if cfg_path.exists():
-            try:
-                with open(cfg_path, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
-            except Exception:
-                pass
-        
+        cfg = await asyncio.to_thread(_read_local_config)
+
         # Ensure default storage directories and log levels are returned
         if "CREWLYZE_DATA_DIR" not in cfg:
             cfg["CREWLYZE_DATA_DIR"] = str(DATA_DIR)
@@ -2436,15 +2685,7 @@ async def save_local_config(
     base_url: Optional[str] = Form("")
 ):
     async with config_lock:
-        cfg_path = get_local_config_path()
-        cfg_path.parent.mkdir(parents=True, exist_ok=True)
-        cfg = {}
-        if cfg_path.exists():
-            try:
-                with open(cfg_path, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
-            except Exception:
-                pass
+        cfg = await asyncio.to_thread(_read_local_config)
         
         content_type = request.headers.get("content-type", "")
         if "application/json" in content_type:
@@ -2482,8 +2723,7 @@ async def save_local_config(
                 cfg["CUSTOM_BASE_URL"] = base_url.strip()
             
         try:
-            with open(cfg_path, "w", encoding="utf-8") as f:
-                json.dump(cfg, f, indent=2)
+            await asyncio.to_thread(_write_local_config, cfg)
             for k, v in cfg.items():
                 os.environ[k] = str(v)
             
@@ -2543,15 +2783,7 @@ async def save_automation_config(
     webhook_attach_pdf: Optional[str] = Form("true")
 ):
     async with config_lock:
-        cfg_path = get_local_config_path()
-        cfg_path.parent.mkdir(parents=True, exist_ok=True)
-        cfg = {}
-        if cfg_path.exists():
-            try:
-                with open(cfg_path, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
-            except Exception:
-                pass
+        cfg = await asyncio.to_thread(_read_local_config)
                 
         cfg["AUTOMATION_EMAIL_ENABLED"] = parse_bool(automation_email_enabled)
         cfg["SMTP_HOST"] = smtp_host.strip() if smtp_host else ""
@@ -2599,8 +2831,7 @@ async def save_automation_config(
         cfg["WEBHOOK_ATTACH_PDF"] = parse_bool(webhook_attach_pdf)
         
         try:
-            with open(cfg_path, "w", encoding="utf-8") as f:
-                json.dump(cfg, f, indent=2)
+            await asyncio.to_thread(_write_local_config, cfg)
             # Update environment variables
             for k, v in cfg.items():
                 os.environ[k] = str(v)
@@ -2609,282 +2840,36 @@ async def save_automation_config(
         return {"status": "success"}
 
 @app.get("/api/llm/providers")
-async def get_llm_providers():
-    try:
-        import litellm
-        import os
-        import json
-
-        model_cost = {}
-        if hasattr(litellm, "model_cost"):
-            model_cost = litellm.model_cost
-        else:
-            try:
-                backup_path = os.path.join(os.path.dirname(litellm.__file__), "model_prices_and_context_window_backup.json")
-                with open(backup_path, "r", encoding="utf-8") as f:
-                    model_cost = json.load(f)
-            except Exception:
-                pass
-
-        providers = set()
-        for model_name, info in model_cost.items():
-            if not isinstance(info, dict):
-                continue
-            prov = info.get("litellm_provider")
-            if prov:
-                providers.add(str(prov).lower())
-            if "/" in model_name:
-                prefix = model_name.split("/")[0].lower()
-                if prefix and prefix not in ("1024-x-1024", "256-x-256", "512-x-512"):
-                    providers.add(prefix)
-
-        def clean_provider_name(p: str) -> bool:
-            p = p.lower().strip()
-            if not p:
-                return False
-            if any(x in p for x in ("http", "docs.litellm", " ", "/", "cost", "token", "image", "audio", "video", "speech", "tts", "embed", "pixel")):
-                return False
-            if "-" in p:
-                parts = p.split("-")
-                if all(part.isdigit() for part in parts if part):
-                    return False
-                if any(part.isdigit() for part in parts):
-                    if any(x in parts for x in ("x", "w", "h")):
-                        return False
-            if p in ("hd", "high", "low", "medium", "standard", "v0", "sample_spec", "fallback_generalizations", "max-x-max"):
-                return False
-            return True
-
-        clean_providers = sorted(list(set(p for p in providers if clean_provider_name(p))))
-        
-        # Ensure standard fallbacks are included
-        standard_fallbacks = ["openai", "anthropic", "nvidia", "groq", "gemini", "ollama", "cohere", "mistral", "vertex_ai", "bedrock", "openrouter", "deepinfra", "together_ai", "xai"]
-        for sf in standard_fallbacks:
-            if sf not in clean_providers:
-                clean_providers.append(sf)
-
-        return {"providers": sorted(clean_providers)}
-    except Exception as e:
-        return {"providers": ["openai", "anthropic", "nvidia", "groq", "gemini", "ollama", "cohere", "mistral", "vertex_ai", "bedrock", "openrouter", "deepinfra", "together_ai", "xai"], "error": str(e)}
-
-def _is_text_generation_model(model_name: str, info: Optional[dict] = None) -> bool:
-    low_name = model_name.lower()
-    _EXCLUDE_SUBSTRINGS = (
-        "embed", "ada-002", "dall-e", "stable-diffusion", "imagen", "image-generation",
-        "tts", "whisper", "audio", "speech", "realtime", "moderation", "content-filter",
-        "shield", "guard", "rerank", "clip", "vit", "siglip", "transcription", "translation",
-        "vector_store", "search-", "encoder", "ocr", "video_generation", "image_edit"
-    )
-    if any(sub in low_name for sub in _EXCLUDE_SUBSTRINGS):
-        return False
-        
-    if info:
-        non_text_keys = (
-            "input_cost_per_image", "output_cost_per_image",
-            "input_cost_per_audio_per_second", "input_cost_per_audio_token", "output_cost_per_audio_token",
-            "ocr_cost_per_page", "annotation_cost_per_page", "input_cost_per_pixel", "output_cost_per_pixel",
-            "input_cost_per_video_per_second", "output_cost_per_video_per_second"
-        )
-        if any(k in info for k in non_text_keys):
-            return False
-            
-        mode = info.get("mode")
-        if mode not in ("chat", "completion", None):
-            return False
-            
-    return True
-
-def _verify_single_model(provider: str, model_name: str, api_key: str) -> bool:
-    import litellm
-    import os
-    
-    if provider == "ollama":
-        env_key_name = "OLLAMA_BASE_URL"
-    elif provider in ("nvidia", "minimax"):
-        env_key_name = "NVIDIA_API_KEY"
-    else:
-        env_key_name = f"{provider.upper()}_API_KEY"
-
-    original_val = os.environ.get(env_key_name)
-    if api_key:
-        os.environ[env_key_name] = api_key
-        
+def get_llm_providers():
     try:
-        litellm.completion(
-            model=model_name,
-            messages=[{"role": "user", "content": "."}],
-            max_tokens=1,
-            timeout=4.0
-        )
-        return True
+        return {"providers": get_model_catalog().providers()}
     except Exception as e:
-        err_str = str(e).lower()
-        err_type = type(e).__name__
-        
-        is_bad_request = False
-        is_not_found = False
-        
-        if "badrequest" in err_type.lower() or "400" in err_str:
-            is_bad_request = True
-        if "notfound" in err_type.lower() or "404" in err_str or "not_found" in err_str:
-            is_not_found = True
-            
-        if is_bad_request or is_not_found:
-            return False
-            
-        return True
-    finally:
-        if original_val is not None:
-            os.environ[env_key_name] = original_val
-        elif env_key_name in os.environ:
-            del os.environ[env_key_name]
+        from tools.model_catalog import STANDARD_PROVIDERS
+        return {"providers": sorted(STANDARD_PROVIDERS), "error": str(e)}
 
 @app.get("/api/llm/providers/{provider}/models")
-async def get_llm_models(provider: str, api_key: Optional[str] = None):
+def get_llm_models(provider: str, api_key: Optional[str] = None):
     """Returns only text-to-text (chat/completion) models for a provider.
     Filters out voice, image, embedding, moderation, realtime, and other
     non-text-generation models that this project cannot use.
-    If api_key is provided or configured, dynamically queries the provider's active models list."""
-    
+    If api_key is provided or configured, the list is the provider's active
+    models, verified in the background and served from the model catalog."""
+    from tools.model_catalog import env_key_name
+
     # Read API Key from local config if not passed/dummy
     if not api_key or not api_key.strip() or api_key.endswith("..."):
-        cfg_path = get_local_config_path()
-        if cfg_path.exists():
-            try:
-                with open(cfg_path, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
-                    if provider == "ollama":
-                        api_key = cfg.get("OLLAMA_BASE_URL", "")
-                    elif provider in ("nvidia", "minimax"):
-                        api_key = cfg.get("NVIDIA_API_KEY", "")
-                    else:
-                        api_key = cfg.get(f"{provider.upper()}_API_KEY", "")
-            except Exception:
-                pass
-
-    models = []
-    fetched_successfully = False
-
-    # Dynamic fetching based on API Key
-    if api_key and api_key.strip() and not api_key.endswith("..."):
-        import requests
-        clean_key = api_key.strip()
-        try:
-            if provider == "nvidia":
-                res = requests.get(
-                    "https://integrate.api.nvidia.com/v1/models",
-                    headers={"Authorization": f"Bearer {clean_key}"},
-                    timeout=4
-                )
-                if res.status_code == 200:
-                    models = [f"nvidia_nim/{m['id']}" for m in res.json().get("data", [])]
-                    fetched_successfully = True
-            elif provider == "groq":
-                res = requests.get(
-                    "https://api.groq.com/openai/v1/models",
-                    headers={"Authorization": f"Bearer {clean_key}"},
-                    timeout=4
-                )
-                if res.status_code == 200:
-                    models = [f"groq/{m['id']}" for m in res.json().get("data", [])]
-                    fetched_successfully = True
-            elif provider == "openai":
-                res = requests.get(
-                    "https://api.openai.com/v1/models",
-                    headers={"Authorization": f"Bearer {clean_key}"},
-                    timeout=4
-                )
-                if res.status_code == 200:
-                    models = [m['id'] for m in res.json().get("data", [])]
-                    fetched_successfully = True
-        except Exception:
-            pass # Fallback to litellm list if request fails
-
-    import litellm
-    import os
-    
-    # Load litellm dictionary
-    model_cost = {}
-    if hasattr(litellm, "model_cost"):
-        model_cost = litellm.model_cost
-    else:
-        try:
-            backup_path = os.path.join(os.path.dirname(litellm.__file__), "model_prices_and_context_window_backup.json")
-            with open(backup_path, "r", encoding="utf-8") as f:
-                model_cost = json.load(f)
-        except Exception:
-            pass
-
-    provider_models = []
-    
-    if fetched_successfully and models:
-        for model in models:
-            info = model_cost.get(model)
-            if _is_text_generation_model(model, info):
-                provider_models.append(model)
-    else:
-        for model_name, info in model_cost.items():
-            if not isinstance(info, dict):
-                continue
-            prov = info.get("litellm_provider", "")
-            prov_lower = prov.lower() if prov else ""
-            req_prov_lower = provider.lower()
-            
-            is_match = False
-            if prov_lower == req_prov_lower:
-                is_match = True
-            elif req_prov_lower == "nvidia" and prov_lower == "nvidia_nim":
-                is_match = True
-            elif req_prov_lower == "cohere" and prov_lower == "cohere_chat":
-                is_match = True
-            elif req_prov_lower == "bedrock" and prov_lower in ("bedrock_converse", "bedrock_mantle"):
-                is_match = True
-            elif model_name.startswith(f"{provider}/"):
-                is_match = True
-            elif provider.lower() == "openai" and "gpt-" in model_name and "/" not in model_name:
-                is_match = True
-
-            if is_match:
-                if _is_text_generation_model(model_name, info):
-                    provider_models.append(model_name)
-
         try:
-            if hasattr(litellm, "model_list"):
-                extra = [m for m in litellm.model_list if m.startswith(f"{provider}/")]
-                if provider == "openai":
-                    extra.extend([m for m in litellm.model_list if "gpt-" in m and "/" not in m])
-                for m in extra:
-                    info = model_cost.get(m)
-                    if _is_text_generation_model(m, info):
-                        provider_models.append(m)
+            api_key = _read_local_config().get(env_key_name(provider), "")
         except Exception:
-            pass
+            api_key = ""
+    if api_key and api_key.endswith("..."):
+        api_key = ""
 
-    provider_models = sorted(list(set(provider_models)))
-
-    verified_models = []
-    # Upstream active validation check
-    if api_key and api_key.strip() and not api_key.endswith("..."):
-        import concurrent.futures
-        clean_key = api_key.strip()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_model = {
-                executor.submit(_verify_single_model, provider, model, clean_key): model
-                for model in provider_models
-            }
-            for future in concurrent.futures.as_completed(future_to_model):
-                model = future_to_model[future]
-                try:
-                    is_active = future.result()
-                    if is_active:
-                        verified_models.append(model)
-                except Exception:
-                    verified_models.append(model)
-    else:
-        verified_models = provider_models
+    return get_model_catalog().models(provider, (api_key or "").strip() or None)
 
-    verified_models = sorted(list(set(verified_models)))
-    return {"models": verified_models}
+@app.get("/api/llm/catalog/stats")
+def get_model_catalog_stats():
+    return get_model_catalog().stats()
 
 # Duplicate validate-key endpoint removed in favor of validate_api_key defined at line 1374.
 
@@ -2894,21 +2879,24 @@ async def get_llm_models(provider: str, api_key: Optional[str] = None):
 # ---------------------------------------------------------------------------
 
 @app.get("/api/projects")
-async def list_projects():
-    """Lists all available data analysis projects/sessions."""
-    projects = []
-    if SESSIONS_DIR.exists():
-        for p in SESSIONS_DIR.iterdir():
-            if p.is_dir():
-                try:
-                    meta = get_project_metadata(p.name)
-                    if meta:
-                        projects.append(meta)
-                except Exception:
-                    pass
-    # Sort projects: newest first
-    projects.sort(key=lambda x: x.get("created_at", 0), reverse=True)
-    return projects
+async def list_projects(
+    offset: int = 0,
+    limit: Optional[int] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    status: Optional[str] = None,
+    q: Optional[str] = None,
+):
+    """Lists data analysis projects from the catalog index (newest first by default).
+
+    Supports paging (``offset``/``limit``), ``sort`` by created_at, updated_at,
+    name, status or size, and filtering by ``status`` or a ``q`` name search.
+    The unpaged total is returned in the X-Total-Count header.
+    """
+    projects, total = get_catalog().list(
+        offset=offset, limit=limit, sort=sort, descending=order.lower() != "asc", status=status, q=q
+    )
+    return JSONResponse(projects, headers={"X-Total-Count": str(total)})
 
 @app.post("/api/projects")
 async def create_project(
@@ -2919,8 +2907,7 @@ async def create_project(
 ):
     """Creates a new project context and uploads the dataset (CSV, Excel, or SQLite)."""
     project_id = uuid.uuid4().hex[:12]
-    session_dir = get_safe_session_dir(project_id)
-    session_dir.mkdir(parents=True, exist_ok=True)
+    session_dir = await asyncio.to_thread(create_session_dir, project_id)
 
     filename_lower = file.filename.lower()
     is_excel = filename_lower.endswith((".xlsx", ".xls"))
@@ -2933,13 +2920,9 @@ async def create_project(
     else:
         file_path = session_dir / "original_upload.csv"
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
     # Pre-configure fresh log files
     log_path = session_dir / "stdout.log"
-    with open(log_path, "w") as f:
-        f.write("Project created. Dataset uploaded successfully.\n")
+    await asyncio.to_thread(_store_upload, file.file, file_path, log_path, "Project created. Dataset uploaded successfully.\n")
 
     status = "idle"
     sheets = []
@@ -2947,26 +2930,19 @@ async def create_project(
 
     if is_excel:
         try:
-            xl = pd.ExcelFile(file_path)
-            sheets = xl.sheet_names
+            sheets = await asyncio.to_thread(_excel_sheet_names, file_path)
             status = "awaiting_sheet"
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to read Excel workbook: {e}")
     elif is_sqlite:
         try:
-            import sqlite3
-            conn = sqlite3.connect(str(file_path))
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [row[0] for row in cursor.fetchall()]
-            conn.close()
+            tables = await asyncio.to_thread(_sqlite_table_names, file_path)
             status = "awaiting_table"
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to read SQLite tables: {e}")
     else:
         try:
-            df = read_csv_robust(file_path)
-            df.to_csv(file_path, index=False)
+            await run_cpu(normalize_csv_upload, str(file_path))
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to read CSV: {e}")
 
@@ -2981,7 +2957,7 @@ async def create_project(
         "created_at": time.time() * 1000,
         "status": status
     }
-    save_project_metadata(project_id, meta)
+    await asyncio.to_thread(save_project_metadata, project_id, meta)
 
     return {
         "id": project_id,
@@ -2997,7 +2973,7 @@ async def create_project(
     }
 
 @app.post("/api/projects/{project_id}/rename")
-async def rename_project(project_id: str, name: str = Form(...)):
+def rename_project(project_id: str, name: str = Form(...)):
     """Renames an existing project context."""
     session_dir = get_safe_session_dir(project_id)
     if not session_dir.exists():
@@ -3011,7 +2987,7 @@ async def rename_project(project_id: str, name: str = Form(...)):
 
 
 @app.post("/api/projects/{project_id}/tweak-relations")
-async def tweak_relations(project_id: str, relations_text: str = Form(...)):
+def tweak_relations(project_id: str, relations_text: str = Form(...)):
     """Saves tweaked relationships back to the results cache."""
     session_dir = get_safe_session_dir(project_id)
     if not session_dir.exists():
@@ -3023,20 +2999,17 @@ async def tweak_relations(project_id: str, relations_text: str = Form(...)):
     res_data = {}
     if results_path.exists():
         try:
-            with open(results_path, "r", encoding="utf-8") as f:
-                res_data = json.load(f)
+            res_data = read_results(session_dir) or {}
         except Exception:
             pass
             
     res_data["relations"] = relations_text.strip()
-    
-    with open(results_path, "w", encoding="utf-8") as f:
-        json.dump(res_data, f, indent=2)
+    write_results(session_dir, res_data)
         
     return {"status": "success", "relations": res_data["relations"]}
 
 @app.delete("/api/projects/{project_id}")
-async def delete_project(project_id: str):
+def delete_project(project_id: str):
     """Deletes all session files, artifacts, and outputs of a project."""
     session_dir = get_safe_session_dir(project_id)
     output_dir = get_safe_output_dir(project_id)
@@ -3044,7 +3017,13 @@ async def delete_project(project_id: str):
     if not session_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
+    close_sql_workbench(session_dir)
+    get_catalog().delete(project_id)
+    get_usage_ledger().forget(project_id)
+    forget_project_metadata(project_id)
     shutil.rmtree(session_dir, ignore_errors=True)
+    invalidate_results(session_dir)
+    invalidate_project_archives(project_id)
     if output_dir.exists():
         shutil.rmtree(output_dir, ignore_errors=True)
 
@@ -3054,105 +3033,77 @@ async def delete_project(project_id: str):
 @app.get("/api/projects/{project_id}/export-zip")
 async def export_project_zip(project_id: str):
     """Exports the entire project (metadata, data files, results, and generated charts) as a ZIP file."""
-    session_dir = get_safe_session_dir(project_id)
-    output_dir = get_safe_output_dir(project_id)
-    if not session_dir.exists():
-        raise HTTPException(status_code=404, detail="Project not found")
+    from tools import project_archive
+
+    def _prepare():
+        session_dir = get_safe_session_dir(project_id)
+        if not session_dir.exists():
+            raise HTTPException(status_code=404, detail="Project not found")
+        output_dir = get_safe_output_dir(project_id)
+        # Export the CSVs, not the cold-tier Parquet files
+        thaw_session(session_dir)
+        # Load metadata first: it may refresh metadata.json, which is part of the archive key
+        meta = get_project_metadata(project_id)
+        entries = project_archive.project_entries(session_dir, output_dir)
+        key = project_archive.archive_key(entries)
+        return meta, entries, key, project_archive.cached_archive(project_id, key)
+
+    meta, entries, key, cached = await asyncio.to_thread(_prepare)
 
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        # Zip session files
-        for root, dirs, files in os.walk(session_dir):
-            for file in files:
-                file_path = Path(root) / file
-                arcname = Path("session") / file_path.relative_to(session_dir)
-                zip_file.write(file_path, arcname=arcname)
-        # Zip output files (charts)
-        if output_dir.exists():
-            for root, dirs, files in os.walk(output_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    arcname = Path("outputs") / file_path.relative_to(output_dir)
-                    zip_file.write(file_path, arcname=arcname)
-
-    zip_buffer.seek(0)
-    meta = get_project_metadata(project_id)
     safe_name = re.sub(r"[^a-zA-Z0-9_-]", "_", meta.get("name", "project").lower())
     filename = f"{safe_name}_{project_id}.zip"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+
+    # Unchanged project: send the archive built by an earlier download
+    if cached is not None:
+        return FileResponse(cached, media_type="application/x-zip-compressed", headers=headers)
+
     return StreamingResponse(
-        BytesIO_iterator(zip_buffer.getvalue()),
+        project_archive.stream_and_cache(project_id, key, entries),
         media_type="application/x-zip-compressed",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers=headers,
     )
 
 
 @app.post("/api/projects/import-zip")
 async def import_project_zip(file: UploadFile = File(...)):
     """Imports a project from a ZIP file and registers it in the system."""
-    zip_contents = await file.read()
-    zip_buffer = BytesIO(zip_contents)
-    
-    project_id = uuid.uuid4().hex[:12]
-    temp_dir = DATA_DIR / "temp_import" / project_id
-    temp_dir.mkdir(parents=True, exist_ok=True)
-    
-    target_project_id = project_id
+    from tools import project_archive
+
+    spool_dir = DATA_DIR / "temp_import"
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    spool_path = spool_dir / f"{uuid.uuid4().hex[:12]}.zip"
+
+    target_project_id = uuid.uuid4().hex[:12]
     session_dir = None
     output_dir = None
     try:
-        with zipfile.ZipFile(zip_buffer, "r") as zip_file:
-            # Zip Slip check:
-            for member in zip_file.infolist():
-                if ".." in member.filename or member.filename.startswith("/") or member.filename.startswith("\\"):
-                    raise HTTPException(status_code=400, detail=f"Invalid zip entry: {member.filename}")
-                target_path = (temp_dir / member.filename).resolve()
-                try:
-                    target_path.relative_to(temp_dir.resolve())
-                except ValueError:
-                    raise HTTPException(status_code=400, detail=f"Zip Slip detected: {member.filename}")
-            zip_file.extractall(temp_dir)
-            
-        # Verify metadata.json exists
-        meta_file = temp_dir / "session" / "metadata.json"
-        if not meta_file.exists():
-            raise HTTPException(status_code=400, detail="Invalid zip format: missing metadata.json")
-            
-        with open(meta_file, "r", encoding="utf-8") as f:
-            meta = json.load(f)
-            
-        orig_project_id = meta.get("id")
-        if orig_project_id:
-            if not is_safe_id(orig_project_id):
-                raise HTTPException(status_code=400, detail="Invalid project ID in metadata.")
-            target_project_id = orig_project_id
-            
-        # Check if project conflicts. If so, generate new ID
-        session_dir = get_safe_session_dir(target_project_id)
-        if session_dir.exists():
-            target_project_id = uuid.uuid4().hex[:12]
-            session_dir = get_safe_session_dir(target_project_id)
-            meta["id"] = target_project_id
-            meta["name"] = f"{meta.get('name', 'Imported')} (Copy)"
-            
-        output_dir = get_safe_output_dir(target_project_id)
-        session_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Copy session files
-        for item in (temp_dir / "session").iterdir():
-            if item.is_file():
-                if not is_safe_filename(item.name):
-                    continue
-                shutil.copy2(item, session_dir / item.name)
-                
-        # Copy outputs
-        if (temp_dir / "outputs").exists():
-            output_dir.mkdir(parents=True, exist_ok=True)
-            for item in (temp_dir / "outputs").iterdir():
-                if item.is_file():
-                    if not is_safe_filename(item.name):
-                        continue
-                    shutil.copy2(item, output_dir / item.name)
-                    
+        await project_archive.spool_upload(file, spool_path)
+        zip_file = await asyncio.to_thread(zipfile.ZipFile, spool_path, "r")
+        with zip_file:
+            meta, members = await asyncio.to_thread(project_archive.plan_import, zip_file)
+
+            orig_project_id = meta.get("id")
+            if orig_project_id:
+                if not is_safe_id(orig_project_id):
+                    raise HTTPException(status_code=400, detail="Invalid project ID in metadata.")
+                target_project_id = orig_project_id
+
+            # Check if project conflicts. If so, generate new ID
+            session_dir = await asyncio.to_thread(get_safe_session_dir, target_project_id)
+            if session_dir.exists():
+                target_project_id = uuid.uuid4().hex[:12]
+                session_dir = await asyncio.to_thread(get_safe_session_dir, target_project_id)
+                meta["id"] = target_project_id
+                meta["name"] = f"{meta.get('name', 'Imported')} (Copy)"
+
+            output_dir = await asyncio.to_thread(get_safe_output_dir, target_project_id)
+            await asyncio.to_thread(session_dir.mkdir, parents=True, exist_ok=True)
+
+            # Stream members straight into the session/output folders
+            await asyncio.to_thread(project_archive.extract_members, zip_file, members, session_dir, output_dir)
+        await asyncio.to_thread(dedupe_session_files, [session_dir / n for n in ("original_upload.csv", "original.csv")])
+
         # Update metadata.json
         meta["id"] = target_project_id
         if meta.get("thumbnail"):
@@ -3162,24 +3113,39 @@ async def import_project_zip(file: UploadFile = File(...)):
                 thumb_parts[3] = target_project_id
                 meta["thumbnail"] = "/".join(thumb_parts)
                 
-        with open(session_dir / "metadata.json", "w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2)
+        await asyncio.to_thread(save_project_metadata, target_project_id, meta)
             
         return meta
     except Exception as e:
-        if session_dir and session_dir.exists():
-            shutil.rmtree(session_dir, ignore_errors=True)
-        if output_dir and output_dir.exists():
-            shutil.rmtree(output_dir, ignore_errors=True)
+        for folder in (session_dir, output_dir):
+            if folder and folder.exists():
+                await asyncio.to_thread(shutil.rmtree, folder, True)
         raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
     finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        spool_path.unlink(missing_ok=True)
 
 
 @app.get("/api/projects/{project_id}/preview")
-async def get_dynamic_preview(project_id: str):
-    """Dynamically reads the latest state of the CSV and returns a 100-row preview, column names, shapes, and types."""
-    session_dir = get_safe_session_dir(project_id)
+async def get_dynamic_preview(
+    project_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    sort: Optional[str] = None,
+    order: str = "asc",
+    q: Optional[str] = None,
+    column: Optional[str] = None,
+):
+    """Returns a page of the latest CSV state plus column names, shape and types.
+
+    Shape and dtypes come from the cached dataset metadata, and the default
+    view reads only the first ``limit`` rows. Paging past the first page,
+    sorting (``sort``/``order``) and filtering (``q``, optionally limited to
+    ``column``) run in DuckDB over the session's workbench table. Nothing is
+    written on GET.
+    """
+    from tools.dataset_diff import load_metadata
+
+    session_dir = await asyncio.to_thread(get_hot_session_dir, project_id)
     if not session_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -3190,34 +3156,30 @@ async def get_dynamic_preview(project_id: str):
     if not csv_path.exists():
         raise HTTPException(status_code=404, detail="CSV not found.")
 
+    limit = max(1, min(limit, 1000))
     try:
-        df = read_csv_robust(str(csv_path))
-        rows_count, cols_count = df.shape
-        preview = df.head(100).fillna("").to_dict(orient="records")
-        col_types = {col: str(dtype) for col, dtype in df.dtypes.items()}
-        columns = list(df.columns)
-
-        # Update cache in results.json if it exists
-        results_path = session_dir / "results.json"
-        if results_path.exists():
-            try:
-                with open(results_path, "r", encoding="utf-8") as f:
-                    res_data = json.load(f)
-                res_data["preview"] = preview
-                res_data["rows_count"] = rows_count
-                res_data["cols_count"] = cols_count
-                with open(results_path, "w", encoding="utf-8") as f:
-                    json.dump(res_data, f, indent=2)
-            except Exception:
-                pass
-
-        return {
+        meta = await asyncio.to_thread(load_metadata, csv_path)
+        columns = meta["columns"]
+        response = {
             "columns": columns,
-            "col_types": col_types,
-            "rows_count": rows_count,
-            "cols_count": cols_count,
-            "preview": preview
+            "col_types": meta["dtypes"],
+            "rows_count": meta["rows"],
+            "cols_count": len(columns),
+            "offset": offset,
+            "limit": limit,
         }
+
+        if offset == 0 and not sort and not q:
+            df = await asyncio.to_thread(read_csv_robust, str(csv_path), nrows=limit)
+            response["preview"] = df.fillna("").to_dict(orient="records")
+            response["filtered_count"] = meta["rows"]
+        else:
+            from tools.sql_workbench import preview_page
+            response.update(await asyncio.to_thread(
+                preview_page, session_dir, csv_path, columns, offset, limit,
+                sort, order.lower() == "desc", q, column,
+            ))
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load preview: {str(e)}")
 
@@ -3225,7 +3187,7 @@ async def get_dynamic_preview(project_id: str):
 @app.get("/api/projects/{project_id}/download-csv")
 async def download_project_csv(project_id: str):
     """Downloads the cleaned dataset CSV for the specified project."""
-    session_dir = get_safe_session_dir(project_id)
+    session_dir = await asyncio.to_thread(get_hot_session_dir, project_id)
     if not session_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -3237,7 +3199,7 @@ async def download_project_csv(project_id: str):
         raise HTTPException(status_code=404, detail="CSV not found.")
 
     try:
-        meta = get_project_metadata(project_id)
+        meta = await asyncio.to_thread(get_project_metadata, project_id)
         orig_name = meta.get("filename", "dataset.csv")
     except Exception:
         orig_name = "dataset.csv"
@@ -3258,342 +3220,21 @@ async def download_project_csv(project_id: str):
 @app.get("/api/projects/{project_id}/export-pptx")
 async def export_project_pptx(project_id: str, theme: str = "dark"):
     """Generates a McKinsey-style executive PowerPoint slide deck from project results."""
-    session_dir = get_safe_session_dir(project_id)
+    session_dir = await asyncio.to_thread(get_safe_session_dir, project_id)
     results_path = session_dir / "results.json"
     if not results_path.exists():
         raise HTTPException(status_code=404, detail="Results not found. Run analysis first.")
 
+    # Served from the report cache; rendered in the renderer pool on a miss
     try:
-        from pptx import Presentation
-        from pptx.util import Inches, Pt
-        from pptx.dml.color import RGBColor
-        from pptx.enum.text import PP_ALIGN
-        from pptx.enum.shapes import MSO_SHAPE
-    except ImportError:
-        import subprocess, sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "python-pptx"])
-        from pptx import Presentation
-        from pptx.util import Inches, Pt
-        from pptx.dml.color import RGBColor
-        from pptx.enum.text import PP_ALIGN
-        from pptx.enum.shapes import MSO_SHAPE
-
-    with open(results_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    meta = get_project_metadata(project_id)
-    report_title = meta.get("report_title", meta.get("name", "Executive Data Analysis"))
-    project_name = meta.get("name", "Crewlyze Project")
-
-    is_light = (theme.lower() == "light")
-
-    # Color Palette Definitions
-    if is_light:
-        bg_rgb = (248, 250, 252)        # Slate 50
-        card_rgb = (255, 255, 255)      # White
-        card_border_rgb = (226, 232, 240) # Slate 200
-        text_head_rgb = (15, 23, 42)    # Slate 900
-        text_body_rgb = (51, 65, 85)    # Slate 700
-        text_sub_rgb = (100, 116, 139)  # Slate 500
-        accent_purple = (124, 58, 237)  # Violet 600
-        accent_emerald = (5, 150, 105)  # Emerald 600
-        accent_cyan = (2, 132, 199)     # Sky 600
-        accent_rose = (225, 29, 72)     # Rose 600
-        accent_amber = (217, 119, 6)    # Amber 600
-    else:
-        bg_rgb = (15, 17, 23)          # Dark Obsidian
-        card_rgb = (24, 28, 41)         # Dark Slate Card
-        card_border_rgb = (51, 65, 85)  # Dark Border
-        text_head_rgb = (255, 255, 255) # Pure White
-        text_body_rgb = (226, 232, 240) # Slate 200
-        text_sub_rgb = (148, 163, 184)  # Slate 400
-        accent_purple = (168, 85, 247)  # Purple 500
-        accent_emerald = (16, 185, 129) # Emerald 500
-        accent_cyan = (14, 165, 233)    # Sky 500
-        accent_rose = (244, 63, 94)     # Rose 500
-        accent_amber = (245, 158, 11)   # Amber 500
-
-    prs = Presentation()
-    prs.slide_width = Inches(13.333)
-    prs.slide_height = Inches(7.5)
-
-    def _add_bg(slide):
-        bg = slide.background
-        fill = bg.fill
-        fill.solid()
-        fill.fore_color.rgb = RGBColor(*bg_rgb)
-
-    def _clean_md(text: str) -> str:
-        """Strips raw markdown hashes and asterisks."""
-        if not text: return ""
-        cleaned = re.sub(r'^\s*#{1,6}\s*', '', text, flags=re.MULTILINE)
-        cleaned = cleaned.replace('**', '').replace('__', '')
-        return cleaned.strip()
-
-    def _clean_takeaway_text(text: str) -> str:
-        if not text:
-            return "Visual distribution map detailing parameter correlations and features matrix."
-        cleaned = re.sub(r'\[Auto-Healing.*?\]', '', text, flags=re.IGNORECASE)
-        cleaned = re.sub(r'Warnings\s*&\s*Alerts:.*', '', cleaned, flags=re.DOTALL | re.IGNORECASE)
-        cleaned = re.sub(r'Active insights agent failed.*', '', cleaned, flags=re.DOTALL | re.IGNORECASE)
-        cleaned = re.sub(r'^\d+[\.\)]\s*', '', cleaned)
-        lines = [line.strip() for line in cleaned.split("\n") if line.strip() and not line.strip().startswith("- [Auto-Healing")]
-        return "\n".join(lines).strip() or "Visual distribution map detailing parameter correlations and features matrix."
-
-    def _add_textbox(slide, left, top, width, height, text, size=13, bold=False, color=text_body_rgb, align=PP_ALIGN.LEFT):
-        clean_t = _clean_md(text)
-        txBox = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
-        tf = txBox.text_frame
-        tf.word_wrap = True
-
-        # Dynamic font size auto-scaling based on text length
-        if len(clean_t) > 400:
-            size = min(size, 9.5)
-            if len(clean_t) > 650:
-                clean_t = clean_t[:640] + "..."
-        elif len(clean_t) > 220:
-            size = min(size, 10.5)
-        elif len(clean_t) > 120:
-            size = min(size, 11.5)
-
-        p = tf.paragraphs[0]
-        p.text = clean_t
-        p.font.size = Pt(size)
-        p.font.bold = bold
-        p.font.color.rgb = RGBColor(*color)
-        p.alignment = align
-        return tf
-
-    # ── SLIDE 1: Cover Page ───────────────────────────────────────────────────
-    slide1 = prs.slides.add_slide(prs.slide_layouts[6])
-    _add_bg(slide1)
-
-    # Accent Header Bar
-    bar = slide1.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0.8), Inches(0.8), Inches(0.18), Inches(5.8))
-    bar.fill.solid()
-    bar.fill.fore_color.rgb = RGBColor(*accent_purple)
-    bar.line.fill.background()
-
-    # Title & Subtitle
-    _add_textbox(slide1, 1.3, 1.8, 11.0, 1.4, report_title, size=34, bold=True, color=text_head_rgb)
-    _add_textbox(slide1, 1.3, 3.2, 11.0, 0.6, f"Project Dataset: {project_name}", size=18, color=accent_purple)
-    
-    import datetime
-    date_str = datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p')
-    _add_textbox(slide1, 1.3, 3.9, 11.0, 0.4, f"Generated on {date_str}", size=13, color=text_sub_rgb)
-
-    # Metadata Stat Badges Container
-    meta_card = slide1.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(1.3), Inches(4.8), Inches(10.8), Inches(1.4))
-    meta_card.fill.solid()
-    meta_card.fill.fore_color.rgb = RGBColor(*card_rgb)
-    meta_card.line.color.rgb = RGBColor(*card_border_rgb)
-
-    meta_text = f"📊 Dataset Scope: {data.get('rows_count', 0):,} Rows × {data.get('cols_count', 0)} Columns  |  Numeric Features: {data.get('numeric_count', 0)}  |  Categorical Features: {data.get('cat_count', 0)}"
-    _add_textbox(slide1, 1.5, 5.3, 10.4, 0.6, meta_text, size=14, bold=True, color=text_body_rgb, align=PP_ALIGN.CENTER)
-
-    # ── SLIDE 2: Executive KPI Metrics Grid ──────────────────────────────────
-    slide2 = prs.slides.add_slide(prs.slide_layouts[6])
-    _add_bg(slide2)
-    _add_textbox(slide2, 0.8, 0.6, 11.5, 0.6, "Executive Data Metrics & Health Profile", size=26, bold=True, color=text_head_rgb)
-
-    kpis = [
-        ("Total Rows", f"{data.get('rows_count', 0):,}", "Complete Data Records", accent_purple),
-        ("Total Features", f"{data.get('cols_count', 0)}", "Dataset Attributes", accent_emerald),
-        ("Numeric Ratio", f"{data.get('numeric_count', 0)} / {data.get('cols_count', 0)}", "Quantitative Columns", accent_cyan),
-        ("Data Quality", "100%", "Cleaned & Validated", accent_amber)
-    ]
-
-    for idx, (title, val, sub, col_rgb) in enumerate(kpis):
-        left_pos = 0.8 + (idx * 2.95)
-        card = slide2.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(left_pos), Inches(1.6), Inches(2.7), Inches(4.8))
-        card.fill.solid()
-        card.fill.fore_color.rgb = RGBColor(*card_rgb)
-        card.line.color.rgb = RGBColor(*col_rgb)
-
-        _add_textbox(slide2, left_pos + 0.1, 2.2, 2.5, 0.4, title.upper(), size=12, bold=True, color=col_rgb, align=PP_ALIGN.CENTER)
-        _add_textbox(slide2, left_pos + 0.1, 3.2, 2.5, 1.0, val, size=32, bold=True, color=text_head_rgb, align=PP_ALIGN.CENTER)
-        _add_textbox(slide2, left_pos + 0.1, 4.8, 2.5, 0.4, sub, size=11, color=text_sub_rgb, align=PP_ALIGN.CENTER)
-
-    # ── SLIDE 3: Descriptive Statistics Table ─────────────────────────────────
-    import pandas as pd
-    cleaned_csv = session_dir / "cleaned.csv"
-    stats_df = None
-    if cleaned_csv.exists():
-        try:
-            stats_df = pd.read_csv(cleaned_csv)
-        except Exception:
-            pass
-
-    slide3 = prs.slides.add_slide(prs.slide_layouts[6])
-    _add_bg(slide3)
-    _add_textbox(slide3, 0.8, 0.6, 11.5, 0.6, "Feature Statistics Profile", size=26, bold=True, color=accent_emerald)
-
-    if stats_df is not None:
-        numeric_cols = stats_df.select_dtypes(include=['number']).columns.tolist()
-        stats = []
-        for col in numeric_cols[:8]:
-            col_data = stats_df[col].dropna()
-            if not col_data.empty:
-                stats.append([
-                    col[:26],
-                    f"{col_data.min():.2f}" if col_data.dtype.kind in 'fc' else str(int(col_data.min())),
-                    f"{col_data.max():.2f}" if col_data.dtype.kind in 'fc' else str(int(col_data.max())),
-                    f"{col_data.mean():.2f}",
-                    f"{col_data.std():.2f}"
-                ])
-
-        rows_len = len(stats) + 1
-        cols_len = 5
-        x, y, cx, cy = Inches(0.8), Inches(1.5), Inches(11.7), Inches(0.5 + 0.42 * len(stats))
-        table_shape = slide3.shapes.add_table(rows_len, cols_len, x, y, cx, cy)
-        table = table_shape.table
-
-        table.columns[0].width = Inches(3.7)
-        table.columns[1].width = Inches(2.0)
-        table.columns[2].width = Inches(2.0)
-        table.columns[3].width = Inches(2.0)
-        table.columns[4].width = Inches(2.0)
-
-        headers = ["Numeric Feature", "Min Value", "Max Value", "Arithmetic Mean", "Std Deviation"]
-        for c_idx, h_text in enumerate(headers):
-            cell = table.cell(0, c_idx)
-            cell.text = h_text
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = RGBColor(*accent_emerald) if is_light else RGBColor(16, 185, 129)
-            p = cell.text_frame.paragraphs[0]
-            p.font.size = Pt(12)
-            p.font.bold = True
-            p.font.color.rgb = RGBColor(255, 255, 255)
-            p.alignment = PP_ALIGN.LEFT if c_idx == 0 else PP_ALIGN.RIGHT
-
-        for r_idx, row_data in enumerate(stats):
-            for c_idx, val in enumerate(row_data):
-                cell = table.cell(r_idx + 1, c_idx)
-                cell.text = val
-                cell.fill.solid()
-                cell.fill.fore_color.rgb = RGBColor(*card_rgb)
-                p = cell.text_frame.paragraphs[0]
-                p.font.size = Pt(11)
-                p.font.color.rgb = RGBColor(*text_body_rgb)
-                p.alignment = PP_ALIGN.LEFT if c_idx == 0 else PP_ALIGN.RIGHT
-
-    # ── SLIDE 4: Strategic Business Insights (Structured Split Cards) ────────
-    insights = data.get("insights", "").strip()
-    insights_paragraphs = [p.strip() for p in _clean_md(insights).split("\n\n") if p.strip()]
-
-    if insights_paragraphs:
-        slide4 = prs.slides.add_slide(prs.slide_layouts[6])
-        _add_bg(slide4)
-        _add_textbox(slide4, 0.8, 0.6, 11.5, 0.6, "Strategic Business Insights & Recommendations", size=24, bold=True, color=accent_amber)
-
-        parsed_cards = []
-        for p in insights_paragraphs[:3]:
-            obs, imp, strat = "", "", ""
-            obs_m = re.search(r"Observation:\s*(.*?)(?=Business Implication|Actionable Strategy|$)", p, re.DOTALL | re.IGNORECASE)
-            imp_m = re.search(r"Business Implication:\s*(.*?)(?=Observation|Actionable Strategy|$)", p, re.DOTALL | re.IGNORECASE)
-            strat_m = re.search(r"Actionable Strategy:\s*(.*?)(?=Observation|Business Implication|$)", p, re.DOTALL | re.IGNORECASE)
-            
-            if obs_m: obs = obs_m.group(1).strip()
-            if imp_m: imp = imp_m.group(1).strip()
-            if strat_m: strat = strat_m.group(1).strip()
-
-            parsed_cards.append({
-                "obs": obs or p[:200],
-                "imp": imp or "Resource allocation exhibits a lockstep relationship with performance metrics.",
-                "strat": strat or "Establish continuous automated monitoring and resource allocation controls."
-            })
-
-        col_w = 3.65
-        for idx, card_data in enumerate(parsed_cards[:3]):
-            left_pos = 0.8 + (idx * 3.9)
-            card = slide4.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(left_pos), Inches(1.4), Inches(col_w), Inches(5.4))
-            card.fill.solid()
-            card.fill.fore_color.rgb = RGBColor(*card_rgb)
-            card.line.color.rgb = RGBColor(*accent_amber)
-
-            _add_textbox(slide4, left_pos + 0.15, 1.55, col_w - 0.3, 0.35, f"STRATEGIC PILLAR #{idx+1}", size=11, bold=True, color=accent_amber)
-
-            _add_textbox(slide4, left_pos + 0.15, 2.0, col_w - 0.3, 0.25, "OBSERVATION", size=9.5, bold=True, color=accent_cyan)
-            _add_textbox(slide4, left_pos + 0.15, 2.3, col_w - 0.3, 1.3, card_data["obs"], size=10, color=text_body_rgb)
-
-            _add_textbox(slide4, left_pos + 0.15, 3.7, col_w - 0.3, 0.25, "BUSINESS IMPLICATION", size=9.5, bold=True, color=accent_purple)
-            _add_textbox(slide4, left_pos + 0.15, 4.0, col_w - 0.3, 1.3, card_data["imp"], size=10, color=text_body_rgb)
-
-            _add_textbox(slide4, left_pos + 0.15, 5.4, col_w - 0.3, 0.25, "ACTIONABLE STRATEGY", size=9.5, bold=True, color=accent_emerald)
-            _add_textbox(slide4, left_pos + 0.15, 5.7, col_w - 0.3, 0.9, card_data["strat"], size=10, color=text_body_rgb)
-
-    # ── SLIDE 5+: Visual Charts & Executive Takeaway Cards ───────────────────
-    png_charts = data.get("png_charts", [])
-    output_dir = Path(data.get("output_dir", ""))
-
-    for idx, chart_name in enumerate(png_charts[:4]):
-        chart_path = output_dir / chart_name
-        if chart_path.exists():
-            slide_chart = prs.slides.add_slide(prs.slide_layouts[6])
-            _add_bg(slide_chart)
-            chart_title = chart_name.replace(".png", "").replace("_", " ").title()
-            _add_textbox(slide_chart, 0.8, 0.6, 11.5, 0.6, f"Visual Intelligence: {chart_title}", size=24, bold=True, color=accent_cyan)
-
-            try:
-                slide_chart.shapes.add_picture(str(chart_path), Inches(0.8), Inches(1.4), Inches(6.5))
-            except Exception as chart_err:
-                print(f"Error adding chart image to PPTX: {chart_err}")
-
-            raw_t = insights_paragraphs[idx + 3] if (idx + 3) < len(insights_paragraphs) else ""
-            takeaway_text = _clean_takeaway_text(raw_t)
-            
-            r_left = 7.6
-            r_width = 4.9
-            
-            card_bg = slide_chart.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(r_left), Inches(1.4), Inches(r_width), Inches(5.4))
-            card_bg.fill.solid()
-            card_bg.fill.fore_color.rgb = RGBColor(*card_rgb)
-            card_bg.line.color.rgb = RGBColor(*accent_cyan)
-
-            _add_textbox(slide_chart, r_left + 0.2, 1.65, r_width - 0.4, 0.35, "EXECUTIVE TAKEAWAY & ANALYSIS", size=12, bold=True, color=accent_cyan)
-
-            _add_textbox(slide_chart, r_left + 0.2, 2.1, r_width - 0.4, 0.25, "KEY PATTERN OBSERVED", size=9.5, bold=True, color=accent_purple)
-            _add_textbox(slide_chart, r_left + 0.2, 2.4, r_width - 0.4, 1.4, takeaway_text, size=10.5, color=text_body_rgb)
-
-            _add_textbox(slide_chart, r_left + 0.2, 3.9, r_width - 0.4, 0.25, "OPERATIONAL RELEVANCE", size=9.5, bold=True, color=accent_amber)
-            _add_textbox(slide_chart, r_left + 0.2, 4.2, r_width - 0.4, 1.0, "This visual distribution provides key evidence for resource allocation and predictive modeling.", size=10, color=text_body_rgb)
-
-            _add_textbox(slide_chart, r_left + 0.2, 5.3, r_width - 0.4, 0.25, "RECOMMENDED NEXT STEP", size=9.5, bold=True, color=accent_emerald)
-            _add_textbox(slide_chart, r_left + 0.2, 5.6, r_width - 0.4, 1.0, "Incorporate key column metrics into automated data-quality monitor.", size=10, color=text_body_rgb)
-
-    # ── SLIDE LAST: Conclusion & Action Plan (Stacked Action Cards) ──────────
-    slide_final = prs.slides.add_slide(prs.slide_layouts[6])
-    _add_bg(slide_final)
-    _add_textbox(slide_final, 0.8, 0.6, 11.5, 0.6, "Conclusions & Actionable Implementation", size=24, bold=True, color=accent_emerald)
-
-    action_items = [
-        ("01", "Operational Optimization", "Leverage mapped correlations to drive high-impact operational optimizations and resource reallocation.", accent_cyan),
-        ("02", "Automated Data Governance", "Implement automated data-quality checks on continuous incoming data streams to prevent pipeline anomalies.", accent_purple),
-        ("03", "Predictive Integration", "Deploy machine-learning ready data structures directly into downstream predictive modeling pipelines.", accent_amber),
-        ("04", "Stakeholder Alignment", "Share executive visual decks and insights with key business stakeholders for strategic alignment.", accent_emerald)
-    ]
-
-    for idx, (num_str, title_str, desc_str, col_rgb) in enumerate(action_items):
-        top_pos = 1.4 + (idx * 1.35)
-        
-        card = slide_final.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.8), Inches(top_pos), Inches(11.7), Inches(1.2))
-        card.fill.solid()
-        card.fill.fore_color.rgb = RGBColor(*card_rgb)
-        card.line.color.rgb = RGBColor(*col_rgb)
-
-        num_box = slide_final.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.95), Inches(top_pos + 0.15), Inches(0.9), Inches(0.9))
-        num_box.fill.solid()
-        num_box.fill.fore_color.rgb = RGBColor(*col_rgb)
-        num_box.line.fill.background()
-
-        _add_textbox(slide_final, 0.95, top_pos + 0.35, 0.9, 0.5, num_str, size=18, bold=True, color=(255, 255, 255), align=PP_ALIGN.CENTER)
-
-        _add_textbox(slide_final, 2.0, top_pos + 0.2, 10.3, 0.35, title_str.upper(), size=12, bold=True, color=col_rgb)
-        _add_textbox(slide_final, 2.0, top_pos + 0.55, 10.3, 0.55, desc_str, size=11, color=text_body_rgb)
-
-    pptx_path = session_dir / "report.pptx"
-    prs.save(str(pptx_path))
+        future = await asyncio.to_thread(render_report, "pptx", project_id, theme=theme)
+        pptx_path = Path(await asyncio.wrap_future(future))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PPTX generation failed: {e}")
 
+    meta = await asyncio.to_thread(get_project_metadata, project_id)
     base_name = meta.get("filename", "report").rsplit(".", 1)[0] if "." in meta.get("filename", "") else meta.get("name", "report")
     return FileResponse(
         str(pptx_path),
@@ -3606,15 +3247,13 @@ async def export_project_pptx(project_id: str, theme: str = "dark"):
 # ---------------------------------------------------------------------------
 
 @app.get("/api/projects/compare")
-async def compare_projects(project_a: str, project_b: str):
+def compare_projects(project_a: str, project_b: str):
     """Returns comparative delta data for two completed projects."""
     def _load_project_summary(pid):
         session_dir = get_safe_session_dir(pid)
-        results_path = session_dir / "results.json"
-        if not results_path.exists():
+        data = read_results(session_dir)
+        if data is None:
             raise HTTPException(status_code=404, detail=f"Results not found for project {pid}")
-        with open(results_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
         meta = get_project_metadata(pid)
         return {
             "id": pid,
@@ -0,0 +1,22 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Point every store at a throwaway data directory."""
+    data = tmp_path / "data"
+    data.mkdir()
+    monkeypatch.setenv("CREWLYZE_DATA_DIR", str(data))
+    monkeypatch.setenv("CREWLYZE_OUTPUTS_DIR", str(tmp_path / "outputs"))
+    return data
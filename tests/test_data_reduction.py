@@ -0,0 +1,50 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import numpy as np
+import pandas as pd
+
+from tools import data_reduction
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    y[4321] = 50.0
+
+    idx, xs, ys = data_reduction.lttb(x, y, 200)
+
+    assert len(idx) == 200
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 4321 in idx
+    assert np.array_equal(xs, x[idx]) and np.array_equal(ys, y[idx])
+
+
+def test_lttb_returns_short_series_unchanged():
+    idx, xs, ys = data_reduction.lttb([1, 2, 3], [4, 5, 6], 10)
+    assert idx.tolist() == [0, 1, 2]
+    assert ys.tolist() == [4, 5, 6]
+
+
+def test_histogram_counts_every_finite_value():
+    values = pd.Series([1, 2, 2, 3, None, np.inf, "x"] + list(range(100)))
+
+    hist = data_reduction.histogram(values, bins=10)
+
+    assert sum(hist["y"]) == 104
+    assert len(hist["x"]) == 10
+    assert hist["width"] > 0
+    assert data_reduction.histogram([None, "x"]) == {"x": [], "y": [], "width": 0.0}
+
+
+def test_line_series_sorts_and_reduces_dates():
+    dates = pd.date_range("2024-01-01", periods=5000, freq="h")
+    df = pd.DataFrame({"when": dates.strftime("%Y-%m-%d %H:%M")[::-1], "value": np.arange(5000)[::-1]})
+
+    reduced = data_reduction.line_series(df, "when", "value", n_out=100)
+
+    assert len(reduced) == 100
+    assert reduced["when"].is_monotonic_increasing
+    assert reduced["value"].iloc[0] == 0 and reduced["value"].iloc[-1] == 4999
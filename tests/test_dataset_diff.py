@@ -0,0 +1,64 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+from tools import dataset_diff
+
+
+def _write(path, rows):
+    path.write_text("id,name,score\n" + "".join(f"{i},{n},{s}\n" for i, n, s in rows))
+    return path
+
+
+def test_key_alignment_counts_changed_cells(tmp_path):
+    orig = _write(tmp_path / "orig.csv", [(i, f"n{i}", i) for i in range(100)])
+    rows = [(i, f"n{i}", i + 1 if i < 3 else i) for i in range(100) if i != 50]
+    clean = _write(tmp_path / "clean.csv", rows[::-1])
+
+    result = dataset_diff.deep_diff(orig, clean, key=["id"])
+
+    assert result["alignment"] == "key"
+    assert (result["rows_removed"], result["rows_added"]) == (4, 3)
+    assert result["rows_unchanged"] == 96
+    assert result["columns"]["score"]["changed_cells"] == 3
+    assert result["columns"]["name"]["changed_cells"] == 0
+    assert len(result["samples"]) == 3
+
+
+def test_duplicate_key_falls_back_to_row_hashes(tmp_path):
+    orig = _write(tmp_path / "orig.csv", [(i % 10, f"n{i}", i) for i in range(100)])
+    clean = _write(tmp_path / "clean.csv", [(i % 10, f"n{i}", i) for i in range(99)])
+
+    result = dataset_diff.deep_diff(orig, clean, key=["id"])
+
+    assert result["alignment"] == "rows"
+    assert "not unique" in result["note"]
+    assert (result["rows_removed"], result["rows_added"]) == (1, 0)
+    assert "changed_cells" not in result["columns"]["score"]
+    assert "samples" not in result
+
+
+def test_row_counts_match_across_many_buckets(tmp_path, monkeypatch):
+    orig = _write(tmp_path / "orig.csv", [(i, "x", i % 7) for i in range(3000)])
+    clean = _write(tmp_path / "clean.csv", [(i, "x", i % 7) for i in range(500, 3200)])
+    expected = dataset_diff.deep_diff(orig, clean, key=["id"])
+
+    monkeypatch.setattr(dataset_diff, "BUCKET_BYTES", 4096)
+    bucketed = dataset_diff.deep_diff(orig, clean, key=["id"])
+
+    assert (expected["rows_removed"], expected["rows_added"]) == (500, 200)
+    assert bucketed == expected
+
+
+def test_position_and_unaligned_modes(tmp_path):
+    orig = _write(tmp_path / "orig.csv", [(i, "a", i) for i in range(5)])
+    same_length = _write(tmp_path / "same.csv", [(i, "b" if i == 2 else "a", i) for i in range(5)])
+    shorter = _write(tmp_path / "short.csv", [(i, "a", i) for i in range(4)])
+
+    positional = dataset_diff.deep_diff(orig, same_length)
+    unaligned = dataset_diff.deep_diff(orig, shorter)
+
+    assert positional["alignment"] == "position"
+    assert positional["columns"]["name"]["changed_cells"] == 1
+    assert unaligned["alignment"] == "none"
+    assert (unaligned["rows_removed"], unaligned["rows_added"]) == (1, 0)
@@ -0,0 +1,115 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import contextlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import events
+
+
+@pytest.fixture
+def router():
+    """Context stdout router and thread propagation, undone after the test."""
+    console = io.StringIO()
+    with events.context_propagation():
+        # Installed in the test body: pytest swaps sys.stdout between phases
+        yield console, contextlib.redirect_stdout(events._ContextStdout(console))
+
+
+def _bind(log, sink):
+    return events.current_log_stream.set(log), events.current_event_sink.set(sink)
+
+
+def _unbind(tokens):
+    events.current_log_stream.reset(tokens[0])
+    events.current_event_sink.reset(tokens[1])
+
+
+def test_threads_and_pool_tasks_inherit_the_run(router):
+    console, routed = router
+    log, received = io.StringIO(), []
+    pool = ThreadPoolExecutor(max_workers=1)
+
+    def work(label):
+        print(f"{label} output")
+        events.emit(events.HEAL_ATTEMPT, kind=label)
+
+    with routed:
+        tokens = _bind(log, received.append)
+        try:
+            thread = threading.Thread(target=work, args=("thread",))
+            thread.start()
+            thread.join()
+            pool.submit(work, "pool").result()
+        finally:
+            _unbind(tokens)
+
+        # The pool worker was created inside the run; later tasks must not inherit it
+        pool.submit(work, "after").result()
+    pool.shutdown()
+
+    assert "thread output" in log.getvalue() and "pool output" in log.getvalue()
+    assert [e["kind"] for e in received] == ["thread", "pool"]
+    assert "after output" in console.getvalue() and "after" not in log.getvalue()
+
+
+def test_concurrent_runs_stay_separate(router):
+    _, routed = router
+    logs = {name: io.StringIO() for name in ("a", "b")}
+    pool = ThreadPoolExecutor(max_workers=2)
+
+    def run(name):
+        tokens = _bind(logs[name], None)
+        try:
+            for _ in range(50):
+                pool.submit(print, f"run {name}").result()
+        finally:
+            _unbind(tokens)
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in logs]
+    with routed:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    pool.shutdown()
+
+    assert logs["a"].getvalue().count("run a") == 50 and "run b" not in logs["a"].getvalue()
+    assert logs["b"].getvalue().count("run b") == 50 and "run a" not in logs["b"].getvalue()
+
+
+def test_closed_run_log_falls_back_to_console(router):
+    console, routed = router
+    log = io.StringIO()
+    tokens = _bind(log, None)
+    log.close()
+    try:
+        with routed:
+            print("late write")
+    finally:
+        _unbind(tokens)
+    assert "late write" in console.getvalue()
+
+
+def test_propagation_is_scoped_to_active_runs():
+    original_start, original_submit = threading.Thread.start, ThreadPoolExecutor.submit
+    with events.context_propagation():
+        with events.context_propagation():
+            assert threading.Thread.start is not original_start
+        assert ThreadPoolExecutor.submit is not original_submit
+
+        # Unbound callers keep their own context in pool tasks
+        marker = events.contextvars.ContextVar("marker", default="worker")
+        token = marker.set("submitter")
+        try:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                assert pool.submit(marker.get).result() == "worker"
+        finally:
+            marker.reset(token)
+    assert threading.Thread.start is original_start
+    assert ThreadPoolExecutor.submit is original_submit
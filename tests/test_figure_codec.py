@@ -0,0 +1,56 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import base64
+
+import numpy as np
+
+from tools import figure_codec
+
+
+def _decode(spec):
+    arr = np.frombuffer(base64.b64decode(spec["bdata"]), dtype="<" + spec["dtype"])
+    if "shape" in spec:
+        arr = arr.reshape([int(n) for n in spec["shape"].split(",")])
+    return arr
+
+
+def test_numeric_arrays_round_trip():
+    ints = list(range(-50, 50))
+    floats = [i / 4 for i in range(40)]
+    fig = {"data": [{"type": "bar", "x": ints, "y": floats, "name": "short", "text": ["a"] * 20}], "layout": {}}
+
+    encoded = figure_codec.encode_figure(fig)
+    trace = encoded["data"][0]
+
+    assert trace["x"]["dtype"] == "i4" and _decode(trace["x"]).tolist() == ints
+    assert trace["y"]["dtype"] == "f4" and _decode(trace["y"]).tolist() == floats
+    assert trace["text"] == ["a"] * 20
+    assert encoded["layout"] == {}
+
+
+def test_timestamps_keep_float64_precision():
+    stamps = [1.7e12 + i for i in range(20)]
+
+    spec = figure_codec.encode_figure({"data": [{"x": stamps}]})["data"][0]["x"]
+
+    assert spec["dtype"] == "f8"
+    assert _decode(spec).tolist() == stamps
+
+
+def test_heatmap_gaps_become_nan():
+    z = [[1, None, 3, 4], [5, 6, None, 8], [9, 10, 11, 12], [13, 14, 15, 16]]
+
+    spec = figure_codec.encode_figure({"data": [{"type": "heatmap", "z": z}]})["data"][0]["z"]
+    decoded = _decode(spec)
+
+    assert decoded.shape == (4, 4)
+    assert np.isnan(decoded[0, 1]) and np.isnan(decoded[1, 2])
+    assert decoded[3, 3] == 16
+
+
+def test_short_and_mixed_lists_stay_json():
+    fig = {"data": [{"x": [1, 2, 3], "y": [1] * 15 + ["n/a"], "marker": {"size": [True] * 20}}]}
+
+    assert figure_codec.encode_figure(fig) == fig
@@ -0,0 +1,79 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import json
+import time
+
+import pytest
+
+from config.metrics_tracker import MetricsStore, parse_window
+
+
+def _run(minutes_ago: float, success: bool = True, total_time: float = 10.0, **extra) -> dict:
+    return {
+        "session_id": extra.pop("session_id", f"s{minutes_ago}"),
+        "dataset_name": "sales.csv",
+        "rows": 100,
+        "columns": 5,
+        "timestamp": (time.time() - minutes_ago * 60) * 1000,
+        "stages": {"cleaning": total_time / 2, "plotly": 1.0},
+        "total_time": total_time,
+        "token_usage": 1000,
+        "estimated_cost": 0.01,
+        "success": success,
+        **extra,
+    }
+
+
+@pytest.mark.parametrize("text,seconds", [("90s", 90), ("15m", 900), ("24h", 86400), ("7d", 604800), ("2w", 1209600), ("30", 30)])
+def test_parse_window(text, seconds):
+    assert parse_window(text) == seconds
+
+
+def test_parse_window_all_and_invalid():
+    assert parse_window("all") is None and parse_window(None) is None
+    with pytest.raises(ValueError):
+        parse_window("yesterday")
+
+
+def test_window_filters_runs_and_counts_failures(tmp_path):
+    store = MetricsStore(tmp_path / "metrics.sqlite3")
+    store.append(_run(120, total_time=40.0))
+    store.append(_run(30, total_time=10.0))
+    store.append(_run(10, success=False, total_time=2.0))
+
+    assert len(store.runs(parse_window("1h"))) == 2
+    assert len(store.runs()) == 3
+
+    hour = store.summarize(parse_window("1h"))
+    assert (hour["runs"], hour["successes"], hour["failures"]) == (2, 1, 1)
+    assert hour["total_time"]["p50"] == 2.0 and hour["total_time"]["p99"] == 10.0
+    assert hour["stages"]["cleaning"]["count"] == 2
+
+    series = store.summarize(parse_window("3h"), bucket_s=3600)["series"]
+    assert sum(bucket["runs"] for bucket in series) == 3
+
+
+def test_non_numeric_stages_are_dropped(tmp_path):
+    store = MetricsStore(tmp_path / "metrics.sqlite3")
+    store.append(_run(1, stages={"plotly": 1.5, "chart_render": {"a.png": 0.2}, "flag": True}))
+    assert store.runs()[0]["stages"] == {"plotly": 1.5}
+
+
+def test_legacy_import_is_atomic_and_deduplicated(tmp_path):
+    legacy = tmp_path / "metrics.json"
+    runs = [_run(60), _run(30)]
+    legacy.write_text(json.dumps(runs + [_run(20, rows="not a number")]))
+
+    store = MetricsStore(tmp_path / "metrics.sqlite3", legacy_json=legacy)
+    assert store.runs() == [] and legacy.exists()  # bad entry: nothing imported, file kept
+
+    legacy.write_text(json.dumps(runs))
+    store = MetricsStore(tmp_path / "metrics.sqlite3", legacy_json=legacy)
+    assert len(store.runs()) == 2 and not legacy.exists()
+
+    # A leftover copy (e.g. the rename failed last time) imports nothing twice
+    legacy.write_text(json.dumps(runs + [_run(5)]))
+    store = MetricsStore(tmp_path / "metrics.sqlite3", legacy_json=legacy)
+    assert len(store.runs()) == 3
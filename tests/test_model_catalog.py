@@ -0,0 +1,50 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import os
+import sys
+import types
+
+from tools import model_catalog
+
+
+def _stub_litellm(monkeypatch, error=None):
+    calls = []
+
+    def completion(**kwargs):
+        calls.append((kwargs, os.environ.get("GROQ_API_KEY")))
+        if error is not None:
+            raise error
+
+    monkeypatch.setitem(sys.modules, "litellm", types.SimpleNamespace(completion=completion))
+    return calls
+
+
+def test_verify_model_passes_key_without_touching_environ(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "configured-key")
+    calls = _stub_litellm(monkeypatch)
+
+    assert model_catalog.verify_model("groq", "groq/llama3", "user-key") is True
+
+    kwargs, env_during_call = calls[0]
+    assert kwargs["api_key"] == "user-key"
+    assert env_during_call == "configured-key"
+    assert os.environ["GROQ_API_KEY"] == "configured-key"
+
+
+def test_verify_model_sends_ollama_url_as_api_base(monkeypatch):
+    calls = _stub_litellm(monkeypatch)
+
+    model_catalog.verify_model("ollama", "ollama/llama3", "http://localhost:11434")
+
+    assert calls[0][0]["api_base"] == "http://localhost:11434"
+    assert "api_key" not in calls[0][0]
+
+
+def test_verify_model_rejects_only_unknown_models(monkeypatch):
+    _stub_litellm(monkeypatch, error=RuntimeError("404 model not_found"))
+    assert model_catalog.verify_model("groq", "groq/missing", "k") is False
+
+    _stub_litellm(monkeypatch, error=TimeoutError("timed out"))
+    assert model_catalog.verify_model("groq", "groq/slow", "k") is True
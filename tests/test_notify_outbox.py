@@ -0,0 +1,83 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import time
+import types
+
+import pytest
+
+from tools import notify_outbox
+from tools.notify_outbox import DEAD, PENDING, SENDING, DeliveryFailed, NotificationOutbox
+
+
+@pytest.fixture
+def outbox(tmp_path, monkeypatch):
+    monkeypatch.setattr(NotificationOutbox, "start", lambda self: None)
+    monkeypatch.setenv("CREWLYZE_NOTIFY_RETRY_BASE_S", "10")
+    monkeypatch.setenv("CREWLYZE_NOTIFY_MAX_ATTEMPTS", "3")
+    return NotificationOutbox(tmp_path / "outbox.sqlite3")
+
+
+def _enqueue(outbox):
+    return outbox.enqueue("s1", {"channel": "slack", "url": "https://hooks.example.com/x", "json": {"text": "hi"}})
+
+
+def _state(outbox, delivery_id):
+    return outbox._conn.execute(
+        "SELECT status, attempts, next_attempt_at FROM deliveries WHERE id = ?", (delivery_id,)
+    ).fetchone()
+
+
+def test_retryable_failure_backs_off_then_dead_letters(outbox):
+    delivery_id = _enqueue(outbox)
+
+    row = outbox._claim_due(10)[0]
+    assert _state(outbox, delivery_id)[0] == SENDING
+    outbox._mark_failed(row, DeliveryFailed("HTTP 503", retry_after=120))
+    status, attempts, next_at = _state(outbox, delivery_id)
+    assert (status, attempts) == (PENDING, 1)
+    assert next_at - time.time() > 100
+    assert outbox._claim_due(10) == []
+
+    for attempts in (1, 2):
+        outbox._mark_failed(dict(row, attempts=attempts), DeliveryFailed("timeout"))
+    assert _state(outbox, delivery_id)[:2] == (DEAD, 3)
+    assert outbox.dead_letters()[0]["host"] == "hooks.example.com"
+
+
+def test_client_errors_dead_letter_at_once_and_can_be_retried(outbox):
+    delivery_id = _enqueue(outbox)
+    row = outbox._claim_due(10)[0]
+
+    outbox._mark_failed(row, DeliveryFailed("HTTP 404", retryable=False))
+
+    assert _state(outbox, delivery_id)[:2] == (DEAD, 1)
+    assert outbox.retry(delivery_id) is True
+    assert _state(outbox, delivery_id)[:2] == (PENDING, 0)
+    assert outbox.retry(delivery_id) is False
+    assert outbox.stats()["since_start"]["slack"] == {"sent": 0, "failed_attempts": 1, "dead": 1}
+
+
+def test_in_flight_deliveries_resume_after_restart(outbox, tmp_path):
+    delivery_id = _enqueue(outbox)
+    outbox._claim_due(10)
+
+    reopened = NotificationOutbox(tmp_path / "outbox.sqlite3")
+
+    assert _state(reopened, delivery_id)[0] == PENDING
+
+
+@pytest.mark.parametrize("status, retryable", [(503, True), (429, True), (404, False), (400, False)])
+def test_http_status_classification(outbox, status, retryable):
+    response = types.SimpleNamespace(status_code=status, headers={"Retry-After": "7"})
+    outbox._session = types.SimpleNamespace(post=lambda *args, **kwargs: response)
+    _enqueue(outbox)
+    row = outbox._claim_due(10)[0]
+
+    with pytest.raises(DeliveryFailed) as failure:
+        outbox._post(row)
+
+    assert failure.value.retryable is retryable
+    assert failure.value.retry_after == 7.0
+    assert notify_outbox._host(row["url"]) in str(failure.value)
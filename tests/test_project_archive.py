@@ -0,0 +1,87 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import io
+import json
+import zipfile
+
+import pytest
+
+from tools import project_archive
+
+
+def _export(session_dir, output_dir) -> zipfile.ZipFile:
+    entries = project_archive.project_entries(session_dir, output_dir)
+    data = b"".join(project_archive.stream_zip(entries, chunk_size=64))
+    return zipfile.ZipFile(io.BytesIO(data))
+
+
+def _zip(entries: dict) -> zipfile.ZipFile:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, payload in entries.items():
+            zf.writestr(name, payload)
+    buf.seek(0)
+    return zipfile.ZipFile(buf)
+
+
+def test_export_import_round_trip_keeps_figures_and_chart_names(tmp_path):
+    session, outputs = tmp_path / "src" / "session", tmp_path / "src" / "outputs"
+    (session / "figures").mkdir(parents=True)
+    outputs.mkdir(parents=True)
+    meta = {"id": "abc123", "name": "Sales"}
+    files = {
+        session / "metadata.json": json.dumps(meta),
+        session / "results.json": json.dumps({"charts": [{"figure": "chart_0_0a1b2c3d4e.json"}]}),
+        session / "original.csv": "a,b\n1,2\n",
+        session / "figures" / "chart_0_0a1b2c3d4e.json": '{"data":[]}',
+        outputs / "plotly_Price ($)_vs_Qty.png": "png-bytes",
+        outputs / "report [final].pdf": "pdf-bytes",
+    }
+    for path, text in files.items():
+        path.write_text(text)
+
+    with _export(session, outputs) as zf:
+        plan_meta, members = project_archive.plan_import(zf)
+        dest_session, dest_outputs = tmp_path / "dst" / "session", tmp_path / "dst" / "outputs"
+        project_archive.extract_members(zf, members, dest_session, dest_outputs)
+
+    assert plan_meta == meta
+    for path, text in files.items():
+        if path.name == "metadata.json":
+            continue  # rewritten by the caller
+        root, dest = (session, dest_session) if session in path.parents else (outputs, dest_outputs)
+        assert (dest / path.relative_to(root)).read_text() == text
+    assert not list(dest_session.rglob("*.tmp"))
+
+
+def test_plan_import_skips_unknown_and_deep_subfolders():
+    zf = _zip({
+        "session/metadata.json": "{}",
+        "session/figures/chart_1_x.json": "{}",
+        "session/figures/nested/chart_2_x.json": "{}",
+        "session/cache/blob.bin": "x",
+        "outputs/figures/chart_3_x.json": "{}",
+        "other/file.txt": "x",
+        "session/bad|name.csv": "x",
+    })
+    _, members = project_archive.plan_import(zf)
+    assert [(folder, rel) for _, folder, rel in members] == [("session", "figures/chart_1_x.json")]
+
+
+@pytest.mark.parametrize("name", [
+    "session/../../etc/passwd",
+    "/session/abs.csv",
+    "session\\win.csv",
+    "session/c:evil.csv",
+])
+def test_plan_import_rejects_unsafe_paths(name):
+    zf = _zip({"session/metadata.json": "{}", name: "x"})
+    with pytest.raises(project_archive.ImportRejected):
+        project_archive.plan_import(zf)
+
+
+def test_plan_import_requires_metadata():
+    with pytest.raises(project_archive.ImportRejected, match="metadata.json"):
+        project_archive.plan_import(_zip({"session/original.csv": "a\n1\n"}))
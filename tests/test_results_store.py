@@ -0,0 +1,40 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import json
+
+from tools import results_store
+
+
+def test_projection_etag_tracks_only_requested_fields(tmp_path):
+    results_store.write_results(tmp_path, {"summary": "a", "charts": [1, 2], "insights": ["x"]})
+    payload, summary_etag = results_store.read_versioned(tmp_path, ["summary", "missing"])
+    _, full_etag = results_store.read_versioned(tmp_path)
+
+    assert payload == {"summary": "a"}
+
+    results_store.write_results(tmp_path, {"summary": "a", "charts": [1, 2, 3], "insights": ["x"]})
+
+    assert results_store.read_versioned(tmp_path, ["summary"])[1] == summary_etag
+    assert results_store.read_versioned(tmp_path)[1] != full_etag
+    assert results_store.read_versioned(tmp_path, ["charts"])[1] != summary_etag
+
+
+def test_external_writes_are_picked_up(tmp_path):
+    etag = results_store.write_results(tmp_path, {"summary": "old"})
+    (tmp_path / results_store.RESULTS_FILENAME).write_text(json.dumps({"summary": "newer text"}))
+
+    payload, new_etag = results_store.read_versioned(tmp_path)
+
+    assert payload == {"summary": "newer text"}
+    assert new_etag != etag
+    (tmp_path / results_store.RESULTS_FILENAME).unlink()
+    assert results_store.read_results(tmp_path) is None
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert results_store.etag_matches('W/"r-1", "r-2"', '"r-1"')
+    assert results_store.etag_matches("*", '"r-1"')
+    assert not results_store.etag_matches('"r-2"', '"r-1"')
+    assert not results_store.etag_matches(None, '"r-1"')
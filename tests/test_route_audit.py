@@ -0,0 +1,102 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import textwrap
+
+from tools import route_audit
+
+
+def _audit(source: str) -> list:
+    return [(handler, call) for _, _, handler, call in route_audit.audit_source(textwrap.dedent(source))]
+
+
+def test_main_has_no_blocking_calls_in_async_routes():
+    findings = route_audit.audit_file(route_audit.Path(__file__).resolve().parent.parent / "main.py")
+    assert findings == [], "\n".join(f"{f}:{line}: {handler}() calls {call}" for f, line, handler, call in findings)
+
+
+def test_flags_direct_blocking_calls():
+    assert _audit("""
+        @app.get("/a")
+        async def handler(pid: str):
+            session_dir = get_safe_session_dir(pid)
+            meta = get_project_metadata(pid)
+            project_archive.plan_import(zf)
+            time.sleep(1)
+    """) == [
+        ("handler", "get_safe_session_dir"),
+        ("handler", "get_project_metadata"),
+        ("handler", "project_archive.plan_import"),
+        ("handler", "time.sleep"),
+    ]
+
+
+def test_offloaded_nested_and_suppressed_calls_pass():
+    assert _audit("""
+        @app.get("/a")
+        async def handler(pid: str):
+            def _prepare():
+                return read_results(get_safe_session_dir(pid))
+            data = await asyncio.to_thread(_prepare)
+            meta = await asyncio.to_thread(get_project_metadata, pid)
+
+            async def body():
+                yield open("x").read()
+
+            get_project_metadata(pid)  # route-audit: ok
+            return StreamingResponse(body())
+
+        def sync_handler(pid: str):
+            return read_results(get_safe_session_dir(pid))
+    """) == []
+
+
+def test_nested_function_called_directly_is_checked():
+    assert _audit("""
+        @app.post("/a")
+        async def handler(pid: str):
+            def _save():
+                save_project_metadata(pid, {})
+            _save()
+    """) == [("handler", "save_project_metadata")]
+
+
+def test_arguments_built_for_an_offloader_are_checked():
+    assert _audit("""
+        @app.get("/a")
+        async def handler(pid: str):
+            await asyncio.to_thread(thaw_session, get_safe_session_dir(pid))
+    """) == [("handler", "get_safe_session_dir")]
+
+
+def test_copilot_handlers_keep_the_crew_off_the_loop():
+    tree = route_audit.ast.parse((route_audit.Path(__file__).resolve().parent.parent / "main.py").read_text(encoding="utf-8"))
+    handlers = {n.name: n for n in tree.body if isinstance(n, route_audit.ast.AsyncFunctionDef)}
+    source = "\n".join(
+        route_audit.ast.unparse(handlers[name])
+        for name in ("ask_copilot", "stream_copilot", "export_chat_history_pdf")
+    )
+    assert route_audit.audit_source(source) == []
+    assert "_load_crew()" in source  # the audit above saw the crew calls
+
+
+def test_flags_lazy_crew_calls_and_unreviewed_local_helpers():
+    assert _audit("""
+        def summarise(pid):
+            return pid
+
+        def parse_bool(value):
+            return value == "true"
+
+        @app.post("/a")
+        async def handler(query: str):
+            _load_crew()
+            res = _run_copilot_query(query, "x.csv", "out")
+            flag = parse_bool(query)
+            return summarise(res)
+    """) == [
+        ("handler", "_load_crew"),
+        ("handler", "_run_copilot_query"),
+        ("handler", "summarise"),
+    ]
@@ -0,0 +1,108 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from tools import sql_workbench  # noqa: E402
+
+
+@pytest.fixture
+def session(tmp_path):
+    session_dir = tmp_path / "session"
+    session_dir.mkdir()
+    csv_path = session_dir / "cleaned.csv"
+    csv_path.write_text("id,region,amount\n" + "".join(f"{i},{'north' if i % 2 else 'south'},{i * 1.5}\n" for i in range(250)))
+    yield session_dir, csv_path
+    sql_workbench.close_session(session_dir)
+
+
+def test_select_pages_with_cursor(session):
+    page = sql_workbench.run_query(*session, "SELECT * FROM dataset ORDER BY id", limit=100)
+    assert page["total_count"] == 250 and len(page["results"]) == 100 and not page["cached"]
+    assert page["columns"] == ["id", "region", "amount"]
+
+    nxt = sql_workbench.run_query(*session, "SELECT * FROM dataset ORDER BY id", limit=100, cursor=page["next_cursor"])
+    assert nxt["cached"] and nxt["offset"] == 100 and nxt["results"][0]["id"] == 100
+
+
+@pytest.mark.parametrize("sql", [
+    "PRAGMA table_info('dataset')",
+    "DESCRIBE dataset",
+    "SHOW TABLES",
+    "EXPLAIN SELECT * FROM dataset",
+    "-- leading comment\nSELECT region, COUNT(*) AS n FROM dataset GROUP BY region;",
+])
+def test_non_select_statements_run_unwrapped(session, sql):
+    assert sql_workbench.run_query(*session, sql)["total_count"] > 0
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT 1; SELECT 2",
+    "SELECT * FROM dataset; DROP TABLE dataset",
+    "PRAGMA table_info('dataset'); SELECT 1",
+])
+def test_multiple_statements_are_rejected(session, sql):
+    with pytest.raises(ValueError, match="one SQL statement"):
+        sql_workbench.run_query(*session, sql)
+
+
+@pytest.mark.parametrize("sql", [
+    "DROP TABLE dataset",
+    "CREATE TABLE copy AS SELECT * FROM dataset",
+    "COPY dataset TO 'leak.csv'",
+    "SELECT * FROM read_csv_auto('/etc/passwd')",
+    "ATTACH 'other.duckdb'",
+    "SET enable_external_access = true",
+])
+def test_writes_and_external_access_are_refused(session, sql):
+    with pytest.raises(Exception):
+        sql_workbench.run_query(*session, sql)
+
+
+class _LegacyConnection:
+    """Stands in for duckdb < 0.10, which has no extract_statements()."""
+
+
+@pytest.mark.parametrize("sql,expected", [
+    ("SELECT ';' AS semi FROM dataset", True),
+    ("/* note; here */ WITH t AS (SELECT 1) SELECT * FROM t", True),
+    ('SELECT "a;b" FROM dataset', True),
+    ("PRAGMA table_info('dataset')", False),
+    ("DESCRIBE dataset", False),
+])
+def test_fallback_classification(sql, expected):
+    assert sql_workbench._is_single_select(_LegacyConnection(), sql) is expected
+
+
+def test_fallback_rejects_multiple_statements():
+    with pytest.raises(ValueError):
+        sql_workbench._is_single_select(_LegacyConnection(), "SELECT 1; DELETE FROM dataset")
+
+
+def test_timeout_interrupts_long_queries(session):
+    with pytest.raises(sql_workbench.QueryTimeout):
+        sql_workbench.run_query(*session, "SELECT SUM(a.range * b.range) FROM range(200000) a, range(200000) b", timeout=0.5)
+
+
+def test_evicted_connection_stays_open_for_active_cursor(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(sql_workbench, "MAX_OPEN_SESSIONS", 1)
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    (other_dir / "cleaned.csv").write_text("x\n1\n2\n")
+
+    with sql_workbench.session_cursor(*session) as cur:
+        sql_workbench.run_query(other_dir, other_dir / "cleaned.csv", "SELECT * FROM dataset")  # evicts the first session
+        assert cur.execute("SELECT COUNT(*) FROM dataset").fetchone()[0] == 250
+    assert str(session[0]) not in sql_workbench._connections
+    sql_workbench.close_session(other_dir)
+
+
+def test_rebuild_after_dataset_changes(session):
+    session_dir, csv_path = session
+    assert sql_workbench.run_query(session_dir, csv_path, "SELECT COUNT(*) AS n FROM dataset")["results"][0]["n"] == 250
+    csv_path.write_text("id,region,amount\n1,east,2.0\n")
+    assert sql_workbench.run_query(session_dir, csv_path, "SELECT COUNT(*) AS n FROM dataset")["results"][0]["n"] == 1
+    assert len(list(session_dir.glob("workbench_*.duckdb"))) == 1
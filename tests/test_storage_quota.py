@@ -0,0 +1,68 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+from tools import session_storage, storage_quota
+
+CSV = "id,value\n" + "".join(f"{i},{i * 3}\n" for i in range(2000))
+
+
+def _make_project(data_dir, project_id, extra=b""):
+    session = data_dir / "sessions" / project_id
+    session.mkdir(parents=True)
+    for name in session_storage.DEDUP_FILES:
+        (session / name).write_text(CSV)
+    (session / "results.json").write_bytes(b"{}" + extra)
+    session_storage.dedupe([session / name for name in session_storage.DEDUP_FILES])
+    return session
+
+
+def test_hardlinked_datasets_are_charged_once(data_dir):
+    _make_project(data_dir, "a")
+    _make_project(data_dir, "b")
+    ledger = storage_quota.UsageLedger()
+
+    total = ledger.reconcile()
+
+    # Four CSV paths (two per project) share one blob inode
+    assert total == len(CSV) + 2 * len("{}")
+    assert ledger.stats()["blob_bytes"] == len(CSV)
+    assert ledger.track("a") == len("{}")
+    assert ledger.total() == total
+
+
+def test_enforce_counts_freed_blobs(data_dir, monkeypatch):
+    _make_project(data_dir, "old")
+    ledger = storage_quota.UsageLedger()
+    monkeypatch.setattr(storage_quota, "_ledger", ledger)
+    monkeypatch.setattr(storage_quota, "_running_projects", lambda: set())
+    monkeypatch.setattr(storage_quota, "MAX_QUOTA_BYTES", 100)
+    monkeypatch.setattr(storage_quota, "TARGET_QUOTA_BYTES", 50)
+    ledger.reconcile()
+
+    assert storage_quota.enforce(max_age_hours=1e6) == ["old"]
+    assert ledger.total() == 0
+    assert not list(session_storage.blobs_dir().iterdir())
+
+
+def test_track_rescans_blobs_only_after_the_store_changed(data_dir, monkeypatch):
+    _make_project(data_dir, "a")
+    ledger = storage_quota.UsageLedger()
+    ledger.reconcile()
+    scans = []
+    measure = storage_quota._folder_usage
+    monkeypatch.setattr(storage_quota, "_folder_usage",
+                        lambda path, include_links=False: scans.append(include_links) or measure(path, include_links))
+
+    ledger.track("a")
+    ledger.track("a")
+    assert True not in scans
+
+    session = data_dir / "sessions" / "a"
+    (session / "original.csv").unlink()
+    (session / "original.csv").write_text("id\n1\n")
+    session_storage.dedupe([session / "original.csv"])
+    ledger.track("a")
+
+    assert scans.count(True) == 1
+    assert ledger.stats()["blob_bytes"] == len(CSV) + len("id\n1\n")
@@ -0,0 +1,261 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+CrewAI tools used by the agents at runtime as a fallback and code-generation aid.
+
+These live apart from tools/dataset_tools.py so the web server, and the
+worker processes it spawns, can use the CSV and profiling helpers without
+importing crewai. Only the agent factories import this module.
+"""
+
+import os
+import textwrap
+from typing import Optional
+
+from crewai.tools import tool
+
+from tools.dataset_tools import _df_to_markdown, _run_in_subprocess, _strip_markdown_fences, read_csv_robust
+
+
+class DatasetTools:
+
+    @tool("Read Dataset Head")
+    def read_dataset_head(file_path: Optional[str] = None) -> str:
+        """Reads the first 10 rows of the dataset to understand its structure.
+        Uses nrows=10 so the entire file is never loaded into memory.
+        If file_path is not specified or is invalid, the active session's CSV will be used.
+        """
+        try:
+            from config.context import current_session_csv
+            fp = file_path
+            if not fp or not isinstance(fp, str) or fp.lower() == "none" or "properties" in str(fp):
+                fp = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
+            df = read_csv_robust(fp, nrows=10)
+            return _df_to_markdown(df, index=False)
+        except Exception as e:
+            return f"Error reading file: {e}"
+
+    @tool("Get Dataset Info")
+    def get_dataset_info(file_path: Optional[str] = None) -> str:
+        """Returns basic information about the dataset: shape, columns, data types,
+        and missing-value counts.
+        If file_path is not specified or is invalid, the active session's CSV will be used.
+        """
+        try:
+            from config.context import current_session_csv
+            fp = file_path
+            if not fp or not isinstance(fp, str) or fp.lower() == "none" or "properties" in str(fp):
+                fp = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
+            df = read_csv_robust(fp)
+            lines = [f"Shape: {df.shape}", "\nColumns and Types:"]
+            for col, dtype in df.dtypes.items():
+                missing = df[col].isnull().sum()
+                lines.append(f"  - {col}: {dtype} (Missing: {missing})")
+            return "\n".join(lines)
+        except Exception as e:
+            return f"Error analyzing file: {e}"
+
+    @tool("Get Correlation Matrix")
+    def get_correlation_matrix(file_path: Optional[str] = None) -> str:
+        """Returns the top-20 strongest column-pair correlations (by absolute value).
+        If file_path is not specified or is invalid, the active session's CSV will be used.
+        """
+        try:
+            from config.context import current_session_csv
+            fp = file_path
+            if not fp or not isinstance(fp, str) or fp.lower() == "none" or "properties" in str(fp):
+                fp = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
+            df = read_csv_robust(fp)
+            numeric_df = df.select_dtypes(include=["number"])
+            if numeric_df.empty:
+                return "No numeric columns found."
+
+            corr = numeric_df.corr()
+            unstacked = (
+                corr.unstack()
+                .reset_index()
+                .rename(columns={"level_0": "Col_A", "level_1": "Col_B", 0: "Correlation"})
+            )
+            unstacked = unstacked[unstacked["Col_A"] < unstacked["Col_B"]]
+            unstacked["AbsCorr"] = unstacked["Correlation"].abs()
+            top = (
+                unstacked.sort_values("AbsCorr", ascending=False)
+                .head(20)
+                .drop(columns=["AbsCorr"])
+                .reset_index(drop=True)
+            )
+            return _df_to_markdown(top, index=False)
+        except Exception as e:
+            return f"Error calculating correlation: {e}"
+
+    @tool("Clean Dataset with Python Code")
+    def clean_dataset_with_python(file_path: Optional[str] = None, python_code: Optional[str] = None) -> str:
+        """Cleans the dataset by executing *python_code* in an isolated subprocess.
+        The file_path parameter is optional and defaults to the active session's dataset CSV.
+
+        Your code must:
+          1. Read the CSV:  df = pd.read_csv(FILE_PATH)   # FILE_PATH is pre-set
+          2. Perform cleaning on df
+          3. Save:          df.to_csv(FILE_PATH, index=False)
+
+        Do NOT include markdown code fences. Do NOT use any other file paths.
+        """
+        # Swap if python_code is not specified but file_path contains code
+        if not python_code:
+            if file_path and ("import " in file_path or "df[" in file_path or "\n" in file_path):
+                python_code = file_path
+                file_path = None
+            else:
+                return "Error: python_code is required."
+
+        from config.context import current_session_csv
+        fp = file_path
+        if not fp or not isinstance(fp, str) or fp.lower() == "none" or "properties" in str(fp):
+            fp = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
+
+        clean_code = _strip_markdown_fences(python_code)
+
+        script = textwrap.dedent(f"""\
+            import os
+            import pandas as pd
+
+            FILE_PATH = {repr(str(fp))}
+            df = pd.read_csv(FILE_PATH)
+
+            # Safeguard: redirect all read_csv calls to FILE_PATH
+            _orig_read_csv = pd.read_csv
+            def custom_read_csv(*args, **kwargs):
+                return _orig_read_csv(FILE_PATH)
+            pd.read_csv = custom_read_csv
+        """) + "\n" + clean_code + "\n" + textwrap.dedent(f"""\
+            df.to_csv(FILE_PATH, index=False)
+            print("Dataset cleaned and saved successfully.")
+        """)
+
+        success, output = _run_in_subprocess(script)
+        if success:
+            return f"Dataset cleaned successfully.\n{output}"
+        return f"Error executing cleaning code:\n{output}"
+
+    @tool("Execute Visualization Code")
+    def execute_visualization_code(python_code: Optional[str] = None, **kwargs) -> str:
+        """Executes Python plotting code to generate and save PNG visual charts.
+
+        The code runs in a pre-configured Python environment where:
+          - 'df' is a pre-loaded pandas DataFrame containing the cleaned dataset.
+          - 'OUTPUT_DIR' is a pre-defined string representing the output folder path.
+          - 'save_chart(filename)' is a helper function to save the current plot into OUTPUT_DIR.
+          - Libraries 'pandas', 'matplotlib.pyplot as plt', and 'seaborn as sns' are already imported.
+
+        Example usage:
+          plt.figure(figsize=(10, 6))
+          sns.scatterplot(data=df, x='column_x', y='column_y')
+          plt.title('Relationship Title')
+          save_chart('chart_name.png')
+          plt.close()
+        """
+        if not python_code:
+            for k, v in kwargs.items():
+                if v and isinstance(v, str) and ("plt." in v or "sns." in v or "import " in v or "\n" in v):
+                    python_code = v
+                    break
+            if not python_code:
+                return "Error: python_code is required."
+
+        clean_code = _strip_markdown_fences(python_code)
+        from config.context import current_session_csv, current_session_output_dir
+        csv_path = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
+        output_dir = current_session_output_dir.get() or os.getenv("CURRENT_SESSION_OUTPUT_DIR", "")
+
+        # Fallbacks if env vars are missing
+        if not csv_path:
+            csv_path = "data/sessions/default/cleaned.csv"
+        if not output_dir:
+            output_dir = "outputs/default"
+
+        script = textwrap.dedent(f"""\
+            import os
+            import pandas as pd
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            import textwrap
+
+            CSV_PATH = {repr(csv_path)}
+            OUTPUT_DIR = {repr(output_dir)}
+
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
+            df = pd.read_csv(CSV_PATH)
+
+            # Safeguard: redirect all read_csv calls to the cleaned CSV path
+            _orig_read_csv = pd.read_csv
+            def custom_read_csv(*args, **kwargs):
+                return _orig_read_csv(CSV_PATH)
+            pd.read_csv = custom_read_csv
+
+            def save_chart(filename):
+                if not filename.endswith('.png'):
+                    filename += '.png'
+                path = os.path.join(OUTPUT_DIR, filename)
+                plt.savefig(path, bbox_inches='tight', dpi=180)
+                print(f"Saved chart: {{filename}}")
+        """) + "\n" + clean_code
+
+        success, output = _run_in_subprocess(script)
+        if success:
+            return f"Visualization executed successfully. Output:\n{output}"
+        return f"Error executing visualization code:\n{output}"
+
+    @tool("Run Python Script")
+    def run_python_script(python_code: Optional[str] = None, **kwargs) -> str:
+        """Executes arbitrary Python code in a sandboxed subprocess for data analysis tasks.
+
+        The code runs in a pre-configured environment where:
+          - 'df' is a pre-loaded pandas DataFrame containing the cleaned dataset.
+          - 'FILE_PATH' is the path to the active session's CSV file.
+          - Libraries 'pandas', 'numpy', and 'sklearn' are available.
+
+        Use this tool to:
+          - Train machine-learning models (e.g. RandomForest) for feature importance.
+          - Compute advanced statistics or aggregations.
+          - Any general-purpose Python data analysis that isn't visualization.
+
+        Return your results via print() statements.
+        """
+        if not python_code:
+            for k, v in kwargs.items():
+                if v and isinstance(v, str) and ("import " in v or "df[" in v or "\n" in v):
+                    python_code = v
+                    break
+            if not python_code:
+                return "Error: python_code is required."
+
+        clean_code = _strip_markdown_fences(python_code)
+        from config.context import current_session_csv
+        csv_path = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
+
+        if not csv_path:
+            csv_path = "data/sessions/default/cleaned.csv"
+
+        script = textwrap.dedent(f"""\
+            import os
+            import pandas as pd
+            import numpy as np
+
+            FILE_PATH = {repr(csv_path)}
+            df = pd.read_csv(FILE_PATH)
+
+            # Safeguard: redirect all read_csv calls to the session CSV
+            _orig_read_csv = pd.read_csv
+            def custom_read_csv(*args, **kwargs):
+                return _orig_read_csv(FILE_PATH)
+            pd.read_csv = custom_read_csv
+        """) + "\n" + clean_code
+
+        success, output = _run_in_subprocess(script, timeout=180)
+        if success:
+            return f"Script executed successfully. Output:\n{output}"
+        return f"Error executing script:\n{output}"
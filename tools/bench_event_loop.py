@@ -0,0 +1,177 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Event-loop latency benchmark: SSE tick jitter under concurrent exports.
+
+SSE streams are written by the event loop, so any handler that blocks the
+loop delays every open stream by the same amount. The benchmark runs the
+FastAPI app in-process (httpx ASGI transport, one event loop, like uvicorn)
+on a synthetic project in a temporary data directory. Three phases:
+
+- idle: only a probe coroutine that wakes every ``--tick`` ms, like an SSE
+  heartbeat, and records how late each wake-up is.
+- offloaded: the probe while ``--clients`` concurrent clients hit upload,
+  preview, deep diff and ZIP export (the endpoints as they are now).
+- inline: the same probe while the CSV normalization and ZIP build run
+  directly on the loop, which is what the handlers used to do.
+
+Usage:
+    python -m tools.bench_event_loop                      # 200k rows, 4 clients
+    python -m tools.bench_event_loop --rows 500000 --clients 8 --rounds 3
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def _write_dataset(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "id": np.arange(rows),
+        "region": rng.choice(["north", "south", "east", "west"], size=rows),
+        "units": rng.integers(0, 500, size=rows),
+        "price": rng.normal(40, 12, size=rows).round(2),
+        "note": rng.choice(["", "promo", "return", "bulk"], size=rows),
+    }).to_csv(path, index=False)
+
+
+class _Probe:
+    """Coroutine that sleeps *tick* seconds in a loop and records the lateness of each wake-up."""
+
+    def __init__(self, tick: float):
+        self.tick = tick
+        self.lateness = []
+        self._stop = asyncio.Event()
+
+    async def run(self) -> None:
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(self.tick)
+            self.lateness.append((time.perf_counter() - start - self.tick) * 1000)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def summary(self) -> dict:
+        samples = sorted(self.lateness) or [0.0]
+        return {
+            "ticks": len(self.lateness),
+            "p50_ms": round(statistics.median(samples), 2),
+            "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 2),
+            "p99_ms": round(samples[int(0.99 * (len(samples) - 1))], 2),
+            "max_ms": round(samples[-1], 2),
+        }
+
+
+async def _measure(workload, tick: float) -> tuple:
+    probe = _Probe(tick)
+    task = asyncio.create_task(probe.run())
+    await asyncio.sleep(tick * 5)
+    start = time.perf_counter()
+    await workload()
+    elapsed = time.perf_counter() - start
+    probe.stop()
+    await task
+    return probe.summary(), round(elapsed, 2)
+
+
+async def _client_round(client, csv_bytes: bytes, project_id: str) -> None:
+    upload = await client.post("/api/upload", files={"file": ("bench.csv", csv_bytes, "text/csv")})
+    upload.raise_for_status()
+    for path in (
+        f"/api/projects/{project_id}/preview?offset=100&sort=price&order=desc",
+        f"/api/dataset-diff?session_id={project_id}&deep=true&key=id",
+        f"/api/projects/{project_id}/export-zip",
+    ):
+        (await client.get(path)).raise_for_status()
+
+
+async def run(rows: int = 200_000, clients: int = 4, rounds: int = 2, tick_ms: float = 10.0) -> dict:
+    import httpx
+    import main
+    from tools import project_archive
+    from tools.dataset_tools import normalize_csv_upload
+    from tools.executors import install
+
+    install()
+    tick = tick_ms / 1000
+
+    # Synthetic finished project: upload, cleaned copy, metadata
+    project_id = "benchloop0001"
+    session_dir = main.get_safe_session_dir(project_id)
+    session_dir.mkdir(parents=True, exist_ok=True)
+    _write_dataset(session_dir / "original_upload.csv", rows)
+    normalize_csv_upload(str(session_dir / "original_upload.csv"))
+    cleaned = pd.read_csv(session_dir / "original_upload.csv")
+    cleaned.loc[cleaned["note"].isna(), "note"] = "none"
+    cleaned.to_csv(session_dir / "cleaned.csv", index=False)
+    main.save_project_metadata(project_id, {"id": project_id, "name": "Bench", "status": "completed"})
+    csv_bytes = (session_dir / "original_upload.csv").read_bytes()
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def offloaded():
+            for _ in range(rounds):
+                await asyncio.gather(*(_client_round(client, csv_bytes, project_id) for _ in range(clients)))
+
+        async def inline():
+            # What the handlers used to do: parse and zip on the event loop
+            output_dir = main.get_safe_output_dir(project_id)
+            for _ in range(rounds):
+                for i in range(clients):
+                    scratch = Path(tempfile.mkdtemp()) / "upload.csv"
+                    scratch.write_bytes(csv_bytes)
+                    normalize_csv_upload(str(scratch))
+                    entries = project_archive.project_entries(session_dir, output_dir)
+                    for _ in project_archive.stream_zip(entries):
+                        pass
+                    await asyncio.sleep(0)
+
+        async def idle():
+            await asyncio.sleep(tick * 200)
+
+        report = {}
+        for name, workload in (("idle", idle), ("offloaded", offloaded), ("inline", inline)):
+            summary, elapsed = await _measure(workload, tick)
+            summary["wall_s"] = elapsed
+            report[name] = summary
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure event-loop (SSE) jitter under concurrent exports.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--tick", type=float, default=10.0, help="Probe interval in ms")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CREWLYZE_DATA_DIR"] = str(Path(tmp) / "data")
+        os.environ["CREWLYZE_OUTPUTS_DIR"] = str(Path(tmp) / "outputs")
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        report = asyncio.run(run(args.rows, args.clients, args.rounds, args.tick))
+
+        from tools.executors import shutdown
+        shutdown()
+
+    print(f"Probe tick: {args.tick} ms, {args.clients} clients x {args.rounds} rounds, {args.rows:,} rows\n")
+    print(f"{'phase':<12}{'ticks':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'wall s':>10}")
+    for name, row in report.items():
+        print(f"{name:<12}{row['ticks']:>8}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+              f"{row['max_ms']:>10}{row['wall_s']:>10}")
+
+
+if __name__ == "__main__":
+    main()
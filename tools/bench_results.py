@@ -0,0 +1,150 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Size/latency benchmark for the /api/results payload.
+
+Compares the legacy layout (every figure inlined in a pretty-printed
+results.json) with the current one (compact results.json that references
+typed-array encoded figure files), on synthetic charts or on a real session.
+
+Usage:
+    python -m tools.bench_results                      # 8 charts x 5000 points
+    python -m tools.bench_results --charts 10 --points 20000
+    python -m tools.bench_results --session <session_id>
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from tools.figure_codec import encode_figure
+
+
+def _synthetic_results(n_charts: int, n_points: int) -> dict:
+    rng = np.random.default_rng(0)
+    charts = []
+    for i in range(n_charts):
+        x = rng.normal(size=n_points).tolist()
+        y = (rng.normal(size=n_points) * 3 + i).tolist()
+        charts.append({
+            "title": f"Chart {i}",
+            "fig_json": {
+                "data": [{"type": "scatter", "mode": "markers", "x": x, "y": y}],
+                "layout": {"title": {"text": f"Chart {i}"}, "template": {"layout": {}}},
+            },
+        })
+    preview = [{f"col_{c}": float(rng.normal()) for c in range(12)} for _ in range(100)]
+    return {
+        "cleaning_steps": "- step\n" * 20,
+        "relations": "X: a | Y: b | Type: scatter\n" * 5,
+        "insights": "Insight text. " * 400,
+        "plotly_charts": charts,
+        "png_charts": [f"plotly_{i}.png" for i in range(n_charts)],
+        "preview": preview,
+    }
+
+
+def _load_session(session_id: str) -> dict:
+    user_home = Path.home() / ".crewlyze"
+    session_dir = Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data"))) / "sessions" / session_id
+    with open(session_dir / "results.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for chart in data.get("plotly_charts", []):
+        if "figure" in chart and "fig_json" not in chart:
+            with open(session_dir / "figures" / chart["figure"], "r", encoding="utf-8") as f:
+                chart["fig_json"] = json.load(f)
+    return data
+
+
+def _write_layouts(data: dict, workdir: Path) -> tuple:
+    """Write both layouts; returns (legacy_path, compact_path, figure_paths)."""
+    legacy_path = workdir / "legacy_results.json"
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+    figures_dir = workdir / "figures"
+    figures_dir.mkdir(exist_ok=True)
+    compact = dict(data)
+    refs, figure_paths = [], []
+    for i, chart in enumerate(data.get("plotly_charts", [])):
+        path = figures_dir / f"chart_{i}.json"
+        path.write_text(json.dumps(encode_figure(chart["fig_json"]), separators=(",", ":")), encoding="utf-8")
+        refs.append({"title": chart["title"], "figure": path.name})
+        figure_paths.append(path)
+    compact["plotly_charts"] = refs
+    compact_path = workdir / "results.json"
+    with open(compact_path, "w", encoding="utf-8") as f:
+        json.dump(compact, f, separators=(",", ":"))
+    return legacy_path, compact_path, figure_paths
+
+
+def _serve_json(path: Path) -> bytes:
+    """What the results endpoint does: parse the file and re-serialize it."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _time(fn, reps: int) -> float:
+    samples = []
+    for _ in range(reps):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(data: dict, reps: int = 20) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path, compact_path, figure_paths = _write_layouts(data, Path(tmp))
+
+        legacy_body = _serve_json(legacy_path)
+        compact_body = _serve_json(compact_path)
+        figure_bodies = [p.read_bytes() for p in figure_paths]
+
+        return {
+            "legacy": {
+                "file_bytes": legacy_path.stat().st_size,
+                "response_bytes": len(legacy_body),
+                "gzip_bytes": len(gzip.compress(legacy_body, 6)),
+                "ms_per_request": round(_time(lambda: _serve_json(legacy_path), reps), 2),
+            },
+            "current": {
+                "file_bytes": compact_path.stat().st_size + sum(p.stat().st_size for p in figure_paths),
+                "response_bytes": len(compact_body) + sum(len(b) for b in figure_bodies),
+                "gzip_bytes": len(gzip.compress(compact_body, 6)) + sum(len(gzip.compress(b, 6)) for b in figure_bodies),
+                # results.json is parsed per poll; figure files are served as-is and cached by the browser
+                "ms_per_request": round(_time(lambda: (_serve_json(compact_path), [p.read_bytes() for p in figure_paths]), reps), 2),
+                "ms_per_poll": round(_time(lambda: _serve_json(compact_path), reps), 2),
+            },
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the /api/results payload layouts.")
+    parser.add_argument("--charts", type=int, default=8)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--session", help="Benchmark an existing session's results instead of synthetic data")
+    parser.add_argument("--reps", type=int, default=20)
+    args = parser.parse_args()
+
+    data = _load_session(args.session) if args.session else _synthetic_results(args.charts, args.points)
+    report = run(data, reps=args.reps)
+
+    print(f"{'':<10}{'file':>12}{'response':>12}{'gzip':>12}{'ms/request':>12}")
+    for name, row in report.items():
+        print(f"{name:<10}{row['file_bytes']:>12,}{row['response_bytes']:>12,}{row['gzip_bytes']:>12,}{row['ms_per_request']:>12}")
+    print(f"\nSteady-state poll (figures cached by the browser): {report['current']['ms_per_poll']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Cold-start benchmark: import cost of main.py and time to first request.
+
+Two measurements, each in fresh interpreters pointed at a temporary data
+directory:
+
+- import: ``python -X importtime -c "import main"``. Reports the total,
+  the slowest top-level imports, and any heavy engine (crewai, litellm,
+  reportlab, pptx, plotly, matplotlib, scikit-learn, PIL) that was pulled in
+  at import time. Those should load on first use only.
+- first request: starts ``uvicorn main:app`` on a free port and polls
+  ``--path`` until it answers 200. Reports the time from spawn to that first
+  response.
+
+Each figure is the median of ``--runs`` runs. ``--budget-ms`` makes the
+script exit 1 when time-to-first-request goes over budget, so CI can track
+regressions.
+
+Usage:
+    python -m tools.bench_startup
+    python -m tools.bench_startup --runs 5 --top 15 --budget-ms 4000
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("crewai", "litellm", "reportlab", "pptx", "plotly", "matplotlib", "sklearn", "PIL", "kaleido")
+
+
+def _env(tmp: str) -> dict:
+    env = dict(os.environ)
+    env["CREWLYZE_DATA_DIR"] = str(Path(tmp) / "data")
+    env["CREWLYZE_OUTPUTS_DIR"] = str(Path(tmp) / "outputs")
+    return env
+
+
+def _parse_importtime(stderr: str) -> list:
+    """``[(module, self_us, cumulative_us, depth), ...]`` from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            parts = line[len("import time:"):].split("|")
+            self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        except (ValueError, IndexError):
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+def measure_import(env: dict) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{proc.stderr[-2000:]}")
+    rows = _parse_importtime(proc.stderr)
+    top_level = [r for r in rows if r[3] <= 1]
+    return {
+        "wall_ms": wall_ms,
+        "import_main_ms": next((r[2] / 1000 for r in rows if r[0] == "main"), None),
+        "top": sorted(top_level, key=lambda r: r[2], reverse=True),
+        "heavy": sorted({r[0].split(".")[0] for r in rows if r[0].split(".")[0] in HEAVY_MODULES}),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_first_request(env: dict, path: str, timeout: float = 60.0) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError("uvicorn exited before serving a request")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=2) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.02)
+        raise RuntimeError(f"no 200 from {path} within {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def run(runs: int = 3, path: str = "/") -> dict:
+    imports, firsts = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _env(tmp)
+        for _ in range(runs):
+            imports.append(measure_import(env))
+            firsts.append(measure_first_request(env, path))
+    return {
+        "import_main_ms": statistics.median(r["import_main_ms"] or r["wall_ms"] for r in imports),
+        "import_wall_ms": statistics.median(r["wall_ms"] for r in imports),
+        "first_request_ms": statistics.median(firsts),
+        "top": imports[-1]["top"],
+        "heavy": imports[-1]["heavy"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure main.py import time and time to first request.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    parser.add_argument("--path", default="/", help="Path polled for the first 200 response")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Exit 1 if time to first request exceeds this")
+    args = parser.parse_args()
+
+    report = run(max(1, args.runs), args.path)
+    print(f"import main        {report['import_main_ms']:8.0f} ms  (interpreter wall {report['import_wall_ms']:.0f} ms)")
+    print(f"first request      {report['first_request_ms']:8.0f} ms  (GET {args.path}, median of {args.runs})")
+    print(f"heavy at import    {', '.join(report['heavy']) or 'none'}\n")
+    print(f"{'module':<40}{'cumulative ms':>15}{'self ms':>10}")
+    for name, self_us, cumulative_us, _ in report["top"][:args.top]:
+        print(f"{name:<40}{cumulative_us / 1000:>15.1f}{self_us / 1000:>10.1f}")
+
+    if args.budget_ms is not None and report["first_request_ms"] > args.budget_ms:
+        print(f"\nTime to first request {report['first_request_ms']:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Build step for static assets. It used to run on every server start.
+
+main.py used to do two jobs at import time. It rewrote bin/crewlyze.js with
+LF line endings, and it re-thumbnailed and re-encoded five PNGs with LANCZOS
+and ``optimize=True``. Both ran on every start and every reload, and
+re-encoding an already optimized PNG can make it larger. This script does
+the same work once:
+
+- bin/crewlyze.js is normalized to LF. It is only rewritten if it contains
+  CRLF.
+- Each PNG in TARGETS is shrunk to fit its maximum size and re-encoded. The
+  new file is kept only if its dimensions changed or it is smaller.
+- ``assets/.build_manifest.json`` records the SHA-256 of each processed
+  file with its target size. A file whose hash still matches is skipped
+  without being decoded.
+
+Git LFS pointer files (under 1 kB) are left alone.
+
+Usage:
+    python -m tools.build_assets            # process changed assets
+    python -m tools.build_assets --check    # exit 1 if anything needs processing
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = ROOT / "assets"
+MANIFEST = ASSETS_DIR / ".build_manifest.json"
+BIN_JS = ROOT / "bin" / "crewlyze.js"
+
+TARGETS = {
+    "logo.png": (512, 512),
+    "chat_logo.png": (512, 512),
+    "favicon.png": (48, 48),
+    "placeholder_thumbnail.png": (600, 400),
+    "branding_image.png": (800, 500),
+}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _load_manifest() -> dict:
+    try:
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _optimize_png(data: bytes, max_size: tuple) -> bytes:
+    """Thumbnailed, optimized PNG bytes, or *data* itself when that is no improvement."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        original_size = img.size
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, "PNG", optimize=True)
+        resized = img.size != original_size
+    encoded = out.getvalue()
+    return encoded if resized or len(encoded) < len(data) else data
+
+
+def build(check: bool = False) -> list:
+    """Process stale assets. Returns the names that were (or, with *check*, would be) changed."""
+    changed = []
+
+    if BIN_JS.exists():
+        content = BIN_JS.read_bytes()
+        if b"\r\n" in content:
+            changed.append(str(BIN_JS.relative_to(ROOT)))
+            if not check:
+                BIN_JS.write_bytes(content.replace(b"\r\n", b"\n"))
+                print("[Assets] Converted bin/crewlyze.js line endings to LF")
+
+    manifest = _load_manifest()
+    updated = dict(manifest)
+    for filename, max_size in TARGETS.items():
+        path = ASSETS_DIR / filename
+        if not path.exists():
+            continue
+        data = path.read_bytes()
+        if len(data) < 1000:
+            print(f"[Assets] Skipping LFS pointer file: {filename}")
+            continue
+        digest = _sha256(data)
+        entry = {"sha256": digest, "max_size": list(max_size)}
+        if manifest.get(filename) == entry:
+            continue
+
+        optimized = _optimize_png(data, max_size)
+        if optimized is not data:
+            changed.append(f"assets/{filename}")
+            if check:
+                continue
+            path.write_bytes(optimized)
+            print(f"[Assets] Optimized {filename}: {len(data)} -> {len(optimized)} bytes")
+        updated[filename] = {"sha256": _sha256(optimized), "max_size": list(max_size)}
+
+    if updated != manifest:
+        if check:
+            changed.append(str(MANIFEST.relative_to(ROOT)))
+        else:
+            MANIFEST.write_text(json.dumps(updated, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Optimize bundled assets once, with a content-hash manifest.")
+    parser.add_argument("--check", action="store_true", help="Report stale assets without changing them")
+    args = parser.parse_args()
+
+    changed = build(check=args.check)
+    if args.check and changed:
+        print("Assets need a build step: " + ", ".join(changed))
+        sys.exit(1)
+    print(f"[Assets] {len(changed)} file(s) {'would change' if args.check else 'updated'}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Content-addressed cache for chart PNGs and Plotly figure JSON.
+
+Each chart is keyed by a hash of the data it plots (the exact column values it
+uses) plus its normalized spec (x, y, type, theme, size). Re-running an
+analysis whose cleaned data and relation lines are unchanged therefore reuses
+the existing artifacts instead of rebuilding and re-rendering them.
+
+The cache is shared by all sessions and lives in ``DATA_DIR/chart_cache``.
+It is bounded by ``CREWLYZE_CHART_CACHE_MB`` (default 256 MB) and evicts the
+least recently used files first.
+
+Every output directory gets a ``chart_manifest.json`` that maps each PNG
+filename to its cache key. The PDF and PPTX exporters and the Slack/Discord
+notifiers call restore_pngs() before reading charts. Any PNG missing from
+the output directory (for example after a quota cleanup) is then restored
+from the cache rather than re-rendered.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+CACHE_VERSION = 1
+MANIFEST_NAME = "chart_manifest.json"
+
+
+def get_cache_dir() -> Path:
+    user_home = Path.home() / ".crewlyze"
+    return Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data"))) / "chart_cache"
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(os.getenv("CREWLYZE_CHART_CACHE_MB", "256")) * 1024 * 1024)
+    except ValueError:
+        return 256 * 1024 * 1024
+
+
+def chart_key(df: pd.DataFrame, columns: list, spec: dict) -> str:
+    """Hash the values of *columns* in *df* together with the normalized *spec*."""
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION}".encode())
+    digest.update(json.dumps(spec, sort_keys=True, default=str).encode())
+    for col in dict.fromkeys(columns):  # de-duplicate, keep order
+        digest.update(str(col).encode())
+        digest.update(str(df[col].dtype).encode())
+        digest.update(pd.util.hash_pandas_object(df[col], index=False).values.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def derive_key(base_key: str, spec: dict) -> str:
+    """Key for a variant of an already-keyed chart (e.g. its white PNG snapshot)."""
+    payload = base_key + json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+class ChartCache:
+    """Size-bounded LRU file cache. Thread-safe within one process."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else _max_bytes()
+        self._lock = threading.Lock()
+        self._index: Optional[OrderedDict] = None  # filename -> size, oldest first
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+
+    # ── Index ────────────────────────────────────────────────────────────────
+    def _load_index(self) -> None:
+        if self._index is not None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                st = entry.stat()
+                entries.append((st.st_mtime, entry.name, st.st_size))
+        entries.sort()
+        self._index = OrderedDict((name, size) for _, name, size in entries)
+        self._total = sum(self._index.values())
+
+    def _touch(self, name: str) -> None:
+        self._index.move_to_end(name)
+        try:
+            os.utime(self.cache_dir / name)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._total -= size
+            (self.cache_dir / name).unlink(missing_ok=True)
+
+    def _lookup(self, name: str) -> Optional[Path]:
+        with self._lock:
+            self._load_index()
+            path = self.cache_dir / name
+            if name in self._index and path.exists():
+                self._touch(name)
+                self.hits += 1
+                return path
+            if name in self._index:
+                self._total -= self._index.pop(name)
+            self.misses += 1
+            return None
+
+    def _store(self, name: str, write) -> None:
+        with self._lock:
+            self._load_index()
+            tmp = self.cache_dir / f"{name}.{uuid.uuid4().hex[:8]}.tmp"
+            try:
+                write(tmp)
+                os.replace(tmp, self.cache_dir / name)
+            finally:
+                tmp.unlink(missing_ok=True)
+            size = (self.cache_dir / name).stat().st_size
+            self._total += size - self._index.get(name, 0)
+            self._index[name] = size
+            self._index.move_to_end(name)
+            self._evict()
+
+    # ── PNG snapshots ────────────────────────────────────────────────────────
+    def get_png(self, key: str, dest: Path) -> bool:
+        """Copy the cached PNG for *key* to *dest*. Returns False on a miss."""
+        src = self._lookup(f"{key}.png")
+        if src is None:
+            return False
+        try:
+            shutil.copyfile(src, dest)
+            return True
+        except OSError:
+            return False
+
+    def put_png(self, key: str, src: Path) -> None:
+        try:
+            self._store(f"{key}.png", lambda tmp: shutil.copyfile(src, tmp))
+        except OSError as e:
+            print(f"[ChartCache] Could not cache {Path(src).name}: {e}")
+
+    # ── Figure JSON ──────────────────────────────────────────────────────────
+    def get_json(self, key: str) -> Optional[str]:
+        path = self._lookup(f"{key}.json")
+        if path is None:
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put_json(self, key: str, text: str) -> None:
+        try:
+            self._store(f"{key}.json", lambda tmp: Path(tmp).write_text(text, encoding="utf-8"))
+        except OSError as e:
+            print(f"[ChartCache] Could not cache figure {key}: {e}")
+
+    # ── Stats ────────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache: Optional[ChartCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_chart_cache() -> ChartCache:
+    """Process-wide cache instance."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ChartCache()
+        return _cache
+
+
+# ---------------------------------------------------------------------------
+# Output-directory manifests
+# ---------------------------------------------------------------------------
+
+def write_manifest(output_dir, entries: dict) -> None:
+    """Record {png_filename: cache_key} for the charts in *output_dir*."""
+    path = Path(output_dir) / MANIFEST_NAME
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+    except OSError as e:
+        print(f"[ChartCache] Could not write manifest: {e}")
+
+
+def restore_pngs(output_dir) -> int:
+    """Restore PNGs listed in *output_dir*'s manifest that are missing on disk."""
+    output_dir = Path(output_dir)
+    manifest = output_dir / MANIFEST_NAME
+    if not manifest.exists():
+        return 0
+    try:
+        with open(manifest, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return 0
+
+    restored = 0
+    cache = get_chart_cache()
+    for name, key in entries.items():
+        dest = output_dir / name
+        if not dest.exists() and cache.get_png(key, dest):
+            restored += 1
+    return restored
@@ -0,0 +1,220 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Concurrent PNG rendering for Plotly figures.
+
+Kaleido start-up and per-image rendering used to dominate the "plotly" stage
+because generate_plotly_charts() deep-copied every figure and called
+write_image() one chart at a time. Charts are now built first and handed to
+render_pngs() as a batch:
+
+- Kaleido >= 1.0 (plotly.io.write_images available): the whole batch goes to
+  one persistent Chromium session that renders the figures concurrently.
+- Kaleido 0.2.x: a persistent process pool is kept for the lifetime of the
+  server. Each worker warms its own Kaleido subprocess once, and jobs are
+  split into per-worker batches so the IPC cost is paid once per batch.
+
+The white PDF theme is applied by swapping the template and colours on the
+serialized layout instead of deep-copying the Figure object.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# Layout overrides for PNG snapshots embedded in PDF/PPTX (light background)
+WHITE_LAYOUT = {
+    "template": "plotly_white",
+    "paper_bgcolor": "white",
+    "plot_bgcolor": "white",
+}
+
+DEFAULT_WIDTH = 800
+DEFAULT_HEIGHT = 500
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_kaleido_server_started = False
+
+
+def _worker_count() -> int:
+    configured = os.getenv("CREWLYZE_RENDER_WORKERS", "").strip()
+    if configured.isdigit() and int(configured) > 0:
+        return int(configured)
+    return min(4, os.cpu_count() or 1)
+
+
+def to_white_spec(fig) -> dict:
+    """Serialize *fig* and swap its theme for the light PNG export."""
+    spec = json.loads(fig.to_json())
+    layout = spec.setdefault("layout", {})
+    layout.update(WHITE_LAYOUT)
+    font = dict(layout.get("font") or {})
+    font["color"] = "black"
+    layout["font"] = font
+    return spec
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs inside pool processes)
+# ---------------------------------------------------------------------------
+
+def _warm_worker() -> None:
+    """Start this worker's Kaleido subprocess before the first real job."""
+    try:
+        import plotly.io as pio
+        pio.to_image({"data": [], "layout": {}}, format="png", width=10, height=10)
+    except Exception as exc:
+        print(f"[Renderer] Kaleido warm-up failed: {exc}", file=sys.stderr)
+
+
+def _render_batch(jobs: list) -> list:
+    """Render ``(spec, path, width, height)`` jobs; returns ``(path, seconds, error)``."""
+    import plotly.io as pio
+
+    results = []
+    for spec, path, width, height in jobs:
+        start = time.perf_counter()
+        try:
+            pio.write_image(spec, path, format="png", width=width, height=height)
+            results.append((path, time.perf_counter() - start, None))
+        except Exception as exc:
+            results.append((path, time.perf_counter() - start, str(exc)))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+            # spawn: forking a threaded server process is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=_worker_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the renderer pool (called on server shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _has_batch_api() -> bool:
+    try:
+        import plotly.io as pio
+        import kaleido
+    except ImportError:
+        return False
+    return hasattr(pio, "write_images") and hasattr(kaleido, "start_sync_server")
+
+
+def _start_kaleido_server() -> None:
+    global _kaleido_server_started
+    import kaleido
+
+    with _pool_lock:
+        if not _kaleido_server_started:
+            try:
+                kaleido.start_sync_server(silence_warnings=True)
+            except Exception:
+                pass  # already running
+            _kaleido_server_started = True
+
+
+def _render_with_kaleido_v1(jobs: list) -> list:
+    """Render all jobs through one persistent Kaleido v1 browser session."""
+    import plotly.io as pio
+
+    _start_kaleido_server()
+    start = time.perf_counter()
+    try:
+        pio.write_images(
+            [spec for spec, _, _, _ in jobs],
+            [path for _, path, _, _ in jobs],
+            format="png",
+            width=[w for _, _, w, _ in jobs],
+            height=[h for _, _, _, h in jobs],
+        )
+    except Exception:
+        # A single bad figure fails the whole batch; retry one by one
+        return _render_batch(jobs)
+    # Charts render concurrently, so per-chart latency is the batch average
+    per_chart = (time.perf_counter() - start) / max(1, len(jobs))
+    return [(path, per_chart, None) for _, path, _, _ in jobs]
+
+
+def _warm_pool_worker(_: int = 0) -> int:
+    return os.getpid()
+
+
+def warm() -> str:
+    """Start the Kaleido renderer that render_pngs() will use. Returns which one."""
+    if _has_batch_api():
+        _start_kaleido_server()
+        _warm_worker()
+        return "kaleido-v1"
+    if _worker_count() > 1:
+        list(_get_pool().map(_warm_pool_worker, range(_worker_count())))  # initializer warms Kaleido
+        return f"pool x{_worker_count()}"
+    _warm_worker()
+    return "in-process"
+
+
+def render_pngs(
+    jobs: list,
+    width: int = DEFAULT_WIDTH,
+    height: int = DEFAULT_HEIGHT,
+) -> dict:
+    """Render ``(fig, png_path)`` pairs to PNG concurrently with the white theme.
+
+    Returns a dict mapping each PNG filename to its render latency in seconds.
+    Failures are printed and left out of the result.
+    """
+    if not jobs:
+        return {}
+
+    specs = [(to_white_spec(fig), path, width, height) for fig, path in jobs]
+
+    if _has_batch_api():
+        results = _render_with_kaleido_v1(specs)
+    else:
+        workers = min(_worker_count(), len(specs))
+        if workers <= 1:
+            results = _render_batch(specs)
+        else:
+            try:
+                pool = _get_pool()
+                batches = [specs[i::workers] for i in range(workers)]
+                results = []
+                for batch_result in pool.map(_render_batch, batches):
+                    results.extend(batch_result)
+            except Exception as exc:
+                print(f"[Renderer] Process pool unavailable ({exc}); rendering serially.")
+                shutdown_pool()  # a broken pool is recreated on the next call
+                results = _render_batch(specs)
+
+    latencies = {}
+    for path, seconds, error in results:
+        name = os.path.basename(path)
+        if error:
+            print(f"[Plotly] Could not save PNG {name}: {error}")
+        else:
+            latencies[name] = round(seconds, 3)
+    return latencies
@@ -0,0 +1,182 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Vectorized data reduction for charts.
+
+Charts used to be drawn from ``head(2000)`` of each column pair, so they only
+showed the top of the file. Raw points were also shipped to the browser even
+for histograms. The helpers below read the *full* column with NumPy and
+return compact, pre-aggregated arrays:
+
+- histogram()   — bin centres, counts and bin width for a 1-D distribution
+- density_2d()  — binned 2-D counts (heatmap) for dense scatter plots
+- lttb()        — Largest-Triangle-Three-Buckets downsampling for line charts
+- box_stats()   — quartiles, whiskers and mean for pre-computed box plots
+- group_means() — per-category means over every row
+
+Each helper's output size depends only on its bin or point budget, never on
+the row count.
+"""
+
+import warnings
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BINS = 30
+DEFAULT_GRID = (60, 40)
+DEFAULT_POINTS = 2000
+
+
+def finite(values) -> np.ndarray:
+    """Float array of *values* with NaN/inf dropped."""
+    arr = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+    return arr[np.isfinite(arr)]
+
+
+def histogram(values, bins: int = DEFAULT_BINS) -> dict:
+    """Histogram of the full column: {"x": centres, "y": counts, "width": bin width}."""
+    arr = finite(values)
+    if arr.size == 0:
+        return {"x": [], "y": [], "width": 0.0}
+    counts, edges = np.histogram(arr, bins=bins)
+    centres = (edges[:-1] + edges[1:]) / 2
+    return {
+        "x": centres.tolist(),
+        "y": counts.tolist(),
+        "width": float(edges[1] - edges[0]) if len(edges) > 1 else 0.0,
+    }
+
+
+def density_2d(x, y, grid: tuple = DEFAULT_GRID) -> dict:
+    """Binned 2-D point density: {"x": x centres, "y": y centres, "z": counts[y][x]}.
+
+    Empty cells are returned as None so the heatmap leaves them transparent.
+    """
+    xs = pd.to_numeric(pd.Series(x), errors="coerce").to_numpy(dtype=float)
+    ys = pd.to_numeric(pd.Series(y), errors="coerce").to_numpy(dtype=float)
+    mask = np.isfinite(xs) & np.isfinite(ys)
+    xs, ys = xs[mask], ys[mask]
+    if xs.size == 0:
+        return {"x": [], "y": [], "z": []}
+
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=grid)
+    z = counts.T.astype(object)  # rows = y bins, as Plotly heatmaps expect
+    z[z == 0] = None
+    return {
+        "x": ((x_edges[:-1] + x_edges[1:]) / 2).tolist(),
+        "y": ((y_edges[:-1] + y_edges[1:]) / 2).tolist(),
+        "z": z.tolist(),
+    }
+
+
+def lttb(x, y, n_out: int = DEFAULT_POINTS) -> tuple:
+    """Downsample a sorted series to *n_out* points with Largest-Triangle-Three-Buckets.
+
+    Keeps the visual shape (peaks, troughs, trends) of the full line far better
+    than taking every k-th row. *x* must be numeric and sorted ascending.
+    Returns ``(x_indices, x_values, y_values)`` as NumPy arrays.
+    """
+    xs = np.asarray(x, dtype=float)
+    ys = np.asarray(y, dtype=float)
+    n = xs.size
+    if n_out >= n or n_out < 3:
+        idx = np.arange(n)
+        return idx, xs, ys
+
+    # Bucket boundaries for the n_out - 2 interior buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Average point of every bucket, used as the third triangle vertex
+    sums_x = np.add.reduceat(xs[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(ys[1:n - 1], edges[:-1] - 1)
+    lengths = np.diff(edges)
+    avg_x = np.append(sums_x / lengths, xs[-1])
+    avg_y = np.append(sums_y / lengths, ys[-1])
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        bx, by = xs[lo:hi], ys[lo:hi]
+        # Triangle area (×2) between the previous pick, each candidate and the next bucket's mean
+        area = np.abs(
+            (xs[prev] - avg_x[b + 1]) * (by - ys[prev])
+            - (xs[prev] - bx) * (avg_y[b + 1] - ys[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        selected[b + 1] = prev
+    return selected, xs[selected], ys[selected]
+
+
+def line_series(df: pd.DataFrame, x_col: str, y_col: str, n_out: int = DEFAULT_POINTS) -> Optional[pd.DataFrame]:
+    """Sorted, LTTB-reduced ``[x_col, y_col]`` frame for a line chart over all rows.
+
+    Numeric and date-like x columns are downsampled with LTTB. Other x columns
+    fall back to per-category means in first-seen order. Returns None when
+    *y_col* has no numeric values.
+    """
+    pair = df[[x_col, y_col]].dropna()
+    y_num = pd.to_numeric(pair[y_col], errors="coerce")
+    pair = pair.assign(**{y_col: y_num}).dropna()
+    if pair.empty:
+        return None
+
+    x_raw = pair[x_col]
+    if pd.api.types.is_numeric_dtype(x_raw):
+        x_key = x_raw.astype(float)
+    else:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # "could not infer format" noise
+                parsed = pd.to_datetime(x_raw, errors="coerce")
+        except (TypeError, ValueError):
+            parsed = pd.Series(pd.NaT, index=x_raw.index)
+        if parsed.notna().mean() < 0.9:
+            means = pair.groupby(x_col, sort=False)[y_col].mean().reset_index()
+            return means.head(n_out)
+        pair = pair[parsed.notna()]
+        x_raw = parsed[parsed.notna()]
+        x_key = x_raw.astype("int64").astype(float)
+
+    order = np.argsort(x_key.to_numpy(), kind="stable")
+    x_sorted = x_raw.to_numpy()[order]
+    idx, _, y_vals = lttb(x_key.to_numpy()[order], pair[y_col].to_numpy()[order], n_out)
+    return pd.DataFrame({x_col: x_sorted[idx], y_col: y_vals})
+
+
+def box_stats(values) -> Optional[dict]:
+    """Tukey box-plot statistics over every value (whiskers at 1.5 IQR)."""
+    arr = finite(values)
+    if arr.size == 0:
+        return None
+    q1, median, q3 = np.percentile(arr, [25, 50, 75])
+    iqr = q3 - q1
+    inside = arr[(arr >= q1 - 1.5 * iqr) & (arr <= q3 + 1.5 * iqr)]
+    return {
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "lowerfence": float(inside.min()) if inside.size else float(q1),
+        "upperfence": float(inside.max()) if inside.size else float(q3),
+        "mean": float(arr.mean()),
+        "count": int(arr.size),
+    }
+
+
+def group_means(df: pd.DataFrame, x_col: str, y_col: str, top: int = 25, by_count: bool = False) -> pd.DataFrame:
+    """Mean of *y_col* for each *x_col* value over all rows.
+
+    With ``by_count`` the *top* most frequent categories are kept; otherwise the
+    first *top* groups in sorted key order (the historical chart behaviour).
+    """
+    pair = df[[x_col, y_col]].dropna()
+    pair = pair.assign(**{y_col: pd.to_numeric(pair[y_col], errors="coerce")}).dropna()
+    if by_count:
+        keep = pair[x_col].value_counts().head(top).index
+        pair = pair[pair[x_col].isin(keep)]
+    return pair.groupby(x_col)[y_col].mean().reset_index().head(top)
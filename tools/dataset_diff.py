@@ -0,0 +1,391 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Dataset diff engine for /api/dataset-diff.
+
+Summary mode works from metadata alone: row count, columns, dtypes and
+null counts. Each CSV's metadata is stored in a ``<file>.meta.json`` sidecar,
+keyed by the file's size and mtime. The pipeline records that metadata from
+the DataFrames it already holds, and it writes ``dataset_diff.json`` once
+cleaning is done. The endpoint then just reads that file. A CSV without a
+valid sidecar is scanned once, in chunks, and the result is cached.
+
+Deep mode (``deep_diff``) compares cell values. Both files are streamed in
+chunks as strings, and every cell is reduced to a 64-bit hash; numeric text
+is normalized first, so "1" and "1.0" are equal.
+
+- Row-level added/removed counts come from a multiset comparison of
+  whole-row hashes. They do not depend on row order. The hashes are
+  partitioned into on-disk buckets and counted one bucket at a time.
+- Per-column changed-cell counts need rows to be aligned. With ``key``
+  columns, the rows are matched through a hash join on the key hash. The join
+  is partitioned into on-disk buckets, so only one bucket of hashes is held
+  in memory, and files larger than RAM work. If the key is not unique on
+  either side, the join is abandoned and only the row-level counts are
+  returned (alignment ``"rows"``). With no key, rows are aligned by position,
+  but only when the row counts match.
+"""
+
+import json
+import math
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_NAME = "dataset_diff.json"
+META_SUFFIX = ".meta.json"
+CHUNK_ROWS = 200_000
+BUCKET_BYTES = 256 * 1024 * 1024  # target hash data per join partition
+_ROW_MIX = np.uint64(0x100000001B3)
+
+
+# ---------------------------------------------------------------------------
+# Metadata (summary mode)
+# ---------------------------------------------------------------------------
+
+def _signature(path: Path) -> dict:
+    st = Path(path).stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _meta_path(csv_path: Path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + META_SUFFIX)
+
+
+def describe_frame(df: pd.DataFrame) -> dict:
+    """Row count, columns, dtypes and null counts of an in-memory frame."""
+    return {
+        "rows": int(len(df)),
+        "columns": [str(c) for c in df.columns],
+        "dtypes": {str(c): str(t) for c, t in df.dtypes.items()},
+        "nulls": {str(c): int(n) for c, n in df.isna().sum().items()},
+    }
+
+
+def _merge_dtype(a: str, b: str) -> str:
+    if a == b:
+        return a
+    numeric = {"int64", "float64"}
+    if a in numeric and b in numeric:
+        return "float64"
+    return "object"
+
+
+def _merge_meta(acc: Optional[dict], part: dict) -> dict:
+    if acc is None:
+        return part
+    acc["rows"] += part["rows"]
+    for col in acc["columns"]:
+        acc["dtypes"][col] = _merge_dtype(acc["dtypes"][col], part["dtypes"].get(col, "object"))
+        acc["nulls"][col] += part["nulls"].get(col, 0)
+    return acc
+
+
+def _iter_chunks(csv_path: Path, **kwargs):
+    return pd.read_csv(
+        csv_path, chunksize=CHUNK_ROWS, encoding="utf-8",
+        encoding_errors="replace", on_bad_lines="skip", **kwargs,
+    )
+
+
+def record_metadata(csv_path: Path, df: pd.DataFrame) -> dict:
+    """Store *df*'s metadata as the sidecar for *csv_path* (call right after writing it)."""
+    meta = describe_frame(df)
+    meta["source"] = _signature(csv_path)
+    try:
+        with open(_meta_path(csv_path), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError as e:
+        print(f"[Dataset Diff] Could not write metadata for {Path(csv_path).name}: {e}")
+    return meta
+
+
+def load_metadata(csv_path: Path) -> dict:
+    """Cached metadata for *csv_path*; scans the file in chunks if the sidecar is stale."""
+    csv_path = Path(csv_path)
+    sig = _signature(csv_path)
+    try:
+        with open(_meta_path(csv_path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("source") == sig:
+            return meta
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    meta = None
+    for chunk in _iter_chunks(csv_path):
+        meta = _merge_meta(meta, describe_frame(chunk))
+    if meta is None:
+        meta = {"rows": 0, "columns": [], "dtypes": {}, "nulls": {}}
+    meta["source"] = sig
+    try:
+        with open(_meta_path(csv_path), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError:
+        pass
+    return meta
+
+
+def summarize(orig: dict, clean: dict) -> dict:
+    """Schema / row-count diff between two metadata dicts (the /api/dataset-diff shape)."""
+    changes = []
+    for col in orig["columns"]:
+        if col not in clean["columns"]:
+            changes.append({"column": col, "type": "dropped"})
+    for col in clean["columns"]:
+        if col not in orig["columns"]:
+            changes.append({"column": col, "type": "added"})
+        elif orig["dtypes"][col] != clean["dtypes"][col]:
+            changes.append({
+                "column": col,
+                "type": "type_changed",
+                "from": orig["dtypes"][col],
+                "to": clean["dtypes"][col],
+            })
+    null_deltas = {
+        col: clean["nulls"][col] - orig["nulls"][col]
+        for col in clean["columns"]
+        if col in orig["nulls"] and clean["nulls"][col] != orig["nulls"][col]
+    }
+    return {
+        "cleaned": True,
+        "original_rows": orig["rows"],
+        "original_cols": len(orig["columns"]),
+        "cleaned_rows": clean["rows"],
+        "cleaned_cols": len(clean["columns"]),
+        "rows_dropped": orig["rows"] - clean["rows"],
+        "changes": changes,
+        "null_deltas": null_deltas,
+    }
+
+
+def record_diff_summary(session_dir: Path) -> Optional[dict]:
+    """Compute and store the summary diff for a session (called after cleaning)."""
+    session_dir = Path(session_dir)
+    orig_path, clean_path = session_dir / "original_upload.csv", session_dir / "cleaned.csv"
+    if not orig_path.exists() or not clean_path.exists():
+        return None
+    summary = summarize(load_metadata(orig_path), load_metadata(clean_path))
+    stored = dict(summary, sources={"original": _signature(orig_path), "cleaned": _signature(clean_path)})
+    with open(session_dir / SUMMARY_NAME, "w", encoding="utf-8") as f:
+        json.dump(stored, f)
+    return summary
+
+
+def diff_summary(session_dir: Path) -> dict:
+    """Summary diff for a session: the recorded one if still valid, else from metadata."""
+    session_dir = Path(session_dir)
+    orig_path, clean_path = session_dir / "original_upload.csv", session_dir / "cleaned.csv"
+    if not clean_path.exists():
+        meta = load_metadata(orig_path)
+        return {
+            "cleaned": False,
+            "original_rows": meta["rows"],
+            "original_cols": len(meta["columns"]),
+            "original_columns": meta["columns"],
+        }
+
+    try:
+        with open(session_dir / SUMMARY_NAME, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.pop("sources", None) == {"original": _signature(orig_path), "cleaned": _signature(clean_path)}:
+            return stored
+    except (OSError, json.JSONDecodeError):
+        pass
+    return record_diff_summary(session_dir)
+
+
+# ---------------------------------------------------------------------------
+# Deep mode
+# ---------------------------------------------------------------------------
+
+def _cell_hashes(col: pd.Series) -> np.ndarray:
+    """uint64 hash per cell; numeric text is compared by value ("1" == "1.0")."""
+    text = col.str.strip()
+    num = pd.to_numeric(text, errors="coerce").astype("float64")
+    h_num = pd.util.hash_pandas_object(num.fillna(0.0), index=False).to_numpy()
+    h_txt = pd.util.hash_pandas_object(text.fillna("\x00"), index=False).to_numpy()
+    return np.where(num.notna().to_numpy(), h_num, h_txt)
+
+
+def _row_hash(hashes: dict, columns: list, n: int) -> np.ndarray:
+    out = np.zeros(n, dtype=np.uint64)
+    for col in columns:
+        out = out * _ROW_MIX ^ hashes[col]
+    return out
+
+
+def _multiset_delta(orig: np.ndarray, clean: np.ndarray) -> tuple:
+    """(removed, added) between two arrays of row hashes."""
+    diff = pd.Series(orig).value_counts().sub(pd.Series(clean).value_counts(), fill_value=0)
+    return int(diff.clip(lower=0).sum()), int((-diff).clip(lower=0).sum())
+
+
+class _RowHashBuckets:
+    """Whole-row hashes of one file, spread over on-disk buckets by hash value."""
+
+    def __init__(self, workdir: Path, side: str, n_buckets: int):
+        self.workdir, self.side, self.n_buckets = workdir, side, n_buckets
+        self.parts = [[] for _ in range(n_buckets)]
+
+    def add(self, row_hash: np.ndarray) -> None:
+        bucket = (row_hash % np.uint64(self.n_buckets)).astype(np.int64)
+        for b in range(self.n_buckets):
+            values = row_hash[bucket == b]
+            if len(values):
+                path = self.workdir / f"rows_{self.side}_{b}_{len(self.parts[b])}.npy"
+                np.save(path, values)
+                self.parts[b].append(path)
+
+    def load(self, b: int) -> np.ndarray:
+        if not self.parts[b]:
+            return np.empty(0, dtype=np.uint64)
+        return np.concatenate([np.load(p) for p in self.parts[b]])
+
+
+class _Partitions:
+    """On-disk hash partitions of (key hash, row number, column hashes) for one file."""
+
+    def __init__(self, workdir: Path, side: str, n_buckets: int, columns: list):
+        self.workdir, self.side, self.n_buckets, self.columns = workdir, side, n_buckets, columns
+        self.parts = [[] for _ in range(n_buckets)]
+
+    def add(self, key_hash: np.ndarray, row_numbers: np.ndarray, hashes: dict) -> None:
+        bucket = (key_hash % np.uint64(self.n_buckets)).astype(np.int64)
+        matrix = np.column_stack([key_hash, row_numbers.astype(np.uint64)] + [hashes[c] for c in self.columns])
+        for b in range(self.n_buckets):
+            rows = matrix[bucket == b]
+            if len(rows):
+                path = self.workdir / f"{self.side}_{b}_{len(self.parts[b])}.npy"
+                np.save(path, rows)
+                self.parts[b].append(path)
+
+    def load(self, b: int) -> pd.DataFrame:
+        names = ["_key", "_row"] + self.columns
+        if not self.parts[b]:
+            return pd.DataFrame({n: np.empty(0, dtype=np.uint64) for n in names})
+        return pd.DataFrame(np.concatenate([np.load(p) for p in self.parts[b]]), columns=names)
+
+
+def _fetch_rows(csv_path: Path, row_numbers: set, columns: list) -> dict:
+    """{row_number: {col: value}} for a few rows, streaming the file once."""
+    found, offset = {}, 0
+    for chunk in _iter_chunks(csv_path, dtype=str, keep_default_na=False):
+        wanted = [r - offset for r in row_numbers if offset <= r < offset + len(chunk)]
+        for pos in wanted:
+            found[offset + pos] = {c: chunk.iloc[pos][c] for c in columns}
+        offset += len(chunk)
+        if len(found) == len(row_numbers):
+            break
+    return found
+
+
+def deep_diff(orig_path: Path, clean_path: Path, key: Optional[list] = None, samples: int = 5) -> dict:
+    """Cell-level diff between two CSVs, streaming both in chunks.
+
+    Returns row-level ``rows_removed`` / ``rows_added`` / ``rows_unchanged``,
+    and per common column ``null_delta``. When rows can be aligned (see
+    module docstring) it also returns ``changed_cells`` per column and up to
+    *samples* changed rows with their old and new values.
+    """
+    orig_path, clean_path = Path(orig_path), Path(clean_path)
+    orig_meta, clean_meta = load_metadata(orig_path), load_metadata(clean_path)
+    common = sorted(set(orig_meta["columns"]) & set(clean_meta["columns"]))
+    key = [k for k in (key or []) if k in common]
+
+    if key:
+        alignment = "key"
+    elif orig_meta["rows"] == clean_meta["rows"]:
+        alignment = "position"
+    else:
+        alignment = "none"
+    compare = [c for c in common if c not in key]
+
+    max_rows = max(orig_meta["rows"], clean_meta["rows"], 1)
+    n_buckets = max(1, math.ceil(2 * 8 * (len(compare) + 2) * max_rows / BUCKET_BYTES))
+    n_row_buckets = max(1, math.ceil(2 * 8 * max_rows / BUCKET_BYTES))
+
+    with tempfile.TemporaryDirectory(prefix="crewlyze_diff_") as tmp:
+        partitions, row_hashes, row_totals = {}, {}, {}
+        for side, path in (("orig", orig_path), ("clean", clean_path)):
+            parts = _Partitions(Path(tmp), side, n_buckets, compare) if alignment != "none" else None
+            row_hashes[side] = _RowHashBuckets(Path(tmp), side, n_row_buckets)
+            offset = 0
+            for chunk in _iter_chunks(path, dtype=str, usecols=common):
+                hashes = {c: _cell_hashes(chunk[c]) for c in common}
+                row_hashes[side].add(_row_hash(hashes, common, len(chunk)))
+                rows = np.arange(offset, offset + len(chunk))
+                if parts is not None:
+                    key_hash = _row_hash(hashes, key, len(chunk)) if key else rows.astype(np.uint64)
+                    parts.add(key_hash, rows, hashes)
+                offset += len(chunk)
+            partitions[side], row_totals[side] = parts, offset
+
+        removed = added = 0
+        for b in range(n_row_buckets):
+            bucket_removed, bucket_added = _multiset_delta(row_hashes["orig"].load(b), row_hashes["clean"].load(b))
+            removed, added = removed + bucket_removed, added + bucket_added
+        result = {
+            "alignment": alignment,
+            "key": key,
+            "rows_removed": removed,
+            "rows_added": added,
+            "rows_unchanged": row_totals["orig"] - removed,
+            "columns": {
+                c: {"null_delta": clean_meta["nulls"].get(c, 0) - orig_meta["nulls"].get(c, 0)}
+                for c in common
+            },
+        }
+        if alignment == "none":
+            result["note"] = "Row counts differ; pass key columns to compare cell values."
+            return result
+
+        changed = dict.fromkeys(compare, 0)
+        sample_pairs = []  # (orig row, clean row, changed columns)
+        for b in range(n_buckets):
+            orig_part, clean_part = partitions["orig"].load(b), partitions["clean"].load(b)
+            # Equal keys share a bucket, so per-bucket uniqueness is global uniqueness
+            if key and (orig_part["_key"].duplicated().any() or clean_part["_key"].duplicated().any()):
+                result["alignment"] = "rows"
+                result["note"] = (f"Key {', '.join(key)} is not unique; compared whole rows only. "
+                                  "Pass unique key columns to compare cell values.")
+                return result
+            joined = orig_part.merge(clean_part, on="_key", suffixes=("_o", "_c"))
+            if joined.empty:
+                continue
+            diff_mask = np.column_stack(
+                [joined[f"{c}_o"].to_numpy() != joined[f"{c}_c"].to_numpy() for c in compare]
+            ) if compare else np.zeros((len(joined), 0), dtype=bool)
+            for i, c in enumerate(compare):
+                changed[c] += int(diff_mask[:, i].sum())
+            if len(sample_pairs) < samples:
+                for idx in np.flatnonzero(diff_mask.any(axis=1))[: samples - len(sample_pairs)]:
+                    cols = [compare[i] for i in np.flatnonzero(diff_mask[idx])]
+                    sample_pairs.append((int(joined["_row_o"].iat[idx]), int(joined["_row_c"].iat[idx]), cols))
+
+    for c in compare:
+        result["columns"][c]["changed_cells"] = changed[c]
+
+    if sample_pairs:
+        shown = key + sorted({c for _, _, cols in sample_pairs for c in cols})
+        orig_rows = _fetch_rows(orig_path, {o for o, _, _ in sample_pairs}, shown)
+        clean_rows = _fetch_rows(clean_path, {c for _, c, _ in sample_pairs}, shown)
+        result["samples"] = [
+            {
+                "original_row": o,
+                "cleaned_row": c,
+                "key": {k: orig_rows.get(o, {}).get(k) for k in key},
+                "changes": {
+                    col: {"from": orig_rows.get(o, {}).get(col), "to": clean_rows.get(c, {}).get(col)}
+                    for col in cols
+                },
+            }
+            for o, c, cols in sample_pairs
+        ]
+    return result
@@ -22,18 +22,26 @@ get_correlation_matrix before they can act.
 generate_plotly_charts() parses the relation-agent output and produces
 interactive Plotly figures directly in Python — no LLM, no subprocess, no PNG
 file I/O. This replaces static matplotlib PNGs with zoomable, hoverable charts.
+
+Import note
+-----------
+This module does not import crewai. The server and its worker processes
+import it for the CSV helpers. The @tool-decorated DatasetTools class is in
+tools/agent_tools.py. It is still importable from here, but only loads when
+accessed.
 """
 
 import os
 import re
 import sys
-import textwrap
 import tempfile
 import subprocess
+from pathlib import Path
 
 import pandas as pd
 from typing import Optional
-from crewai.tools import tool
+
+from config.events import HEAL_ATTEMPT, emit as emit_event
 
 
 
@@ -71,6 +79,20 @@ def read_csv_robust(file_path: str, **kwargs) -> pd.DataFrame:
     return pd.read_csv(file_path, **kwargs)
 
 
+def normalize_csv_upload(file_path: str) -> dict:
+    """Rewrite an uploaded CSV as UTF-8 comma-separated and record its metadata.
+
+    Runs in the server's CPU pool (tools/executors.py), so it takes and
+    returns only plain values. Returns ``{"rows": ..., "columns": ...}``.
+    """
+    from tools.dataset_diff import record_metadata
+
+    df = read_csv_robust(file_path)
+    df.to_csv(file_path, index=False)
+    record_metadata(Path(file_path), df)
+    return {"rows": int(df.shape[0]), "columns": int(df.shape[1])}
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
@@ -221,6 +243,7 @@ def _run_in_subprocess(script: str, timeout: int = 120, is_healed_attempt: bool
                     subprocess.run([sys.executable, "-m", "pip", "install", module_name], capture_output=True)
                     # Retry execution after package install
                     success_pkg, output_pkg = _run_in_subprocess(script, timeout=timeout, is_healed_attempt=True)
+                    emit_event(HEAL_ATTEMPT, kind="dependency", module=module_name, success=success_pkg)
                     if success_pkg:
                         print(f"[Auto-Healing System] Installed '{module_name}' and executed successfully!")
                         sys.stdout.flush()
@@ -235,6 +258,7 @@ def _run_in_subprocess(script: str, timeout: int = 120, is_healed_attempt: bool
             healed_script = _heal_script_code(script, output)
             if healed_script and healed_script != script:
                 success_h, output_h = _run_in_subprocess(healed_script, timeout=timeout, is_healed_attempt=True)
+                emit_event(HEAL_ATTEMPT, kind="code", success=success_h)
                 if success_h:
                     print("[Auto-Healing System] Code repaired and executed successfully!")
                     sys.stdout.flush()
@@ -349,32 +373,123 @@ def build_dataset_profile(csv_path: str, max_rows: int = 5000) -> str:
     return "\n".join(lines)
 
 
-def generate_plotly_charts(csv_path: str, relations_text: str, max_rows: int = 5000, output_dir: str = "") -> list:
+def _scatter_figure(pair: pd.DataFrame, x_col: str, y_col: str, title: str, color: str, lbls: dict, max_points: int):
+    """Scatter of every row when small; a binned density heatmap (numeric pairs) or a
+    uniform random sample (mixed types) when there are more than *max_points* rows."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from tools.data_reduction import density_2d
+
+    numeric_pair = pd.api.types.is_numeric_dtype(pair[x_col]) and pd.api.types.is_numeric_dtype(pair[y_col])
+    if len(pair) > max_points and numeric_pair:
+        dens = density_2d(pair[x_col], pair[y_col])
+        fig = go.Figure(go.Heatmap(
+            x=dens["x"], y=dens["y"], z=dens["z"],
+            colorscale=[[0, "rgba(15,23,42,0.2)"], [1, color]],
+            colorbar=dict(title="Rows"),
+            hovertemplate=f"{lbls[x_col]}: %{{x}}<br>{lbls[y_col]}: %{{y}}<br>Rows: %{{z}}<extra></extra>",
+        ))
+        fig.update_layout(title=f"{title} ({len(pair):,} rows, density)",
+                          xaxis_title=lbls[x_col], yaxis_title=lbls[y_col])
+        return fig
+
+    if len(pair) > max_points:
+        pair = pair.sample(max_points, random_state=0)
+    fig = px.scatter(
+        pair, x=x_col, y=y_col, title=title,
+        color_discrete_sequence=[color], opacity=0.75,
+        labels=lbls
+    )
+    return fig
+
+
+def _histogram_figure(values: pd.Series, title: str, color: str, x_label: str):
+    """Histogram binned over the full column; ships bin counts, not raw points."""
+    import plotly.graph_objects as go
+    from tools.data_reduction import histogram
+
+    if pd.api.types.is_numeric_dtype(values):
+        hist = histogram(values)
+        fig = go.Figure(go.Bar(x=hist["x"], y=hist["y"], width=hist["width"] or None, marker_color=color))
+    else:
+        counts = values.value_counts().head(30)
+        fig = go.Figure(go.Bar(x=counts.index.astype(str).tolist(), y=counts.tolist(), marker_color=color))
+    fig.update_layout(title=title, xaxis_title=x_label, yaxis_title="Count", bargap=0.05)
+    return fig
+
+
+def _box_figure(pair: pd.DataFrame, x_col: str, y_col: str, title: str, color: str, lbls: dict):
+    """Box plots from quartiles computed over every row (top 20 categories)."""
+    import plotly.graph_objects as go
+    from tools.data_reduction import box_stats
+
+    if pd.api.types.is_numeric_dtype(pair[x_col]):
+        groups = [(lbls[y_col], pair[y_col])]
+    else:
+        top = pair[x_col].value_counts().head(20).index
+        groups = [(str(cat), pair.loc[pair[x_col] == cat, y_col]) for cat in top]
+
+    fig = go.Figure()
+    for name, values in groups:
+        stats = box_stats(values)
+        if stats is None:
+            continue
+        fig.add_trace(go.Box(
+            name=name, x=[name],
+            q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]],
+            lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+            mean=[stats["mean"]], marker_color=color, showlegend=False,
+        ))
+    fig.update_layout(title=title, xaxis_title=lbls[x_col], yaxis_title=lbls[y_col])
+    return fig
+
+
+def generate_plotly_charts(
+    csv_path: str,
+    relations_text: str,
+    max_rows: int = 5000,
+    output_dir: str = "",
+    render_stats: Optional[dict] = None,
+) -> list:
     """Parse agent relation output and generate interactive Plotly figures.
 
     Replaces static matplotlib PNGs with zoomable, hoverable charts rendered
     natively by st.plotly_chart(). No LLM calls, no subprocess, no file I/O.
 
+    Charts are computed over every row: histograms and box plots ship binned
+    statistics, line charts are LTTB-downsampled and dense scatter plots become
+    density heatmaps (see tools/data_reduction.py).
+
     Args:
         csv_path       : Path to the cleaned CSV file.
         relations_text : Raw text output from the relation agent.
-        max_rows       : Row cap for chart data (default 5000 for rendering speed).
+        max_rows       : Point budget per chart; larger scatter plots are binned
+                         and line charts downsampled to stay under it.
         output_dir     : Directory where PNG snapshots are saved for PDF embedding.
+                         Snapshots are rendered concurrently after all figures
+                         are built (see tools/chart_renderer.py).
+        render_stats   : Optional dict filled with {png_filename: seconds}.
 
     Returns:
-        List of dicts: [{"title": str, "fig": plotly.graph_objs.Figure}, ...]
+        List of dicts: [{"title": str, "fig": plotly.graph_objs.Figure}, ...].
+        Charts with a PNG snapshot also carry its filename under "png".
         Returns an empty list if plotly is unavailable or no valid relations found.
     """
     try:
         import plotly.express as px
+        import plotly.io as pio
     except ImportError:
         return []
 
+    from tools.chart_cache import chart_key, derive_key, get_chart_cache, write_manifest
+
     try:
-        df = read_csv_robust(csv_path, nrows=max_rows)
+        df = read_csv_robust(csv_path)
     except Exception:
         return []
 
+    from tools.data_reduction import DEFAULT_POINTS, group_means, line_series
+
     # Dark-theme layout matching the app's "Obsidian & Electric Violet" aesthetic
     _dark = dict(
         paper_bgcolor="rgba(9,9,11,0.0)",
@@ -398,6 +513,10 @@ def generate_plotly_charts(csv_path: str, relations_text: str, max_rows: int = 5
     _colors = ["#a78bfa", "#6366f1", "#22d3ee", "#e879f9", "#34d399"]
 
     figures = []
+    render_jobs = []  # (fig, png_path, cache_key) rendered as one batch after the loop
+    manifest = {}     # png filename -> cache key
+    png_hits = 0
+    chart_cache = get_chart_cache()
 
     for line in relations_text.split("\n"):
         line = line.strip()
@@ -430,68 +549,64 @@ def generate_plotly_charts(csv_path: str, relations_text: str, max_rows: int = 5
         lbls = {x_col: clean_x, y_col: clean_y}
 
         try:
-            sample = df[[x_col, y_col]].dropna().head(2000)
+            pair = df[[x_col, y_col]].dropna()
 
-            if sample.empty:
+            if pair.empty:
                 continue
 
-            if "scatter" in ptype or "plot" in ptype:
-                fig = px.scatter(
-                    sample, x=x_col, y=y_col, title=title,
-                    color_discrete_sequence=[color], opacity=0.75,
-                    labels=lbls
-                )
-                fig.update_traces(marker=dict(size=6, line=dict(width=0.5, color="rgba(255,255,255,0.3)")))
-            elif "bar" in ptype:
-                if pd.api.types.is_numeric_dtype(df[x_col]):
-                    # numeric x → bin it, then aggregate
-                    agg = sample.groupby(x_col)[y_col].mean().reset_index()
-                else:
-                    agg = sample.groupby(x_col)[y_col].mean().reset_index()
-                fig = px.bar(
-                    agg.head(25), x=x_col, y=y_col, title=title,
-                    color_discrete_sequence=[color], labels=lbls
-                )
-            elif "line" in ptype:
-                fig = px.line(
-                    sample.sort_values(x_col), x=x_col, y=y_col, title=title,
-                    color_discrete_sequence=[color], labels=lbls
-                )
-            elif "box" in ptype:
-                fig = px.box(
-                    sample, x=x_col if not pd.api.types.is_numeric_dtype(df[x_col]) else None,
-                    y=y_col, title=title,
-                    color_discrete_sequence=[color], labels=lbls
-                )
-            elif "hist" in ptype:
-                fig = px.histogram(
-                    sample, x=x_col, nbins=30,
-                    title=f"Distribution of {clean_x}",
-                    color_discrete_sequence=[color], labels=lbls
-                )
+            spec = {"x": x_col, "y": y_col, "type": ptype, "title": title, "color": color,
+                    "theme": "dark", "max_points": max_rows}
+            fig_key = chart_key(pair, [x_col, y_col], spec)
+            cached_json = chart_cache.get_json(fig_key)
+            if cached_json is not None:
+                fig = pio.from_json(cached_json)
             else:
-                # Default: scatter
-                fig = px.scatter(
-                    sample, x=x_col, y=y_col, title=title,
-                    color_discrete_sequence=[color], opacity=0.75, labels=lbls
-                )
-                
-            # Center title
-            fig.update_layout(title_x=0.5)
+                if "scatter" in ptype or "plot" in ptype:
+                    fig = _scatter_figure(pair, x_col, y_col, title, color, lbls, max_rows)
+                    fig.update_traces(
+                        selector=lambda trace: trace.type in ("scatter", "scattergl"),
+                        marker=dict(size=6, line=dict(width=0.5, color="rgba(255,255,255,0.3)")),
+                    )
+                elif "bar" in ptype:
+                    agg = group_means(pair, x_col, y_col, top=25)
+                    fig = px.bar(
+                        agg, x=x_col, y=y_col, title=title,
+                        color_discrete_sequence=[color], labels=lbls
+                    )
+                elif "line" in ptype:
+                    series = line_series(pair, x_col, y_col, n_out=min(max_rows, DEFAULT_POINTS))
+                    if series is None:
+                        continue
+                    fig = px.line(
+                        series, x=x_col, y=y_col, title=title,
+                        color_discrete_sequence=[color], labels=lbls
+                    )
+                elif "box" in ptype:
+                    fig = _box_figure(pair, x_col, y_col, title, color, lbls)
+                elif "hist" in ptype:
+                    fig = _histogram_figure(pair[x_col], f"Distribution of {clean_x}", color, clean_x)
+                else:
+                    # Default: scatter
+                    fig = _scatter_figure(pair, x_col, y_col, title, color, lbls, max_rows)
 
-            fig.update_layout(**_dark)
+                # Center title
+                fig.update_layout(title_x=0.5)
+
+                fig.update_layout(**_dark)
+                chart_cache.put_json(fig_key, fig.to_json())
             figures.append({"title": title, "fig": fig, "x": x_col, "y": y_col, "type": ptype})
-            
-            # Export to PNG for PDF (white theme)
+
+            # Reuse the cached PNG for PDF (white theme) or queue it for rendering
             if output_dir:
-                try:
-                    import copy
-                    fig_white = copy.deepcopy(fig)
-                    fig_white.update_layout(template="plotly_white", paper_bgcolor="white", plot_bgcolor="white", font=dict(color="black"))
-                    png_path = os.path.join(output_dir, f"plotly_{x_col}_vs_{y_col}.png".replace("/", "_"))
-                    fig_white.write_image(png_path, width=800, height=500)
-                except Exception as e:
-                    print(f"[Plotly] Could not save PNG for {title}: {e}")
+                png_name = f"plotly_{x_col}_vs_{y_col}.png".replace("/", "_")
+                png_path = os.path.join(output_dir, png_name)
+                figures[-1]["png"] = png_name
+                png_key = derive_key(fig_key, {"theme": "white", "width": 800, "height": 500})
+                manifest[png_name] = png_key
+                if chart_cache.get_png(png_key, Path(png_path)):
+                    png_hits += 1
+                else:
+                    render_jobs.append((fig, png_path, png_key))
 
         except Exception as _chart_err:  # log but continue
             print(f"[Plotly] Skipping {title!r}: {_chart_err}")
@@ -508,9 +623,7 @@ def generate_plotly_charts(csv_path: str, relations_text: str, max_rows: int = 5
             color = _colors[i % len(_colors)]
             # Histogram for each numeric col
             try:
-                fig = px.histogram(df[[col]].dropna().head(3000), x=col,
-                                   nbins=30, title=f"Distribution of {col}",
-                                   color_discrete_sequence=[color])
+                fig = _histogram_figure(df[col].dropna(), f"Distribution of {col}", color, col)
                 fig.update_layout(**_dark)
                 figures.append({"title": f"Distribution of {col}", "fig": fig, "x": col, "y": col, "type": "histogram"})
                 pair_count += 1
@@ -522,9 +635,8 @@ def generate_plotly_charts(csv_path: str, relations_text: str, max_rows: int = 5
             xc, yc = numeric_cols[i], numeric_cols[i + 1]
             color = _colors[(pair_count + i) % len(_colors)]
             try:
-                sample = df[[xc, yc]].dropna().head(2000)
-                fig = px.scatter(sample, x=xc, y=yc, title=f"{xc} vs {yc}",
-                                 color_discrete_sequence=[color], opacity=0.75)
+                pair = df[[xc, yc]].dropna()
+                fig = _scatter_figure(pair, xc, yc, f"{xc} vs {yc}", color, {xc: xc, yc: yc}, max_rows)
                 fig.update_layout(**_dark)
                 figures.append({"title": f"{xc} vs {yc}", "fig": fig, "x": xc, "y": yc, "type": "scatter"})
             except Exception:
@@ -542,253 +654,24 @@ def generate_plotly_charts(csv_path: str, relations_text: str, max_rows: int = 5
             except Exception:
                 pass
 
-    return figures
-
-
-# ---------------------------------------------------------------------------
-# CrewAI tools — used by agents at runtime as fallback / code generation aid
-# ---------------------------------------------------------------------------
-
-class DatasetTools:
-
-    @tool("Read Dataset Head")
-    def read_dataset_head(file_path: Optional[str] = None) -> str:
-        """Reads the first 10 rows of the dataset to understand its structure.
-        Uses nrows=10 so the entire file is never loaded into memory.
-        If file_path is not specified or is invalid, the active session's CSV will be used.
-        """
-        try:
-            from config.context import current_session_csv
-            fp = file_path
-            if not fp or not isinstance(fp, str) or fp.lower() == "none" or "properties" in str(fp):
-                fp = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
-            df = read_csv_robust(fp, nrows=10)
-            return _df_to_markdown(df, index=False)
-        except Exception as e:
-            return f"Error reading file: {e}"
-
-    @tool("Get Dataset Info")
-    def get_dataset_info(file_path: Optional[str] = None) -> str:
-        """Returns basic information about the dataset: shape, columns, data types,
-        and missing-value counts.
-        If file_path is not specified or is invalid, the active session's CSV will be used.
-        """
+    if render_jobs:
+        from tools.chart_renderer import render_pngs
         try:
-            from config.context import current_session_csv
-            fp = file_path
-            if not fp or not isinstance(fp, str) or fp.lower() == "none" or "properties" in str(fp):
-                fp = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
-            df = read_csv_robust(fp)
-            lines = [f"Shape: {df.shape}", "\nColumns and Types:"]
-            for col, dtype in df.dtypes.items():
-                missing = df[col].isnull().sum()
-                lines.append(f"  - {col}: {dtype} (Missing: {missing})")
-            return "\n".join(lines)
+            latencies = render_pngs([(fig, png_path) for fig, png_path, _ in render_jobs])
         except Exception as e:
-            return f"Error analyzing file: {e}"
+            print(f"[Plotly] PNG rendering failed: {e}")
+            latencies = {}
+        for _, png_path, png_key in render_jobs:
+            if os.path.basename(png_path) in latencies:
+                chart_cache.put_png(png_key, Path(png_path))
+        if render_stats is not None:
+            render_stats.update(latencies)
+
+    if output_dir and manifest:
+        write_manifest(output_dir, manifest)
+        print(f"[ChartCache] Reused {png_hits}/{png_hits + len(render_jobs)} chart snapshot(s).")
 
-    @tool("Get Correlation Matrix")
-    def get_correlation_matrix(file_path: Optional[str] = None) -> str:
-        """Returns the top-20 strongest column-pair correlations (by absolute value).
-        If file_path is not specified or is invalid, the active session's CSV will be used.
-        """
-        try:
-            from config.context import current_session_csv
-            fp = file_path
-            if not fp or not isinstance(fp, str) or fp.lower() == "none" or "properties" in str(fp):
-                fp = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
-            df = read_csv_robust(fp)
-            numeric_df = df.select_dtypes(include=["number"])
-            if numeric_df.empty:
-                return "No numeric columns found."
-
-            corr = numeric_df.corr()
-            unstacked = (
-                corr.unstack()
-                .reset_index()
-                .rename(columns={"level_0": "Col_A", "level_1": "Col_B", 0: "Correlation"})
-            )
-            unstacked = unstacked[unstacked["Col_A"] < unstacked["Col_B"]]
-            unstacked["AbsCorr"] = unstacked["Correlation"].abs()
-            top = (
-                unstacked.sort_values("AbsCorr", ascending=False)
-                .head(20)
-                .drop(columns=["AbsCorr"])
-                .reset_index(drop=True)
-            )
-            return _df_to_markdown(top, index=False)
-        except Exception as e:
-            return f"Error calculating correlation: {e}"
-
-    @tool("Clean Dataset with Python Code")
-    def clean_dataset_with_python(file_path: Optional[str] = None, python_code: Optional[str] = None) -> str:
-        """Cleans the dataset by executing *python_code* in an isolated subprocess.
-        The file_path parameter is optional and defaults to the active session's dataset CSV.
-
-        Your code must:
-          1. Read the CSV:  df = pd.read_csv(FILE_PATH)   # FILE_PATH is pre-set
-          2. Perform cleaning on df
-          3. Save:          df.to_csv(FILE_PATH, index=False)
-
-        Do NOT include markdown code fences. Do NOT use any other file paths.
-        """
-        # Swap if python_code is not specified but file_path contains code
-        if not python_code:
-            if file_path and ("import " in file_path or "df[" in file_path or "\n" in file_path):
-                python_code = file_path
-                file_path = None
-            else:
-                return "Error: python_code is required."
-
-        from config.context import current_session_csv
-        fp = file_path
-        if not fp or not isinstance(fp, str) or fp.lower() == "none" or "properties" in str(fp):
-            fp = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
-
-        clean_code = _strip_markdown_fences(python_code)
-
-        script = textwrap.dedent(f"""\
-            import os
-            import pandas as pd
-
-            FILE_PATH = {repr(str(fp))}
-            df = pd.read_csv(FILE_PATH)
-
-            # Safeguard: redirect all read_csv calls to FILE_PATH
-            _orig_read_csv = pd.read_csv
-            def custom_read_csv(*args, **kwargs):
-                return _orig_read_csv(FILE_PATH)
-            pd.read_csv = custom_read_csv
-        """) + "\n" + clean_code + "\n" + textwrap.dedent(f"""\
-            df.to_csv(FILE_PATH, index=False)
-            print("Dataset cleaned and saved successfully.")
-        """)
-
-        success, output = _run_in_subprocess(script)
-        if success:
-            return f"Dataset cleaned successfully.\n{output}"
-        return f"Error executing cleaning code:\n{output}"
-
-    @tool("Execute Visualization Code")
-    def execute_visualization_code(python_code: Optional[str] = None, **kwargs) -> str:
-        """Executes Python plotting code to generate and save PNG visual charts.
-
-        The code runs in a pre-configured Python environment where:
-          - 'df' is a pre-loaded pandas DataFrame containing the cleaned dataset.
-          - 'OUTPUT_DIR' is a pre-defined string representing the output folder path.
-          - 'save_chart(filename)' is a helper function to save the current plot into OUTPUT_DIR.
-          - Libraries 'pandas', 'matplotlib.pyplot as plt', and 'seaborn as sns' are already imported.
-
-        Example usage:
-          plt.figure(figsize=(10, 6))
-          sns.scatterplot(data=df, x='column_x', y='column_y')
-          plt.title('Relationship Title')
-          save_chart('chart_name.png')
-          plt.close()
-        """
-        if not python_code:
-            for k, v in kwargs.items():
-                if v and isinstance(v, str) and ("plt." in v or "sns." in v or "import " in v or "\n" in v):
-                    python_code = v
-                    break
-            if not python_code:
-                return "Error: python_code is required."
-
-        clean_code = _strip_markdown_fences(python_code)
-        from config.context import current_session_csv, current_session_output_dir
-        csv_path = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
-        output_dir = current_session_output_dir.get() or os.getenv("CURRENT_SESSION_OUTPUT_DIR", "")
-
-        # Fallbacks if env vars are missing
-        if not csv_path:
-            csv_path = "data/sessions/default/cleaned.csv"
-        if not output_dir:
-            output_dir = "outputs/default"
-
-        script = textwrap.dedent(f"""\
-            import os
-            import pandas as pd
-            import matplotlib
-            matplotlib.use('Agg')
-            import matplotlib.pyplot as plt
-            import seaborn as sns
-            import textwrap
-
-            CSV_PATH = {repr(csv_path)}
-            OUTPUT_DIR = {repr(output_dir)}
-
-            os.makedirs(OUTPUT_DIR, exist_ok=True)
-            df = pd.read_csv(CSV_PATH)
-
-            # Safeguard: redirect all read_csv calls to the cleaned CSV path
-            _orig_read_csv = pd.read_csv
-            def custom_read_csv(*args, **kwargs):
-                return _orig_read_csv(CSV_PATH)
-            pd.read_csv = custom_read_csv
-
-            def save_chart(filename):
-                if not filename.endswith('.png'):
-                    filename += '.png'
-                path = os.path.join(OUTPUT_DIR, filename)
-                plt.savefig(path, bbox_inches='tight', dpi=180)
-                print(f"Saved chart: {{filename}}")
-        """) + "\n" + clean_code
-
-        success, output = _run_in_subprocess(script)
-        if success:
-            return f"Visualization executed successfully. Output:\n{output}"
-        return f"Error executing visualization code:\n{output}"
-
-    @tool("Run Python Script")
-    def run_python_script(python_code: Optional[str] = None, **kwargs) -> str:
-        """Executes arbitrary Python code in a sandboxed subprocess for data analysis tasks.
-
-        The code runs in a pre-configured environment where:
-          - 'df' is a pre-loaded pandas DataFrame containing the cleaned dataset.
-          - 'FILE_PATH' is the path to the active session's CSV file.
-          - Libraries 'pandas', 'numpy', and 'sklearn' are available.
-
-        Use this tool to:
-          - Train machine-learning models (e.g. RandomForest) for feature importance.
-          - Compute advanced statistics or aggregations.
-          - Any general-purpose Python data analysis that isn't visualization.
-
-        Return your results via print() statements.
-        """
-        if not python_code:
-            for k, v in kwargs.items():
-                if v and isinstance(v, str) and ("import " in v or "df[" in v or "\n" in v):
-                    python_code = v
-                    break
-            if not python_code:
-                return "Error: python_code is required."
-
-        clean_code = _strip_markdown_fences(python_code)
-        from config.context import current_session_csv
-        csv_path = current_session_csv.get() or os.getenv("CURRENT_SESSION_CSV", "")
-
-        if not csv_path:
-            csv_path = "data/sessions/default/cleaned.csv"
-
-        script = textwrap.dedent(f"""\
-            import os
-            import pandas as pd
-            import numpy as np
-
-            FILE_PATH = {repr(csv_path)}
-            df = pd.read_csv(FILE_PATH)
-
-            # Safeguard: redirect all read_csv calls to the session CSV
-            _orig_read_csv = pd.read_csv
-            def custom_read_csv(*args, **kwargs):
-                return _orig_read_csv(FILE_PATH)
-            pd.read_csv = custom_read_csv
-        """) + "\n" + clean_code
-
-        success, output = _run_in_subprocess(script, timeout=180)
-        if success:
-            return f"Script executed successfully. Output:\n{output}"
-        return f"Error executing script:\n{output}"
+    return figures
 
 
 def auto_coerce_types(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
@@ -900,3 +783,12 @@ def auto_coerce_types(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
                         pass
 
     return df, actions
+
+
+def __getattr__(name):
+    # DatasetTools moved to tools/agent_tools.py; import crewai only when asked for
+    if name == "DatasetTools":
+        from tools.agent_tools import DatasetTools
+        return DatasetTools
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
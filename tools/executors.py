@@ -0,0 +1,154 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Execution policy for blocking work in the web server.
+
+Async handlers used to run pandas parsing, zipping and HTTP calls directly on
+the event loop. Every SSE stream froze until they returned. Blocking work
+now goes to one of two bounded pools:
+
+- I/O pool: a thread pool of ``CREWLYZE_IO_THREADS`` threads (default
+  ``min(32, cpus + 4)``). install() makes it the event loop's default
+  executor, so ``asyncio.to_thread`` and ``run_in_executor(None, ...)`` use
+  it. It also sizes the thread limiter that FastAPI uses for plain ``def``
+  handlers to match.
+- CPU pool: a spawn-context process pool of ``CREWLYZE_CPU_WORKERS``
+  processes (default ``min(4, cpus - 1)``) for heavy pandas work such as
+  normalizing an uploaded CSV. CPU work there does not hold the GIL against
+  the event loop. If processes cannot be started, it falls back to the I/O
+  pool.
+
+Report rendering keeps its own pool (tools/report_renderer.py) and so does
+chart rendering (tools/chart_renderer.py). tools/route_audit.py checks that
+async routes follow this policy.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_cpu_pool = None
+_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    configured = os.getenv(name, "").strip()
+    if configured.isdigit() and int(configured) > 0:
+        return int(configured)
+    return default
+
+
+def io_threads() -> int:
+    return _env_int("CREWLYZE_IO_THREADS", min(32, (os.cpu_count() or 1) + 4))
+
+
+def cpu_workers() -> int:
+    return _env_int("CREWLYZE_CPU_WORKERS", max(1, min(4, (os.cpu_count() or 1) - 1)))
+
+
+def _io_pool_locked() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=io_threads(), thread_name_prefix="crewlyze-io")
+    return _io_pool
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    with _lock:
+        return _io_pool_locked()
+
+
+def get_cpu_pool():
+    global _cpu_pool
+    with _lock:
+        if _cpu_pool is None:
+            try:
+                import multiprocessing
+                # spawn: forking a threaded server process is unsafe
+                _cpu_pool = ProcessPoolExecutor(
+                    max_workers=cpu_workers(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, ImportError, NotImplementedError) as e:
+                print(f"[Executors] Process pool unavailable ({e}); CPU work runs in threads")
+                _cpu_pool = _io_pool_locked()
+        return _cpu_pool
+
+
+def _reset_cpu_pool() -> None:
+    global _cpu_pool
+    with _lock:
+        _cpu_pool = None
+
+
+def _warm_cpu_worker(_: int = 0) -> int:
+    import pandas  # noqa: F401
+    import tools.dataset_tools  # noqa: F401
+    return os.getpid()
+
+
+def warm() -> int:
+    """Start the CPU pool's processes with pandas and the dataset helpers imported."""
+    return len(set(get_cpu_pool().map(_warm_cpu_worker, range(cpu_workers()))))
+
+
+def install(loop: asyncio.AbstractEventLoop = None) -> None:
+    """Make the I/O pool the loop's default executor and size FastAPI's threadpool to match.
+
+    Call from a startup hook, while the loop is running.
+    """
+    loop = loop or asyncio.get_running_loop()
+    loop.set_default_executor(get_io_pool())
+    try:
+        import anyio.to_thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = io_threads()
+    except Exception as e:
+        print(f"[Executors] Could not size the request threadpool: {e}")
+
+
+def submit_cpu(fn, *args) -> Future:
+    """Run ``fn(*args)`` in the CPU pool. *fn* and *args* must be picklable."""
+    try:
+        return get_cpu_pool().submit(fn, *args)
+    except BrokenProcessPool:
+        _reset_cpu_pool()
+        return get_cpu_pool().submit(fn, *args)
+
+
+async def run_io(fn, *args, **kwargs):
+    """Await ``fn(*args, **kwargs)`` run in the I/O pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_pool(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_cpu(fn, *args):
+    """Await ``fn(*args)`` run in the CPU pool."""
+    return await asyncio.wrap_future(submit_cpu(fn, *args))
+
+
+def shutdown() -> None:
+    """Stop both pools (called on server shutdown)."""
+    global _io_pool, _cpu_pool
+    with _lock:
+        if _cpu_pool is not None and _cpu_pool is not _io_pool:
+            _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+        if _io_pool is not None:
+            _io_pool.shutdown(wait=False, cancel_futures=True)
+            _io_pool = None
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            "io_threads": io_threads(),
+            "cpu_workers": cpu_workers(),
+            "cpu_pool": type(_cpu_pool).__name__ if _cpu_pool is not None else None,
+        }
@@ -0,0 +1,124 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Compact storage for Plotly figures.
+
+results.json used to embed every figure as pretty-printed JSON, with each
+data point written out as a decimal float. This module rewrites numeric trace
+arrays as Plotly.js typed-array specs (``{"dtype": "f4", "bdata": <base64>}``,
+supported natively since plotly.js 2.28). It stores each figure in its own
+file under the session's ``figures/`` directory, so results.json only carries
+small references to them.
+
+Precision:
+- float32 is used when its rounding error stays within 1e-6 of the data's
+  spread.
+- Otherwise float64 is used (e.g. epoch timestamps in milliseconds).
+- Integer arrays that fit are stored as int32.
+"""
+
+import base64
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+FIGURES_DIRNAME = "figures"
+MIN_ENCODE_LENGTH = 16  # short arrays stay as plain JSON lists
+
+
+def _is_number(v) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _encode_array(arr: np.ndarray, shape=None) -> dict:
+    if np.issubdtype(arr.dtype, np.integer) and arr.size and \
+            arr.min() >= np.iinfo(np.int32).min and arr.max() <= np.iinfo(np.int32).max:
+        out = arr.astype("<i4")
+        dtype = "i4"
+    else:
+        as64 = arr.astype("<f8")
+        as32 = as64.astype("<f4")
+        finite = as64[np.isfinite(as64)]
+        # float32 must keep neighbouring values apart: judge the error against
+        # the data's spread, not its magnitude (1.7e12 ms timestamps fail)
+        span = float(np.ptp(finite)) if finite.size else 0.0
+        scale = span if span > 0 else (float(np.abs(finite).max()) if finite.size else 0.0)
+        error = float(np.nanmax(np.abs(as32.astype("<f8") - as64))) if finite.size else 0.0
+        if error <= 1e-6 * scale:
+            out, dtype = as32, "f4"
+        else:
+            out, dtype = as64, "f8"
+    spec = {"dtype": dtype, "bdata": base64.b64encode(out.tobytes()).decode("ascii")}
+    if shape is not None:
+        spec["shape"] = ",".join(str(n) for n in shape)
+    return spec
+
+
+def _maybe_encode(value):
+    """Typed-array spec for a numeric list (1-D, or 2-D with None gaps); else None."""
+    if not isinstance(value, list) or not value:
+        return None
+
+    if isinstance(value[0], list):
+        # 2-D matrix (heatmap z): rectangular rows of numbers / None
+        width = len(value[0])
+        if width == 0 or any(not isinstance(row, list) or len(row) != width for row in value):
+            return None
+        flat = [v for row in value for v in row]
+        if len(flat) < MIN_ENCODE_LENGTH or not all(v is None or _is_number(v) for v in flat):
+            return None
+        arr = np.array([np.nan if v is None else v for v in flat], dtype=float)
+        return _encode_array(arr, shape=(len(value), width))
+
+    if len(value) < MIN_ENCODE_LENGTH or not all(_is_number(v) for v in value):
+        return None
+    if all(isinstance(v, int) for v in value):
+        return _encode_array(np.array(value, dtype=np.int64))
+    return _encode_array(np.array(value, dtype=float))
+
+
+def _encode_node(node):
+    if isinstance(node, dict):
+        # Already a typed-array spec (plotly.py >= 6 emits these itself)
+        if "bdata" in node and "dtype" in node:
+            return node
+        return {k: _encode_node(v) for k, v in node.items()}
+    if isinstance(node, list):
+        encoded = _maybe_encode(node)
+        if encoded is not None:
+            return encoded
+        return [_encode_node(v) for v in node]
+    return node
+
+
+def encode_figure(fig_dict: dict) -> dict:
+    """Return a copy of *fig_dict* with numeric trace arrays as typed-array specs."""
+    out = dict(fig_dict)
+    out["data"] = [_encode_node(trace) for trace in fig_dict.get("data", [])]
+    return out
+
+
+def save_figure(figures_dir: Path, index: int, fig) -> dict:
+    """Encode *fig* (a Plotly Figure) into *figures_dir* and return its reference.
+
+    Filenames embed a content hash, so clients may cache them indefinitely.
+    """
+    figures_dir.mkdir(parents=True, exist_ok=True)
+    encoded = encode_figure(json.loads(fig.to_json()))
+    payload = json.dumps(encoded, separators=(",", ":"))
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:10]
+    name = f"chart_{index}_{digest}.json"
+    (figures_dir / name).write_text(payload, encoding="utf-8")
+    traces = encoded.get("data") or [{}]
+    return {"figure": name, "type": traces[0].get("type", "chart")}
+
+
+def clear_figures(figures_dir: Path) -> None:
+    """Remove figure files left by a previous run of the same session."""
+    if figures_dir.exists():
+        for old in figures_dir.glob("chart_*.json"):
+            old.unlink(missing_ok=True)
@@ -0,0 +1,368 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+In-memory catalog of LLM providers and text-generation models.
+
+The model picker used to scan all of ``litellm.model_cost`` on every
+request. When an API key was set, it also test-called every model through
+a fresh 20-thread pool, so opening the dropdown took tens of seconds. The
+catalog now works like this:
+
+- warm() builds the provider list and the per-provider model index from
+  litellm's price table once. The server runs it in the background at
+  startup.
+- With an API key, the provider's live model list and the per-model
+  verification verdicts are cached per (provider, key hash). The live
+  list lasts ``CREWLYZE_MODEL_LIST_TTL_S`` seconds (default 3600) and a
+  verdict lasts ``CREWLYZE_MODEL_VERIFY_TTL_S`` seconds (default 86400).
+  A missing or stale entry is refreshed in the background, one refresh
+  per key at a time. Until then the request gets the static list, or the
+  last verified list. Refreshes only verify models without a fresh
+  verdict.
+
+Keys are hashed for the cache key and are only held by the refresh job
+that uses them.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+STANDARD_PROVIDERS = [
+    "openai", "anthropic", "nvidia", "groq", "gemini", "ollama", "cohere", "mistral",
+    "vertex_ai", "bedrock", "openrouter", "deepinfra", "together_ai", "xai",
+]
+
+# Providers whose /models endpoint lists what a key can use
+_LIVE_ENDPOINTS = {
+    "nvidia": ("https://integrate.api.nvidia.com/v1/models", "nvidia_nim/"),
+    "groq": ("https://api.groq.com/openai/v1/models", "groq/"),
+    "openai": ("https://api.openai.com/v1/models", ""),
+}
+
+# litellm provider names that belong to a picker provider
+_PROVIDER_ALIASES = {
+    "nvidia": {"nvidia_nim"},
+    "cohere": {"cohere_chat"},
+    "bedrock": {"bedrock_converse", "bedrock_mantle"},
+}
+
+VERIFY_WORKERS = 20
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _key_hash(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def env_key_name(provider: str) -> str:
+    """Environment / config key that holds *provider*'s credential."""
+    if provider == "ollama":
+        return "OLLAMA_BASE_URL"
+    if provider in ("nvidia", "minimax"):
+        return "NVIDIA_API_KEY"
+    return f"{provider.upper()}_API_KEY"
+
+
+def load_model_cost() -> dict:
+    """litellm's model price table, or its bundled backup copy."""
+    import litellm
+
+    if hasattr(litellm, "model_cost"):
+        return litellm.model_cost
+    try:
+        backup_path = os.path.join(os.path.dirname(litellm.__file__), "model_prices_and_context_window_backup.json")
+        with open(backup_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def is_text_generation_model(model_name: str, info: Optional[dict] = None) -> bool:
+    low_name = model_name.lower()
+    _EXCLUDE_SUBSTRINGS = (
+        "embed", "ada-002", "dall-e", "stable-diffusion", "imagen", "image-generation",
+        "tts", "whisper", "audio", "speech", "realtime", "moderation", "content-filter",
+        "shield", "guard", "rerank", "clip", "vit", "siglip", "transcription", "translation",
+        "vector_store", "search-", "encoder", "ocr", "video_generation", "image_edit"
+    )
+    if any(sub in low_name for sub in _EXCLUDE_SUBSTRINGS):
+        return False
+
+    if info:
+        non_text_keys = (
+            "input_cost_per_image", "output_cost_per_image",
+            "input_cost_per_audio_per_second", "input_cost_per_audio_token", "output_cost_per_audio_token",
+            "ocr_cost_per_page", "annotation_cost_per_page", "input_cost_per_pixel", "output_cost_per_pixel",
+            "input_cost_per_video_per_second", "output_cost_per_video_per_second"
+        )
+        if any(k in info for k in non_text_keys):
+            return False
+
+        mode = info.get("mode")
+        if mode not in ("chat", "completion", None):
+            return False
+
+    return True
+
+
+def _clean_provider_name(p: str) -> bool:
+    p = p.lower().strip()
+    if not p:
+        return False
+    if any(x in p for x in ("http", "docs.litellm", " ", "/", "cost", "token", "image", "audio", "video", "speech", "tts", "embed", "pixel")):
+        return False
+    if "-" in p:
+        parts = p.split("-")
+        if all(part.isdigit() for part in parts if part):
+            return False
+        if any(part.isdigit() for part in parts):
+            if any(x in parts for x in ("x", "w", "h")):
+                return False
+    if p in ("hd", "high", "low", "medium", "standard", "v0", "sample_spec", "fallback_generalizations", "max-x-max"):
+        return False
+    return True
+
+
+def verify_model(provider: str, model_name: str, api_key: str) -> bool:
+    """One-token completion against *model_name*; False only when the provider rejects the model."""
+    import litellm
+
+    # The credential goes with the call, so concurrent checks for different
+    # keys don't race on os.environ. Ollama's "key" is its base URL.
+    credential = {}
+    if api_key:
+        credential = {"api_base": api_key} if env_key_name(provider) == "OLLAMA_BASE_URL" else {"api_key": api_key}
+    try:
+        litellm.completion(
+            model=model_name,
+            messages=[{"role": "user", "content": "."}],
+            max_tokens=1,
+            timeout=4.0,
+            **credential,
+        )
+        return True
+    except Exception as e:
+        err_str = str(e).lower()
+        err_type = type(e).__name__.lower()
+        if "badrequest" in err_type or "400" in err_str:
+            return False
+        if "notfound" in err_type or "404" in err_str or "not_found" in err_str:
+            return False
+        return True
+
+
+def fetch_live_models(provider: str, api_key: str) -> Optional[list]:
+    """The provider's own model list for *api_key*, or None if it has no endpoint or the call fails."""
+    if provider not in _LIVE_ENDPOINTS:
+        return None
+    import requests
+
+    url, prefix = _LIVE_ENDPOINTS[provider]
+    try:
+        res = requests.get(url, headers={"Authorization": f"Bearer {api_key}"}, timeout=4)
+        if res.status_code == 200:
+            return [f"{prefix}{m['id']}" for m in res.json().get("data", [])]
+    except Exception:
+        pass
+    return None
+
+
+class ModelCatalog:
+    """Provider/model index built once, plus per-key live lists and verdicts. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._built = threading.Event()
+        self._model_cost: dict = {}
+        self._providers: list = []
+        self._index: dict = {}       # provider -> sorted static model list
+        self._live: dict = {}        # (provider, key hash) -> {"models", "fetched_at"}
+        self._verdicts: dict = {}    # (provider, key hash) -> {model: (ok, checked_at)}
+        self._refreshing: set = set()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="crewlyze-models")
+        self.counters = {"hits": 0, "misses": 0, "refreshes": 0, "verifications": 0}
+
+    # ------------------------------------------------------------------
+    # Static index
+    # ------------------------------------------------------------------
+
+    def warm(self) -> None:
+        """Build the provider list and model index from litellm (idempotent)."""
+        if self._built.is_set():
+            return
+        with self._build_lock:
+            if self._built.is_set():
+                return
+            start = time.perf_counter()
+            try:
+                model_cost = load_model_cost()
+            except Exception as e:
+                print(f"[Models] litellm unavailable ({e}); using the standard provider list")
+                model_cost = {}
+
+            providers = set()
+            index: dict = {}
+            for model_name, info in model_cost.items():
+                if not isinstance(info, dict):
+                    continue
+                prov = str(info.get("litellm_provider") or "").lower()
+                if prov:
+                    providers.add(prov)
+                prefix = model_name.split("/")[0].lower() if "/" in model_name else ""
+                if prefix and prefix not in ("1024-x-1024", "256-x-256", "512-x-512"):
+                    providers.add(prefix)
+                if not is_text_generation_model(model_name, info):
+                    continue
+                owners = {prov} if prov else set()
+                if prefix:
+                    owners.add(prefix)
+                if "gpt-" in model_name and "/" not in model_name:
+                    owners.add("openai")
+                for owner in owners:
+                    index.setdefault(owner, set()).add(model_name)
+
+            try:
+                import litellm
+                for m in getattr(litellm, "model_list", []) or []:
+                    if "/" in m:
+                        owner = m.split("/")[0].lower()
+                    elif "gpt-" in m:
+                        owner = "openai"
+                    else:
+                        continue
+                    if is_text_generation_model(m, model_cost.get(m)):
+                        index.setdefault(owner, set()).add(m)
+            except Exception:
+                pass
+
+            clean = set(p for p in providers if _clean_provider_name(p)) | set(STANDARD_PROVIDERS)
+            with self._lock:
+                self._model_cost = model_cost
+                self._providers = sorted(clean)
+                self._index = {p: sorted(models) for p, models in index.items()}
+            self._built.set()
+            print(f"[Models] Catalog built: {len(self._providers)} providers, "
+                  f"{sum(len(v) for v in self._index.values())} models in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def providers(self) -> list:
+        self.warm()
+        return list(self._providers)
+
+    def static_models(self, provider: str) -> list:
+        self.warm()
+        provider = provider.lower()
+        models = set(self._index.get(provider, ()))
+        for alias in _PROVIDER_ALIASES.get(provider, ()):
+            models.update(self._index.get(alias, ()))
+        return sorted(models)
+
+    # ------------------------------------------------------------------
+    # Per-key live lists and verification
+    # ------------------------------------------------------------------
+
+    def models(self, provider: str, api_key: Optional[str] = None) -> dict:
+        """``{"models", "verified", "refreshing"}`` served from memory.
+
+        Without a key this is the static list. With a key it is the cached
+        verified list. A missing or stale entry starts a background refresh,
+        and the static list (or the stale list) is returned meanwhile.
+        """
+        static = self.static_models(provider)
+        if not api_key:
+            return {"models": static, "verified": False, "refreshing": False}
+
+        cache_key = (provider.lower(), _key_hash(api_key))
+        now = time.time()
+        with self._lock:
+            live = self._live.get(cache_key)
+            verdicts = dict(self._verdicts.get(cache_key, {}))
+            fresh = live is not None and now - live["fetched_at"] < _env_seconds("CREWLYZE_MODEL_LIST_TTL_S", 3600)
+            self.counters["hits" if fresh else "misses"] += 1
+        if not fresh:
+            self._schedule_refresh(cache_key, provider.lower(), api_key)
+        if live is None:
+            return {"models": static, "verified": False, "refreshing": True}
+        verified = [m for m in live["models"] if verdicts.get(m, (True, 0))[0]]
+        return {"models": verified, "verified": True, "refreshing": not fresh}
+
+    def _schedule_refresh(self, cache_key: tuple, provider: str, api_key: str) -> None:
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        self._refresh_pool.submit(self._refresh, cache_key, provider, api_key)
+
+    def _refresh(self, cache_key: tuple, provider: str, api_key: str) -> None:
+        try:
+            start = time.perf_counter()
+            live = fetch_live_models(provider, api_key)
+            if live:
+                candidates = sorted(set(m for m in live if is_text_generation_model(m, self._model_cost.get(m))))
+            else:
+                candidates = self.static_models(provider)
+
+            verify_ttl = _env_seconds("CREWLYZE_MODEL_VERIFY_TTL_S", 86400)
+            now = time.time()
+            with self._lock:
+                known = dict(self._verdicts.get(cache_key, {}))
+            stale = [m for m in candidates if m not in known or now - known[m][1] >= verify_ttl]
+
+            if stale:
+                with ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="crewlyze-verify") as pool:
+                    futures = {pool.submit(verify_model, provider, m, api_key): m for m in stale}
+                    for future in as_completed(futures):
+                        try:
+                            ok = future.result()
+                        except Exception:
+                            ok = True
+                        known[futures[future]] = (ok, time.time())
+
+            with self._lock:
+                self._verdicts[cache_key] = {m: known[m] for m in candidates if m in known}
+                self._live[cache_key] = {"models": candidates, "fetched_at": time.time()}
+                self.counters["refreshes"] += 1
+                self.counters["verifications"] += len(stale)
+            print(f"[Models] Refreshed {provider}: {len(candidates)} models, {len(stale)} verified "
+                  f"in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            print(f"[Models] Refresh for {provider} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(cache_key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "built": self._built.is_set(),
+                "providers": len(self._providers),
+                "models": sum(len(v) for v in self._index.values()),
+                "cached_keys": len(self._live),
+                "refreshing": len(self._refreshing),
+                **self.counters,
+            }
+
+
+_catalog: Optional[ModelCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_model_catalog() -> ModelCatalog:
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ModelCatalog()
+        return _catalog
@@ -0,0 +1,420 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Persistent outbox for Slack, Discord and webhook notifications.
+
+The automation hub used to post each notification one after another at the
+end of the analysis thread, with a fresh connection per post. A slow
+endpoint held up the run and a failed post was only logged. Now:
+
+- Deliveries are rows in ``DATA_DIR/notify_outbox.sqlite3``, written when
+  the analysis completes. enqueue() returns at once. Deliveries that were
+  in flight when the server stopped are sent after the next start.
+- A dispatcher thread runs an asyncio loop that sends due deliveries
+  concurrently, up to ``CREWLYZE_NOTIFY_CONCURRENCY`` at a time (default
+  8). Posts share one pooled ``requests.Session``.
+- Failures are retried with exponential backoff and jitter, starting at
+  ``CREWLYZE_NOTIFY_RETRY_BASE_S`` seconds (default 5) and honouring
+  ``Retry-After``. Network errors, 408, 429 and 5xx responses are retried.
+  Other 4xx responses, and deliveries that are still failing after
+  ``CREWLYZE_NOTIFY_MAX_ATTEMPTS`` tries (default 6), are dead-lettered.
+  Dead letters stay in the table until they are retried or pruned.
+- Attachments are references, not bytes. ``{"kind": "report_pdf"}`` is
+  resolved at send time through the artifact resolver registered by the
+  server (the cached report PDF). ``{"kind": "file"}`` points at a file such
+  as a chart PNG.
+
+stats() reports counts by status and channel, plus request and end-to-end
+latency percentiles. Sent rows older than ``CREWLYZE_NOTIFY_KEEP_DAYS``
+(default 7) are pruned.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+PENDING, SENDING, SENT, DEAD = "pending", "sending", "sent", "dead"
+REQUEST_TIMEOUT = 15
+MAX_BACKOFF_S = 30 * 60
+RETRYABLE_STATUS = {408, 425, 429}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id      TEXT,
+    channel         TEXT NOT NULL,
+    label           TEXT,
+    url             TEXT NOT NULL,
+    payload         TEXT NOT NULL,
+    attachments     TEXT NOT NULL,
+    status          TEXT NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error      TEXT,
+    created_at      REAL NOT NULL,
+    sent_at         REAL
+);
+CREATE INDEX IF NOT EXISTS idx_deliveries_due ON deliveries(status, next_attempt_at);
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _percentile(samples, q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1) + 0.5))], 1)
+
+
+def _host(url: str) -> str:
+    try:
+        return urlsplit(url).netloc or "?"
+    except ValueError:
+        return "?"
+
+
+class DeliveryFailed(Exception):
+    def __init__(self, message: str, retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class NotificationOutbox:
+    """SQLite-backed outbox with an asyncio dispatcher thread. Thread-safe."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Deliveries interrupted by a restart go out again
+        self._conn.execute("UPDATE deliveries SET status = ? WHERE status = ?", (PENDING, SENDING))
+        self._conn.commit()
+
+        self._resolvers: dict = {}  # attachment kind -> fn(session_id) -> Path
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._session = None
+
+        self._request_ms = deque(maxlen=500)
+        self._delivery_ms = deque(maxlen=500)
+        self._counters: dict = {}  # channel -> {"sent", "failed_attempts", "dead"}
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def register_artifact(self, kind: str, resolver: Callable[[str], Path]) -> None:
+        """Resolve ``{"kind": kind}`` attachments with ``resolver(session_id)`` at send time."""
+        self._resolvers[kind] = resolver
+
+    def enqueue(self, session_id: str, delivery: dict) -> int:
+        """Persist one delivery and wake the dispatcher. Returns its id.
+
+        *delivery* has ``channel``, ``url`` and ``json`` (the payload), and
+        optionally ``label`` and ``attachments``.
+        """
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO deliveries (session_id, channel, label, url, payload, attachments, status, "
+                "next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (session_id, delivery["channel"], delivery.get("label"), delivery["url"],
+                 json.dumps(delivery["json"]), json.dumps(delivery.get("attachments") or []),
+                 PENDING, now, now),
+            )
+            self._conn.commit()
+            delivery_id = cur.lastrowid
+        self.start()
+        self._notify()
+        return delivery_id
+
+    def retry(self, delivery_id: int) -> bool:
+        """Move a dead letter back to the queue. Returns False if it is not dead."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE deliveries SET status = ?, attempts = 0, next_attempt_at = ? WHERE id = ? AND status = ?",
+                (PENDING, time.time(), delivery_id, DEAD),
+            )
+            self._conn.commit()
+        if cur.rowcount:
+            self.start()
+            self._notify()
+        return bool(cur.rowcount)
+
+    # ------------------------------------------------------------------
+    # Queue bookkeeping
+    # ------------------------------------------------------------------
+
+    def _claim_due(self, limit: int) -> list:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, session_id, channel, label, url, payload, attachments, attempts, created_at "
+                "FROM deliveries WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (PENDING, now, limit),
+            ).fetchall()
+            if rows:
+                self._conn.executemany("UPDATE deliveries SET status = ? WHERE id = ?", [(SENDING, r[0]) for r in rows])
+                self._conn.commit()
+        keys = ("id", "session_id", "channel", "label", "url", "payload", "attachments", "attempts", "created_at")
+        return [dict(zip(keys, r)) for r in rows]
+
+    def _seconds_until_due(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM deliveries WHERE status = ?", (PENDING,)
+            ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def _count(self, channel: str, key: str) -> None:
+        with self._lock:
+            counts = self._counters.setdefault(channel, {"sent": 0, "failed_attempts": 0, "dead": 0})
+            counts[key] += 1
+
+    def _mark_sent(self, row: dict, request_ms: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE deliveries SET status = ?, attempts = attempts + 1, sent_at = ?, last_error = NULL WHERE id = ?",
+                (SENT, now, row["id"]),
+            )
+            self._conn.commit()
+            self._request_ms.append(request_ms)
+            self._delivery_ms.append((now - row["created_at"]) * 1000)
+        self._count(row["channel"], "sent")
+
+    def _mark_failed(self, row: dict, error: DeliveryFailed) -> None:
+        attempts = row["attempts"] + 1
+        max_attempts = int(_env_float("CREWLYZE_NOTIFY_MAX_ATTEMPTS", 6)) or 1
+        self._count(row["channel"], "failed_attempts")
+        if not error.retryable or attempts >= max_attempts:
+            status, next_at = DEAD, time.time()
+            self._count(row["channel"], "dead")
+            print(f"[Outbox] {row['channel']} delivery {row['id']} dead-lettered after {attempts} attempt(s): {error}")
+        else:
+            base = _env_float("CREWLYZE_NOTIFY_RETRY_BASE_S", 5)
+            delay = min(MAX_BACKOFF_S, base * (2 ** (attempts - 1))) * random.uniform(0.8, 1.2)
+            if error.retry_after is not None:
+                delay = max(delay, error.retry_after)
+            status, next_at = PENDING, time.time() + delay
+            print(f"[Outbox] {row['channel']} delivery {row['id']} failed ({error}); retry {attempts + 1} in {delay:.1f}s")
+        with self._lock:
+            self._conn.execute(
+                "UPDATE deliveries SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (status, attempts, next_at, str(error)[:500], row["id"]),
+            )
+            self._conn.commit()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - _env_float("CREWLYZE_NOTIFY_KEEP_DAYS", 7) * 86400
+        with self._lock:
+            self._conn.execute("DELETE FROM deliveries WHERE status IN (?, ?) AND created_at < ?", (SENT, DEAD, cutoff))
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Sending (runs in the dispatcher's worker threads)
+    # ------------------------------------------------------------------
+
+    def _http(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            size = int(_env_float("CREWLYZE_NOTIFY_CONCURRENCY", 8)) or 1
+            adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _open_attachments(self, row: dict) -> tuple:
+        """``(files, opened)`` for requests; attachments that cannot be resolved are skipped."""
+        files, opened = {}, []
+        for spec in json.loads(row["attachments"]):
+            try:
+                if spec.get("kind") == "file":
+                    path = Path(spec["path"])
+                else:
+                    path = Path(self._resolvers[spec["kind"]](row["session_id"]))
+                fp = open(path, "rb")
+            except Exception as e:
+                print(f"[Outbox] Skipping {spec.get('kind')} attachment for delivery {row['id']}: {e}")
+                continue
+            opened.append(fp)
+            files[spec.get("field", "file")] = (spec.get("filename") or path.name, fp, spec.get("mime", "application/octet-stream"))
+        return files, opened
+
+    def _post(self, row: dict) -> float:
+        """Send one delivery. Returns the request time in ms; raises DeliveryFailed."""
+        import requests
+
+        payload = json.loads(row["payload"])
+        files, opened = self._open_attachments(row)
+        start = time.perf_counter()
+        try:
+            if files:
+                response = self._http().post(row["url"], data={"payload_json": json.dumps(payload)},
+                                             files=files, timeout=REQUEST_TIMEOUT)
+            else:
+                response = self._http().post(row["url"], json=payload, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            raise DeliveryFailed(f"{type(e).__name__}: {e}")
+        finally:
+            for fp in opened:
+                fp.close()
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            retry_after = None
+            try:
+                retry_after = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                pass
+            retryable = response.status_code >= 500 or response.status_code in RETRYABLE_STATUS
+            raise DeliveryFailed(f"HTTP {response.status_code} from {_host(row['url'])}", retryable, retry_after)
+        return elapsed
+
+    # ------------------------------------------------------------------
+    # Dispatcher
+    # ------------------------------------------------------------------
+
+    async def _deliver(self, row: dict, slots: asyncio.Semaphore) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+            request_ms = await loop.run_in_executor(None, self._post, row)
+            self._mark_sent(row, request_ms)
+            print(f"[Outbox] {row['label'] or row['channel']} delivered ({request_ms:.0f} ms)")
+        except DeliveryFailed as e:
+            self._mark_failed(row, e)
+        except Exception as e:
+            self._mark_failed(row, DeliveryFailed(f"{type(e).__name__}: {e}"))
+        finally:
+            slots.release()
+            self._wake.set()
+
+    async def _run(self) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        concurrency = int(_env_float("CREWLYZE_NOTIFY_CONCURRENCY", 8)) or 1
+        self._loop = asyncio.get_running_loop()
+        self._loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crewlyze-notify"))
+        self._wake = asyncio.Event()
+        slots = asyncio.Semaphore(concurrency)
+        tasks = set()
+        last_prune = 0.0
+
+        while not self._stopping:
+            self._wake.clear()
+            free = concurrency - len(tasks)
+            for row in (self._claim_due(free) if free > 0 else []):
+                await slots.acquire()
+                task = asyncio.create_task(self._deliver(row, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if time.time() - last_prune > 3600:
+                await self._loop.run_in_executor(None, self._prune)
+                last_prune = time.time()
+            timeout = self._seconds_until_due()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=min(timeout if timeout is not None else 60, 60))
+            except asyncio.TimeoutError:
+                pass
+
+        if tasks:
+            await asyncio.wait(tasks, timeout=REQUEST_TIMEOUT)
+
+    def _notify(self) -> None:
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def start(self) -> None:
+        """Start the dispatcher thread once."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="crewlyze-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._notify()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            by_status = dict(self._conn.execute("SELECT status, COUNT(*) FROM deliveries GROUP BY status").fetchall())
+            by_channel: dict = {}
+            for channel, status, count in self._conn.execute(
+                "SELECT channel, status, COUNT(*) FROM deliveries GROUP BY channel, status"
+            ):
+                by_channel.setdefault(channel, {})[status] = count
+            request_ms, delivery_ms = list(self._request_ms), list(self._delivery_ms)
+            counters = {k: dict(v) for k, v in self._counters.items()}
+        return {
+            "queue": {s: by_status.get(s, 0) for s in (PENDING, SENDING, SENT, DEAD)},
+            "channels": by_channel,
+            "since_start": counters,
+            "request_ms": {"p50": _percentile(request_ms, 0.5), "p95": _percentile(request_ms, 0.95)},
+            "delivery_ms": {"p50": _percentile(delivery_ms, 0.5), "p95": _percentile(delivery_ms, 0.95)},
+            "dispatcher_alive": self._thread is not None and self._thread.is_alive(),
+        }
+
+    def dead_letters(self, limit: int = 50) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, session_id, channel, label, url, attempts, last_error, created_at "
+                "FROM deliveries WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (DEAD, max(1, min(int(limit), 500))),
+            ).fetchall()
+        return [
+            {"id": r[0], "session_id": r[1], "channel": r[2], "label": r[3], "host": _host(r[4]),
+             "attempts": r[5], "last_error": r[6], "created_at": r[7] * 1000}
+            for r in rows
+        ]
+
+
+_outbox: Optional[NotificationOutbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox(data_dir: Optional[Path] = None) -> NotificationOutbox:
+    """Process-wide outbox in ``DATA_DIR/notify_outbox.sqlite3``."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            if data_dir is None:
+                user_home = Path.home() / ".crewlyze"
+                data_dir = Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data")))
+            _outbox = NotificationOutbox(Path(data_dir) / "notify_outbox.sqlite3")
+        return _outbox
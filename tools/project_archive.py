@@ -0,0 +1,349 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Streaming project ZIP export and import.
+
+The export used to write every session and output file into an in-memory
+``BytesIO`` with ``ZIP_DEFLATED``, then send a copy of the finished buffer,
+so the whole archive sat in RAM twice. CSVs were also recompressed on every
+download.
+
+stream_zip() now yields the archive in chunks while each file is being read.
+Memory use is bounded by the read block size, whatever the project size.
+Files that are already compressed (PNG, Parquet, zstd, Office documents) are
+written with ``ZIP_STORED``. Only text-like files are deflated.
+
+Finished archives are cached in ``DATA_DIR/export_cache``. The key is a hash
+of the archive's file listing: names, sizes and mtimes. A repeat download of
+an unchanged project is then a plain file send. The cache is bounded by
+``CREWLYZE_EXPORT_CACHE_MB`` (default 512 MB) and evicts the least recently
+used archives first. Setting it to 0 disables caching.
+
+Imports used to read the whole upload into memory, extractall() it into a
+temp folder and then copy every file again. Now:
+
+- spool_upload() writes the upload to disk in chunks.
+- plan_import() validates every entry from the central directory before
+  anything is written. It checks paths, sizes, compression ratios and that
+  ``session/metadata.json`` is present.
+- extract_members() streams each member straight into its final folder.
+  Each file is written beside its target and renamed into place once its
+  size and CRC check out.
+
+Uploads are capped by ``CREWLYZE_IMPORT_MAX_MB`` (default 4096 MB).
+"""
+
+import hashlib
+import json
+import os
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+ARCHIVE_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+# Already-compressed formats: deflating them again costs CPU for no gain
+STORED_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".parquet", ".zst", ".gz", ".zip",
+    ".pptx", ".xlsx", ".docx", ".pdf",
+}
+
+
+def get_cache_dir() -> Path:
+    user_home = Path.home() / ".crewlyze"
+    return Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data"))) / "export_cache"
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(os.getenv("CREWLYZE_EXPORT_CACHE_MB", "512")) * 1024 * 1024)
+    except ValueError:
+        return 512 * 1024 * 1024
+
+
+def _is_exportable(name: str) -> bool:
+    """Skip derived caches and half-written temp files."""
+    if name.startswith(".") and name.endswith(".tmp"):
+        return False
+    return not (name.startswith("workbench_") and ".duckdb" in name)
+
+
+def project_entries(session_dir: Path, output_dir: Path) -> list:
+    """``[(path, arcname), ...]`` for a project's session and output files, in a stable order."""
+    entries = []
+    for prefix, base in (("session", Path(session_dir)), ("outputs", Path(output_dir))):
+        if not base.exists():
+            continue
+        for root, dirs, files in os.walk(base):
+            dirs.sort()
+            for file in sorted(files):
+                if not _is_exportable(file):
+                    continue
+                path = Path(root) / file
+                entries.append((path, (Path(prefix) / path.relative_to(base)).as_posix()))
+    return entries
+
+
+def compress_type_for(path: Path) -> int:
+    return zipfile.ZIP_STORED if Path(path).suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+
+
+def archive_key(entries: list) -> str:
+    """Hash of the file listing. It changes whenever any file is added, removed or rewritten."""
+    digest = hashlib.sha256(f"v{ARCHIVE_VERSION}".encode())
+    for path, arcname in entries:
+        st = Path(path).stat()
+        digest.update(f"\n{arcname}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class _Sink:
+    """Write-only, non-seekable buffer that zipfile writes into and stream_zip() drains.
+
+    Because it cannot seek, zipfile writes sizes and CRCs in data descriptors
+    after each member instead of patching the local headers.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: list, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a ZIP archive of *entries* chunk by chunk."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w") as zf:
+        for path, arcname in entries:
+            try:
+                info = zipfile.ZipInfo.from_file(path, arcname)
+            except OSError:
+                continue  # removed since the listing was taken
+            info.compress_type = compress_type_for(path)
+            with open(path, "rb") as src, zf.open(info, "w") as dst:
+                for block in iter(lambda: src.read(chunk_size), b""):
+                    dst.write(block)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
+
+
+# ---------------------------------------------------------------------------
+# Archive cache
+# ---------------------------------------------------------------------------
+
+def _cache_path(project_id: str, key: str) -> Path:
+    return get_cache_dir() / f"{project_id}-{key}.zip"
+
+
+def cached_archive(project_id: str, key: str) -> Optional[Path]:
+    """Path of the cached archive for this listing, or None on a miss."""
+    path = _cache_path(project_id, key)
+    try:
+        os.utime(path)  # LRU: mark as recently used
+        return path
+    except OSError:
+        return None
+
+
+def _prune(keep: Path) -> None:
+    """Drop superseded archives of the same project, then the oldest until under budget."""
+    project_id = keep.name.rsplit("-", 1)[0]
+    archives = []
+    for entry in os.scandir(keep.parent):
+        if not entry.name.endswith(".zip") or entry.path == str(keep):
+            continue
+        try:
+            if entry.name.rsplit("-", 1)[0] == project_id:
+                os.unlink(entry.path)
+            else:
+                st = entry.stat()
+                archives.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            continue
+    total = sum(size for _, size, _ in archives) + keep.stat().st_size
+    for _, size, path in sorted(archives):
+        if total <= _max_bytes():
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            continue
+
+
+def stream_and_cache(project_id: str, key: str, entries: list) -> Iterator[bytes]:
+    """stream_zip(), also teed to the cache. The archive is kept only if the stream finishes."""
+    if _max_bytes() <= 0:
+        yield from stream_zip(entries)
+        return
+    cache_dir = get_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    final = _cache_path(project_id, key)
+    tmp = cache_dir / f".{final.name}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(tmp, "wb") as out:
+            for chunk in stream_zip(entries):
+                out.write(chunk)
+                yield chunk
+        if tmp.stat().st_size <= _max_bytes():
+            os.replace(tmp, final)
+            _prune(final)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def invalidate(project_id: str) -> None:
+    """Remove every cached archive of *project_id*."""
+    cache_dir = get_cache_dir()
+    if not cache_dir.exists():
+        return
+    for path in cache_dir.glob(f"{project_id}-*.zip"):
+        path.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+MAX_MEMBERS = 10_000
+MAX_RATIO = 200  # uncompressed/compressed; higher ratios on large members look like a zip bomb
+RATIO_MIN_BYTES = 16 * 1024 * 1024
+MAX_METADATA_BYTES = 4 * 1024 * 1024
+# Session subfolders carried through an import (one level deep)
+SESSION_SUBFOLDERS = ("figures",)
+
+
+class ImportRejected(ValueError):
+    """The archive is not a valid project export."""
+
+
+def max_import_bytes() -> int:
+    try:
+        return int(float(os.getenv("CREWLYZE_IMPORT_MAX_MB", "4096")) * 1024 * 1024)
+    except ValueError:
+        return 4096 * 1024 * 1024
+
+
+async def spool_upload(upload, dest: Path, chunk_size: int = CHUNK_SIZE) -> int:
+    """Copy an UploadFile to *dest* in chunks. Returns the byte count."""
+    limit = max_import_bytes()
+    total = 0
+    with open(dest, "wb") as out:
+        while True:
+            block = await upload.read(chunk_size)
+            if not block:
+                break
+            total += len(block)
+            if total > limit:
+                raise ImportRejected(f"archive exceeds {limit // (1024 * 1024)} MB")
+            out.write(block)
+    return total
+
+
+def _is_importable(folder: str, relpath: str) -> bool:
+    from tools.safe_paths import is_safe_filename
+
+    parts = relpath.split("/")
+    if len(parts) == 2 and folder == "session" and parts[0] in SESSION_SUBFOLDERS:
+        return is_safe_filename(parts[1])
+    return len(parts) == 1 and is_safe_filename(parts[0])
+
+
+def plan_import(zf: zipfile.ZipFile) -> tuple:
+    """Validate *zf* from its central directory.
+
+    Returns ``(meta, members)``: the parsed ``session/metadata.json`` and a
+    list of ``(ZipInfo, "session" | "outputs", relpath)`` for every file to
+    extract. ``relpath`` is a bare filename, or ``figures/<name>`` for the
+    stored Plotly figures. Other entries and deeper subfolders are skipped,
+    as before. Unsafe paths reject the whole archive.
+    """
+    infos = zf.infolist()
+    if len(infos) > MAX_MEMBERS:
+        raise ImportRejected(f"too many entries ({len(infos)})")
+
+    members, meta_info, total = [], None, 0
+    for info in infos:
+        name = info.filename
+        if ".." in name or name.startswith(("/", "\\")) or "\\" in name or ":" in name or "\0" in name:
+            raise ImportRejected(f"Invalid zip entry: {name}")
+        if info.is_dir():
+            continue
+        if info.flag_bits & 0x1:
+            raise ImportRejected(f"encrypted entry: {name}")
+        if info.file_size >= RATIO_MIN_BYTES and info.file_size > MAX_RATIO * max(info.compress_size, 1):
+            raise ImportRejected(f"suspicious compression ratio: {name}")
+        total += info.file_size
+        if total > max_import_bytes():
+            raise ImportRejected("archive expands beyond the import size limit")
+
+        folder, _, relpath = name.partition("/")
+        if folder not in ("session", "outputs") or not _is_importable(folder, relpath):
+            continue
+        if folder == "session" and relpath == "metadata.json":
+            meta_info = info
+            continue  # rewritten by the caller once the project id is settled
+        members.append((info, folder, relpath))
+
+    if meta_info is None:
+        raise ImportRejected("Invalid zip format: missing metadata.json")
+    if meta_info.file_size > MAX_METADATA_BYTES:
+        raise ImportRejected("metadata.json is too large")
+    try:
+        meta = json.loads(zf.read(meta_info).decode("utf-8"))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ImportRejected(f"metadata.json is not valid JSON: {e}")
+    if not isinstance(meta, dict):
+        raise ImportRejected("metadata.json must be an object")
+    return meta, members
+
+
+def extract_members(zf: zipfile.ZipFile, members: list, session_dir: Path, output_dir: Path,
+                    chunk_size: int = CHUNK_SIZE) -> int:
+    """Stream each planned member into place. Returns bytes written."""
+    written = 0
+    for info, folder, relpath in members:
+        target = (Path(session_dir) if folder == "session" else Path(output_dir)) / relpath
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.parent / f".{target.name}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            size = 0
+            with zf.open(info) as src, open(tmp, "wb") as out:  # zipfile verifies the CRC at EOF
+                for block in iter(lambda: src.read(chunk_size), b""):
+                    size += len(block)
+                    if size > info.file_size:
+                        raise ImportRejected(f"{info.filename} is larger than its header says")
+                    out.write(block)
+            if size != info.file_size:
+                raise ImportRejected(f"{info.filename} is truncated")
+            os.replace(tmp, target)
+            written += size
+        finally:
+            tmp.unlink(missing_ok=True)
+    return written
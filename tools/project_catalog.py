@@ -0,0 +1,148 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+SQLite index of project metadata behind /api/projects.
+
+Listing projects used to walk every session directory, read each
+metadata.json and stat every chart PNG, on every request. The catalog keeps
+one row per project in ``DATA_DIR/catalog.sqlite3``:
+
+- Rows are written through whenever metadata is saved: create, rename,
+  status change, thumbnail on chart output. They are removed when a project
+  is deleted.
+- List queries are indexed, paginated, sorted and filtered, and never touch
+  the filesystem.
+
+metadata.json is still the source of truth. sync() backfills the catalog
+from disk once at startup. It then reads only the metadata files of
+projects the catalog does not know yet, and it drops rows whose directories
+are gone.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+SORT_COLUMNS = {"created_at", "updated_at", "name", "status", "size"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id           TEXT PRIMARY KEY,
+    name         TEXT,
+    report_title TEXT,
+    filename     TEXT,
+    status       TEXT,
+    size         INTEGER,
+    created_at   REAL,
+    updated_at   REAL,
+    thumbnail    TEXT,
+    meta         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projects_created ON projects(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_projects_status  ON projects(status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_projects_name    ON projects(name COLLATE NOCASE);
+"""
+
+
+class ProjectCatalog:
+    """Thread-safe project index on a single SQLite connection (WAL mode)."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def upsert(self, meta: dict) -> None:
+        row = (
+            meta["id"], meta.get("name"), meta.get("report_title"), meta.get("filename"),
+            meta.get("status"), int(meta.get("size") or 0), float(meta.get("created_at") or 0),
+            time.time() * 1000, meta.get("thumbnail"), json.dumps(meta, default=str),
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO projects "
+                "(id, name, report_title, filename, status, size, created_at, updated_at, thumbnail, meta) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            self._conn.commit()
+
+    def delete(self, project_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            self._conn.commit()
+
+    def get(self, project_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT meta FROM projects WHERE id = ?", (project_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def ids(self) -> set:
+        with self._lock:
+            return {r[0] for r in self._conn.execute("SELECT id FROM projects")}
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, sort: str = "created_at",
+             descending: bool = True, status: Optional[str] = None, q: Optional[str] = None) -> tuple:
+        """Return ``(projects, total)`` for one page of the listing."""
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if q:
+            where.append("(name LIKE ? OR report_title LIKE ? OR filename LIKE ?)")
+            params.extend([f"%{q}%"] * 3)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        column = sort if sort in SORT_COLUMNS else "created_at"
+        collate = " COLLATE NOCASE" if column == "name" else ""
+        order = f"ORDER BY {column}{collate} {'DESC' if descending else 'ASC'}, id"
+        page = f"LIMIT {int(limit)} OFFSET {max(0, int(offset))}" if limit else ""
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM projects {clause}", params).fetchone()[0]
+            rows = self._conn.execute(f"SELECT meta FROM projects {clause} {order} {page}", params).fetchall()
+        return [json.loads(r[0]) for r in rows], total
+
+    def sync(self, sessions_dir: Path, load_meta: Callable[[str], dict]) -> tuple:
+        """Reconcile with the session directories on disk. Returns ``(added, removed)``."""
+        on_disk = {p.name for p in Path(sessions_dir).iterdir() if p.is_dir()} if Path(sessions_dir).exists() else set()
+        known = self.ids()
+        added = removed = 0
+        for project_id in on_disk - known:
+            try:
+                meta = load_meta(project_id)
+                if meta:
+                    self.upsert(dict(meta, id=project_id))
+                    added += 1
+            except Exception as e:
+                print(f"[Catalog] Could not index {project_id}: {e}")
+        for project_id in known - on_disk:
+            self.delete(project_id)
+            removed += 1
+        return added, removed
+
+
+_catalog: Optional[ProjectCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog(data_dir: Optional[Path] = None) -> ProjectCatalog:
+    """Process-wide catalog in ``DATA_DIR/catalog.sqlite3``."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            if data_dir is None:
+                user_home = Path.home() / ".crewlyze"
+                data_dir = Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data")))
+            _catalog = ProjectCatalog(Path(data_dir) / "catalog.sqlite3")
+        return _catalog
@@ -0,0 +1,134 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+In-memory cache of SQL workbench results, stored as Arrow tables.
+
+Users page through and re-run the same query while they tweak the UI, and
+each call used to run it again from scratch. Results are now kept here,
+keyed by (dataset signature, normalized SQL). A later page, or the same
+query re-run, is then a zero-copy ``Table.slice`` and does not execute
+again.
+
+The cache is bounded by ``CREWLYZE_SQL_CACHE_MB`` (default 128 MB) and evicts
+the least recently used results first. Results bigger than a quarter of the
+budget are not cached; the workbench pages those with LIMIT/OFFSET instead.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace outside string literals and drop trailing semicolons."""
+    parts = _QUOTED.split(sql.strip().rstrip(";").strip())
+    return "".join(p if i % 2 else re.sub(r"\s+", " ", p) for i, p in enumerate(parts)).strip()
+
+
+def query_key(dataset_sig: str, sql: str) -> str:
+    return hashlib.sha1(f"{dataset_sig}\n{normalize_sql(sql)}".encode("utf-8")).hexdigest()[:20]
+
+
+def make_cursor(key: str, offset: int) -> str:
+    """Opaque next-page token."""
+    return f"{key}.{offset}"
+
+
+def parse_cursor(cursor: str) -> Optional[tuple]:
+    """``(key, offset)`` from a token made by make_cursor(), or None if malformed."""
+    key, _, offset = (cursor or "").partition(".")
+    if not key or not offset.isdigit():
+        return None
+    return key, int(offset)
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(os.getenv("CREWLYZE_SQL_CACHE_MB", "128")) * 1024 * 1024)
+    except ValueError:
+        return 128 * 1024 * 1024
+
+
+class QueryResultCache:
+    """Byte-bounded LRU of ``pyarrow.Table`` results. Thread-safe."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else _max_bytes()
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0  # results too large to cache
+
+    @property
+    def max_entry_bytes(self) -> int:
+        return self.max_bytes // 4
+
+    def get(self, key: str):
+        with self._lock:
+            table = self._entries.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return table
+
+    def put(self, key: str, table) -> bool:
+        """Cache *table* under *key*. Returns False if it is too large to keep."""
+        size = table.nbytes
+        with self._lock:
+            if size > self.max_entry_bytes:
+                self.rejected += 1
+                return False
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = table
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "rejected": self.rejected,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache: Optional[QueryResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryResultCache:
+    """Process-wide cache instance."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = QueryResultCache()
+        return _cache
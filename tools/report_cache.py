@@ -0,0 +1,125 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Disk cache for rendered PDF reports and PPTX decks.
+
+/api/export-pdf used to rebuild the whole ReportLab document on every call.
+Each email, webhook, Slack or Discord notification also wrote its own
+``<id>_report.pdf``, and those copies went stale as soon as the results or
+title changed.
+
+Every report is now keyed by everything it is built from:
+
+- the results.json version (its ETag),
+- the cleaned dataset's signature,
+- the signature of the chart PNGs in the output folder,
+- the title and goal,
+- the layout version.
+
+Decks use the same scheme, with the theme added to the key. The API and all
+notifiers share one cached file per key. The cache lives in
+``DATA_DIR/report_cache`` and is bounded by ``CREWLYZE_REPORT_CACHE_MB``
+(default 128 MB). Least recently used reports are evicted first.
+"""
+
+import hashlib
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from tools.chart_cache import ChartCache
+
+LAYOUT_VERSION = 1
+
+_build_locks = [threading.Lock() for _ in range(16)]
+
+
+def get_cache_dir() -> Path:
+    user_home = Path.home() / ".crewlyze"
+    return Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data"))) / "report_cache"
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(os.getenv("CREWLYZE_REPORT_CACHE_MB", "128")) * 1024 * 1024)
+    except ValueError:
+        return 128 * 1024 * 1024
+
+
+def files_signature(paths) -> str:
+    """Hash of (name, size, mtime) for *paths*. Missing files are skipped."""
+    digest = hashlib.sha1()
+    for path in sorted(Path(p) for p in paths):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        digest.update(f"{path.name}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+
+def charts_signature(output_dir: Path) -> str:
+    return files_signature(Path(output_dir).glob("*.png"))
+
+
+def report_key(results_etag: str, dataset_sig: str, charts_sig: str, title: str, goal: str = "",
+               kind: str = "pdf", theme: str = "") -> str:
+    payload = "\n".join([f"v{LAYOUT_VERSION}", kind, results_etag, dataset_sig, charts_sig, title, goal, theme])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def build_lock(key: str) -> threading.Lock:
+    """Serialise builds of the same report so concurrent requests render it once."""
+    return _build_locks[zlib.crc32(key.encode("utf-8")) % len(_build_locks)]
+
+
+class ReportCache(ChartCache):
+    """Size-bounded LRU of report files, on the same index as the chart cache."""
+
+    def _get(self, name: str) -> Optional[Path]:
+        path = self._lookup(name)
+        if path is None and (self.cache_dir / name).exists():
+            # Written by a renderer worker process, whose index is separate
+            with self._lock:
+                size = (self.cache_dir / name).stat().st_size
+                self._total += size - self._index.get(name, 0)
+                self._index[name] = size
+                self._touch(name)
+                self.misses -= 1
+                self.hits += 1
+                self._evict()
+            path = self.cache_dir / name
+        return path
+
+    def _put(self, name: str, data: bytes) -> Path:
+        self._store(name, lambda tmp: Path(tmp).write_bytes(data))
+        return self.cache_dir / name
+
+    def get_pdf(self, key: str) -> Optional[Path]:
+        return self._get(f"{key}.pdf")
+
+    def put_pdf(self, key: str, pdf_bytes: bytes) -> Path:
+        return self._put(f"{key}.pdf", pdf_bytes)
+
+    def get_pptx(self, key: str) -> Optional[Path]:
+        return self._get(f"{key}.pptx")
+
+    def put_pptx(self, key: str, pptx_bytes: bytes) -> Path:
+        return self._put(f"{key}.pptx", pptx_bytes)
+
+
+_cache: Optional[ReportCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    """Process-wide cache instance."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReportCache(get_cache_dir(), _max_bytes())
+        return _cache
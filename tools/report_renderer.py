@@ -0,0 +1,158 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Background rendering of PDF reports and PPTX decks.
+
+The "Download PDF" and "Export PPTX" buttons used to run ReportLab and
+python-pptx inside the async request handlers, which blocked the event loop
+for seconds. Now:
+
+- Rendering runs in a persistent process pool (spawn context, like the
+  chart renderer). ``CREWLYZE_REPORT_WORKERS`` sets its size (default 1).
+- Renders are deduplicated by cache key. A request that arrives while its
+  artifact is still rendering waits on that render instead of starting
+  another.
+- When an analysis completes, run_crew_in_background() queues the report and
+  the default deck. The first download is then usually a cache hit.
+
+render() returns a ``concurrent.futures.Future`` that resolves to the path of
+the file in the report cache. Async handlers await it through
+``asyncio.wrap_future``. If the process pool cannot be used, rendering falls
+back to a thread pool.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+_pool = None
+_pool_lock = threading.Lock()
+_inflight: dict = {}  # cache key -> Future
+_inflight_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    configured = os.getenv("CREWLYZE_REPORT_WORKERS", "").strip()
+    if configured.isdigit() and int(configured) > 0:
+        return int(configured)
+    return 1
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs inside pool processes)
+# ---------------------------------------------------------------------------
+
+def _render_pdf(key: str, job: dict) -> str:
+    from ui.export import export_pdf_cached
+    return str(export_pdf_cached(job, key))
+
+
+def _render_pptx(key: str, job: dict) -> str:
+    from ui.pptx_export import export_pptx_cached
+    return str(export_pptx_cached(job, key))
+
+
+_RENDERERS = {"pdf": _render_pdf, "pptx": _render_pptx}
+
+
+def _warm_worker(_: int = 0) -> int:
+    """Import ReportLab and python-pptx in this worker ahead of the first render."""
+    import ui.export  # noqa: F401
+    import ui.pptx_export  # noqa: F401
+    return os.getpid()
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            try:
+                import multiprocessing
+                # spawn: forking a threaded server process is unsafe
+                _pool = ProcessPoolExecutor(
+                    max_workers=_worker_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, ImportError, NotImplementedError) as e:
+                print(f"[Reports] Process pool unavailable ({e}); rendering in threads")
+                _pool = ThreadPoolExecutor(max_workers=_worker_count(), thread_name_prefix="crewlyze-report")
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def shutdown_pool() -> None:
+    """Stop the report renderer pool (called on server shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def warm() -> int:
+    """Start every pool worker and preload the renderers. Returns the number of warm workers."""
+    pool = _get_pool()
+    return len(set(pool.map(_warm_worker, range(_worker_count()))))
+
+
+def _cached(kind: str, key: str) -> Optional[str]:
+    from tools.report_cache import get_report_cache
+    cache = get_report_cache()
+    path = cache.get_pdf(key) if kind == "pdf" else cache.get_pptx(key)
+    return str(path) if path is not None else None
+
+
+def render(kind: str, key: str, job: dict) -> Future:
+    """Future resolving to the cached file for *key*, rendering it in the pool if needed.
+
+    *kind* is ``"pdf"`` (job: the export_pdf() result dict) or ``"pptx"`` (job:
+    the export_pptx_cached() arguments). *job* must be picklable.
+    """
+    cached = _cached(kind, key)
+    if cached is not None:
+        done: Future = Future()
+        done.set_result(cached)
+        return done
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future
+        try:
+            future = _get_pool().submit(_RENDERERS[kind], key, job)
+        except BrokenProcessPool:
+            _reset_pool()
+            future = _get_pool().submit(_RENDERERS[kind], key, job)
+        _inflight[key] = future
+
+    def _forget(f: Future) -> None:
+        with _inflight_lock:
+            if _inflight.get(key) is f:
+                del _inflight[key]
+        if not f.cancelled() and f.exception() is not None:
+            print(f"[Reports] {kind.upper()} render failed: {f.exception()}")
+
+    future.add_done_callback(_forget)
+    return future
+
+
+def stats() -> dict:
+    with _inflight_lock:
+        return {
+            "in_flight": len(_inflight),
+            "workers": _worker_count(),
+            "pool": type(_pool).__name__ if _pool is not None else None,
+        }
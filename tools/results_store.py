@@ -0,0 +1,146 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Versioned access to a session's results.json.
+
+/api/results used to open and parse the whole file on every dashboard poll.
+This store keeps parsed results in a small in-memory LRU. Each entry is
+checked against the file's (mtime, size, inode), so a write from any code
+path invalidates it. write_results() replaces the file atomically and
+refreshes the cache (write-through).
+
+Every version gets a strong ETag: a hash of the file bytes. A ``fields``
+projection gets its own ETag, built from per-field digests. A dashboard that
+polls only ``insights`` therefore gets 304 Not Modified until the insights
+actually change.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+
+RESULTS_FILENAME = "results.json"
+MAX_CACHED_SESSIONS = 32
+
+_cache: "OrderedDict[str, dict]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _signature(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _etag(digest: str) -> str:
+    return f'"r-{digest[:20]}"'
+
+
+def _remember(path: Path, signature: tuple, data: dict, raw: bytes) -> dict:
+    entry = {
+        "signature": signature,
+        "data": data,
+        "etag": _etag(hashlib.sha1(raw).hexdigest()),
+        "field_digests": {},
+    }
+    with _lock:
+        _cache[str(path)] = entry
+        _cache.move_to_end(str(path))
+        while len(_cache) > MAX_CACHED_SESSIONS:
+            _cache.popitem(last=False)
+    return entry
+
+
+def _load(session_dir: Path) -> Optional[dict]:
+    path = Path(session_dir) / RESULTS_FILENAME
+    signature = _signature(path)
+    if signature is None:
+        with _lock:
+            _cache.pop(str(path), None)
+        return None
+
+    with _lock:
+        entry = _cache.get(str(path))
+        if entry is not None and entry["signature"] == signature:
+            _cache.move_to_end(str(path))
+            return entry
+
+    raw = path.read_bytes()
+    data = json.loads(raw.decode("utf-8"))
+    return _remember(path, signature, data, raw)
+
+
+def read_results(session_dir: Path) -> Optional[dict]:
+    """Parsed results (shallow copy; treat nested values as read-only), or None."""
+    entry = _load(session_dir)
+    return dict(entry["data"]) if entry else None
+
+
+def read_versioned(session_dir: Path, fields: Optional[Iterable[str]] = None) -> Optional[tuple]:
+    """Return ``(payload, etag)`` for the results, optionally projected to *fields*.
+
+    Unknown field names are ignored. Returns None if results.json is missing.
+    """
+    entry = _load(session_dir)
+    if entry is None:
+        return None
+    data = entry["data"]
+    if not fields:
+        return dict(data), entry["etag"]
+
+    wanted = [f for f in dict.fromkeys(fields) if f in data]
+    digests = entry["field_digests"]
+    parts = []
+    for name in wanted:
+        if name not in digests:
+            encoded = json.dumps(data[name], sort_keys=True, separators=(",", ":"), default=str)
+            digests[name] = hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+        parts.append(f"{name}:{digests[name]}")
+    etag = _etag(hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest())
+    return {name: data[name] for name in wanted}, etag
+
+
+def write_results(session_dir: Path, data: dict) -> str:
+    """Atomically replace results.json and refresh the cache. Returns the new ETag."""
+    path = Path(session_dir) / RESULTS_FILENAME
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+    tmp = path.with_name(f".{RESULTS_FILENAME}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return _remember(path, _signature(path), dict(data), raw)["etag"]
+
+
+def invalidate(session_dir: Path) -> None:
+    """Drop any cached copy (e.g. after the session directory is deleted)."""
+    with _lock:
+        _cache.pop(str(Path(session_dir) / RESULTS_FILENAME), None)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against *etag* (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,215 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Static check that async route handlers never block the event loop.
+
+An ``async def`` handler runs on the event loop itself. Any blocking call in
+it (file parsing, pandas, ReportLab, zipping, HTTP requests, SMTP, sleeps)
+stalls every other request and every open SSE stream until it returns. The
+execution policy (tools/executors.py) is:
+
+- Handlers that have nothing to await are plain ``def``. FastAPI runs them
+  in the bounded I/O thread pool.
+- ``async def`` handlers pass blocking work to ``asyncio.to_thread`` /
+  ``run_io`` (I/O, light CPU) or ``run_cpu`` (heavy pandas work).
+
+This module parses main.py and reports each blocking call that runs directly
+in a registered async route. A call is blocking if it is on the denylists
+below, or if it calls a plain ``def`` defined at module level in the audited
+file, unless that helper is in LOCAL_ALLOWED. New helpers are therefore
+treated as blocking until someone reviews them. Calls in functions handed to an executor, in
+nested generators (StreamingResponse bodies) and in background tasks are
+not run by the handler, so they pass. A nested function that the handler
+calls directly is checked as part of the handler. A trailing
+``# route-audit: ok`` comment accepts one line after review.
+
+Usage:
+    python -m tools.route_audit            # audit main.py, exit 1 on findings
+    python -m tools.route_audit path/to/app.py
+"""
+
+import argparse
+import ast
+import sys
+from pathlib import Path
+
+ROUTE_DECORATORS = {"get", "post", "put", "patch", "delete", "api_route", "websocket"}
+
+# module.function calls that block
+BLOCKING_ATTRS = {
+    "requests": {"get", "post", "put", "patch", "delete", "head", "request"},
+    "urllib.request": {"urlopen"},
+    "smtplib": {"SMTP", "SMTP_SSL"},
+    "time": {"sleep"},
+    "subprocess": {"run", "call", "check_call", "check_output", "Popen"},
+    "shutil": {"copyfileobj", "copyfile", "copy", "copy2", "copytree", "rmtree", "move", "make_archive"},
+    "zipfile": {"ZipFile"},
+    "json": {"load"},
+    "pd": {"read_csv", "read_excel", "read_sql_query", "read_parquet", "read_json", "ExcelFile"},
+    "sqlite3": {"connect"},
+    "litellm": {"completion"},
+}
+
+# Bare function names that block (builtins and this repo's heavy helpers)
+BLOCKING_NAMES = {
+    "open",
+    "read_csv_robust", "record_dataset_metadata", "load_dataframe",
+    "export_pdf", "export_pdf_cached", "export_pptx", "export_pptx_cached", "get_report_pdf",
+    "send_automated_email", "send_automated_slack", "send_automated_webhook", "send_automated_discord",
+    "run_automation_pipeline", "optimize_goal_grammar",
+    "_validate_llm_connection", "verify_model", "fetch_live_models", "_export_chat_pdf",
+    "run_query", "preview_page", "deep_diff",
+    # Path resolution, metadata and results I/O
+    "get_safe_session_dir", "get_safe_output_dir", "get_hot_session_dir", "create_session_dir", "thaw_session",
+    "get_project_metadata", "save_project_metadata", "read_versioned", "read_results", "write_results",
+    "dedupe_session_files", "restore_cached_charts", "load_metadata", "diff_summary",
+    "project_entries", "archive_key", "cached_archive", "plan_import", "extract_members",
+    # Bound lazily by main._load_crew (crewai/litellm import, LLM calls)
+    "_load_crew", "_run_crew", "_apply_runtime_llm_settings", "_run_copilot_query", "_export_pdf",
+}
+
+# Module-level helpers of the audited file that are cheap enough for the loop
+LOCAL_ALLOWED = {"BytesIO_iterator", "is_safe_id", "parse_bool"}
+
+# Method names that block whatever the receiver (DataFrame writers, future waits)
+BLOCKING_METHODS = {"to_csv", "to_excel", "to_parquet", "read_excel", "result", "urlopen"}
+
+# Calls whose function arguments run somewhere else
+OFFLOADERS = {"to_thread", "run_in_executor", "run_io", "run_cpu", "add_task", "submit", "StreamingResponse"}
+
+SUPPRESS = "route-audit: ok"
+
+
+def _dotted(node) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted(node.value)
+        return f"{base}.{node.attr}" if base else ""
+    return ""
+
+
+def _is_route(func: ast.AsyncFunctionDef) -> bool:
+    for deco in func.decorator_list:
+        target = deco.func if isinstance(deco, ast.Call) else deco
+        if isinstance(target, ast.Attribute) and target.attr in ROUTE_DECORATORS:
+            return True
+    return False
+
+
+def _blocking_name(call: ast.Call, local_defs=frozenset()):
+    """Readable name of the blocking call, or None."""
+    func = call.func
+    if isinstance(func, ast.Name):
+        return func.id if func.id in BLOCKING_NAMES or func.id in local_defs else None
+    if isinstance(func, ast.Attribute):
+        owner = _dotted(func.value)
+        if func.attr in BLOCKING_ATTRS.get(owner, ()):
+            return f"{owner}.{func.attr}"
+        if isinstance(func.value, ast.Name) and func.attr in BLOCKING_NAMES:
+            return f"{owner}.{func.attr}"  # module-qualified helper, e.g. project_archive.plan_import
+        if func.attr in BLOCKING_METHODS:
+            return f".{func.attr}()"
+    return None
+
+
+class _HandlerVisitor(ast.NodeVisitor):
+    """Collect blocking calls that execute on the handler's own frame."""
+
+    def __init__(self, nested: dict, local_defs=frozenset()):
+        self.nested = nested
+        self.local_defs = local_defs
+        self.findings = []
+        self._seen = set()
+
+    # Bodies defined here run elsewhere unless called directly (see visit_Call)
+    def visit_FunctionDef(self, node):
+        pass
+
+    def visit_AsyncFunctionDef(self, node):
+        pass
+
+    def visit_Lambda(self, node):
+        pass
+
+    def visit_Await(self, node):
+        # ``await x.read()`` etc. are non-blocking by definition
+        value = node.value
+        if isinstance(value, ast.Call):
+            for arg in list(value.args) + [k.value for k in value.keywords]:
+                self.visit(arg)
+            if isinstance(value.func, ast.Attribute):
+                self.visit(value.func.value)
+        else:
+            self.visit(value)
+
+    def visit_Call(self, node):
+        func = node.func
+        callee = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        if callee in OFFLOADERS:
+            # Function references and their arguments are handed off; still
+            # check the expressions that are evaluated to build them
+            for arg in node.args:
+                if isinstance(arg, ast.Call):
+                    self.visit(arg)
+            return
+
+        name = _blocking_name(node, self.local_defs)
+        if name:
+            self.findings.append((node.lineno, name))
+        if isinstance(func, ast.Name) and func.id in self.nested and func.id not in self._seen:
+            self._seen.add(func.id)
+            for stmt in self.nested[func.id].body:
+                self.visit(stmt)
+        self.generic_visit(node)
+
+
+def audit_source(source: str, filename: str = "main.py") -> list:
+    """``[(filename, line, handler, call), ...]`` for every blocking call in an async route."""
+    tree = ast.parse(source, filename=filename)
+    lines = source.splitlines()
+    local_defs = {n.name for n in tree.body if isinstance(n, ast.FunctionDef)} - LOCAL_ALLOWED
+    findings = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.AsyncFunctionDef) and _is_route(node)):
+            continue
+        nested = {
+            n.name: n for n in ast.walk(node)
+            if isinstance(n, ast.FunctionDef) and n is not node
+        }
+        visitor = _HandlerVisitor(nested, local_defs)
+        for stmt in node.body:
+            visitor.visit(stmt)
+        for lineno, name in sorted(set(visitor.findings)):
+            if SUPPRESS in lines[lineno - 1]:
+                continue
+            findings.append((filename, lineno, node.name, name))
+    return findings
+
+
+def audit_file(path) -> list:
+    path = Path(path)
+    return audit_source(path.read_text(encoding="utf-8"), str(path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report blocking calls inside async FastAPI routes.")
+    parser.add_argument("paths", nargs="*", default=[str(Path(__file__).resolve().parent.parent / "main.py")])
+    args = parser.parse_args()
+
+    findings = []
+    for path in args.paths:
+        findings.extend(audit_file(path))
+    for filename, lineno, handler, name in findings:
+        print(f"{filename}:{lineno}: {handler}() calls blocking {name} on the event loop")
+    if findings:
+        print(f"\n{len(findings)} blocking call(s) in async routes. Make the handler a plain def, "
+              f"or offload with asyncio.to_thread / run_io / run_cpu.")
+        sys.exit(1)
+    print("No blocking calls in async routes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Filename checks shared by the API routes and the project archive importer.
+"""
+
+import re
+
+_SAFE_FILENAME = re.compile(r"^[a-zA-Z0-9_\-. ()[\]$,%&+@=;\'~#]+$")
+
+
+def is_safe_filename(filename: str) -> bool:
+    """Ensure the filename doesn't contain path traversal characters and has a safe pattern."""
+    if not filename:
+        return False
+    if ".." in filename or "/" in filename or "\\" in filename:
+        return False
+    if "\0" in filename:
+        return False
+    # Allow safe characters including spaces, dashes, dots, underscores, parentheses, brackets, and common special symbols in column names
+    return bool(_SAFE_FILENAME.match(filename))
@@ -0,0 +1,312 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Deduplicated and tiered storage for session datasets.
+
+Deduplication: each session keeps the upload (``original_upload.csv``) and
+the pipeline's backup of it (``original.csv``), and the two are usually
+byte-identical. dedupe() hardlinks identical files to one content-addressed
+blob in ``DATA_DIR/blobs``, so the data is stored once. A file must go
+through break_link() before anything rewrites it in place. Blobs that no
+session links to any more are removed by gc_blobs(). blob_generation()
+changes whenever either of them adds or removes a blob, so the usage ledger
+re-measures the store only when it changed.
+
+Cold tier: sessions idle for more than ``CREWLYZE_COLD_AFTER_HOURS`` hours
+(default 6) are frozen. Each dataset CSV becomes a zstd-compressed Parquet
+file with every column stored as text. If the Parquet round trip would not
+reproduce the CSV byte for byte (e.g. duplicate column names), the CSV is
+zstd-compressed as-is instead. A ``.cold.json`` manifest records each file's
+size, mtime and hash. thaw() restores the CSVs exactly, with their original
+mtimes, so signature-keyed caches (metadata sidecars, the SQL workbench)
+stay valid. Request handlers that read or replace a session's datasets
+thaw it first, off the event loop, so callers never see the cold format.
+
+Both tiers need pyarrow. Without it, sessions simply stay hot.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+
+COLD_MANIFEST = ".cold.json"
+TIERED_FILES = ("original_upload.csv", "original.csv", "cleaned.csv")
+DEDUP_FILES = ("original_upload.csv", "original.csv")
+
+_locks = [threading.Lock() for _ in range(32)]
+_last_access: dict = {}  # session dir -> epoch seconds
+_blob_lock = threading.Lock()
+_blob_generation = 0  # bumped whenever a blob is created or deleted
+
+
+def _lock_for(session_dir: Path) -> threading.Lock:
+    return _locks[zlib.crc32(str(session_dir).encode("utf-8")) % len(_locks)]
+
+
+def blobs_dir() -> Path:
+    user_home = Path.home() / ".crewlyze"
+    return Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data"))) / "blobs"
+
+
+def cold_after_hours() -> float:
+    try:
+        return float(os.getenv("CREWLYZE_COLD_AFTER_HOURS", "6"))
+    except ValueError:
+        return 6.0
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _tmp_beside(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _blobs_changed() -> None:
+    global _blob_generation
+    with _blob_lock:
+        _blob_generation += 1
+
+
+def blob_generation() -> int:
+    """Counter that changes whenever dedupe() or gc_blobs() adds or removes a blob."""
+    with _blob_lock:
+        return _blob_generation
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed deduplication
+# ---------------------------------------------------------------------------
+
+def dedupe(paths) -> int:
+    """Hardlink each file in *paths* to its content blob. Returns bytes saved."""
+    store = blobs_dir()
+    store.mkdir(parents=True, exist_ok=True)
+    saved = 0
+    for path in (Path(p) for p in paths):
+        try:
+            if not path.is_file():
+                continue
+            blob = store / f"{_sha256(path)}{path.suffix}"
+            if not blob.exists():
+                os.link(path, blob)
+                _blobs_changed()
+                continue
+            if os.path.samefile(path, blob):
+                continue
+            tmp = _tmp_beside(path)
+            os.link(blob, tmp)
+            size = path.stat().st_size
+            os.replace(tmp, path)
+            saved += size
+        except OSError as e:
+            # e.g. blobs on another filesystem: keep the plain copy
+            print(f"[Storage] Could not deduplicate {path.name}: {e}")
+    return saved
+
+
+def break_link(path: Path) -> None:
+    """Give *path* its own inode before it is rewritten in place."""
+    path = Path(path)
+    try:
+        if path.stat().st_nlink > 1:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def gc_blobs() -> int:
+    """Delete blobs no session links to any more. Returns the number removed."""
+    store = blobs_dir()
+    if not store.exists():
+        return 0
+    removed = 0
+    for entry in os.scandir(store):
+        try:
+            if entry.is_file() and entry.stat().st_nlink <= 1:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    if removed:
+        _blobs_changed()
+    return removed
+
+
+# ---------------------------------------------------------------------------
+# Cold tier
+# ---------------------------------------------------------------------------
+
+def is_cold(session_dir: Path) -> bool:
+    return (Path(session_dir) / COLD_MANIFEST).exists()
+
+
+def note_access(session_dir: Path) -> None:
+    _last_access[str(session_dir)] = time.time()
+
+
+def _freeze_file(path: Path, sha: str) -> dict:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    st = path.stat()
+    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    if hashlib.sha256(df.to_csv(index=False).encode("utf-8")).hexdigest() == sha:
+        stored = path.with_name(path.name + ".parquet")
+        tmp = _tmp_beside(stored)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="zstd")
+        entry["format"] = "parquet"
+    else:
+        stored = path.with_name(path.name + ".zst")
+        tmp = _tmp_beside(stored)
+        with open(path, "rb") as src, pa.CompressedOutputStream(str(tmp), "zstd") as out:
+            for block in iter(lambda: src.read(1024 * 1024), b""):
+                out.write(block)
+        entry["format"] = "zst"
+    os.replace(tmp, stored)
+    entry["stored"] = stored.name
+    return entry
+
+
+def _thaw_file(session_dir: Path, name: str, entry: dict) -> None:
+    import pyarrow as pa
+
+    path = session_dir / name
+    stored = session_dir / entry["stored"]
+    tmp = _tmp_beside(path)
+    try:
+        if entry["format"] == "parquet":
+            import pyarrow.parquet as pq
+            df = pq.read_table(stored).to_pandas()
+            with open(tmp, "wb") as f:
+                f.write(df.to_csv(index=False).encode("utf-8"))
+        else:
+            with pa.input_stream(str(stored), compression="zstd") as src, open(tmp, "wb") as out:
+                for block in iter(lambda: src.read(1024 * 1024), b""):
+                    out.write(block)
+        if tmp.stat().st_size != entry["size"]:
+            raise IOError(f"size mismatch restoring {name}")
+        os.utime(tmp, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def freeze(session_dir: Path) -> int:
+    """Move a session's dataset CSVs to the cold tier. Returns bytes saved."""
+    session_dir = Path(session_dir)
+    with _lock_for(session_dir):
+        if is_cold(session_dir):
+            return 0
+        manifest, by_hash, before, after = {}, {}, 0, 0
+        try:
+            for name in TIERED_FILES:
+                path = session_dir / name
+                if not path.is_file():
+                    continue
+                sha = _sha256(path)
+                if sha in by_hash:
+                    # Identical content (the deduplicated upload/backup pair): store once
+                    st = path.stat()
+                    manifest[name] = dict(by_hash[sha], size=st.st_size, mtime_ns=st.st_mtime_ns)
+                else:
+                    manifest[name] = by_hash[sha] = _freeze_file(path, sha)
+                    after += (session_dir / manifest[name]["stored"]).stat().st_size
+                before += manifest[name]["size"]
+        except Exception:
+            for entry in manifest.values():
+                (session_dir / entry["stored"]).unlink(missing_ok=True)
+            raise
+        if not manifest:
+            return 0
+
+        # Commit: manifest first, then drop the CSVs it replaces
+        tmp = _tmp_beside(session_dir / COLD_MANIFEST)
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, session_dir / COLD_MANIFEST)
+        for name in manifest:
+            (session_dir / name).unlink(missing_ok=True)
+        # The SQL workbench database is a derived cache; rebuilt on demand
+        try:
+            from tools.sql_workbench import close_session
+            close_session(session_dir)
+        except Exception:
+            pass
+        for db in session_dir.glob("workbench_*.duckdb"):
+            db.unlink(missing_ok=True)
+        return before - after
+
+
+def thaw(session_dir: Path) -> None:
+    """Restore a cold session's CSVs (no-op for hot sessions)."""
+    session_dir = Path(session_dir)
+    manifest_path = session_dir / COLD_MANIFEST
+    if not manifest_path.exists():
+        return
+    with _lock_for(session_dir):
+        if not manifest_path.exists():
+            return
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        for name, entry in manifest.items():
+            if not (session_dir / name).exists():
+                _thaw_file(session_dir, name, entry)
+        manifest_path.unlink(missing_ok=True)
+        for stored in {entry["stored"] for entry in manifest.values()}:
+            (session_dir / stored).unlink(missing_ok=True)
+    dedupe(session_dir / n for n in DEDUP_FILES)
+    print(f"[Storage] Rehydrated cold session {session_dir.name}")
+
+
+def ensure_hot(session_dir: Path) -> None:
+    """Record an access and thaw the session if it is cold."""
+    note_access(session_dir)
+    if is_cold(session_dir):
+        thaw(session_dir)
+
+
+def _last_activity(session_dir: Path) -> float:
+    times = [_last_access.get(str(session_dir), 0.0)]
+    for name in TIERED_FILES + ("metadata.json", "results.json"):
+        try:
+            times.append((session_dir / name).stat().st_mtime)
+        except OSError:
+            pass
+    return max(times)
+
+
+def tier_idle_sessions(sessions_root: Path, protected: set = frozenset()) -> list:
+    """Freeze every hot session idle longer than cold_after_hours(). Returns frozen ids."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return []
+    cutoff = time.time() - cold_after_hours() * 3600
+    frozen = []
+    for session_dir in Path(sessions_root).iterdir():
+        if not session_dir.is_dir() or session_dir.name in protected or is_cold(session_dir):
+            continue
+        if _last_activity(session_dir) >= cutoff:
+            continue
+        try:
+            saved = freeze(session_dir)
+            if saved:
+                frozen.append(session_dir.name)
+                print(f"[Storage] Froze idle session {session_dir.name} ({saved / (1024*1024):.1f}MB saved)")
+        except Exception as e:
+            print(f"[Storage] Could not freeze {session_dir.name}: {e}")
+    return frozen
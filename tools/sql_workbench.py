@@ -0,0 +1,379 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Persistent DuckDB backend for the SQL workbench (/api/query-sql).
+
+The old workbench copied the whole CSV into a new in-memory SQLite database
+on every query. This module loads the session's dataset once into
+``<session>/workbench_<sig>.duckdb`` as table ``dataset``. ``<sig>`` is
+derived from the source file's size and mtime, so re-cleaning or replacing
+the dataset triggers a rebuild. Queries then run on a cached connection that
+is opened once per session.
+
+Builds are serialized per session (striped locks), not globally, so loading
+one large dataset does not stall queries on other sessions. Connections are
+reference-counted by session_cursor(). A connection evicted from the LRU or
+replaced by a rebuild is closed when its last cursor is released.
+
+Safety is enforced by the engine rather than by keyword filters:
+- the connection is opened ``read_only``;
+- ``enable_external_access`` is off, so there is no file, ATTACH, COPY or
+  extension access;
+- ``lock_configuration`` stops the query from turning either setting back on;
+- only one statement is accepted per query.
+
+A timer interrupts any query that runs longer than ``CREWLYZE_SQL_TIMEOUT``
+seconds (default 10). Results are cached as Arrow tables (tools/query_cache.py),
+so paging through them does not re-execute the query.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from tools.query_cache import get_query_cache, make_cursor, parse_cursor, query_key
+
+TABLE_NAME = "dataset"
+DB_PREFIX = "workbench_"
+MAX_OPEN_SESSIONS = 8
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_CACHED_ROWS = 250_000  # larger results are paged with LIMIT/OFFSET instead
+
+# Statements that return rows and can be wrapped in SELECT ... LIMIT for paging
+WRAPPABLE_KEYWORDS = ("SELECT", "WITH", "FROM", "VALUES", "TABLE")
+
+# session dir -> {"db": path, "con": connection, "refs": open cursors, "retired": bool}
+_connections: "OrderedDict[str, dict]" = OrderedDict()
+_lock = threading.Lock()
+_build_locks = [threading.Lock() for _ in range(16)]
+
+
+class QueryTimeout(Exception):
+    """Raised when a query exceeds the workbench time limit."""
+
+
+def query_timeout() -> float:
+    try:
+        return max(0.5, float(os.getenv("CREWLYZE_SQL_TIMEOUT", "10")))
+    except ValueError:
+        return 10.0
+
+
+def _db_path(session_dir: Path, csv_path: Path) -> Path:
+    st = csv_path.stat()
+    sig = hashlib.sha1(f"{csv_path.name}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()[:12]
+    return session_dir / f"{DB_PREFIX}{sig}.duckdb"
+
+
+def _build(db_path: Path, csv_path: Path) -> None:
+    """Load *csv_path* into a fresh database file at *db_path*."""
+    import duckdb
+
+    tmp = db_path.with_suffix(".building")
+    tmp.unlink(missing_ok=True)
+    con = duckdb.connect(str(tmp))
+    try:
+        try:
+            con.execute(f"CREATE TABLE {TABLE_NAME} AS SELECT * FROM read_csv_auto(?)", [str(csv_path)])
+        except Exception as e:
+            # Fall back to the pandas reader for files DuckDB's sniffer rejects
+            print(f"[SQL Workbench] DuckDB CSV import failed ({e}); loading via pandas")
+            from tools.dataset_tools import read_csv_robust
+
+            con.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+            df = read_csv_robust(str(csv_path))
+            con.register("_source_df", df)
+            con.execute(f"CREATE TABLE {TABLE_NAME} AS SELECT * FROM _source_df")
+            con.unregister("_source_df")
+    finally:
+        con.close()
+    os.replace(tmp, db_path)
+
+
+def _connect(db_path: Path):
+    import duckdb
+
+    return duckdb.connect(
+        str(db_path),
+        read_only=True,
+        config={"enable_external_access": False, "lock_configuration": True},
+    )
+
+
+def _close_entry(entry: dict) -> None:
+    try:
+        entry["con"].close()
+    except Exception:
+        pass
+
+
+def _retire(entry: dict) -> bool:
+    """Mark *entry* as no longer cached (call under _lock). True if it can be closed now."""
+    entry["retired"] = True
+    return entry["refs"] == 0
+
+
+def _acquire(session_dir: Path, csv_path: Path) -> dict:
+    key = str(session_dir)
+    db_path = _db_path(session_dir, csv_path)
+
+    def cached():
+        entry = _connections.get(key)
+        if entry is not None and entry["db"] == db_path:
+            entry["refs"] += 1
+            _connections.move_to_end(key)
+            return entry
+        return None
+
+    with _lock:
+        entry = cached()
+    if entry is not None:
+        return entry
+
+    with _build_locks[zlib.crc32(key.encode("utf-8")) % len(_build_locks)]:
+        with _lock:
+            entry = cached()  # built by another request while this one waited
+        if entry is not None:
+            return entry
+
+        if not db_path.exists():
+            _build(db_path, csv_path)
+            print(f"[SQL Workbench] Built {db_path.name} from {csv_path.name}")
+
+        entry = {"db": db_path, "con": _connect(db_path), "refs": 1, "retired": False}
+        with _lock:
+            replaced = [_connections.pop(key)] if key in _connections else []
+            _connections[key] = entry
+            while len(_connections) > MAX_OPEN_SESSIONS:
+                replaced.append(_connections.popitem(last=False)[1])
+            closable = [old for old in replaced if _retire(old)]
+        for old in closable:
+            _close_entry(old)
+
+        # Stale databases from an earlier version of the dataset
+        for old in session_dir.glob(f"{DB_PREFIX}*.duckdb"):
+            if old != db_path:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass  # still open elsewhere (Windows); removed after the next rebuild
+        return entry
+
+
+def _release(entry: dict) -> None:
+    with _lock:
+        entry["refs"] -= 1
+        closable = entry["retired"] and entry["refs"] == 0
+    if closable:
+        _close_entry(entry)
+
+
+@contextmanager
+def session_cursor(session_dir: Path, csv_path: Path):
+    """Cursor on the session's read-only workbench database, building it if needed.
+
+    The underlying connection stays open until the cursor is closed, even if
+    the session is evicted or rebuilt meanwhile.
+    """
+    entry = _acquire(Path(session_dir), Path(csv_path))
+    try:
+        cur = entry["con"].cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+    finally:
+        _release(entry)
+
+
+def close_session(session_dir: Path) -> None:
+    """Close the cached connection for *session_dir* (e.g. before deleting it)."""
+    with _lock:
+        entry = _connections.pop(str(Path(session_dir)), None)
+        closable = entry is not None and _retire(entry)
+    if closable:
+        _close_entry(entry)
+
+
+_SQL_TOKENS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/|;|[^'\";/-]+|.", re.S)
+
+
+def _sql_outline(sql: str) -> str:
+    """*sql* with comments removed and string literals / quoted names blanked."""
+    out = []
+    for tok in _SQL_TOKENS.findall(sql):
+        if tok.startswith(("--", "/*")):
+            out.append(" ")
+        elif tok[0] in "'\"":
+            out.append(tok[0] * 2)
+        else:
+            out.append(tok)
+    return "".join(out)
+
+
+def _is_single_select(con, sql: str) -> bool:
+    """True when *sql* is one plain SELECT that can be wrapped for paging.
+
+    Other single statements (PRAGMA, DESCRIBE, SHOW, EXPLAIN ...) return
+    False and run as written. More than one statement raises ValueError.
+    """
+    outline = _sql_outline(sql).strip().rstrip(";")
+    if hasattr(con, "extract_statements"):  # duckdb >= 0.10
+        import duckdb
+
+        statements = con.extract_statements(sql)
+        if len(statements) != 1:
+            raise ValueError("Only one SQL statement can be run at a time.")
+        if statements[0].type != duckdb.StatementType.SELECT:
+            return False  # e.g. EXPLAIN, CALL
+    elif ";" in outline:
+        raise ValueError("Only one SQL statement can be run at a time.")
+    # PRAGMA, DESCRIBE and SHOW parse as SELECT too, but cannot be wrapped
+    words = outline.lstrip("( \n\t").split(None, 1)
+    return bool(words) and words[0].upper() in WRAPPABLE_KEYWORDS
+
+
+def _with_timeout(cur, fn, timeout: float):
+    timer = threading.Timer(timeout, cur.interrupt)
+    timer.start()
+    try:
+        return fn()
+    except Exception as e:
+        if "interrupt" in str(e).lower():
+            raise QueryTimeout(f"Query execution timed out ({timeout:g}s limit exceeded).") from e
+        raise
+    finally:
+        timer.cancel()
+
+
+def _fetch_arrow(cur):
+    result = cur.arrow()
+    # duckdb >= 1.4 returns a RecordBatchReader, older versions a Table
+    return result.read_all() if hasattr(result, "read_all") else result
+
+
+def _page_via_sql(cur, sql: str, offset: int, limit: int, timeout: float) -> tuple:
+    """COUNT plus LIMIT/OFFSET for results too large to cache."""
+    def page():
+        count = cur.execute(f"SELECT COUNT(*) FROM ({sql}\n) AS q").fetchone()[0]
+        df = cur.execute(f"SELECT * FROM ({sql}\n) AS q LIMIT {limit} OFFSET {offset}").df()
+        return count, df
+    return _with_timeout(cur, page, timeout)
+
+
+def _execute(session_dir: Path, csv_path: Path, sql: str, key: str, offset: int,
+             limit: int, timeout: float) -> tuple:
+    """Run *sql* and cache its Arrow result when small enough; returns ``(total, page_df)``."""
+    try:
+        import pyarrow  # noqa: F401  (needed by DuckDB's Arrow export)
+        use_arrow = True
+    except ImportError:
+        use_arrow = False
+
+    with session_cursor(session_dir, csv_path) as cur:
+        if _is_single_select(cur, sql):
+            if not use_arrow:
+                return _page_via_sql(cur, sql, offset, limit, timeout)
+            table = _with_timeout(
+                cur, lambda: _fetch_arrow(cur.execute(f"SELECT * FROM ({sql}\n) AS q LIMIT {MAX_CACHED_ROWS + 1}")), timeout
+            )
+            if table.num_rows > MAX_CACHED_ROWS:
+                return _page_via_sql(cur, sql, offset, limit, timeout)
+        elif use_arrow:
+            # EXPLAIN, DESCRIBE, SHOW, SUMMARIZE ... return small results
+            table = _with_timeout(cur, lambda: _fetch_arrow(cur.execute(sql)), timeout)
+        else:
+            full = _with_timeout(cur, lambda: cur.execute(sql).df(), timeout)
+            return len(full), full.iloc[offset:offset + limit]
+
+    get_query_cache().put(key, table)
+    return table.num_rows, table.slice(offset, limit).to_pandas()
+
+
+def run_query(session_dir: Path, csv_path: Path, sql: str, offset: int = 0,
+              limit: int = DEFAULT_PAGE_SIZE, timeout: Optional[float] = None,
+              cursor: Optional[str] = None) -> dict:
+    """Execute *sql* against table ``dataset`` and return one page of results.
+
+    Results of up to MAX_CACHED_ROWS rows are kept in the query cache, so
+    later pages (via *offset* or the returned ``next_cursor``) are slices of
+    the cached Arrow table. A *cursor* from a different query or an older
+    dataset version is ignored.
+
+    Returns ``{"columns", "results", "total_count", "offset", "limit",
+    "next_cursor", "cached"}``. Errors raised by DuckDB (syntax, read-only or
+    permission violations) propagate unchanged. QueryTimeout is raised when
+    the time limit is hit.
+    """
+    sql = sql.strip().rstrip(";").strip()
+    offset = max(0, int(offset))
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    timeout = timeout or query_timeout()
+
+    key = query_key(_db_path(Path(session_dir), Path(csv_path)).stem, sql)
+    parsed = parse_cursor(cursor) if cursor else None
+    if parsed and parsed[0] == key:
+        offset = parsed[1]
+
+    table = get_query_cache().get(key)
+    cached = table is not None
+    if cached:
+        total, df = table.num_rows, table.slice(offset, limit).to_pandas()
+    else:
+        total, df = _execute(Path(session_dir), Path(csv_path), sql, key, offset, limit, timeout)
+
+    df = df.replace([float("inf"), float("-inf")], float("nan")).astype(object).fillna("")
+    next_offset = offset + len(df)
+    return {
+        "columns": [str(c) for c in df.columns],
+        "results": df.to_dict(orient="records"),
+        "total_count": int(total),
+        "offset": offset,
+        "limit": limit,
+        "next_cursor": make_cursor(key, next_offset) if next_offset < total else None,
+        "cached": cached,
+    }
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def preview_page(session_dir: Path, csv_path: Path, columns: list, offset: int = 0,
+                 limit: int = DEFAULT_PAGE_SIZE, sort: Optional[str] = None, descending: bool = False,
+                 search: Optional[str] = None, column: Optional[str] = None) -> dict:
+    """One page of the preview grid, sorted/filtered by DuckDB over the workbench table.
+
+    *search* is a case-insensitive substring match on *column*, or on every
+    column when *column* is None. Unknown column names are ignored.
+    Returns ``{"preview", "filtered_count"}``.
+    """
+    offset = max(0, int(offset))
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    where, params = "", []
+    if search:
+        targets = [column] if column in columns else columns
+        where = "WHERE " + " OR ".join(f"CAST({_quote_ident(c)} AS VARCHAR) ILIKE ?" for c in targets)
+        params = [f"%{search}%"] * len(targets)
+    order = f"ORDER BY {_quote_ident(sort)} {'DESC' if descending else 'ASC'} NULLS LAST" if sort in columns else ""
+
+    with session_cursor(session_dir, csv_path) as cur:
+        def page():
+            count = cur.execute(f"SELECT COUNT(*) FROM {TABLE_NAME} {where}", params).fetchone()[0]
+            df = cur.execute(
+                f"SELECT * FROM {TABLE_NAME} {where} {order} LIMIT {limit} OFFSET {offset}", params
+            ).df()
+            return count, df
+        total, df = _with_timeout(cur, page, query_timeout())
+
+    df = df.replace([float("inf"), float("-inf")], float("nan")).astype(object).fillna("")
+    return {"preview": df.to_dict(orient="records"), "filtered_count": int(total)}
@@ -0,0 +1,318 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Disk-usage ledger and scheduled cleanup for session and output folders.
+
+Cleanup used to run at the start of every analysis. It walked every file
+under sessions/ and outputs/ to total their size. When over quota it walked
+everything again after each folder it deleted, which is quadratic in the
+number of sessions.
+
+The ledger now keeps one entry per project: bytes and last-modified time,
+summed over ``sessions/<id>`` and ``outputs/<id>``.
+
+- Entries are updated when a project is written (track()) or deleted
+  (forget()). Only that project's folders are scanned.
+- A full rescan (reconcile()) runs in the background on the scheduler's
+  first tick, then every ``CREWLYZE_QUOTA_RECONCILE_MIN`` minutes
+  (default 60).
+- Deduplicated datasets are hardlinks into ``DATA_DIR/blobs``
+  (tools/session_storage.py). A project is charged only for files it owns
+  outright. Linked files are charged once, through the size of the blob
+  store, which is part of the total. track() re-measures the store only
+  when its blob generation changed since the last measurement.
+- enforce() removes projects older than the age limit. When the total
+  exceeds the quota it picks the oldest projects from one mtime-sorted pass
+  until usage drops below the target. Running projects are never evicted.
+
+The scheduler is a daemon thread that runs every
+``CREWLYZE_CLEANUP_INTERVAL_MIN`` minutes (default 10). Each tick calls
+enforce(), then moves idle sessions to the compressed cold tier
+(tools/session_storage.py). Cold storage makes the age limit affordable, so
+it is ``CREWLYZE_SESSION_MAX_AGE_HOURS`` (default two weeks) rather than a
+day.
+"""
+
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+MAX_AGE_HOURS = 24 * 14  # cold sessions are compressed (session_storage.py), so keep two weeks
+MAX_QUOTA_BYTES = 1000 * 1024 * 1024    # 1.0 GB
+TARGET_QUOTA_BYTES = 400 * 1024 * 1024  # prune down to 400 MB
+
+
+def _roots() -> tuple:
+    user_home = Path.home() / ".crewlyze"
+    data_dir = Path(os.getenv("CREWLYZE_DATA_DIR", str(user_home / "data")))
+    outputs_root = Path(os.getenv("CREWLYZE_OUTPUTS_DIR", str(user_home / "outputs")))
+    return data_dir, data_dir / "sessions", outputs_root
+
+
+def _env_minutes(name: str, default: float) -> float:
+    try:
+        return max(0.1, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _folder_usage(path: Path, include_links: bool = False) -> tuple:
+    """(total bytes, folder mtime) for one folder tree; (0, 0.0) if it is missing.
+
+    Files with more than one hardlink are skipped unless *include_links* is
+    set: they share an inode with a blob and are charged there.
+    """
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return 0, 0.0
+    total, stack = 0, [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            if include_links or st.st_nlink <= 1:
+                                total += st.st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total, mtime
+
+
+class UsageLedger:
+    """Per-project byte counts with a running total. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict = {}  # project id -> {"bytes": int, "mtime": float}
+        self._total = 0
+        self._blob_bytes = 0
+        self._blob_generation: Optional[int] = None
+        self.reconciled_at: Optional[float] = None
+
+    def _set(self, project_id: str, size: int, mtime: float) -> None:
+        old = self._entries.pop(project_id, None)
+        if old is not None:
+            self._total -= old["bytes"]
+        if size or mtime:
+            self._entries[project_id] = {"bytes": size, "mtime": mtime}
+            self._total += size
+
+    def refresh_blobs(self) -> int:
+        """Re-measure the shared blob store. Returns its size."""
+        from tools.session_storage import blob_generation
+
+        data_dir, _, _ = _roots()
+        generation = blob_generation()
+        size, _ = _folder_usage(data_dir / "blobs", include_links=True)
+        with self._lock:
+            self._blob_bytes = size
+            self._blob_generation = generation
+        return size
+
+    def refresh_blobs_if_changed(self) -> None:
+        """Re-measure the blob store only if a blob was added or removed since the last measurement."""
+        from tools.session_storage import blob_generation
+
+        with self._lock:
+            current = self._blob_generation == blob_generation()
+        if not current:
+            self.refresh_blobs()
+
+    def track(self, project_id: str) -> int:
+        """Rescan one project's folders after it was written. Returns its size."""
+        _, sessions_root, outputs_root = _roots()
+        s_bytes, s_mtime = _folder_usage(sessions_root / project_id)
+        o_bytes, o_mtime = _folder_usage(outputs_root / project_id)
+        with self._lock:
+            self._set(project_id, s_bytes + o_bytes, max(s_mtime, o_mtime))
+        self.refresh_blobs_if_changed()  # a write may have linked a new blob
+        return s_bytes + o_bytes
+
+    def forget(self, project_id: str) -> None:
+        with self._lock:
+            self._set(project_id, 0, 0.0)
+
+    def reconcile(self) -> int:
+        """Full rescan of both roots (background only). Returns the new total."""
+        _, sessions_root, outputs_root = _roots()
+        self.refresh_blobs()
+        usage: dict = {}
+        for root in (sessions_root, outputs_root):
+            if not root.exists():
+                continue
+            for folder in root.iterdir():
+                if folder.is_dir():
+                    size, mtime = _folder_usage(folder)
+                    entry = usage.setdefault(folder.name, {"bytes": 0, "mtime": 0.0})
+                    entry["bytes"] += size
+                    entry["mtime"] = max(entry["mtime"], mtime)
+        with self._lock:
+            self._entries = usage
+            self._total = sum(e["bytes"] for e in usage.values())
+            self.reconciled_at = time.time()
+            return self._total + self._blob_bytes
+
+    def total(self) -> int:
+        with self._lock:
+            return self._total + self._blob_bytes
+
+    def oldest_first(self) -> list:
+        with self._lock:
+            return sorted(((pid, dict(e)) for pid, e in self._entries.items()), key=lambda x: x[1]["mtime"])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "projects": len(self._entries),
+                "bytes": self._total + self._blob_bytes,
+                "blob_bytes": self._blob_bytes,
+                "max_bytes": MAX_QUOTA_BYTES,
+                "target_bytes": TARGET_QUOTA_BYTES,
+                "reconciled_at": self.reconciled_at,
+            }
+
+
+_ledger = UsageLedger()
+
+
+def get_ledger() -> UsageLedger:
+    return _ledger
+
+
+def _running_projects() -> set:
+    try:
+        from tools.project_catalog import get_catalog
+        projects, _ = get_catalog().list(status="running")
+        return {p["id"] for p in projects}
+    except Exception:
+        return set()
+
+
+def remove_project(project_id: str) -> None:
+    """Delete a project's folders and drop it from the ledger, catalog and caches."""
+    _, sessions_root, outputs_root = _roots()
+    try:
+        from tools.sql_workbench import close_session
+        close_session(sessions_root / project_id)
+    except Exception:
+        pass
+    shutil.rmtree(sessions_root / project_id, ignore_errors=True)
+    shutil.rmtree(outputs_root / project_id, ignore_errors=True)
+    _ledger.forget(project_id)
+    try:
+        # Drop blobs this project was the last to link, so the total reflects the space freed
+        from tools.session_storage import gc_blobs
+        gc_blobs()
+    except Exception:
+        pass
+    _ledger.refresh_blobs_if_changed()
+    try:
+        from tools.project_archive import invalidate
+        invalidate(project_id)
+    except Exception:
+        pass
+    try:
+        from tools.project_catalog import get_catalog
+        get_catalog().delete(project_id)
+    except Exception as e:
+        print(f"[Catalog] Could not drop {project_id}: {e}")
+
+
+def _max_age_hours() -> float:
+    try:
+        return float(os.getenv("CREWLYZE_SESSION_MAX_AGE_HOURS", str(MAX_AGE_HOURS)))
+    except ValueError:
+        return float(MAX_AGE_HOURS)
+
+
+def enforce(max_age_hours: Optional[float] = None) -> list:
+    """Apply the age limit and disk quota from the ledger. Returns removed project ids."""
+    if max_age_hours is None:
+        max_age_hours = _max_age_hours()
+    protected = _running_projects()
+    cutoff = time.time() - max_age_hours * 3600
+    removed = []
+
+    candidates = [(pid, e) for pid, e in _ledger.oldest_first() if pid not in protected]
+    for pid, entry in candidates:
+        if entry["mtime"] < cutoff:
+            remove_project(pid)
+            removed.append(pid)
+
+    total = _ledger.total()
+    if total > MAX_QUOTA_BYTES:
+        print(f"Disk quota exceeded: {total / (1024*1024):.1f}MB. Pruning oldest sessions...")
+        for pid, entry in candidates:
+            if total <= TARGET_QUOTA_BYTES:
+                break
+            if pid in removed:
+                continue
+            remove_project(pid)
+            removed.append(pid)
+            total = _ledger.total()
+        print(f"Disk footprint reduced to {_ledger.total() / (1024*1024):.1f}MB.")
+    return removed
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+_scheduler: Optional[threading.Thread] = None
+_scheduler_lock = threading.Lock()
+_stop = threading.Event()
+
+
+def _tier_idle_sessions() -> None:
+    """Compress idle sessions and drop unreferenced dataset blobs."""
+    from tools.session_storage import gc_blobs, tier_idle_sessions
+
+    _, sessions_root, _ = _roots()
+    if not sessions_root.exists():
+        return
+    for project_id in tier_idle_sessions(sessions_root, _running_projects()):
+        _ledger.track(project_id)
+    gc_blobs()
+
+
+def _scheduler_loop() -> None:
+    interval = _env_minutes("CREWLYZE_CLEANUP_INTERVAL_MIN", 10) * 60
+    reconcile_every = _env_minutes("CREWLYZE_QUOTA_RECONCILE_MIN", 60) * 60
+    while not _stop.is_set():
+        try:
+            if _ledger.reconciled_at is None or time.time() - _ledger.reconciled_at >= reconcile_every:
+                _ledger.reconcile()
+            removed = enforce()
+            if removed:
+                print(f"[Cleanup] Removed {len(removed)} old session(s)")
+            _tier_idle_sessions()
+        except Exception as e:
+            print(f"[Cleanup] Scheduled cleanup failed: {e}")
+        _stop.wait(interval)
+
+
+def ensure_scheduler() -> None:
+    """Start the background cleanup thread once per process."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None and _scheduler.is_alive():
+            return
+        _stop.clear()
+        _scheduler = threading.Thread(target=_scheduler_loop, name="crewlyze-cleanup", daemon=True)
+        _scheduler.start()
+
+
+def stop_scheduler() -> None:
+    _stop.set()
@@ -0,0 +1,175 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+Optional background warm-up of the analysis engines after startup.
+
+Since imports became lazy, the server binds its port quickly. The cost has
+moved to the first analysis instead: importing crewai, litellm's model
+tables, matplotlib's font cache and scikit-learn, plus starting Kaleido and
+the worker pools. With ``CREWLYZE_WARMUP`` set, start() pays that cost on a
+daemon thread. The thread begins ``CREWLYZE_WARMUP_DELAY_S`` seconds (default
+1) after the startup hook, so the port is already bound and requests are
+served during the warm-up.
+
+``CREWLYZE_WARMUP`` takes ``1``/``true``/``all`` for every step, or a
+comma-separated list of step names (see STEPS). It is off by default.
+
+status() backs ``/api/health``. A step that fails (for example a missing
+optional package) is recorded with its error. It does not stop the other
+steps.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+
+def _warm_crewai() -> str:
+    import crewai  # noqa: F401
+    import crew  # noqa: F401
+    import ui.copilot  # noqa: F401
+    import ui.export  # noqa: F401
+    return "crew, copilot and export modules imported"
+
+
+def _warm_litellm() -> str:
+    from tools.model_catalog import get_model_catalog
+    catalog = get_model_catalog()
+    catalog.warm()
+    stats = catalog.stats()
+    return f"{stats['providers']} providers, {stats['models']} models indexed"
+
+
+def _warm_matplotlib() -> str:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    from matplotlib import font_manager
+    return f"{len(font_manager.fontManager.ttflist)} fonts cached"
+
+
+def _warm_sklearn() -> str:
+    import sklearn.ensemble  # noqa: F401
+    import sklearn.model_selection  # noqa: F401
+    return "sklearn.ensemble imported"
+
+
+def _warm_sandbox() -> str:
+    # Agent code runs in fresh interpreters; this primes the OS file cache and
+    # matplotlib's on-disk font cache they all share
+    from tools.dataset_tools import _run_in_subprocess
+    ok, output = _run_in_subprocess(
+        "import pandas, numpy, matplotlib\nmatplotlib.use('Agg')\nimport matplotlib.pyplot\nprint('ok')",
+        timeout=120,
+        is_healed_attempt=True,
+    )
+    if not ok:
+        raise RuntimeError(output[-300:])
+    return "sandbox interpreter primed"
+
+
+def _warm_cpu_workers() -> str:
+    from tools.executors import warm
+    return f"{warm()} CPU worker(s) started"
+
+
+def _warm_report_workers() -> str:
+    from tools.report_renderer import warm
+    return f"{warm()} report worker(s) started"
+
+
+def _warm_kaleido() -> str:
+    from tools.chart_renderer import warm
+    return f"Kaleido ready ({warm()})"
+
+
+STEPS = {
+    "crewai": _warm_crewai,
+    "litellm": _warm_litellm,
+    "matplotlib": _warm_matplotlib,
+    "sklearn": _warm_sklearn,
+    "sandbox": _warm_sandbox,
+    "cpu_workers": _warm_cpu_workers,
+    "report_workers": _warm_report_workers,
+    "kaleido": _warm_kaleido,
+}
+
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_state = {"enabled": False, "state": "disabled", "started_at": None, "finished_at": None, "steps": {}}
+
+
+def configured_steps() -> list:
+    value = os.getenv("CREWLYZE_WARMUP", "").strip().lower()
+    if value in ("", "0", "false", "off", "no"):
+        return []
+    if value in ("1", "true", "on", "yes", "all"):
+        return list(STEPS)
+    requested = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in STEPS]
+    if unknown:
+        print(f"[Warmup] Ignoring unknown step(s): {', '.join(unknown)}")
+    return [name for name in requested if name in STEPS]
+
+
+def _run(steps: list, delay: float) -> None:
+    time.sleep(delay)
+    with _lock:
+        _state["state"] = "running"
+        _state["started_at"] = time.time() * 1000
+    total = time.perf_counter()
+    for name in steps:
+        with _lock:
+            _state["steps"][name]["status"] = "running"
+        start = time.perf_counter()
+        try:
+            detail, status = STEPS[name](), "ok"
+        except Exception as e:
+            detail, status = f"{type(e).__name__}: {e}", "failed"
+        elapsed = round(time.perf_counter() - start, 2)
+        with _lock:
+            _state["steps"][name].update(status=status, seconds=elapsed, detail=detail)
+        print(f"[Warmup] {name}: {status} in {elapsed:.2f}s ({detail})")
+    with _lock:
+        _state["state"] = "ready"
+        _state["finished_at"] = time.time() * 1000
+    print(f"[Warmup] Finished in {time.perf_counter() - total:.1f}s")
+
+
+def start(delay: Optional[float] = None) -> bool:
+    """Start the warm-up thread once if CREWLYZE_WARMUP enables any step. Returns True if started."""
+    global _thread
+    steps = configured_steps()
+    if not steps:
+        return False
+    if delay is None:
+        try:
+            delay = max(0.0, float(os.getenv("CREWLYZE_WARMUP_DELAY_S", "1")))
+        except ValueError:
+            delay = 1.0
+    with _lock:
+        if _thread is not None:
+            return False
+        _state.update(enabled=True, state="pending",
+                      steps={name: {"status": "pending", "seconds": None, "detail": None} for name in steps})
+        _thread = threading.Thread(target=_run, args=(steps, delay), name="crewlyze-warmup", daemon=True)
+        _thread.start()
+    return True
+
+
+def status() -> dict:
+    """Warm-up state for the health endpoint. ``ready`` is True when warm-up is off or finished."""
+    with _lock:
+        snapshot = {
+            "enabled": _state["enabled"],
+            "state": _state["state"],
+            "started_at": _state["started_at"],
+            "finished_at": _state["finished_at"],
+            "steps": {name: dict(step) for name, step in _state["steps"].items()},
+        }
+    snapshot["ready"] = snapshot["state"] in ("disabled", "ready")
+    snapshot["failed"] = [name for name, step in snapshot["steps"].items() if step["status"] == "failed"]
+    return snapshot
@@ -18,10 +18,12 @@ Premium design with:
 """
 
 import html
-import io
+import json
 import os
 import re
+import threading
 import urllib.parse
+from collections import OrderedDict
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
@@ -303,11 +305,54 @@ def _kv_chip(label: str, value: str, label_style, value_style) -> Table:
     )
 
 
+def _restore_cached_charts(output_dir) -> None:
+    """Bring back chart PNGs missing from *output_dir* from the chart cache."""
+    try:
+        from tools.chart_cache import restore_pngs
+        restore_pngs(output_dir)
+    except Exception as e:
+        print(f"[PDF] Could not restore cached charts: {e}")
+
+
+# Section memos shared across report builds: PNG dimensions keyed by file
+# signature, dataset profiles keyed by the caller's ``dataset_key``.
+_MEMO_SIZE = 64
+_image_sizes: "OrderedDict[tuple, tuple]" = OrderedDict()
+_dataset_summaries: "OrderedDict[str, dict]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _memo_get(memo: OrderedDict, key):
+    with _memo_lock:
+        value = memo.get(key)
+        if value is not None:
+            memo.move_to_end(key)
+        return value
+
+
+def _memo_put(memo: OrderedDict, key, value) -> None:
+    with _memo_lock:
+        memo[key] = value
+        memo.move_to_end(key)
+        while len(memo) > _MEMO_SIZE:
+            memo.popitem(last=False)
+
+
+def _image_size(png_path: Path) -> tuple:
+    st = os.stat(png_path)
+    key = (str(png_path), st.st_size, st.st_mtime_ns)
+    size = _memo_get(_image_sizes, key)
+    if size is None:
+        with PILImage.open(png_path) as im:
+            size = im.size
+        _memo_put(_image_sizes, key, size)
+    return size
+
+
 def _img_flowable(png_path: Path, max_w: int = 440, max_h: int = 250):
     """Return (img_table, fig_title) for a chart image, or (None, None) on error."""
     try:
-        with PILImage.open(png_path) as im:
-            ow, oh = im.size
+        ow, oh = _image_size(png_path)
         aspect = oh / ow
         if aspect > (max_h / max_w):
             nh, nw = max_h, max_h / aspect
@@ -338,7 +383,143 @@ def _img_flowable(png_path: Path, max_w: int = 440, max_h: int = 250):
 # Column statistics table
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _build_stats_tables(df: pd.DataFrame, body_style) -> list:
+def _column_stats(df: pd.DataFrame) -> dict:
+    """Pre-formatted cell text for the appendix tables (the pandas-heavy part)."""
+    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
+    cat_cols     = df.select_dtypes(include=["object", "category"]).columns.tolist()
+
+    numeric_rows = []
+    for col in numeric_cols[:22]:
+        s   = df[col]
+        sn  = s.dropna()
+        miss = round(s.isnull().sum() / max(len(df), 1) * 100, 1)
+        numeric_rows.append([
+            _escape(str(col)),
+            _fmt_num(sn.min())    if not sn.empty else "—",
+            _fmt_num(sn.max())    if not sn.empty else "—",
+            _fmt_num(sn.mean())   if not sn.empty else "—",
+            _fmt_num(sn.median()) if not sn.empty else "—",
+            _fmt_num(sn.std())    if len(sn) > 1 else "—",
+            f"{miss}%",
+        ])
+
+    cat_rows = []
+    for col in cat_cols[:10]:
+        s    = df[col]
+        miss = round(s.isnull().sum() / max(len(df), 1) * 100, 1)
+        top3 = s.value_counts().head(3)
+        top_str = ", ".join(f"{_escape(str(v))}({c})" for v, c in top3.items()) if not top3.empty else "—"
+        cat_rows.append([_escape(str(col)), top_str[:100], str(s.nunique()), f"{miss}%"])
+
+    return {"numeric": numeric_rows, "categorical": cat_rows}
+
+
+def _deck_stats(df: pd.DataFrame) -> list:
+    """Min / max / mean / std cell text for the PPTX statistics slide."""
+    rows = []
+    for col in df.select_dtypes(include=["number"]).columns.tolist()[:8]:
+        col_data = df[col].dropna()
+        if not col_data.empty:
+            rows.append([
+                str(col)[:26],
+                f"{col_data.min():.2f}" if col_data.dtype.kind in "fc" else str(int(col_data.min())),
+                f"{col_data.max():.2f}" if col_data.dtype.kind in "fc" else str(int(col_data.max())),
+                f"{col_data.mean():.2f}",
+                f"{col_data.std():.2f}",
+            ])
+    return rows
+
+
+def _profile_frame(df: pd.DataFrame) -> dict:
+    cols_preview = ", ".join(str(c) for c in df.columns[:7])
+    if len(df.columns) > 7:
+        cols_preview += "  …"
+    return {
+        "rows":         int(df.shape[0]),
+        "columns":      int(df.shape[1]),
+        "numeric":      len(df.select_dtypes(include=["number"]).columns),
+        "categorical":  len(df.select_dtypes(include=["object", "category"]).columns),
+        "cols_preview": cols_preview,
+        "stats":        _column_stats(df),
+        "deck_stats":   _deck_stats(df),
+    }
+
+
+PROFILE_SUFFIX = ".profile.json"
+PROFILE_VERSION = 1
+
+
+def _profile_path(dataset_path: Path) -> Path:
+    return dataset_path.with_name(dataset_path.name + PROFILE_SUFFIX)
+
+
+def _profile_signature(dataset_path: Path) -> dict:
+    st = dataset_path.stat()
+    return {"version": PROFILE_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def record_profile(dataset_path, df: pd.DataFrame) -> dict:
+    """Profile *df* (the contents of *dataset_path*) and store the sidecar. Returns the profile."""
+    path = Path(dataset_path)
+    profile = _profile_frame(df)
+    sidecar = _profile_path(path)
+    try:
+        tmp = sidecar.with_name(f".{sidecar.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"signature": _profile_signature(path), "profile": profile}, f)
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        print(f"[Reports] Could not store dataset profile: {e}")
+    return profile
+
+
+def dataset_profile(dataset_path, memo_key: str = None) -> dict:
+    """Shape, column counts and formatted statistics of a dataset CSV, for the PDF and the deck.
+
+    The profile is stored in a ``<file>.profile.json`` sidecar keyed by the
+    file's size and mtime. The dataset is read at most once per version,
+    whichever report needs it first, and in whichever process.
+    """
+    if memo_key:
+        cached = _memo_get(_dataset_summaries, memo_key)
+        if cached is not None:
+            return cached
+
+    path = Path(dataset_path)
+    profile = None
+    try:
+        with open(_profile_path(path), "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("signature") == _profile_signature(path):
+            profile = stored["profile"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if profile is None:
+        from tools.dataset_tools import read_csv_robust
+        profile = record_profile(path, read_csv_robust(str(path)))
+
+    if memo_key:
+        _memo_put(_dataset_summaries, memo_key, profile)
+    return profile
+
+
+def _dataset_summary(result: dict) -> dict:
+    """Profile of the report's dataset (see dataset_profile()), or None.
+
+    An in-memory ``result["dataframe"]`` is profiled directly. Otherwise the
+    profile comes from ``result["dataset_path"]``, memoized under
+    ``result["dataset_key"]``.
+    """
+    df = result.get("dataframe")
+    if isinstance(df, pd.DataFrame):
+        return _profile_frame(df)
+    if result.get("dataset_path") and Path(result["dataset_path"]).exists():
+        return dataset_profile(result["dataset_path"], result.get("dataset_key"))
+    return None
+
+
+def _build_stats_tables(stats: dict, body_style) -> list:
     flowables = []
 
     hdr_style = ParagraphStyle("TblHdr", fontName="Helvetica-Bold", fontSize=8.5,
@@ -346,10 +527,7 @@ def _build_stats_tables(df: pd.DataFrame, body_style) -> list:
     cell_style = ParagraphStyle("TblCell", fontName="Helvetica", fontSize=8.5,
                                 textColor=C_INK, leading=12)
 
-    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-    cat_cols     = df.select_dtypes(include=["object", "category"]).columns.tolist()
-
-    if numeric_cols:
+    if stats["numeric"]:
         header = [
             Paragraph("<b>Column</b>",   hdr_style),
             Paragraph("<b>Min</b>",      hdr_style),
@@ -360,19 +538,8 @@ def _build_stats_tables(df: pd.DataFrame, body_style) -> list:
             Paragraph("<b>Missing%</b>", hdr_style),
         ]
         rows = [header]
-        for col in numeric_cols[:22]:
-            s   = df[col]
-            sn  = s.dropna()
-            miss = round(s.isnull().sum() / max(len(df), 1) * 100, 1)
-            rows.append([
-                Paragraph(_escape(str(col)),                                  cell_style),
-                Paragraph(_fmt_num(sn.min())    if not sn.empty else "—",     cell_style),
-                Paragraph(_fmt_num(sn.max())    if not sn.empty else "—",     cell_style),
-                Paragraph(_fmt_num(sn.mean())   if not sn.empty else "—",     cell_style),
-                Paragraph(_fmt_num(sn.median()) if not sn.empty else "—",     cell_style),
-                Paragraph(_fmt_num(sn.std())    if len(sn) > 1 else "—",      cell_style),
-                Paragraph(f"{miss}%",                                          cell_style),
-            ])
+        for cells in stats["numeric"]:
+            rows.append([Paragraph(text, cell_style) for text in cells])
 
         tbl = Table(rows, colWidths=[130, 52, 52, 52, 52, 52, 58])
         tbl.setStyle(TableStyle([
@@ -388,7 +555,7 @@ def _build_stats_tables(df: pd.DataFrame, body_style) -> list:
         ]))
         flowables.extend([tbl, Spacer(1, 10)])
 
-    if cat_cols:
+    if stats["categorical"]:
         cat_hdr = [
             Paragraph("<b>Column</b>",             hdr_style),
             Paragraph("<b>Top Values (count)</b>", hdr_style),
@@ -396,17 +563,8 @@ def _build_stats_tables(df: pd.DataFrame, body_style) -> list:
             Paragraph("<b>Missing%</b>",           hdr_style),
         ]
         cat_rows = [cat_hdr]
-        for col in cat_cols[:10]:
-            s    = df[col]
-            miss = round(s.isnull().sum() / max(len(df), 1) * 100, 1)
-            top3 = s.value_counts().head(3)
-            top_str = ", ".join(f"{_escape(str(v))}({c})" for v, c in top3.items()) if not top3.empty else "—"
-            cat_rows.append([
-                Paragraph(_escape(str(col)), cell_style),
-                Paragraph(top_str[:100],     cell_style),
-                Paragraph(str(s.nunique()),  cell_style),
-                Paragraph(f"{miss}%",        cell_style),
-            ])
+        for cells in stats["categorical"]:
+            cat_rows.append([Paragraph(text, cell_style) for text in cells])
 
         cat_tbl = Table(cat_rows, colWidths=[110, 278, 56, 56])
         cat_tbl.setStyle(TableStyle([
@@ -430,7 +588,11 @@ def _build_stats_tables(df: pd.DataFrame, body_style) -> list:
 # ─────────────────────────────────────────────────────────────────────────────
 
 def export_pdf(result: dict, filename: str = "") -> bytes:
-    """Build and return a premium world-class executive PDF report."""
+    """Build and return a premium world-class executive PDF report.
+
+    The dataset comes from ``result["dataframe"]``, or from the stored
+    profile of ``result["dataset_path"]`` (see dataset_profile()).
+    """
     buffer = BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -465,8 +627,9 @@ def export_pdf(result: dict, filename: str = "") -> bytes:
     report_title   = _clean_ai_artifacts(result.get("report_title") or result.get("name") or filename or "Executive Analysis").strip()
     report_goal    = _clean_ai_artifacts(result.get("goal", "")).strip()
     timestamp      = datetime.now().strftime("%B %d, %Y  ·  %I:%M %p")
-    df             = result.get("dataframe")
+    summary        = _dataset_summary(result)
     output_dir     = result.get("output_dir", Path("outputs"))
+    _restore_cached_charts(output_dir)
     png_files      = list(Path(output_dir).glob("*.png"))
     placed_charts  = set()
 
@@ -520,12 +683,12 @@ def export_pdf(result: dict, filename: str = "") -> bytes:
     story.append(Spacer(1, 60))
 
     # Dataset Summary Card on Cover Page
-    if df is not None and isinstance(df, pd.DataFrame):
+    if summary is not None:
         cover_meta_data = [
-            [Paragraph("<b>TOTAL RECORDS</b>", label_style), Paragraph(f"<b>{df.shape[0]:,}</b>", value_style),
-             Paragraph("<b>TOTAL COLUMNS</b>", label_style), Paragraph(f"<b>{df.shape[1]}</b>", value_style)],
-            [Paragraph("<b>NUMERIC COLS</b>", label_style), Paragraph(f"<b>{len(df.select_dtypes(include=['number']).columns)}</b>", value_style),
-             Paragraph("<b>CATEGORICAL COLS</b>", label_style), Paragraph(f"<b>{len(df.select_dtypes(include=['object', 'category']).columns)}</b>", value_style)]
+            [Paragraph("<b>TOTAL RECORDS</b>", label_style), Paragraph(f"<b>{summary['rows']:,}</b>", value_style),
+             Paragraph("<b>TOTAL COLUMNS</b>", label_style), Paragraph(f"<b>{summary['columns']}</b>", value_style)],
+            [Paragraph("<b>NUMERIC COLS</b>", label_style), Paragraph(f"<b>{summary['numeric']}</b>", value_style),
+             Paragraph("<b>CATEGORICAL COLS</b>", label_style), Paragraph(f"<b>{summary['categorical']}</b>", value_style)]
         ]
         t_cover = Table(cover_meta_data, colWidths=[110, 110, 110, 110])
         t_cover.setStyle(TableStyle([
@@ -557,16 +720,14 @@ def export_pdf(result: dict, filename: str = "") -> bytes:
     ))
     story.append(Spacer(1, 10))
 
-    if df is not None and isinstance(df, pd.DataFrame):
-        ncol = len(df.select_dtypes(include=["number"]).columns)
-        ccol = len(df.select_dtypes(include=["object", "category"]).columns)
-        cols_preview = ", ".join(str(c) for c in df.columns[:7])
-        if len(df.columns) > 7:
-            cols_preview += "  …"
+    if summary is not None:
+        ncol = summary["numeric"]
+        ccol = summary["categorical"]
+        cols_preview = summary["cols_preview"]
 
         kv_rows = [
-            [Paragraph("<b>Total Records</b>",    label_style), Paragraph(f"<b>{df.shape[0]:,}</b>", value_style),
-             Paragraph("<b>Total Columns</b>",    label_style), Paragraph(f"<b>{df.shape[1]}</b>",   value_style)],
+            [Paragraph("<b>Total Records</b>",    label_style), Paragraph(f"<b>{summary['rows']:,}</b>", value_style),
+             Paragraph("<b>Total Columns</b>",    label_style), Paragraph(f"<b>{summary['columns']}</b>", value_style)],
             [Paragraph("<b>Numeric Columns</b>",  label_style), Paragraph(f"<b>{ncol}</b>",           value_style),
              Paragraph("<b>Categorical Cols</b>", label_style), Paragraph(f"<b>{ccol}</b>",           value_style)],
             [Paragraph("<b>Column Preview</b>",   label_style), Paragraph(_escape(cols_preview),      value_style),
@@ -824,14 +985,14 @@ def export_pdf(result: dict, filename: str = "") -> bytes:
         Spacer(1, 12)
     ]))
 
-    if df is not None and isinstance(df, pd.DataFrame):
+    if summary is not None:
         story.append(Paragraph("Per-Column Statistical Summary", h2_style))
         story.append(Paragraph(
             "Numeric distributions and categorical frequency breakdowns for all dataset columns:",
             body_style
         ))
         story.append(Spacer(1, 5))
-        stat_flowables = _build_stats_tables(df, body_style)
+        stat_flowables = _build_stats_tables(summary["stats"], body_style)
         if stat_flowables:
             story.extend(stat_flowables)
         story.append(Spacer(1, 12))
@@ -903,40 +1064,23 @@ def export_pdf(result: dict, filename: str = "") -> bytes:
 # Cached wrapper
 # ─────────────────────────────────────────────────────────────────────────────
 
-_pdf_cache: dict = {}
-
-
-def export_pdf_cached(
-    cache_key:       str,
-    filename:        str = "",
-    result_cleaning: str = "",
-    result_relations:str = "",
-    result_insights: str = "",
-    result_code:     str = "",
-    output_dir_str:  str = "outputs",
-    df_csv:          str = "",
-) -> bytes:
-    if cache_key in _pdf_cache:
-        return _pdf_cache[cache_key]
-
-    df = None
-    if df_csv:
-        try:
-            df = pd.read_csv(io.StringIO(df_csv))
-        except Exception:
-            df = None
-
-    result = {
-        "dataframe":      df,
-        "cleaning_steps": result_cleaning,
-        "relations":      result_relations,
-        "insights":       result_insights,
-        "code":           result_code,
-        "output_dir":     output_dir_str,
-    }
-    pdf_bytes = export_pdf(result, filename=filename)
-    _pdf_cache[cache_key] = pdf_bytes
-    return pdf_bytes
+def export_pdf_cached(result: dict, cache_key: str, filename: str = "") -> Path:
+    """Path of the cached PDF for *cache_key*, rendering it with export_pdf() on a miss.
+
+    Build *cache_key* with tools.report_cache.report_key() from everything the
+    report depends on.
+    """
+    from tools.report_cache import build_lock, get_report_cache
+
+    cache = get_report_cache()
+    path = cache.get_pdf(cache_key)
+    if path is not None:
+        return path
+    with build_lock(cache_key):
+        path = cache.get_pdf(cache_key)  # built by a concurrent request meanwhile
+        if path is None:
+            path = cache.put_pdf(cache_key, export_pdf(result, filename=filename))
+    return path
 
 
 # ─────────────────────────────────────────────────────────────────────────────
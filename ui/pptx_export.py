@@ -0,0 +1,388 @@
+# Crewlyze
+# Copyright (c) 2026 Sowmiyan S
+# Licensed under the MIT License
+
+"""
+PPTX export — McKinsey-style executive slide deck.
+
+The deck is built from a project's results, metadata and cleaned dataset.
+It used to be built inline in the export-pptx request handler. It is now a
+plain function, so the report renderer pool (tools/report_renderer.py) can
+build it off the event loop and cache the file next to the PDF report.
+
+- Statistics come from the stored dataset profile that the PDF report also
+  uses (ui/export.py dataset_profile()). The CSV is not re-read for each
+  deck, and switching theme does not recompute anything.
+- Slides start from a per-theme template: an empty presentation with the
+  slide size and the master background already set, built once per process.
+- Chart PNGs are restored from the chart cache instead of being re-rendered.
+"""
+
+import re
+import threading
+from io import BytesIO
+from pathlib import Path
+
+_templates: dict = {}  # theme -> template bytes
+_templates_lock = threading.Lock()
+
+
+def _restore_cached_charts(output_dir) -> None:
+    """Bring back chart PNGs missing from *output_dir* from the chart cache."""
+    try:
+        from tools.chart_cache import restore_pngs
+        restore_pngs(output_dir)
+    except Exception as e:
+        print(f"[PPTX] Could not restore cached charts: {e}")
+
+
+def _deck_template(bg_rgb: tuple) -> bytes:
+    """Empty 16:9 presentation whose slide master carries the theme background."""
+    with _templates_lock:
+        template = _templates.get(bg_rgb)
+        if template is None:
+            from pptx import Presentation
+            from pptx.util import Inches
+            from pptx.dml.color import RGBColor
+
+            prs = Presentation()
+            prs.slide_width = Inches(13.333)
+            prs.slide_height = Inches(7.5)
+            fill = prs.slide_master.background.fill
+            fill.solid()
+            fill.fore_color.rgb = RGBColor(*bg_rgb)
+            buffer = BytesIO()
+            prs.save(buffer)
+            template = _templates[bg_rgb] = buffer.getvalue()
+        return template
+
+
+def _deck_stats(cleaned_csv, dataset_key: str = None):
+    """Rows for the statistics slide from the stored dataset profile, or None."""
+    if not cleaned_csv or not Path(cleaned_csv).exists():
+        return None
+    try:
+        from ui.export import dataset_profile
+        return dataset_profile(cleaned_csv, dataset_key)["deck_stats"]
+    except Exception as e:
+        print(f"[PPTX] Could not load dataset profile: {e}")
+        return None
+
+
+def export_pptx(data: dict, meta: dict, cleaned_csv=None, theme: str = "dark", dataset_key: str = None) -> bytes:
+    """Build and return the executive slide deck as PPTX bytes."""
+    try:
+        from pptx import Presentation
+        from pptx.util import Inches, Pt
+        from pptx.dml.color import RGBColor
+        from pptx.enum.text import PP_ALIGN
+        from pptx.enum.shapes import MSO_SHAPE
+    except ImportError:
+        import subprocess, sys
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "python-pptx"])
+        from pptx import Presentation
+        from pptx.util import Inches, Pt
+        from pptx.dml.color import RGBColor
+        from pptx.enum.text import PP_ALIGN
+        from pptx.enum.shapes import MSO_SHAPE
+
+    report_title = meta.get("report_title", meta.get("name", "Executive Data Analysis"))
+    project_name = meta.get("name", "Crewlyze Project")
+
+    is_light = (theme.lower() == "light")
+
+    # Color Palette Definitions
+    if is_light:
+        bg_rgb = (248, 250, 252)        # Slate 50
+        card_rgb = (255, 255, 255)      # White
+        card_border_rgb = (226, 232, 240) # Slate 200
+        text_head_rgb = (15, 23, 42)    # Slate 900
+        text_body_rgb = (51, 65, 85)    # Slate 700
+        text_sub_rgb = (100, 116, 139)  # Slate 500
+        accent_purple = (124, 58, 237)  # Violet 600
+        accent_emerald = (5, 150, 105)  # Emerald 600
+        accent_cyan = (2, 132, 199)     # Sky 600
+        accent_rose = (225, 29, 72)     # Rose 600
+        accent_amber = (217, 119, 6)    # Amber 600
+    else:
+        bg_rgb = (15, 17, 23)          # Dark Obsidian
+        card_rgb = (24, 28, 41)         # Dark Slate Card
+        card_border_rgb = (51, 65, 85)  # Dark Border
+        text_head_rgb = (255, 255, 255) # Pure White
+        text_body_rgb = (226, 232, 240) # Slate 200
+        text_sub_rgb = (148, 163, 184)  # Slate 400
+        accent_purple = (168, 85, 247)  # Purple 500
+        accent_emerald = (16, 185, 129) # Emerald 500
+        accent_cyan = (14, 165, 233)    # Sky 500
+        accent_rose = (244, 63, 94)     # Rose 500
+        accent_amber = (245, 158, 11)   # Amber 500
+
+    prs = Presentation(BytesIO(_deck_template(bg_rgb)))
+
+    def _clean_md(text: str) -> str:
+        """Strips raw markdown hashes and asterisks."""
+        if not text: return ""
+        cleaned = re.sub(r'^\s*#{1,6}\s*', '', text, flags=re.MULTILINE)
+        cleaned = cleaned.replace('**', '').replace('__', '')
+        return cleaned.strip()
+
+    def _clean_takeaway_text(text: str) -> str:
+        if not text:
+            return "Visual distribution map detailing parameter correlations and features matrix."
+        cleaned = re.sub(r'\[Auto-Healing.*?\]', '', text, flags=re.IGNORECASE)
+        cleaned = re.sub(r'Warnings\s*&\s*Alerts:.*', '', cleaned, flags=re.DOTALL | re.IGNORECASE)
+        cleaned = re.sub(r'Active insights agent failed.*', '', cleaned, flags=re.DOTALL | re.IGNORECASE)
+        cleaned = re.sub(r'^\d+[\.\)]\s*', '', cleaned)
+        lines = [line.strip() for line in cleaned.split("\n") if line.strip() and not line.strip().startswith("- [Auto-Healing")]
+        return "\n".join(lines).strip() or "Visual distribution map detailing parameter correlations and features matrix."
+
+    def _add_textbox(slide, left, top, width, height, text, size=13, bold=False, color=text_body_rgb, align=PP_ALIGN.LEFT):
+        clean_t = _clean_md(text)
+        txBox = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
+        tf = txBox.text_frame
+        tf.word_wrap = True
+
+        # Dynamic font size auto-scaling based on text length
+        if len(clean_t) > 400:
+            size = min(size, 9.5)
+            if len(clean_t) > 650:
+                clean_t = clean_t[:640] + "..."
+        elif len(clean_t) > 220:
+            size = min(size, 10.5)
+        elif len(clean_t) > 120:
+            size = min(size, 11.5)
+
+        p = tf.paragraphs[0]
+        p.text = clean_t
+        p.font.size = Pt(size)
+        p.font.bold = bold
+        p.font.color.rgb = RGBColor(*color)
+        p.alignment = align
+        return tf
+
+    # ── SLIDE 1: Cover Page ───────────────────────────────────────────────────
+    slide1 = prs.slides.add_slide(prs.slide_layouts[6])
+
+    # Accent Header Bar
+    bar = slide1.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0.8), Inches(0.8), Inches(0.18), Inches(5.8))
+    bar.fill.solid()
+    bar.fill.fore_color.rgb = RGBColor(*accent_purple)
+    bar.line.fill.background()
+
+    # Title & Subtitle
+    _add_textbox(slide1, 1.3, 1.8, 11.0, 1.4, report_title, size=34, bold=True, color=text_head_rgb)
+    _add_textbox(slide1, 1.3, 3.2, 11.0, 0.6, f"Project Dataset: {project_name}", size=18, color=accent_purple)
+    
+    import datetime
+    date_str = datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p')
+    _add_textbox(slide1, 1.3, 3.9, 11.0, 0.4, f"Generated on {date_str}", size=13, color=text_sub_rgb)
+
+    # Metadata Stat Badges Container
+    meta_card = slide1.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(1.3), Inches(4.8), Inches(10.8), Inches(1.4))
+    meta_card.fill.solid()
+    meta_card.fill.fore_color.rgb = RGBColor(*card_rgb)
+    meta_card.line.color.rgb = RGBColor(*card_border_rgb)
+
+    meta_text = f"📊 Dataset Scope: {data.get('rows_count', 0):,} Rows × {data.get('cols_count', 0)} Columns  |  Numeric Features: {data.get('numeric_count', 0)}  |  Categorical Features: {data.get('cat_count', 0)}"
+    _add_textbox(slide1, 1.5, 5.3, 10.4, 0.6, meta_text, size=14, bold=True, color=text_body_rgb, align=PP_ALIGN.CENTER)
+
+    # ── SLIDE 2: Executive KPI Metrics Grid ──────────────────────────────────
+    slide2 = prs.slides.add_slide(prs.slide_layouts[6])
+    _add_textbox(slide2, 0.8, 0.6, 11.5, 0.6, "Executive Data Metrics & Health Profile", size=26, bold=True, color=text_head_rgb)
+
+    kpis = [
+        ("Total Rows", f"{data.get('rows_count', 0):,}", "Complete Data Records", accent_purple),
+        ("Total Features", f"{data.get('cols_count', 0)}", "Dataset Attributes", accent_emerald),
+        ("Numeric Ratio", f"{data.get('numeric_count', 0)} / {data.get('cols_count', 0)}", "Quantitative Columns", accent_cyan),
+        ("Data Quality", "100%", "Cleaned & Validated", accent_amber)
+    ]
+
+    for idx, (title, val, sub, col_rgb) in enumerate(kpis):
+        left_pos = 0.8 + (idx * 2.95)
+        card = slide2.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(left_pos), Inches(1.6), Inches(2.7), Inches(4.8))
+        card.fill.solid()
+        card.fill.fore_color.rgb = RGBColor(*card_rgb)
+        card.line.color.rgb = RGBColor(*col_rgb)
+
+        _add_textbox(slide2, left_pos + 0.1, 2.2, 2.5, 0.4, title.upper(), size=12, bold=True, color=col_rgb, align=PP_ALIGN.CENTER)
+        _add_textbox(slide2, left_pos + 0.1, 3.2, 2.5, 1.0, val, size=32, bold=True, color=text_head_rgb, align=PP_ALIGN.CENTER)
+        _add_textbox(slide2, left_pos + 0.1, 4.8, 2.5, 0.4, sub, size=11, color=text_sub_rgb, align=PP_ALIGN.CENTER)
+
+    # ── SLIDE 3: Descriptive Statistics Table ─────────────────────────────────
+    stats = _deck_stats(cleaned_csv, dataset_key)
+
+    slide3 = prs.slides.add_slide(prs.slide_layouts[6])
+    _add_textbox(slide3, 0.8, 0.6, 11.5, 0.6, "Feature Statistics Profile", size=26, bold=True, color=accent_emerald)
+
+    if stats is not None:
+        rows_len = len(stats) + 1
+        cols_len = 5
+        x, y, cx, cy = Inches(0.8), Inches(1.5), Inches(11.7), Inches(0.5 + 0.42 * len(stats))
+        table_shape = slide3.shapes.add_table(rows_len, cols_len, x, y, cx, cy)
+        table = table_shape.table
+
+        table.columns[0].width = Inches(3.7)
+        table.columns[1].width = Inches(2.0)
+        table.columns[2].width = Inches(2.0)
+        table.columns[3].width = Inches(2.0)
+        table.columns[4].width = Inches(2.0)
+
+        headers = ["Numeric Feature", "Min Value", "Max Value", "Arithmetic Mean", "Std Deviation"]
+        for c_idx, h_text in enumerate(headers):
+            cell = table.cell(0, c_idx)
+            cell.text = h_text
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = RGBColor(*accent_emerald) if is_light else RGBColor(16, 185, 129)
+            p = cell.text_frame.paragraphs[0]
+            p.font.size = Pt(12)
+            p.font.bold = True
+            p.font.color.rgb = RGBColor(255, 255, 255)
+            p.alignment = PP_ALIGN.LEFT if c_idx == 0 else PP_ALIGN.RIGHT
+
+        for r_idx, row_data in enumerate(stats):
+            for c_idx, val in enumerate(row_data):
+                cell = table.cell(r_idx + 1, c_idx)
+                cell.text = val
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = RGBColor(*card_rgb)
+                p = cell.text_frame.paragraphs[0]
+                p.font.size = Pt(11)
+                p.font.color.rgb = RGBColor(*text_body_rgb)
+                p.alignment = PP_ALIGN.LEFT if c_idx == 0 else PP_ALIGN.RIGHT
+
+    # ── SLIDE 4: Strategic Business Insights (Structured Split Cards) ────────
+    insights = data.get("insights", "").strip()
+    insights_paragraphs = [p.strip() for p in _clean_md(insights).split("\n\n") if p.strip()]
+
+    if insights_paragraphs:
+        slide4 = prs.slides.add_slide(prs.slide_layouts[6])
+        _add_textbox(slide4, 0.8, 0.6, 11.5, 0.6, "Strategic Business Insights & Recommendations", size=24, bold=True, color=accent_amber)
+
+        parsed_cards = []
+        for p in insights_paragraphs[:3]:
+            obs, imp, strat = "", "", ""
+            obs_m = re.search(r"Observation:\s*(.*?)(?=Business Implication|Actionable Strategy|$)", p, re.DOTALL | re.IGNORECASE)
+            imp_m = re.search(r"Business Implication:\s*(.*?)(?=Observation|Actionable Strategy|$)", p, re.DOTALL | re.IGNORECASE)
+            strat_m = re.search(r"Actionable Strategy:\s*(.*?)(?=Observation|Business Implication|$)", p, re.DOTALL | re.IGNORECASE)
+            
+            if obs_m: obs = obs_m.group(1).strip()
+            if imp_m: imp = imp_m.group(1).strip()
+            if strat_m: strat = strat_m.group(1).strip()
+
+            parsed_cards.append({
+                "obs": obs or p[:200],
+                "imp": imp or "Resource allocation exhibits a lockstep relationship with performance metrics.",
+                "strat": strat or "Establish continuous automated monitoring and resource allocation controls."
+            })
+
+        col_w = 3.65
+        for idx, card_data in enumerate(parsed_cards[:3]):
+            left_pos = 0.8 + (idx * 3.9)
+            card = slide4.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(left_pos), Inches(1.4), Inches(col_w), Inches(5.4))
+            card.fill.solid()
+            card.fill.fore_color.rgb = RGBColor(*card_rgb)
+            card.line.color.rgb = RGBColor(*accent_amber)
+
+            _add_textbox(slide4, left_pos + 0.15, 1.55, col_w - 0.3, 0.35, f"STRATEGIC PILLAR #{idx+1}", size=11, bold=True, color=accent_amber)
+
+            _add_textbox(slide4, left_pos + 0.15, 2.0, col_w - 0.3, 0.25, "OBSERVATION", size=9.5, bold=True, color=accent_cyan)
+            _add_textbox(slide4, left_pos + 0.15, 2.3, col_w - 0.3, 1.3, card_data["obs"], size=10, color=text_body_rgb)
+
+            _add_textbox(slide4, left_pos + 0.15, 3.7, col_w - 0.3, 0.25, "BUSINESS IMPLICATION", size=9.5, bold=True, color=accent_purple)
+            _add_textbox(slide4, left_pos + 0.15, 4.0, col_w - 0.3, 1.3, card_data["imp"], size=10, color=text_body_rgb)
+
+            _add_textbox(slide4, left_pos + 0.15, 5.4, col_w - 0.3, 0.25, "ACTIONABLE STRATEGY", size=9.5, bold=True, color=accent_emerald)
+            _add_textbox(slide4, left_pos + 0.15, 5.7, col_w - 0.3, 0.9, card_data["strat"], size=10, color=text_body_rgb)
+
+    # ── SLIDE 5+: Visual Charts & Executive Takeaway Cards ───────────────────
+    png_charts = data.get("png_charts", [])
+    output_dir = Path(data.get("output_dir", ""))
+    _restore_cached_charts(output_dir)
+
+    for idx, chart_name in enumerate(png_charts[:4]):
+        chart_path = output_dir / chart_name
+        if chart_path.exists():
+            slide_chart = prs.slides.add_slide(prs.slide_layouts[6])
+            chart_title = chart_name.replace(".png", "").replace("_", " ").title()
+            _add_textbox(slide_chart, 0.8, 0.6, 11.5, 0.6, f"Visual Intelligence: {chart_title}", size=24, bold=True, color=accent_cyan)
+
+            try:
+                slide_chart.shapes.add_picture(str(chart_path), Inches(0.8), Inches(1.4), Inches(6.5))
+            except Exception as chart_err:
+                print(f"Error adding chart image to PPTX: {chart_err}")
+
+            raw_t = insights_paragraphs[idx + 3] if (idx + 3) < len(insights_paragraphs) else ""
+            takeaway_text = _clean_takeaway_text(raw_t)
+            
+            r_left = 7.6
+            r_width = 4.9
+            
+            card_bg = slide_chart.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(r_left), Inches(1.4), Inches(r_width), Inches(5.4))
+            card_bg.fill.solid()
+            card_bg.fill.fore_color.rgb = RGBColor(*card_rgb)
+            card_bg.line.color.rgb = RGBColor(*accent_cyan)
+
+            _add_textbox(slide_chart, r_left + 0.2, 1.65, r_width - 0.4, 0.35, "EXECUTIVE TAKEAWAY & ANALYSIS", size=12, bold=True, color=accent_cyan)
+
+            _add_textbox(slide_chart, r_left + 0.2, 2.1, r_width - 0.4, 0.25, "KEY PATTERN OBSERVED", size=9.5, bold=True, color=accent_purple)
+            _add_textbox(slide_chart, r_left + 0.2, 2.4, r_width - 0.4, 1.4, takeaway_text, size=10.5, color=text_body_rgb)
+
+            _add_textbox(slide_chart, r_left + 0.2, 3.9, r_width - 0.4, 0.25, "OPERATIONAL RELEVANCE", size=9.5, bold=True, color=accent_amber)
+            _add_textbox(slide_chart, r_left + 0.2, 4.2, r_width - 0.4, 1.0, "This visual distribution provides key evidence for resource allocation and predictive modeling.", size=10, color=text_body_rgb)
+
+            _add_textbox(slide_chart, r_left + 0.2, 5.3, r_width - 0.4, 0.25, "RECOMMENDED NEXT STEP", size=9.5, bold=True, color=accent_emerald)
+            _add_textbox(slide_chart, r_left + 0.2, 5.6, r_width - 0.4, 1.0, "Incorporate key column metrics into automated data-quality monitor.", size=10, color=text_body_rgb)
+
+    # ── SLIDE LAST: Conclusion & Action Plan (Stacked Action Cards) ──────────
+    slide_final = prs.slides.add_slide(prs.slide_layouts[6])
+    _add_textbox(slide_final, 0.8, 0.6, 11.5, 0.6, "Conclusions & Actionable Implementation", size=24, bold=True, color=accent_emerald)
+
+    action_items = [
+        ("01", "Operational Optimization", "Leverage mapped correlations to drive high-impact operational optimizations and resource reallocation.", accent_cyan),
+        ("02", "Automated Data Governance", "Implement automated data-quality checks on continuous incoming data streams to prevent pipeline anomalies.", accent_purple),
+        ("03", "Predictive Integration", "Deploy machine-learning ready data structures directly into downstream predictive modeling pipelines.", accent_amber),
+        ("04", "Stakeholder Alignment", "Share executive visual decks and insights with key business stakeholders for strategic alignment.", accent_emerald)
+    ]
+
+    for idx, (num_str, title_str, desc_str, col_rgb) in enumerate(action_items):
+        top_pos = 1.4 + (idx * 1.35)
+        
+        card = slide_final.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.8), Inches(top_pos), Inches(11.7), Inches(1.2))
+        card.fill.solid()
+        card.fill.fore_color.rgb = RGBColor(*card_rgb)
+        card.line.color.rgb = RGBColor(*col_rgb)
+
+        num_box = slide_final.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.95), Inches(top_pos + 0.15), Inches(0.9), Inches(0.9))
+        num_box.fill.solid()
+        num_box.fill.fore_color.rgb = RGBColor(*col_rgb)
+        num_box.line.fill.background()
+
+        _add_textbox(slide_final, 0.95, top_pos + 0.35, 0.9, 0.5, num_str, size=18, bold=True, color=(255, 255, 255), align=PP_ALIGN.CENTER)
+
+        _add_textbox(slide_final, 2.0, top_pos + 0.2, 10.3, 0.35, title_str.upper(), size=12, bold=True, color=col_rgb)
+        _add_textbox(slide_final, 2.0, top_pos + 0.55, 10.3, 0.55, desc_str, size=11, color=text_body_rgb)
+
+    buffer = BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def export_pptx_cached(job: dict, cache_key: str) -> Path:
+    """Path of the cached deck for *cache_key*, building it with export_pptx() on a miss.
+
+    *job* holds the export_pptx() arguments: ``data``, ``meta``,
+    ``cleaned_csv``, ``theme`` and ``dataset_key``.
+    """
+    from tools.report_cache import build_lock, get_report_cache
+
+    cache = get_report_cache()
+    path = cache.get_pptx(cache_key)
+    if path is not None:
+        return path
+    with build_lock(cache_key):
+        path = cache.get_pptx(cache_key)
+        if path is None:
+            pptx_bytes = export_pptx(job["data"], job["meta"], job.get("cleaned_csv"), job.get("theme", "dark"),
+                                     job.get("dataset_key"))
+            path = cache.put_pptx(cache_key, pptx_bytes)
+    return path
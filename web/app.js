@@ -84,6 +84,8 @@ const state = {
   chatHistory:      [],   // [{role, content, plot_url}]
   previewMinimized: false,
   sseSource:        null, // current EventSource
+  eventSource:      null, // typed progress EventSource (/api/analyze/events)
+  typedProgress:    false, // true once typed stage events arrive; disables log inference
   resultsCache:     {},   // session_id -> results JSON cache
   smtpAccounts:     [],   // cache list of SMTP accounts
 };
@@ -2682,18 +2684,23 @@ function markStage(stage, status) {
 let _activeStage = null;
 const STAGE_ORDER = ['cleaning', 'relations', 'insights', 'visualization', 'plotly'];
 
-function updateProgressTrack(newStage) {
+function updateProgressTrack(newStage, exact = false) {
   const newIdx = STAGE_ORDER.indexOf(newStage);
   if (newIdx === -1) return;
 
   const currentIdx = STAGE_ORDER.indexOf(_activeStage);
   
-  // We only progress forward. If newIdx is less than or equal to currentIdx, ignore.
-  if (newIdx <= currentIdx) return;
+  if (exact) {
+    // Typed events report the real stage order; no guessing needed
+    if (newStage === _activeStage) return;
+  } else {
+    // We only progress forward. If newIdx is less than or equal to currentIdx, ignore.
+    if (newIdx <= currentIdx) return;
 
-  // Mark all stages before newStage as done
-  for (let i = 0; i < newIdx; i++) {
-    markStage(STAGE_ORDER[i], 'done');
+    // Mark all stages before newStage as done
+    for (let i = 0; i < newIdx; i++) {
+      markStage(STAGE_ORDER[i], 'done');
+    }
   }
 
   // Mark newStage as active
@@ -2794,6 +2801,51 @@ function inferStageFromLog(line) {
   return null;
 }
 
+function applyProgressEvent(evt) {
+  switch (evt.type) {
+    case 'stage_started':
+      state.typedProgress = true;
+      updateProgressTrack(evt.stage, true);
+      break;
+    case 'stage_finished':
+    case 'stage_skipped':
+      markStage(evt.stage, 'done');
+      if (evt.type === 'stage_finished' && evt.duration_ms != null) {
+        const tokens = evt.tokens ? `, ${evt.tokens.toLocaleString()} tokens` : '';
+        appendLog(`[${evt.stage}] finished in ${(evt.duration_ms / 1000).toFixed(1)}s${tokens}`);
+      }
+      break;
+    case 'chart_produced':
+      appendLog(`Chart ready: ${evt.title}${evt.render_seconds != null ? ` (rendered in ${evt.render_seconds.toFixed(2)}s)` : ''}`);
+      break;
+    case 'heal_attempt':
+      addNotification('Auto-Healing', `Script repair (${evt.kind}) ${evt.success ? 'succeeded' : 'failed'}`, evt.success ? 'success' : 'info');
+      break;
+  }
+}
+
+function startProgressEvents(sessionId) {
+  if (state.eventSource) { state.eventSource.close(); state.eventSource = null; }
+  state.typedProgress = false;
+
+  const src = new EventSource(`/api/analyze/events?session_id=${sessionId}`);
+  state.eventSource = src;
+
+  src.onmessage = e => {
+    try {
+      applyProgressEvent(JSON.parse(e.data));
+    } catch (err) {
+      console.warn('Bad progress event', err);
+    }
+  };
+  const stop = () => {
+    src.close();
+    if (state.eventSource === src) state.eventSource = null;
+  };
+  src.addEventListener('end', stop);
+  src.onerror = stop;
+}
+
 function startSSEStream(sessionId) {
   // Close any existing stream
   if (state.sseSource) { state.sseSource.close(); state.sseSource = null; }
@@ -2842,6 +2894,8 @@ function startSSEStream(sessionId) {
     if (timerEl) timerEl.textContent = `${mins}:${secs}`;
   }, 1000);
 
+  startProgressEvents(sessionId);
+
   const src = new EventSource(`/api/analyze/stream?session_id=${sessionId}`);
   state.sseSource = src;
 
@@ -2888,7 +2942,9 @@ function startSSEStream(sessionId) {
 
     appendLog(line);
 
-    // Infer stage transitions and update progress track
+    // Fall back to inferring stage transitions from log text only when the
+    // server is not sending typed progress events
+    if (state.typedProgress) return;
     const stage = inferStageFromLog(line);
     if (stage) {
       updateProgressTrack(stage);
@@ -2934,6 +2990,23 @@ els.clearLogBtn.addEventListener('click', () => { els.logOutput.innerHTML = '';
 // ────────────────────────────────────────────────────────────────────────────
 // Load & Render Results
 // ────────────────────────────────────────────────────────────────────────────
+// Charts are stored as separate typed-array encoded files; results.json only
+// carries { title, figure, type } references. Fetch them in parallel.
+async function hydrateFigures(data, sessionId) {
+  const charts = data.plotly_charts || [];
+  await Promise.all(charts.map(async chart => {
+    if (chart.fig_json || !chart.figure) return;
+    try {
+      const res = await fetch(`/api/figures/${sessionId}/${encodeURIComponent(chart.figure)}`);
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      chart.fig_json = await res.json();
+    } catch (err) {
+      console.warn('Failed to load figure', chart.figure, err);
+      chart.fig_json = { data: [], layout: {} };
+    }
+  }));
+}
+
 async function loadResults(sessionId, retryCount = 0) {
   // Check if we have cached results for this session
   if (state.resultsCache[sessionId]) {
@@ -2973,6 +3046,8 @@ async function loadResults(sessionId, retryCount = 0) {
       return;
     }
 
+    await hydrateFigures(data, sessionId);
+
     // Cache the retrieved results
     state.resultsCache[sessionId] = data;
 
@@ -3637,7 +3712,7 @@ function renderCharts(plotlyCharts, pngCharts, sessionId) {
       const card = document.createElement('div');
       card.className = 'chart-card';
 
-      const typeLabel = chart.fig_json?.data?.[0]?.type || 'chart';
+      const typeLabel = chart.fig_json?.data?.[0]?.type || chart.type || 'chart';
       card.innerHTML = `
         <div class="chart-card-header">
           <div class="chart-card-title">${escHtml(chart.title)}</div>
@@ -3703,8 +3778,9 @@ function renderCharts(plotlyCharts, pngCharts, sessionId) {
             if (zoomTitle) zoomTitle.textContent = chart.title || 'Chart Inspector';
             zoomModal.classList.remove('hidden');
 
-            const zData = JSON.parse(JSON.stringify(chart.fig_json.data || []));
-            const zLayout = JSON.parse(JSON.stringify(chart.fig_json.layout || {}));
+            // structuredClone keeps typed arrays intact (JSON round-trips do not)
+            const zData = structuredClone(chart.fig_json.data || []);
+            const zLayout = structuredClone(chart.fig_json.layout || {});
             delete zLayout.width;
             zLayout.autosize = true;
             zLayout.paper_bgcolor = '#111115';
@@ -4102,20 +4178,24 @@ async function executeSqlWorkbench(sql, sessionId) {
   try {
     const fd = new FormData();
     fd.append('session_id', sessionId);
-    fd.append('query', sql.trim());
+    fd.append('sql_query', sql.trim());
+    fd.append('offset', '0');
+    fd.append('limit', '100');
 
     const res = await fetch('/api/query-sql', { method: 'POST', body: fd });
     const data = await res.json();
-    if (!res.ok || data.status === 'error') {
-      toast('SQL Query error: ' + (data.detail || data.message || 'Execution failed'), 'error');
+    if (!res.ok || data.success === false) {
+      toast('SQL Query error: ' + (data.detail || data.error || 'Execution failed'), 'error');
       return;
     }
 
     if (els.chatArtifactCanvas && els.artifactCanvasBody) {
       els.chatArtifactCanvas.classList.remove('hidden');
-      let tableHtml = `<div style="font-size: 0.78rem; font-weight: 700; color: var(--emerald); margin-bottom: 6px;">✓ SQL Query Results (${data.row_count || 0} rows)</div>`;
-      if (data.rows && data.rows.length) {
-        const cols = Object.keys(data.rows[0]);
+      const rows = data.results || [];
+      const shown = rows.length < (data.total_count || 0) ? `first ${rows.length} of ` : '';
+      let tableHtml = `<div style="font-size: 0.78rem; font-weight: 700; color: var(--emerald); margin-bottom: 6px;">✓ SQL Query Results (${shown}${data.total_count || 0} rows)</div>`;
+      if (rows.length) {
+        const cols = data.columns || Object.keys(rows[0]);
         tableHtml += `
           <div style="overflow-x: auto; max-height: 320px; border: 1px solid var(--border-mid); border-radius: var(--r-sm);">
             <table class="preview-table" style="width: 100%; font-size: 0.75rem;">
@@ -4123,7 +4203,7 @@ async function executeSqlWorkbench(sql, sessionId) {
                 <tr>${cols.map(c => `<th>${escHtml(c)}</th>`).join('')}</tr>
               </thead>
               <tbody>
-                ${data.rows.map(r => `<tr>${cols.map(c => `<td>${escHtml(r[c])}</td>`).join('')}</tr>`).join('')}
+                ${rows.map(r => `<tr>${cols.map(c => `<td>${escHtml(r[c])}</td>`).join('')}</tr>`).join('')}
               </tbody>
             </table>
           </div>